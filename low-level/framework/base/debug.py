@@ -19,8 +19,8 @@
  ****************************************************************************
 """
 
-import json
-from framework.utils.service_logging import logger
+from framework.utils.service_logging import lazy_logger
+from framework.utils import json_codec
 try:
    from systemd import journal
    use_journal=True
@@ -36,16 +36,20 @@ class Debug(object):
         self._debug = False
         self._debug_persist = False
 
-    def _log_debug(self, message):
-        """Logging messages"""
+    def _log_debug(self, message, *args):
+        """Logging messages, the %-style args are only formatted into the
+        message when debug logging is enabled"""
         # if self._debug:
         #     log_msg = self.name() + ", " + message
         #     if use_journal:
         #         journal.send(log_msg, PRIORITY=7, SYSLOG_IDENTIFIER="sspl-ll")
         #     else:
         #         logger.debug(log_msg)
-        log_msg = self.name() + ", " + message
-        logger.debug(log_msg)
+        if args:
+            lazy_logger.debug("%s, " + message, self.name(), *args,
+                              caller_depth=1)
+        else:
+            lazy_logger.debug("%s, %s", self.name(), message, caller_depth=1)
 
     def _set_debug(self, debug):
         """Sets debug flag"""
@@ -78,7 +82,7 @@ class Debug(object):
 
         # Handle raw strings
         if isinstance(jsonMsgRaw, dict) is False:
-            jsonMsg = json.loads(jsonMsgRaw)
+            jsonMsg = json_codec.loads(jsonMsgRaw)
         else:
             jsonMsg = jsonMsgRaw
 
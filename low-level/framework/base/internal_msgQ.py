@@ -20,11 +20,335 @@
                     another.
  ****************************************************************************
 """
+import queue
+import threading
+import time
+from collections import deque
+
 from framework.utils.service_logging import logger
 
+
+class InternalMsgQueue(queue.Queue):
+    """Queue used for the internal messages of a module. It can notify the
+    module consuming it whenever a message is placed on it.
+
+    When maxsize is set the overflow policy decides what happens to a
+    message written to a full queue:
+        block      - the producer waits up to put_timeout secs for space,
+                     the message is dropped if none frees up
+        drop_oldest - the oldest queued message is discarded, its producer
+                     is released with the event flagged as dropped, see
+                     InternalMsgQ._wait_msg_delivered()
+        spill      - the message is written to spill_queue, a persistent
+                     StoreQueue, and moved back once there is space again.
+                     The spill queue is read and written without holding
+                     the queue lock.
+    """
+
+    BLOCK       = "block"
+    DROP_OLDEST = "drop_oldest"
+    SPILL       = "spill"
+
+    OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, SPILL)
+
+    # Returned by _get() in place of a message to read from the spill queue
+    _SPILLED = object()
+
+    def __init__(self, maxsize=0, overflow_policy=BLOCK, put_timeout=None,
+                 spill_queue=None):
+        super(InternalMsgQueue, self).__init__(maxsize)
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError("Unknown overflow policy: %s" % overflow_policy)
+        if overflow_policy == self.SPILL and spill_queue is None:
+            raise ValueError("A spill queue is required by the spill policy")
+
+        self._waker = None
+        self.overflow_policy = overflow_policy
+        self.put_timeout = put_timeout
+        self._spill_queue = spill_queue
+        # Keeps the reads and writes of the spill queue in order
+        self._spill_lock = threading.Lock()
+        # Messages being written to and read back from the spill queue
+        self._spilling = 0
+        self._unspilling = 0
+        # Messages left over in the spill queue from a previous run
+        self._spilled = 0
+        if spill_queue is not None:
+            self._spilled = spill_queue.tail - spill_queue.head
+
+        # Largest number of messages the queue has held
+        self.high_water_mark = 0
+        # Messages discarded and written to the spill queue on overflow
+        self.dropped = 0
+        self.spilled = 0
+
+    @staticmethod
+    def release_dropped(event):
+        """Releases the producer waiting on the event of a dropped message,
+        flagging the event so that it is not taken for a delivered one"""
+        event.dropped = True
+        event.set()
+
+    def set_waker(self, waker):
+        """Registers a callable invoked each time a message is put"""
+        self._waker = waker
+
+    def put(self, item, block=True, timeout=None):
+        """Places a message on the queue applying the overflow policy,
+        raises queue.Full if the message was dropped while blocking"""
+        if self.maxsize <= 0:
+            return super(InternalMsgQueue, self).put(item, block, timeout)
+
+        if self.overflow_policy == self.BLOCK:
+            if timeout is None:
+                timeout = self.put_timeout
+            try:
+                return super(InternalMsgQueue, self).put(item, block, timeout)
+            except queue.Full:
+                with self.mutex:
+                    self.dropped += 1
+                raise
+
+        dropped = None
+        spill = False
+        with self.not_full:
+            if self.overflow_policy == self.DROP_OLDEST:
+                if self._qsize() >= self.maxsize:
+                    dropped = self._drop_oldest()
+                    self.dropped += 1
+            # Keep the messages in order by spilling while older ones are
+            #  still in, or on their way to or from, the spill queue
+            elif self._spilled > 0 or self._spilling > 0 or \
+                 self._unspilling > 0 or self._qsize() >= self.maxsize:
+                self._spilling += 1
+                spill = True
+
+            if not spill:
+                self._put(item)
+                self.unfinished_tasks += 1
+                self.not_empty.notify()
+
+        # The spill queue is written and a dropped message's producer
+        #  released without holding the queue lock
+        if dropped is not None and dropped[1] is not None:
+            self.release_dropped(dropped[1])
+        if spill:
+            self._spill(item)
+
+    def get(self, block=True, timeout=None):
+        """Removes and returns the oldest message, read from the spill queue
+        once the queue lock is released when it was spilled"""
+        item = super(InternalMsgQueue, self).get(block, timeout)
+        if self._spill_queue is None:
+            return item
+        if item is self._SPILLED:
+            item = self._read_spilled()
+        self._unspill()
+        return item
+
+    def _drop_oldest(self):
+        """Discards the oldest queued message and returns it"""
+        return self.queue.popleft()
+
+    def _spill(self, item):
+        """Writes the message to the persistent spill queue, the event of a
+        spilled message can not be persisted and is not set"""
+        jsonMsg, _ = item
+        try:
+            with self._spill_lock:
+                self._spill_queue.put(jsonMsg, pickled=True)
+        except Exception:
+            with self.mutex:
+                self._spilling -= 1
+            raise
+
+        with self.not_empty:
+            self._spilling -= 1
+            self._spilled += 1
+            self.spilled += 1
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+        if self._waker is not None:
+            self._waker()
+
+    def _qsize(self):
+        return len(self.queue) + self._spilled
+
+    def _put(self, item):
+        super(InternalMsgQueue, self)._put(item)
+        if len(self.queue) > self.high_water_mark:
+            self.high_water_mark = len(self.queue)
+        if self._waker is not None:
+            self._waker()
+
+    def _get(self):
+        if self.queue:
+            return self.queue.popleft()
+        # The oldest message is spilled, get() reads it
+        self._spilled -= 1
+        self._unspilling += 1
+        return self._SPILLED
+
+    def _read_spilled(self):
+        """Returns the oldest spilled message claimed by _get()"""
+        try:
+            with self._spill_lock:
+                jsonMsg = self._spill_queue.get()
+        finally:
+            with self.mutex:
+                self._unspilling -= 1
+        if jsonMsg is None:
+            # Spilled messages were lost from the store
+            return None, None
+        return jsonMsg, None
+
+    def _unspill(self):
+        """Moves the oldest spilled message back onto the queue when there
+        is space for it"""
+        with self.mutex:
+            if self._spilled == 0 or len(self.queue) >= self.maxsize:
+                return
+            self._spilled -= 1
+            self._unspilling += 1
+
+        jsonMsg = None
+        try:
+            with self._spill_lock:
+                jsonMsg = self._spill_queue.get()
+        finally:
+            with self.not_empty:
+                self._unspilling -= 1
+                if jsonMsg is not None:
+                    self.queue.append((jsonMsg, None))
+                    self.not_empty.notify()
+
+
+class MsgLanes(object):
+    """Deque like container keeping the messages of a PriorityLaneMsgQueue in
+    one FIFO lane per priority, highest priority first. popleft() serves the
+    highest priority lane holding messages unless the oldest message of a
+    lower one has waited starvation_timeout secs or more.
+    """
+
+    # Queueing latencies kept per lane to compute percentiles
+    LATENCY_SAMPLES = 1000
+
+    def __init__(self, names, classifier, starvation_timeout):
+        self.names = names
+        self._classifier = classifier
+        self._starvation_timeout = starvation_timeout
+        self._lanes = [deque() for _ in names]
+        self._latencies = [deque(maxlen=self.LATENCY_SAMPLES) for _ in names]
+        self._served = [0] * len(names)
+        self._starved = [0] * len(names)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        """Iterates over the messages in the order they are served when
+        none is starved"""
+        for msgs in self._lanes:
+            for _, item in msgs:
+                yield item
+
+    def append(self, item):
+        try:
+            lane = self._classifier(item[0])
+        except Exception as e:
+            logger.warning("MsgLanes, unable to classify message: %r" % e)
+            lane = 0
+        self._lanes[lane].append((time.time(), item))
+        self._size += 1
+
+    def popleft(self):
+        now = time.time()
+        lane = None
+        for index, msgs in enumerate(self._lanes):
+            if not msgs:
+                continue
+            if lane is None:
+                lane = index
+            elif now - msgs[0][0] >= self._starvation_timeout:
+                lane = index
+                self._starved[index] += 1
+                break
+        if lane is None:
+            raise IndexError("pop from empty lanes")
+
+        queued, item = self._lanes[lane].popleft()
+        self._size -= 1
+        self._served[lane] += 1
+        self._latencies[lane].append(now - queued)
+        return item
+
+    def drop(self):
+        """Discards the oldest message of the lowest priority lane and
+        returns it"""
+        for msgs in reversed(self._lanes):
+            if msgs:
+                self._size -= 1
+                return msgs.popleft()[1]
+
+    def stats(self):
+        """Returns the depth, messages served and queueing latency
+        percentiles in msecs of each lane"""
+        stats = {}
+        for index, name in enumerate(self.names):
+            latencies = sorted(self._latencies[index])
+            stats[name] = {
+                "depth": len(self._lanes[index]),
+                "served": self._served[index],
+                "starved": self._starved[index],
+                "latency_p50_ms": self._percentile(latencies, 50),
+                "latency_p99_ms": self._percentile(latencies, 99),
+                "latency_max_ms": self._percentile(latencies, 100)
+            }
+        return stats
+
+    @staticmethod
+    def _percentile(latencies, percent):
+        if not latencies:
+            return None
+        index = min(len(latencies) - 1, len(latencies) * percent // 100)
+        return round(latencies[index] * 1000, 3)
+
+
+class PriorityLaneMsgQueue(InternalMsgQueue):
+    """InternalMsgQueue serving its messages by priority. classifier returns
+    the index in lanes of the lane a message is queued on, lanes being
+    ordered highest priority first. Messages of a lower lane are served
+    anyway once they waited starvation_timeout secs. The drop_oldest
+    policy discards messages of the lowest priority lane first.
+    """
+
+    def __init__(self, lanes, classifier, starvation_timeout=1, maxsize=0,
+                 overflow_policy=InternalMsgQueue.BLOCK, put_timeout=None,
+                 spill_queue=None):
+        # Used by _init() called from the queue.Queue constructor
+        self._lanes = (lanes, classifier, starvation_timeout)
+        super(PriorityLaneMsgQueue, self).__init__(maxsize, overflow_policy,
+                                                   put_timeout, spill_queue)
+
+    def _init(self, maxsize):
+        self.queue = MsgLanes(*self._lanes)
+
+    def _drop_oldest(self):
+        return self.queue.drop()
+
+    def lane_stats(self):
+        """Returns the statistics of each lane of the queue"""
+        with self.mutex:
+            return self.queue.stats()
+
+
 class InternalMsgQ(object):
     """Base Class for internal message queue communications between modules"""
 
+    # Limits the messages written by the module when set
+    _rate_limiter = None
+
     def __init__(self):
         super(InternalMsgQ, self).__init__()
 
@@ -32,16 +356,39 @@ class InternalMsgQ(object):
         """Initialize the map of internal message queues"""
         self._msgQlist = msgQlist
 
+        # Have the scheduler run us as soon as a message is placed on our queue
+        if getattr(self, "WAKE_ON_MSGQ", False):
+            q = self._msgQlist.get(self.name())
+            if isinstance(q, InternalMsgQueue):
+                q.set_waker(self.wakeup)
+            else:
+                logger.warning("%s, message queue does not support wake on put, "
+                               "falling back to polling" % self.name())
+                self.WAKE_ON_MSGQ = False
+                self.MSGQ_IDLE_INTERVAL = 1
+
+    def set_rate_limiter(self, rate_limiter):
+        """Limits the rate of the messages written by this module with a
+        MsgRateLimiter"""
+        self._rate_limiter = rate_limiter
+
+    def get_rate_limiter_stats(self):
+        """Returns the rate limiting counters, None when not rate limited"""
+        if self._rate_limiter is None:
+            return None
+        return self._rate_limiter.stats()
+
     def _is_my_msgQ_empty(self):
         """Returns True/False for this module's queue being empty"""
         q = self._msgQlist[self.name()]
         return q.empty()
 
-    def _read_my_msgQ(self):
-        """Blocks on reading from this module's queue placed by another thread"""
+    def _read_my_msgQ(self, timeout=None):
+        """Blocks on reading from this module's queue placed by another thread,
+        for at most timeout secs when given"""
         try:
             q = self._msgQlist[self.name()]
-            jsonMsg, event = q.get()
+            jsonMsg, event = q.get(timeout=timeout)
 
             if jsonMsg is None:
                 return None, None
@@ -51,9 +398,13 @@ class InternalMsgQ(object):
             if global_debug_off is True:
                  self._debug_off_globally()
 
-            self._log_debug("_read_my_msgQ: %s, Msg:%s" % (self.name(), jsonMsg))
+            self._module_stats.record_msg()
+            self._log_debug("_read_my_msgQ: %s, Msg:%s", self.name(), jsonMsg)
             return jsonMsg, event
 
+        except queue.Empty:
+            return None, None
+
         except Exception as e:
             logger.exception("_read_my_msgQ: %r" % e)
 
@@ -79,7 +430,8 @@ class InternalMsgQ(object):
             if global_debug_off is True:
                 self._debug_off_globally()
 
-            self._log_debug("_read_my_msgQ_noWait: %s, Msg:%s" % (self.name(), jsonMsg))
+            self._module_stats.record_msg()
+            self._log_debug("_read_my_msgQ_noWait: %s, Msg:%s", self.name(), jsonMsg)
             return jsonMsg, event
 
         except Exception as e:
@@ -87,11 +439,63 @@ class InternalMsgQ(object):
 
     def _write_internal_msgQ(self, toModule, jsonMsg, event=None):
         """writes a json message to an internal message queue"""
-        self._log_debug("_write_internal_msgQ: From %s, To %s, Msg:%s" %
-                       (self.name(), toModule, jsonMsg))
+        self._log_debug("_write_internal_msgQ: From %s, To %s, Msg:%s",
+                        self.name(), toModule, jsonMsg)
 
+        if self._rate_limiter is None:
+            self._put_internal_msgQ(toModule, jsonMsg, event)
+            return
+
+        # The workers of the shared module pool run the other modules and
+        #  must not sleep until the message is allowed
+        block = getattr(self, "_module_pool", None) is None
+        for item in self._rate_limiter.admit((toModule, jsonMsg, event), block):
+            self._put_internal_msgQ(*item)
+        self._schedule_rate_limited_drain()
+        self._schedule_rate_limit_report()
+
+    def _schedule_rate_limited_drain(self):
+        """Has the rate limiter's timer write the messages held back once
+        they are allowed"""
+        delay = self._rate_limiter.claim_drain()
+        if delay is not None:
+            self._rate_limiter.schedule(delay, self._drain_rate_limited)
+
+    def _drain_rate_limited(self):
+        for item in self._rate_limiter.drain():
+            self._put_internal_msgQ(*item)
+        self._schedule_rate_limited_drain()
+
+    def _schedule_rate_limit_report(self):
+        """Has the rate limiter's timer log the summary of the messages
+        throttled once it is due, also when the module stopped writing
+        since"""
+        delay = self._rate_limiter.claim_report()
+        if delay is not None:
+            self._rate_limiter.schedule(delay, self._report_rate_limited)
+
+    def _report_rate_limited(self):
+        self._rate_limiter.report()
+        self._schedule_rate_limit_report()
+
+    def _put_internal_msgQ(self, toModule, jsonMsg, event):
         q = self._msgQlist[toModule]
-        q.put((jsonMsg, event))
+        try:
+            q.put((jsonMsg, event))
+        except queue.Full:
+            logger.warning("_write_internal_msgQ: %s queue is full, dropped "
+                           "message from %s" % (toModule, self.name()))
+            if event is not None:
+                InternalMsgQueue.release_dropped(event)
+
+    @staticmethod
+    def _wait_msg_delivered(event, timeout):
+        """Waits up to timeout secs on the event of a message written with
+        _write_internal_msgQ. Returns True once the message was delivered,
+        False when it timed out or the message was dropped by a full queue"""
+        delivered = event.wait(timeout) and not getattr(event, "dropped", False)
+        event.dropped = False
+        return delivered
 
     def _get_msgQ_copy(self, module_name):
         """Returns a copy of a modules message queue"""
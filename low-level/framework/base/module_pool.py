@@ -0,0 +1,229 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Shared pool of worker threads which runs the scheduled
+                    events of module threads from a single timer heap,
+                    instead of one OS thread and sched.scheduler per module.
+ ****************************************************************************
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import namedtuple
+
+from framework.utils.service_logging import logger
+
+# Same fields as sched.Event so modules can inspect the events they queued
+PoolEvent = namedtuple('PoolEvent', 'time, priority, sequence, action, argument, kwargs')
+
+
+class ModuleScheduler(object):
+    """Replaces the sched.scheduler of a module whose events are run by a
+    ModuleThreadPool. Only the part of the sched API used by modules is
+    provided."""
+
+    def __init__(self, module_pool, module):
+        self._module_pool = module_pool
+        self._module = module
+
+    def enterabs(self, time, priority, action, argument=(), kwargs=None):
+        """Queues an event for the module to run at an absolute time"""
+        return self._module_pool._enterabs(self._module, time, priority,
+                                           action, argument, kwargs or {})
+
+    def enter(self, delay, priority, action, argument=(), kwargs=None):
+        """Queues an event for the module to run after delay seconds"""
+        return self.enterabs(self._module_pool.timefunc() + delay, priority,
+                             action, argument, kwargs)
+
+    def cancel(self, event):
+        """Removes an event from the queue, raises ValueError if not queued"""
+        self._module_pool._cancel(self._module, event)
+
+    def empty(self):
+        return not self.queue
+
+    @property
+    def queue(self):
+        """List of upcoming events of the module in the order they will run"""
+        return self._module_pool._module_events(self._module)
+
+    def run(self, blocking=True):
+        """Events are run by the pool workers, so there is nothing to wait on"""
+        return None
+
+
+class ModuleThreadPool(object):
+    """Runs the scheduled events of all pooled modules on a fixed number of
+    worker threads.
+
+    Due events are picked by the PRIORITY of their module, lower values
+    first as with sched, and a module never has two events running at once.
+    Events waiting past their due time gain one priority level every
+    AGING_INTERVAL seconds so busy modules can not starve the others.
+    """
+
+    AGING_INTERVAL = 5
+
+    def __init__(self, num_workers, timefunc=time.time):
+        self.timefunc = timefunc
+        self._num_workers = num_workers
+        self._cond = threading.Condition()
+        # Heap of (time, sequence) for every queued event, entries of
+        #  cancelled events are dropped lazily when they reach the top
+        self._heap = []
+        # Live events, sequence -> (module, event)
+        self._events = {}
+        # Sequences of live events which are due
+        self._ready = []
+        # Modules which have an event executing on a worker
+        self._busy = set()
+        self._sequence = itertools.count()
+        self._workers = []
+        self._stopping = False
+
+    def start(self):
+        """Starts the worker threads"""
+        logger.info("ModuleThreadPool, starting %d workers" % self._num_workers)
+        for index in range(self._num_workers):
+            worker = threading.Thread(target=self._worker,
+                                      name="ModuleThreadPool-%d" % index)
+            self._workers.append(worker)
+            worker.start()
+
+    def stop(self):
+        """Lets the workers exit once the queued events left all belong to
+        modules which have been shut down"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+    def scheduler_for(self, module):
+        """Returns the scheduler a pooled module queues its events on"""
+        return ModuleScheduler(self, module)
+
+    def start_module(self, module, conf_reader, msgQlist, product, resume=True):
+        """Hands a module over to the pool and queues its initialization.
+        Also used by the ThreadController to (re)start a pooled module."""
+        module.use_module_pool(self)
+
+        # Drop events left over from a previous run, such as the delayed
+        #  _cleanup_and_stop of a restart, so they can't halt the new one
+        for event in module._scheduler.queue:
+            try:
+                module._scheduler.cancel(event)
+            except ValueError:
+                pass
+
+        self._enterabs(module, self.timefunc(), module._priority,
+                       self._start_module,
+                       (module, conf_reader, msgQlist, product, resume), {})
+
+    def _start_module(self, module, conf_reader, msgQlist, product, resume):
+        # Suspend module threads not allowed to run in degraded mode
+        if resume == False:
+            module.suspend()
+        logger.info("Starting: %s on ModuleThreadPool" % module.name())
+        module.start_thread(conf_reader, msgQlist, product)
+
+    def _enterabs(self, module, time, priority, action, argument, kwargs):
+        with self._cond:
+            event = PoolEvent(time, priority, next(self._sequence),
+                              action, argument, kwargs)
+            self._events[event.sequence] = (module, event)
+            heapq.heappush(self._heap, (time, event.sequence))
+            self._cond.notify()
+        return event
+
+    def _cancel(self, module, event):
+        with self._cond:
+            entry = self._events.get(event.sequence)
+            if entry is None or entry[0] is not module:
+                raise ValueError("event not in the queue of %s" % module.name())
+            del self._events[event.sequence]
+
+    def _module_events(self, module):
+        with self._cond:
+            events = [event for (owner, event) in self._events.values()
+                      if owner is module]
+        return sorted(events, key=lambda e: (e.time, e.priority, e.sequence))
+
+    def _next_event(self):
+        """Waits for the next event to run, called with self._cond held"""
+        while True:
+            if self._stopping and not any(module.is_running()
+                                          for (module, _) in self._events.values()):
+                self._cond.notify_all()
+                return None, None
+
+            now = self.timefunc()
+            while self._heap and self._heap[0][0] <= now:
+                _, sequence = heapq.heappop(self._heap)
+                if sequence in self._events:
+                    self._ready.append(sequence)
+
+            best, best_key = None, None
+            ready = []
+            for sequence in self._ready:
+                entry = self._events.get(sequence)
+                if entry is None:
+                    continue
+                ready.append(sequence)
+                module, event = entry
+                if module in self._busy:
+                    continue
+                key = (event.priority - (now - event.time) / self.AGING_INTERVAL,
+                       sequence)
+                if best_key is None or key < best_key:
+                    best, best_key = sequence, key
+            self._ready = ready
+
+            if best is not None:
+                self._ready.remove(best)
+                module, event = self._events.pop(best)
+                self._busy.add(module)
+                return module, event
+
+            timeout = None
+            if self._heap:
+                timeout = max(0, self._heap[0][0] - now)
+            self._cond.wait(timeout)
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                module, event = self._next_event()
+            if event is None:
+                return
+
+            try:
+                module._run_event(event)
+            except Exception as ex:
+                # Same outcome as an error escaping a dedicated module thread
+                logger.error(f"{module.name()} has encountered an error {ex}, "
+                             f"error is unrecoverable , shutting down {module.name()}")
+                try:
+                    module.shutdown()
+                    module._cleanup_and_stop()
+                except Exception as ae:
+                    logger.exception(ae)
+            finally:
+                with self._cond:
+                    self._busy.discard(module)
+                    self._cond.notify_all()
@@ -0,0 +1,97 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Runtime statistics recorded for each module thread:
+                    run() durations, scheduler lag and message throughput.
+ ****************************************************************************
+"""
+
+import threading
+import time
+
+
+class ModuleStats(object):
+    """Runtime statistics of a module thread"""
+
+    # Upper bounds in seconds of the run() duration histogram buckets,
+    #  runs longer than the last bound are counted in an overflow bucket
+    RUN_BUCKETS = (0.001, 0.01, 0.1, 1, 10, 60)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self._run_histogram = [0] * (len(self.RUN_BUCKETS) + 1)
+        self._run_count = 0
+        self._run_total = 0.0
+        self._run_max = 0.0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+        self._msgs_total = 0
+        # Messages counted since the last snapshot, for the current rate
+        self._msgs_window = 0
+        self._window_start = self._started
+
+    def record_run(self, lag, duration):
+        """Records a run() which fired lag seconds after it was planned
+        and took duration seconds"""
+        lag = max(0.0, lag)
+        bucket = len(self.RUN_BUCKETS)
+        for index, bound in enumerate(self.RUN_BUCKETS):
+            if duration <= bound:
+                bucket = index
+                break
+        with self._lock:
+            self._run_histogram[bucket] += 1
+            self._run_count += 1
+            self._run_total += duration
+            self._run_max = max(self._run_max, duration)
+            self._lag_total += lag
+            self._lag_max = max(self._lag_max, lag)
+
+    def record_msg(self):
+        """Records a message read from the module's internal queue"""
+        with self._lock:
+            self._msgs_total += 1
+            self._msgs_window += 1
+
+    def snapshot(self):
+        """Returns the statistics as a dict and starts a new window for
+        the messages per second rate"""
+        now = time.time()
+        with self._lock:
+            runs = self._run_count
+            window = max(now - self._window_start, 1e-6)
+            histogram = {}
+            for index, count in enumerate(self._run_histogram):
+                if index < len(self.RUN_BUCKETS):
+                    histogram["<=%ss" % self.RUN_BUCKETS[index]] = count
+                else:
+                    histogram[">%ss" % self.RUN_BUCKETS[-1]] = count
+            stats = {
+                "runs": runs,
+                "run_time_avg": round(self._run_total / runs, 6) if runs else 0,
+                "run_time_max": round(self._run_max, 6),
+                "run_time_histogram": histogram,
+                "sched_lag_avg": round(self._lag_total / runs, 6) if runs else 0,
+                "sched_lag_max": round(self._lag_max, 6),
+                "msgs_total": self._msgs_total,
+                "msgs_per_sec": round(self._msgs_window / window, 3),
+                "msgs_per_sec_avg": round(self._msgs_total / max(now - self._started, 1e-6), 3),
+            }
+            self._msgs_window = 0
+            self._window_start = now
+        return stats
@@ -26,6 +26,7 @@ import threading
 import time
 from sched import scheduler
 from .debug import Debug
+from .module_stats import ModuleStats
 from framework.utils.service_logging import logger
 
 class DependencyState(object):
@@ -65,10 +66,26 @@ class ScheduledModuleThread(ModuleThread, Debug):
     SUSPENDED = 2
     HALTED = 3
 
+    # Modules which only have work to do when a message is placed on their
+    #  internal queue set this so that a pending run() fires as soon as a
+    #  message arrives instead of waiting for its next timed re-arm.
+    WAKE_ON_MSGQ = False
+
+    # Seconds a wake on put module waits between runs while its queue is idle
+    MSGQ_IDLE_INTERVAL = 30
+
+    # Modules whose run() blocks for long periods, such as event loops and
+    #  blocking consumers, keep a thread of their own when the shared
+    #  ModuleThreadPool is enabled
+    DEDICATED_THREAD = False
+
     def __init__(self, module_name, priority):
         super(ScheduledModuleThread, self).__init__()
 
-        self._scheduler   = scheduler(time.time, time.sleep)
+        self._wakeup_event = threading.Event()
+        self._module_pool = None
+        self._module_stats = ModuleStats()
+        self._scheduler   = scheduler(time.time, self._wait_for_event)
         self._module_name = module_name
         self._priority    = priority
         self._running     = False
@@ -84,12 +101,83 @@ class ScheduledModuleThread(ModuleThread, Debug):
     def start(self):
         """Run the scheduler"""
         self._running = True
-        self._scheduler.run()
+        if self._module_pool is None:
+            self._run_scheduler()
+
+    def _run_scheduler(self):
+        """Runs the scheduled events until there are none left, the same way
+        sched.scheduler.run() does while recording the module statistics"""
+        while True:
+            events = self._scheduler.queue
+            if not events:
+                break
+            event = events[0]
+            now = time.time()
+            if event.time > now:
+                self._wait_for_event(event.time - now)
+                continue
+            try:
+                self._scheduler.cancel(event)
+            except ValueError:
+                # Cancelled or moved by another thread in the meantime
+                continue
+            self._run_event(event)
+            # Let other threads run
+            self._wait_for_event(0)
+
+    def _run_event(self, event):
+        """Runs a scheduled event, timing it when it is the module's run()"""
+        if event.action != self.run:
+            event.action(*event.argument, **event.kwargs)
+            return
+
+        fired = time.time()
+        try:
+            event.action(*event.argument, **event.kwargs)
+        finally:
+            self._module_stats.record_run(fired - event.time, time.time() - fired)
+
+    def get_stats(self):
+        """Returns the runtime statistics of the module"""
+        return self._module_stats.snapshot()
 
     def start_thread(self, conf_reader, msgQlist, product):
         self.initialize(conf_reader, msgQlist, product)
         self.start()
 
+    def use_module_pool(self, module_pool):
+        """Hands the scheduling of this module over to a ModuleThreadPool"""
+        self._module_pool = module_pool
+        self._scheduler = module_pool.scheduler_for(self)
+
+    def wakeup(self):
+        """Wakes up the scheduler to run the module right away.
+        Called by the internal msgQ when a message is placed on our queue"""
+        if self._module_pool is not None:
+            self._run_now()
+        else:
+            self._wakeup_event.set()
+
+    def _wait_for_event(self, delay):
+        """Scheduler delay function, sleeps until the next scheduled event
+        is due or until the module is woken up by a new message"""
+        if self._wakeup_event.wait(delay):
+            self._wakeup_event.clear()
+            self._run_now()
+
+    def _run_now(self):
+        """Moves a pending run() of the module to the front of the scheduler"""
+        now = time.time()
+        for event in self._scheduler.queue:
+            if event.action != self.run or event.time <= now:
+                continue
+            try:
+                self._scheduler.cancel(event)
+            except ValueError:
+                # Already fired or cancelled
+                continue
+            self._scheduler.enterabs(now, event.priority, self.run, event.argument)
+
     def _cleanup_and_stop(self):
         """Clean out the remainder of events from the scheduler queue."""
         self._log_debug("last module calling _cleanup_and_stop thread scheduler")
@@ -0,0 +1,99 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Immutable envelope for the messages passed between
+                    modules on the internal message queues. The message is
+                    kept as a dict while it travels between modules and is
+                    serialized to JSON only once, when it leaves SSPL-LL.
+ ****************************************************************************
+"""
+
+from framework.utils import json_codec
+
+
+class MsgEnvelope(dict):
+    """Read only dict holding a message, the top level keys can not be
+    changed once created. Nested sections are shared with the producer and
+    must be treated as read only as well, use replace() to derive a
+    modified message"""
+
+    __slots__ = ("_json", "_parts")
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self._json = None
+        # Top level key -> its value already serialized to JSON
+        self._parts = None
+
+    @classmethod
+    def prepared(cls, msg, parts):
+        """Returns an envelope of msg reusing the given JSON of some of its
+        top level values, kept across replace() of the other keys"""
+        envelope = cls(msg)
+        envelope._parts = parts
+        return envelope
+
+    @classmethod
+    def wrap(cls, msg):
+        """Returns msg as an envelope, parsing it when it is a JSON string"""
+        if isinstance(msg, cls):
+            return msg
+        if isinstance(msg, (str, bytes)):
+            envelope = cls(json_codec.loads(msg))
+            envelope._json = msg if isinstance(msg, str) else msg.decode("utf8")
+            return envelope
+        return cls(msg)
+
+    def to_json(self):
+        """Returns the message serialized to JSON, computed only once"""
+        if self._json is None:
+            if self._parts:
+                self._json = "{%s}" % json_codec.ITEM_SEPARATOR.join(
+                    json_codec.dumps(key) + json_codec.KEY_SEPARATOR +
+                    (self._parts[key] if key in self._parts else json_codec.dumps(value))
+                    for key, value in self.items())
+            else:
+                self._json = json_codec.dumps(self)
+        return self._json
+
+    def to_bytes(self):
+        """Returns the message serialized to UTF-8 encoded JSON"""
+        if self._json is None and not self._parts:
+            data = json_codec.dumps_bytes(self)
+            self._json = data.decode("utf8")
+            return data
+        return self.to_json().encode("utf8")
+
+    def replace(self, **fields):
+        """Returns a new envelope with the given top level fields replaced"""
+        msg = dict(self)
+        msg.update(fields)
+        if self._parts:
+            parts = {key: value for key, value in self._parts.items()
+                     if key not in fields}
+            return MsgEnvelope.prepared(msg, parts)
+        return MsgEnvelope(msg)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("MsgEnvelope is read only, use replace()")
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def __reduce__(self):
+        return (MsgEnvelope, (dict(self),))
@@ -0,0 +1,289 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Token bucket rate limiting of the messages a module
+                     writes to the internal message queues
+ ****************************************************************************
+"""
+
+import heapq
+import threading
+import time
+from collections import deque
+
+from framework.base.internal_msgQ import InternalMsgQueue
+from framework.utils.service_logging import logger
+
+
+class TokenBucket(object):
+    """Allows rate messages per sec on average and bursts of up to burst
+    messages"""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._last = time.time()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def consume(self, now):
+        """Takes a token, returns False when none is available"""
+        self._refill(now)
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def reserve(self, now):
+        """Takes a token ahead of time, returns the secs to wait until it
+        is available"""
+        self._refill(now)
+        self._tokens -= 1
+        return max(0, -self._tokens / self.rate)
+
+    def take(self, count, now):
+        """Takes up to count tokens, returns the number taken"""
+        self._refill(now)
+        taken = max(0, min(count, int(self._tokens)))
+        self._tokens -= taken
+        return taken
+
+    def wait_time(self, now):
+        """Returns the secs until a token is available"""
+        self._refill(now)
+        return max(0, (1 - self._tokens) / self.rate)
+
+
+class RateLimitTimer(object):
+    """Thread running the drains and summary reports of all the rate
+    limiters. They do not depend on the scheduler of the module writing the
+    messages, which may be blocked in its run() or sleeping without being
+    woken up by events entered from another thread."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get(cls):
+        """Returns the timer, started on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        # Heap of the (time, sequence, action) to run
+        self._events = []
+        self._sequence = 0
+        self._thread = threading.Thread(target=self._run,
+                                        name="RateLimitTimer", daemon=True)
+        self._thread.start()
+
+    def enter(self, delay, action):
+        """Runs action in delay secs"""
+        with self._cond:
+            heapq.heappush(self._events,
+                           (time.time() + delay, self._sequence, action))
+            self._sequence += 1
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._events or self._events[0][0] > time.time():
+                    timeout = None
+                    if self._events:
+                        timeout = self._events[0][0] - time.time()
+                    self._cond.wait(timeout)
+                _, _, action = heapq.heappop(self._events)
+            try:
+                action()
+            except Exception as e:
+                logger.exception("RateLimitTimer, %r" % e)
+
+
+class MsgRateLimiter(object):
+    """Limits the messages written by a module to rate per sec, with bursts
+    of up to burst messages. Messages over the limit are handled by the
+    policy:
+        delay       - the writer sleeps until the message is allowed. A
+                      writer which must not block, such as a worker of the
+                      shared module pool, has the message held back and
+                      written once allowed instead.
+        drop_oldest - the message is held back, along with up to backlog
+                      others, and written once allowed. The oldest message
+                      held back is discarded when the backlog is full.
+    Messages are the (toModule, jsonMsg, event) written by InternalMsgQ.
+    Messages held back are written by the RateLimitTimer, see
+    claim_drain(). A summary of the messages throttled is logged every
+    SUMMARY_INTERVAL secs while the module is over its limit, and once more
+    after it is back under it, see claim_report().
+    """
+
+    DELAY       = "delay"
+    DROP_OLDEST = "drop_oldest"
+
+    POLICIES = (DELAY, DROP_OLDEST)
+
+    SUMMARY_INTERVAL = 60
+
+    def __init__(self, module_name, rate, burst=None, policy=DELAY,
+                 backlog=None):
+        if rate <= 0:
+            raise ValueError("Invalid rate limit: %s" % rate)
+        if policy not in self.POLICIES:
+            raise ValueError("Unknown rate limit policy: %s" % policy)
+
+        burst = burst or max(1, rate)
+        self._module_name = module_name
+        self._bucket = TokenBucket(rate, burst)
+        self.policy = policy
+        # Messages held back along with the time they were held back, the
+        #  delay policy holds back the messages of writers which must not
+        #  block. The drop_oldest policy bounds the backlog.
+        if policy == self.DROP_OLDEST:
+            self._backlog_size = int(backlog or burst)
+        else:
+            self._backlog_size = None
+        self._backlog = deque()
+        self._drain_scheduled = False
+        self._report_scheduled = False
+        self._lock = threading.Lock()
+
+        # Messages delayed, held back and dropped in total
+        self.delayed = 0
+        self.delay_secs = 0
+        self.held = 0
+        self.dropped = 0
+        self._reported = (0, 0, 0)
+        self._last_summary = time.time()
+
+    def admit(self, item, block=True):
+        """Returns the messages that can be written now, item included
+        unless it was held back. Sleeps with the delay policy when block is
+        set and no message is held back."""
+        dropped = None
+        released = None
+        with self._lock:
+            now = time.time()
+            if self.policy == self.DELAY and block and not self._backlog:
+                wait = self._bucket.reserve(now)
+                if wait > 0:
+                    self.delayed += 1
+                    self.delay_secs += wait
+                self._report(now)
+            else:
+                if self._backlog_size is not None and \
+                   len(self._backlog) >= self._backlog_size:
+                    dropped = self._backlog.popleft()[1]
+                    self.dropped += 1
+                self._backlog.append((now, item))
+                released = self._release(now)
+                # The message is the last of the backlog
+                if self._backlog:
+                    if self.policy == self.DELAY:
+                        self.delayed += 1
+                    else:
+                        self.held += 1
+                self._report(now)
+
+        if dropped is not None and dropped[2] is not None:
+            InternalMsgQueue.release_dropped(dropped[2])
+        if released is not None:
+            return released
+        if wait > 0:
+            time.sleep(wait)
+        return [item]
+
+    def schedule(self, delay, action):
+        """Has the RateLimitTimer run action in delay secs"""
+        RateLimitTimer.get().enter(delay, action)
+
+    def claim_drain(self):
+        """Returns the secs after which the messages held back should be
+        drained, None when there are none or a drain is already due"""
+        with self._lock:
+            if not self._backlog or self._drain_scheduled:
+                return None
+            self._drain_scheduled = True
+            return self._bucket.wait_time(time.time())
+
+    def drain(self):
+        """Returns the messages held back that can be written now"""
+        with self._lock:
+            self._drain_scheduled = False
+            return self._release(time.time())
+
+    def claim_report(self):
+        """Returns the secs after which the summary of the messages
+        throttled should be logged, None when there is nothing to report or
+        a report is already due"""
+        with self._lock:
+            if self._report_scheduled or \
+               self._reported == (self.delayed, self.held, self.dropped):
+                return None
+            self._report_scheduled = True
+            return max(0, self._last_summary + self.SUMMARY_INTERVAL - time.time())
+
+    def report(self):
+        """Logs the summary of the messages throttled when it is due"""
+        with self._lock:
+            self._report_scheduled = False
+            self._report(time.time())
+
+    def stats(self):
+        """Returns the rate limiting counters"""
+        with self._lock:
+            return {
+                "rate": self._bucket.rate,
+                "burst": self._bucket.burst,
+                "policy": self.policy,
+                "delayed": self.delayed,
+                "delay_secs": round(self.delay_secs, 3),
+                "held": self.held,
+                "backlog": len(self._backlog),
+                "dropped": self.dropped
+            }
+
+    def _release(self, now):
+        released = []
+        while self._backlog and self._bucket.consume(now):
+            held_at, item = self._backlog.popleft()
+            if self.policy == self.DELAY:
+                self.delay_secs += now - held_at
+            released.append(item)
+        return released
+
+    def _report(self, now):
+        """Logs what was throttled since the last summary"""
+        if now - self._last_summary < self.SUMMARY_INTERVAL:
+            return
+        delayed = self.delayed - self._reported[0]
+        held = self.held - self._reported[1]
+        dropped = self.dropped - self._reported[2]
+        if delayed or held or dropped:
+            logger.warning("%s rate limited to %s msgs/sec: %d messages delayed, "
+                           "%d held back, %d dropped in the last %d secs" %
+                           (self._module_name, self._bucket.rate, delayed, held,
+                            dropped, now - self._last_summary))
+        self._reported = (self.delayed, self.held, self.dropped)
+        self._last_summary = now
@@ -36,6 +36,7 @@ setups = ["vm", "cortx", "ssu", "gw", "cmu"]
 RESOURCE_PATH = "/opt/seagate/%s/sspl/low-level/json_msgs/schemas/" % (PRODUCT_FAMILY)
 CLI_RESOURCE_PATH = "/opt/seagate/%s/sspl/low-level/tests/manual" % (PRODUCT_FAMILY)
 DATA_PATH = "/var/%s/sspl/data/" % (PRODUCT_FAMILY)
+SQLITE_STORE_PATH = "%ssspl_store.db" % (DATA_PATH)
 SSPL_CONFIGURED_DIR = "/var/%s/sspl" % (PRODUCT_FAMILY)
 SSPL_CONFIGURED = "%s/sspl-configured" % SSPL_CONFIGURED_DIR
 RESOURCE_HEALTH_VIEW = "/usr/bin/resource_health_view"
@@ -291,6 +292,7 @@ class EnclInterface(Enum):
 class StoreTypes(Enum):
     FILE = "file"
     CONSUL = "consul"
+    SQLITE = "sqlite"
 
 class ServiceTypes(Enum):
     RABBITMQ = "rabbitmq"
@@ -21,7 +21,6 @@
 
 import errno
 import hashlib
-import json
 import time
 
 from framework.base.sspl_constants import ServiceTypes
@@ -35,6 +34,7 @@ from framework.utils.conf_utils import (CLUSTER, CONTROLLER, ENCLOSURE,
 from framework.utils.service_logging import logger
 from framework.utils.store_factory import store
 from framework.utils.webservices import WebServices
+from framework.utils import json_codec
 
 
 class RealStorEnclosure(StorageEnclosure):
@@ -224,7 +224,7 @@ class RealStorEnclosure(StorageEnclosure):
                 self.mc_timeout_counter = 0
 
                 try:
-                    jresponse = json.loads(response.content)
+                    jresponse = json_codec.loads(response.content)
 
                     #TODO: Need a way to check return-code 2 in more optimal way if possible,
                     # currently being checked for all http 200 responses
@@ -289,7 +289,7 @@ class RealStorEnclosure(StorageEnclosure):
             return
 
         try:
-            jresponse = json.loads(response.content)
+            jresponse = json_codec.loads(response.content)
         except ValueError as badjson:
             logger.error("%s returned mal-formed json:\n%s" % (url, badjson))
 
@@ -391,7 +391,7 @@ class RealStorEnclosure(StorageEnclosure):
         self.poll_system_ts = time.time()
 
         try:
-            jresponse = json.loads(response.content)
+            jresponse = json_codec.loads(response.content)
         except ValueError as badjson:
             logger.error("%s returned mal-formed json:\n%s" % (url, badjson))
 
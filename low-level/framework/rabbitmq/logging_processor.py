@@ -62,6 +62,7 @@ class LoggingProcessor(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "LoggingProcessor"
     PRIORITY    = 2
+    DEDICATED_THREAD = True
 
     # Section and keys in configuration file
     LOGGINGPROCESSOR    = MODULE_NAME.upper()
@@ -27,25 +27,21 @@ import time
 
 from framework.base.module_thread import ScheduledModuleThread
 from framework.base.internal_msgQ import InternalMsgQ
+from framework.base.msg_envelope import MsgEnvelope
+from framework.utils.message_signer import (NO_SECURITY_LIB_SIGNATURE,
+                                            MessageSigner)
 from framework.utils.service_logging import logger
 from .rabbitmq_connector import RabbitMQSafeConnection
 from json_msgs.messages.actuators.thread_controller import ThreadControllerMsg
 from json_msgs.messages.actuators.ack_response import AckResponseMsg
 
-import ctypes
-try:
-    use_security_lib=True
-    SSPL_SEC = ctypes.cdll.LoadLibrary('libsspl_sec.so.0')
-except Exception as ae:
-    logger.info("PlaneCntrlRMQegressProcessor, libsspl_sec not found, disabling authentication on egress msgs")
-    use_security_lib=False
-
 
 class PlaneCntrlRMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
     """Handles outgoing messages via rabbitMQ over network"""
 
     MODULE_NAME = "PlaneCntrlRMQegressProcessor"
     PRIORITY    = 1
+    DEDICATED_THREAD = True
 
     # Section and keys in configuration file
     RABBITMQPROCESSOR       = MODULE_NAME.upper()
@@ -174,6 +170,9 @@ class PlaneCntrlRMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
                                                                  self.SECONDARY_RABBITMQ,
                                                                  'localhost')
             self._current_rabbitMQ_server = self._primary_rabbitMQ_server
+            self._signer = MessageSigner(self._signature_user,
+                                         self._signature_token,
+                                         self._signature_expires)
             self._connection = RabbitMQSafeConnection(
                 self._username, self._password, self._virtual_host,
                 self._exchange_name, self._routing_key, self._queue_name
@@ -188,28 +187,20 @@ class PlaneCntrlRMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
         self._jsonMsg["expires"]  = int(self._signature_expires)
         self._jsonMsg["time"]     = str(int(time.time()))
 
-        if use_security_lib:
-            authn_token_len = len(self._signature_token) + 1
-            session_length  = int(self._signature_expires)
-            token = ctypes.create_string_buffer(SSPL_SEC.sspl_get_token_length())
-
-            SSPL_SEC.sspl_generate_session_token(
-                                    self._signature_user, authn_token_len,
-                                    self._signature_token, session_length, token)
-
-            # Generate the signature
-            msg_len = len(self._jsonMsg) + 1
-            sig = ctypes.create_string_buffer(SSPL_SEC.sspl_get_sig_length())
-            SSPL_SEC.sspl_sign_message(msg_len, str(self._jsonMsg), self._signature_user,
-                                       token, sig)
-
-            self._jsonMsg["signature"] = str(sig.raw)
+        sig = self._signer.sign(self._jsonMsg)
+        if sig is not None:
+            self._jsonMsg["signature"] = str(sig)
         else:
-            self._jsonMsg["signature"] = "SecurityLibNotInstalled"
+            self._jsonMsg["signature"] = NO_SECURITY_LIB_SIGNATURE
 
     def _transmit_msg_on_exchange(self):
         """Transmit json message onto RabbitMQ exchange"""
         try:
+            # The signature and ack status are written into the message, the
+            #  envelope is not used by any other module once it reached us
+            if isinstance(self._jsonMsg, MsgEnvelope):
+                self._jsonMsg = dict(self._jsonMsg)
+
             if self._jsonMsg.get("actuator_request_type") is not None and \
                self._jsonMsg.get("actuator_request_type").get("plane_controller") is not None:
                 self._working_command  = self._jsonMsg.get("actuator_request_type").get("plane_controller").get("command")
@@ -22,23 +22,21 @@
 
 import pika
 import json
-import os
 
 from socket import gethostname
 
-from jsonschema import Draft3Validator
-from jsonschema import validate
-
 from pika.exceptions import AMQPError
 
 from framework.base.module_thread import ScheduledModuleThread
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.utils.service_logging import logger
+from framework.utils import json_codec
+from framework.utils.content_encoding import decode_body
 from .rabbitmq_connector import RabbitMQSafeConnection
 from framework.rabbitmq.plane_cntrl_rmq_egress_processor import PlaneCntrlRMQegressProcessor
-from framework.base.sspl_constants import RESOURCE_PATH
 
 from json_msgs.messages.actuators.ack_response import AckResponseMsg
+from json_msgs.schemas.registry import ACTUATORS, SENSORS, schema_registry
 
 import ctypes
 try:
@@ -54,6 +52,7 @@ class PlaneCntrlRMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "PlaneCntrlRMQingressProcessor"
     PRIORITY    = 1
+    DEDICATED_THREAD = True
 
     # Section and keys in configuration file
     RABBITMQPROCESSOR   = MODULE_NAME.upper()
@@ -78,29 +77,9 @@ class PlaneCntrlRMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
         super(PlaneCntrlRMQingressProcessor, self).__init__(self.MODULE_NAME,
                                                        self.PRIORITY)
 
-        # Read in the actuator schema for validating messages
-        schema_file = os.path.join(RESOURCE_PATH + '/actuators',
-                                   self.JSON_ACTUATOR_SCHEMA)
-        self._actuator_schema = self._load_schema(schema_file)
-
-        # Read in the sensor schema for validating messages
-        schema_file = os.path.join(RESOURCE_PATH + '/sensors',
-                                    self.JSON_SENSOR_SCHEMA)
-        self._sensor_schema = self._load_schema(schema_file)
-
-    def _load_schema(self, schema_file):
-        """Loads a schema from a file and validates
-
-        @param string schema_file     location of schema on the file system
-        @return string                Trimmed and validated schema
-        """
-        with open(schema_file, 'r') as f:
-            schema = json.load(f)
-
-        # Validate the schema to conform to Draft 3 specification
-        Draft3Validator.check_schema(schema)
-
-        return schema
+        # Compile the request schemas for validating messages
+        schema_registry.get_validator(ACTUATORS, self.JSON_ACTUATOR_SCHEMA)
+        schema_registry.get_validator(SENSORS, self.JSON_SENSOR_SCHEMA)
 
     def initialize(self, conf_reader, msgQlist, products):
         """initialize configuration reader and internal msg queues"""
@@ -150,7 +129,9 @@ class PlaneCntrlRMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
         ingressMsg = {}
         try:
             if isinstance(body, dict) is False:
-                ingressMsg = json.loads(body)
+                # Large bodies may be compressed, see content_encoding
+                body = decode_body(body, getattr(properties, "content_encoding", None))
+                ingressMsg = json_codec.loads(body)
             else:
                 ingressMsg = body
 
@@ -174,13 +155,13 @@ class PlaneCntrlRMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
                 msgType = message.get("actuator_request_type")
 
                 # Validate against the actuator schema
-                validate(ingressMsg, self._actuator_schema)
+                schema_registry.validate(ACTUATORS, self.JSON_ACTUATOR_SCHEMA, ingressMsg)
 
             elif message.get("sensor_request_type") is not None:
                 msgType = message.get("sensor_request_type")
 
                 # Validate against the sensor schema
-                validate(ingressMsg, self._sensor_schema)
+                schema_registry.validate(SENSORS, self.JSON_SENSOR_SCHEMA, ingressMsg)
 
             else:
                 # We only handle incoming actuator and sensor requests, ignore everything else
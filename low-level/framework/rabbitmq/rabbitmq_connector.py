@@ -20,6 +20,7 @@ import re
 import os
 import pika
 import pika.exceptions
+import pika.spec
 import encodings.idna  # noqa
 
 from framework.utils.service_logging import logger
@@ -93,8 +94,18 @@ class RabbitMQSafeConnection:
         self.routing_key = routing_key
         self.queue_name = queue_name
         self.wait_time = 10
+        # Channel in publisher confirms mode used by publish_batch()
+        self._confirm_channel = None
+        self._delivery_tag = 0
+        self._unconfirmed = set()
+        self._confirmed = {}
         self.connection = self._establish_connection(raise_err=False)
 
+    def is_connected(self):
+        """Returns True when the connection to RabbitMQ is open"""
+        connection = getattr(self, "_connection", None)
+        return connection is not None and connection.is_open
+
     def _retry_connection(self):
         """Retries to establish the connection until a connection is made
         with RabbitMQ a node in the cluster.
@@ -128,6 +139,90 @@ class RabbitMQSafeConnection:
             self._establish_connection()
             self.publish(exchange, routing_key, properties, body)
 
+    def publish_batch(self, exchange, routing_key, properties, bodies,
+                      timeout=10):
+        """Publishes the messages in one pipelined burst on a channel in
+        publisher confirms mode and waits up to timeout secs for the broker
+        to confirm them. Returns a list telling for each message if it was
+        confirmed, the ones nacked or left unconfirmed are False.
+        properties is shared by the messages or a list of one per message.
+        """
+        if not isinstance(properties, (list, tuple)):
+            properties = [properties] * len(bodies)
+        tags = []
+        try:
+            channel = self._get_confirm_channel(timeout)
+            for body, props in zip(bodies, properties):
+                channel.basic_publish(exchange=exchange,
+                                      routing_key=routing_key,
+                                      properties=props, body=body)
+                self._delivery_tag += 1
+                self._unconfirmed.add(self._delivery_tag)
+                tags.append(self._delivery_tag)
+
+            deadline = time.time() + timeout
+            while self._unconfirmed and time.time() < deadline:
+                self._connection.process_data_events(
+                    time_limit=deadline - time.time())
+        except connection_exceptions as e:
+            logger.error(connection_error_msg.format(e))
+            logger.error('Connection closed while publishing a batch of '
+                         f'{len(bodies)} messages')
+            self._establish_connection(raise_err=False)
+
+        confirmed = [self._confirmed.pop(tag, False) for tag in tags]
+        self._unconfirmed.difference_update(tags)
+        confirmed.extend([False] * (len(bodies) - len(tags)))
+        return confirmed
+
+    def _get_confirm_channel(self, timeout):
+        """Returns the channel in publisher confirms mode, opening it first
+        if needed. The confirms are handled by _on_delivery_confirmation
+        instead of the BlockingChannel waiting on each publish, which
+        BlockingChannel.confirm_delivery() would do. Raises
+        AMQPConnectionError when the broker does not answer Confirm.Select
+        within timeout secs.
+        """
+        if self._confirm_channel is not None and self._confirm_channel.is_open:
+            return self._confirm_channel
+
+        selected = []
+        channel = self._connection.channel()
+        channel._impl.confirm_delivery(
+            ack_nack_callback=self._on_delivery_confirmation,
+            callback=selected.append)
+        deadline = time.time() + timeout
+        while not selected:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                try:
+                    channel.close()
+                except Exception:
+                    pass
+                raise pika.exceptions.AMQPConnectionError(
+                    f"Confirm.Select not answered within {timeout} secs")
+            self._connection.process_data_events(time_limit=min(1, remaining))
+
+        self._confirm_channel = channel
+        self._delivery_tag = 0
+        self._unconfirmed.clear()
+        self._confirmed.clear()
+        return channel
+
+    def _on_delivery_confirmation(self, frame):
+        """Records the Basic.Ack or Basic.Nack sent by the broker"""
+        method = frame.method
+        acked = isinstance(method, pika.spec.Basic.Ack)
+        if method.multiple:
+            tags = [tag for tag in self._unconfirmed
+                    if tag <= method.delivery_tag]
+        else:
+            tags = [method.delivery_tag]
+        for tag in tags:
+            if tag in self._unconfirmed:
+                self._unconfirmed.discard(tag)
+                self._confirmed[tag] = acked
+
     def consume(self, callback):
         """Consumes based on routing key. Retries if fails."""
         try:
@@ -167,6 +262,7 @@ class RabbitMQSafeConnection:
                 self.username, self.password, self.virtual_host
             )
             self._channel = self._connection.channel()
+            self._confirm_channel = None
             self._channel.exchange_declare(
                 exchange=self.exchange_name, exchange_type='topic', durable=True
             )
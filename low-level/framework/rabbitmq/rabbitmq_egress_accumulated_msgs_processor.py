@@ -5,7 +5,9 @@
                     This keeps on running periodicaly and check if there is
                     any message to be sent to rabbtmq. If rabbitmq connection
                     is availble message will be sent, else in next iteration
-                    it will be retried.
+                    it will be retried. Messages are replayed in batches
+                    published with confirms at up to replay_rate msgs/sec,
+                    over a connection kept open across cycles.
  Creation Date:     03/19/2020
  Author:            Sandeep Anjara
 
@@ -18,7 +20,6 @@
  Seagate Technology, LLC.
  ****************************************************************************
 """
-import json
 import sys
 import time
 
@@ -26,12 +27,14 @@ import pika
 
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.base.module_thread import ScheduledModuleThread
+from framework.base.rate_limiter import TokenBucket
 from framework.base.sspl_constants import ServiceTypes
 from framework.rabbitmq.rabbitmq_connector import (RabbitMQSafeConnection,
                                                    connection_error_msg,
                                                    connection_exceptions)
 from framework.utils import encryptor
 from framework.utils.conf_utils import CLUSTER, GLOBAL_CONF, SSPL_CONF, Conf
+from framework.utils.content_encoding import ContentEncoder
 from framework.utils.service_logging import logger
 from framework.utils.store_factory import store
 from framework.utils.store_queue import StoreQueue
@@ -63,12 +66,20 @@ class RabbitMQEgressAccumulatedMsgsProcessor(ScheduledModuleThread, InternalMsgQ
     SIGNATURE_EXPIRES       = 'message_signature_expires'
     IEM_ROUTE_ADDR          = 'iem_route_addr'
     IEM_ROUTE_EXCHANGE_NAME = 'iem_route_exchange_name'
+    CONFIRM_TIMEOUT         = 'confirm_timeout'
+    REPLAY_BATCH_SIZE       = 'replay_batch_size'
+    REPLAY_RATE             = 'replay_rate'
+    REPLAY_INTERVAL         = 'replay_interval'
+    CONTENT_ENCODING        = 'content_encoding'
+    CONTENT_ENCODING_THRESHOLD = 'content_encoding_threshold'
+    CONTENT_ENCODING_LEVEL  = 'content_encoding_level'
 
     SYSTEM_INFORMATION_KEY = 'SYSTEM_INFORMATION'
     CLUSTER_ID_KEY = 'cluster_id'
     NODE_ID_KEY = 'node_id'
-    # 300 seconds for 5 mins
-    MSG_TIMEOUT = 300
+
+    # Secs between two progress reports of a replay
+    PROGRESS_INTERVAL = 60
 
 
     @staticmethod
@@ -96,6 +107,24 @@ class RabbitMQEgressAccumulatedMsgsProcessor(ScheduledModuleThread, InternalMsgQ
             self._exchange_name, self._routing_key, self._queue_name
         )
 
+        # Accumulated messages are stored uncompressed and encoded as the
+        #  egress processor does when they are replayed
+        self._encoder = ContentEncoder(self._content_encoding,
+                                       self._content_encoding_threshold,
+                                       self._content_encoding_level)
+        self._msg_props = {}
+        self._bucket = None
+        if self._replay_rate > 0:
+            self._bucket = TokenBucket(self._replay_rate,
+                                       max(self._replay_rate, self._replay_batch_size))
+        # Messages read from the store queue and not confirmed yet, retried
+        #  before any other so that they are replayed in order
+        self._unconfirmed = []
+        self._replayed = 0
+        self._requeued = 0
+        self._replay_started = None
+        self._last_progress = 0
+
     def read_data(self):
         """This method is part of interface. Currently it is not
         in use.
@@ -116,30 +145,112 @@ class RabbitMQEgressAccumulatedMsgsProcessor(ScheduledModuleThread, InternalMsgQ
                     logger.info("RabbitMQEgressAccumulatedMsgsProcessor, run, received" \
                                     "global shutdown message from sspl_ll_d")
                     self.shutdown()
+        delay = self._replay_interval
         try:
-            if not self.store_queue.is_empty():
-                logger.debug("Found accumulated messages, trying to send again")
-                self._connection._establish_connection()
-                msg_props = pika.BasicProperties()
-                msg_props.content_type = "text/plain"
-                while not self.store_queue.is_empty():
-                    message = self.store_queue.get()
-                    dict_msg = json.loads(message)
-                    if "actuator_response_type" in dict_msg["message"]:
-                        event_time = dict_msg["message"]["actuator_response_type"]["info"]["event_time"]
-                        time_diff = int(time.time()) - int(event_time)
-                        if time_diff > self.MSG_TIMEOUT:
-                            continue
-                    self._connection.publish(exchange=self._exchange_name,routing_key=self._routing_key,properties=msg_props,body=message)
-
-                self._connection.cleanup()
+            delay = self._replay_batch()
         except connection_exceptions as e:
             logger.error(connection_error_msg.format(e))
         except Exception as e:
             logger.error(e)
         finally:
             logger.debug("Consul accumulated processing ended")
-            self._scheduler.enter(30, self._priority, self.run, ())
+            self._scheduler.enter(delay, self._priority, self.run, ())
+
+    def _replay_batch(self):
+        """Publishes the next batch of accumulated messages and returns the
+        secs until the next one. Expired messages are dropped by the store
+        queue. The unconfirmed ones are held and retried in the next cycle,
+        ahead of the messages left in the store queue."""
+        if not self._unconfirmed and self.store_queue.is_empty():
+            self._end_replay()
+            return self._replay_interval
+
+        if not self._connection.is_connected():
+            self._connection._establish_connection(raise_err=False)
+            if not self._connection.is_connected():
+                return self._replay_interval
+
+        if self._replay_started is None:
+            logger.info("Found %s accumulated messages, replaying them" %
+                        (self.store_queue.backlog() + len(self._unconfirmed)))
+            self._replay_started = time.time()
+
+        count = self._replay_batch_size
+        if self._unconfirmed:
+            count = min(count, len(self._unconfirmed))
+        if self._bucket is not None:
+            count = self._bucket.take(count, time.time())
+            if count == 0:
+                return self._bucket.wait_time(time.time())
+
+        if self._unconfirmed:
+            messages = self._unconfirmed[:count]
+            del self._unconfirmed[:count]
+        else:
+            messages = self.store_queue.get_batch(count)
+        if not messages:
+            return 0
+        bodies = []
+        msg_props = []
+        for message in messages:
+            body, content_encoding = self._encoder.encode(message)
+            bodies.append(body)
+            msg_props.append(self._get_msg_props(content_encoding))
+        confirmed = self._connection.publish_batch(
+            exchange=self._exchange_name, routing_key=self._routing_key,
+            properties=msg_props, bodies=bodies,
+            timeout=self._confirm_timeout)
+
+        unconfirmed = [message for message, ok in zip(messages, confirmed) if not ok]
+        self._unconfirmed[:0] = unconfirmed
+        self._replayed += len(messages) - len(unconfirmed)
+        self._requeued += len(unconfirmed)
+        self._report_progress()
+        if unconfirmed:
+            logger.warning("RabbitMQEgressAccumulatedMsgsProcessor, %s messages "
+                           "not confirmed, retrying in %s secs" %
+                           (len(unconfirmed), self._replay_interval))
+            return self._replay_interval
+        return 0
+
+    def _get_msg_props(self, content_encoding=None):
+        """Returns the properties of the messages published with the
+        content encoding, None for the ones published as is"""
+        msg_props = self._msg_props.get(content_encoding)
+        if msg_props is None:
+            msg_props = pika.BasicProperties()
+            msg_props.content_type = "text/plain"
+            msg_props.content_encoding = content_encoding
+            self._msg_props[content_encoding] = msg_props
+        return msg_props
+
+    def _report_progress(self):
+        now = time.time()
+        if now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            logger.info("Replayed %s accumulated messages in %d secs, %s left" %
+                        (self._replayed, now - self._replay_started,
+                         self.store_queue.backlog()))
+
+    def _end_replay(self):
+        if self._replay_started is not None:
+            logger.info("Replayed %s accumulated messages in %d secs" %
+                        (self._replayed, time.time() - self._replay_started))
+            self._replay_started = None
+            self._last_progress = 0
+
+    def get_stats(self):
+        """Returns the runtime statistics of the module, with the progress
+        of the replay and the backlog left"""
+        stats = super(RabbitMQEgressAccumulatedMsgsProcessor, self).get_stats()
+        stats["replay"] = {
+            "in_progress": self._replay_started is not None,
+            "replayed": self._replayed,
+            "requeued": self._requeued,
+        }
+        stats["replay"].update(self.store_queue.stats())
+        stats["replay"]["unconfirmed"] = len(self._unconfirmed)
+        return stats
 
     def _read_config(self):
         """Configure the RabbitMQ exchange with defaults available"""
@@ -176,6 +287,20 @@ class RabbitMQEgressAccumulatedMsgsProcessor(ScheduledModuleThread, InternalMsgQ
             self._iem_route_addr = Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.IEM_ROUTE_ADDR}",'')
             self._iem_route_exchange_name = Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.IEM_ROUTE_EXCHANGE_NAME}",
                                                                  'sspl-in')
+            self._confirm_timeout = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.CONFIRM_TIMEOUT}",
+                                                                 10))
+            self._replay_batch_size = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.REPLAY_BATCH_SIZE}",
+                                                                 100))
+            self._replay_rate = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.REPLAY_RATE}",
+                                                                 0))
+            self._replay_interval = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.REPLAY_INTERVAL}",
+                                                                 30))
+            self._content_encoding = Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.CONTENT_ENCODING}",
+                                                                 'none')
+            self._content_encoding_threshold = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.CONTENT_ENCODING_THRESHOLD}",
+                                                                 65536))
+            self._content_encoding_level = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.CONTENT_ENCODING_LEVEL}",
+                                                                 6))
 
             cluster_id = Conf.get(GLOBAL_CONF, f"{CLUSTER}>{self.CLUSTER_ID_KEY}",'CC01')
 
@@ -194,3 +319,7 @@ class RabbitMQEgressAccumulatedMsgsProcessor(ScheduledModuleThread, InternalMsgQ
         """Clean up scheduler queue and gracefully shutdown thread"""
         super(RabbitMQEgressAccumulatedMsgsProcessor, self).shutdown()
         self._connection.cleanup()
+        # Not lost, they are replayed after the rest of the store queue
+        for message in self._unconfirmed:
+            self.store_queue.put(message)
+        self._unconfirmed = []
@@ -19,8 +19,6 @@
  ****************************************************************************
 """
 
-import ctypes
-import json
 import sys
 import time
 
@@ -28,27 +26,26 @@ import pika
 
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.base.module_thread import ScheduledModuleThread
+from framework.base.msg_envelope import MsgEnvelope
 from framework.base.sspl_constants import ServiceTypes
-from framework.utils import encryptor
+from framework.utils import encryptor, json_codec
+from framework.utils.alert_coalescer import AlertCoalescer
 from framework.utils.conf_utils import CLUSTER, GLOBAL_CONF, SSPL_CONF, Conf
+from framework.utils.content_encoding import ContentEncoder
+from framework.utils.message_signer import (NO_SECURITY_LIB_SIGNATURE,
+                                            MessageSigner)
 from framework.utils.service_logging import logger
 from framework.utils.store_factory import store
 from framework.utils.store_queue import StoreQueue
 
 from .rabbitmq_connector import RabbitMQSafeConnection, connection_exceptions
 
-try:
-    use_security_lib=True
-    SSPL_SEC = ctypes.cdll.LoadLibrary('libsspl_sec.so.0')
-except Exception as ae:
-    logger.info("RabbitMQegressProcessor, libsspl_sec not found, disabling authentication on egress msgs")
-    use_security_lib=False
-
 class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
     """Handles outgoing messages via rabbitMQ over localhost"""
 
     MODULE_NAME = "RabbitMQegressProcessor"
     PRIORITY    = 1
+    WAKE_ON_MSGQ = True
 
     # Section and keys in configuration file
     RABBITMQPROCESSOR       = MODULE_NAME.upper()
@@ -69,19 +66,73 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
     SIGNATURE_EXPIRES       = 'message_signature_expires'
     IEM_ROUTE_ADDR          = 'iem_route_addr'
     IEM_ROUTE_EXCHANGE_NAME = 'iem_route_exchange_name'
+    BATCH_SIZE              = 'batch_size'
+    BATCH_TIMEOUT_MS        = 'batch_timeout_ms'
+    CONFIRM_TIMEOUT         = 'confirm_timeout'
+    COALESCE_WINDOW         = 'coalesce_window'
+    CONTENT_ENCODING        = 'content_encoding'
+    CONTENT_ENCODING_THRESHOLD = 'content_encoding_threshold'
+    CONTENT_ENCODING_LEVEL  = 'content_encoding_level'
 
     SYSTEM_INFORMATION_KEY = 'SYSTEM_INFORMATION'
     CLUSTER_ID_KEY = 'cluster_id'
     NODE_ID_KEY = 'node_id'
 
+    # Channels a message can be published on
+    ACK_ROUTE    = "ack"
+    IEM_ROUTE    = "iem"
+    SENSOR_ROUTE = "sensor"
+
+    # Lanes of the message queue when msgq_priority_lanes is set, highest
+    #  priority first, see msg_lane()
+    MSGQ_LANES = ("ack", "alert", "telemetry")
+    ACK_LANE, ALERT_LANE, TELEMETRY_LANE = range(len(MSGQ_LANES))
+    ALERT_TYPES = ("fault", "fault_resolved", "missing", "insertion")
+    ALERT_SEVERITIES = ("critical", "error")
+
     @staticmethod
     def name():
         """ @return: name of the module."""
         return RabbitMQegressProcessor.MODULE_NAME
 
+    @classmethod
+    def msg_lane(cls, jsonMsg):
+        """Returns the lane of the message queue a message is placed on,
+        actuator responses first then alerts by alert_type/severity, all
+        other sensor messages are telemetry"""
+        if isinstance(jsonMsg, (str, bytes)):
+            # Messages queued serialized are classified like the others
+            try:
+                jsonMsg = json_codec.loads(jsonMsg)
+            except ValueError:
+                return cls.ALERT_LANE
+        if not isinstance(jsonMsg, dict):
+            return cls.ALERT_LANE
+
+        message = jsonMsg.get("message") or {}
+        if message.get("actuator_response_type") is not None:
+            return cls.ACK_LANE
+
+        sensor_response = message.get("sensor_response_type")
+        if not isinstance(sensor_response, dict):
+            return cls.ALERT_LANE
+
+        # Older sensor messages nest the alert under the sensor name
+        responses = [sensor_response]
+        if "alert_type" not in sensor_response:
+            responses = [response for response in sensor_response.values()
+                         if isinstance(response, dict)]
+        for response in responses:
+            if response.get("alert_type") in cls.ALERT_TYPES or \
+               str(response.get("severity")).lower() in cls.ALERT_SEVERITIES:
+                return cls.ALERT_LANE
+        return cls.TELEMETRY_LANE
+
     def __init__(self):
         super(RabbitMQegressProcessor, self).__init__(self.MODULE_NAME,
                                                       self.PRIORITY)
+        self._coalescer = None
+        self._encoder = None
 
     def initialize(self, conf_reader, msgQlist, product):
         """initialize configuration reader and internal msg queues"""
@@ -102,6 +153,19 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
         self._connection = None
         self._read_config()
 
+        if self._coalesce_window > 0:
+            self._coalescer = AlertCoalescer(self._coalesce_window,
+                                             self.ALERT_TYPES)
+
+        self._encoder = ContentEncoder(self._content_encoding,
+                                       self._content_encoding_threshold,
+                                       self._content_encoding_level)
+        self._msg_props = {}
+
+        self._signer = MessageSigner(self._signature_user,
+                                     self._signature_token,
+                                     self._signature_expires)
+
         self._connection = RabbitMQSafeConnection(
             self._username, self._password, self._virtual_host,
             self._exchange_name, self._routing_key, self._queue_name
@@ -119,9 +183,9 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
         )
 
         # Display values used to configure pika from the config file
-        self._log_debug("RabbitMQ user: %s" % self._username)
-        self._log_debug("RabbitMQ exchange: %s, routing_key: %s, vhost: %s" %
-                       (self._exchange_name, self._routing_key, self._virtual_host))
+        self._log_debug("RabbitMQ user: %s", self._username)
+        self._log_debug("RabbitMQ exchange: %s, routing_key: %s, vhost: %s",
+                        self._exchange_name, self._routing_key, self._virtual_host)
 
     def run(self):
         """Run the module periodically on its own thread. """
@@ -131,6 +195,9 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
         #self._set_debug_persist(True)
 
         try:
+            if self._batch_size > 1:
+                self._transmit_msg_batches()
+
             # Loop thru all messages in queue until and transmit
             while not self._is_my_msgQ_empty():
                 self._jsonMsg, self._event = self._read_my_msgQ()
@@ -138,6 +205,9 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
                 if self._jsonMsg is not None:
                     self._transmit_msg_on_exchange()
 
+            # Nothing coalesced is left behind on shutdown
+            self._transmit_coalesced_alerts(flush_all=self._request_shutdown)
+
         except Exception:
             # Log it and restart the whole process when a failure occurs
             logger.error("RabbitMQegressProcessor restarting")
@@ -150,7 +220,143 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
         if self._request_shutdown is True:
             self.shutdown()
         else:
-            self._scheduler.enter(1, self._priority, self.run, ())
+            self._scheduler.enter(self._next_run_interval(), self._priority, self.run, ())
+
+    def _next_run_interval(self):
+        """Returns the secs until the next run, which is due before
+        MSGQ_IDLE_INTERVAL when a coalescing window ends first"""
+        interval = self.MSGQ_IDLE_INTERVAL
+        if self._coalescer is not None:
+            due = self._coalescer.next_due()
+            if due is not None:
+                interval = min(interval, max(0, due - time.time()))
+        return interval
+
+    def _coalesce(self):
+        """Passes the sensor message through the alert coalescer, returns
+        False when it was suppressed and is not published now"""
+        if self._coalescer is None:
+            return True
+
+        jsonMsg = self._coalescer.offer(self._jsonMsg)
+        if jsonMsg is None:
+            self._log_debug("_coalesce, suppressed: %s", self._jsonMsg)
+            # The summary of the alert's window accounts for it
+            if self._event:
+                self._event.set()
+            return False
+
+        self._jsonMsg = jsonMsg
+        return True
+
+    def _transmit_coalesced_alerts(self, flush_all=False):
+        """Publishes the summaries of the coalescing windows that ended, or
+        of all the open windows with flush_all"""
+        if self._coalescer is None:
+            return
+
+        if flush_all:
+            summaries = self._coalescer.flush_all()
+        else:
+            summaries = self._coalescer.flush_due()
+        for summary in summaries:
+            self._jsonMsg, self._event = summary, None
+            self._transmit_msg_on_exchange(self.SENSOR_ROUTE, coalesce=False)
+
+    def get_stats(self):
+        """Returns the runtime statistics of the module, with the alert
+        coalescing counters when enabled"""
+        stats = super(RabbitMQegressProcessor, self).get_stats()
+        if self._coalescer is not None:
+            stats["coalescing"] = self._coalescer.stats()
+        if self._encoder is not None and self._encoder.enabled:
+            stats["content_encoding"] = self._encoder.stats()
+        return stats
+
+    def _get_msg_props(self, content_encoding=None):
+        """Returns the properties of the messages published with the
+        content encoding, None for the ones published as is"""
+        msg_props = self._msg_props.get(content_encoding)
+        if msg_props is None:
+            msg_props = pika.BasicProperties()
+            msg_props.content_type = "text/plain"
+            msg_props.content_encoding = content_encoding
+            self._msg_props[content_encoding] = msg_props
+        return msg_props
+
+    def _transmit_msg_batches(self):
+        """Drains the queue in batches of up to batch_size messages or
+        batch_timeout_ms. Sensor messages of a batch are published in one
+        burst with publisher confirms, acks and IEMs are sent one at a time.
+        """
+        while not self._is_my_msgQ_empty() and not self._request_shutdown:
+            messages = []
+            events = []
+            deadline = time.time() + self._batch_timeout
+            while len(messages) < self._batch_size:
+                self._jsonMsg, self._event = self._read_my_msgQ(
+                                    timeout=max(0, deadline - time.time()))
+                if self._jsonMsg is None:
+                    break
+
+                try:
+                    self._jsonMsg = MsgEnvelope.wrap(self._jsonMsg)
+                    route = self._get_route()
+                    if route != self.SENSOR_ROUTE:
+                        self._transmit_msg_on_exchange(route)
+                        continue
+                    if not self._coalesce():
+                        continue
+
+                    messages.append(self._jsonMsg)
+                    events.append(self._event)
+                except Exception as ex:
+                    logger.error(f'RabbitMQegressProcessor, _transmit_msg_batches, problem while preparing the message:{ex}, dropping message: {self._jsonMsg}')
+
+            if not messages:
+                continue
+            try:
+                messages = self._add_signatures(messages)
+            except Exception as ex:
+                logger.error(f'RabbitMQegressProcessor, _transmit_msg_batches, problem while signing {len(messages)} messages:{ex}, dropping them')
+                continue
+            self._publish_batch(
+                [(message.to_bytes(), event)
+                 for message, event in zip(messages, events)])
+
+    def _publish_batch(self, batch):
+        """Publishes a batch of signed sensor messages. Only the messages the
+        broker confirmed have their event set, the ones nacked or left
+        unconfirmed are added to the persistent store, uncompressed.
+        """
+        bodies = []
+        msg_props = []
+        for body, _ in batch:
+            body, content_encoding = self._encoder.encode(body)
+            bodies.append(body)
+            msg_props.append(self._get_msg_props(content_encoding))
+        try:
+            confirmed = self._connection.publish_batch(
+                exchange=self._exchange_name, routing_key=self._routing_key,
+                properties=msg_props, bodies=bodies,
+                timeout=self._confirm_timeout)
+        except Exception as err:
+            logger.error(f'RabbitMQegressProcessor, _publish_batch, Unknown error {err} while publishing {len(batch)} messages')
+            confirmed = [False] * len(batch)
+
+        for (body, event), is_confirmed in zip(batch, confirmed):
+            if is_confirmed:
+                # If event is added by sensors, set it
+                if event:
+                    event.set()
+            else:
+                self.store_queue.put(body)
+
+        unconfirmed = confirmed.count(False)
+        if unconfirmed:
+            logger.error(f'RabbitMQegressProcessor, _publish_batch, {unconfirmed} of {len(batch)} messages not confirmed by rabbitmq, adding them to persistent store')
+        self._log_debug("_publish_batch, Successfully Sent: %d messages",
+                        len(batch) - unconfirmed)
 
     def _read_config(self):
         """Configure the RabbitMQ exchange with defaults available"""
@@ -188,6 +394,28 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
             self._iem_route_exchange_name = Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.IEM_ROUTE_EXCHANGE_NAME}",
                                                                  'sspl-in')
 
+            # Bodies of at least content_encoding_threshold bytes are
+            #  compressed with content_encoding, none disables it
+            self._content_encoding = Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.CONTENT_ENCODING}",
+                                                                 'none')
+            self._content_encoding_threshold = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.CONTENT_ENCODING_THRESHOLD}",
+                                                                 65536))
+            self._content_encoding_level = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.CONTENT_ENCODING_LEVEL}",
+                                                                 6))
+
+            # Sensor messages are published in batches of up to batch_size
+            #  messages collected within batch_timeout_ms, 1 disables batching
+            self._batch_size = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.BATCH_SIZE}",
+                                                                 1))
+            self._batch_timeout = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.BATCH_TIMEOUT_MS}",
+                                                                 100)) / 1000
+            self._confirm_timeout = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.CONFIRM_TIMEOUT}",
+                                                                 10))
+            # Alerts of a resource are coalesced for coalesce_window secs,
+            #  0 disables coalescing
+            self._coalesce_window = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.COALESCE_WINDOW}",
+                                                                 0))
+
             cluster_id = Conf.get(GLOBAL_CONF, f"{CLUSTER}>{self.CLUSTER_ID_KEY}",'CC01')
 
             # Decrypt RabbitMQ Password
@@ -202,69 +430,82 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
 
     def _add_signature(self):
         """Adds the authentication signature to the message"""
-        self._log_debug("_add_signature, jsonMsg: %s" % self._jsonMsg)
-        self._jsonMsg["username"] = self._signature_user
-        self._jsonMsg["expires"]  = int(self._signature_expires)
-        self._jsonMsg["time"]     = str(int(time.time()))
-
-        if use_security_lib:
-            authn_token_len = len(self._signature_token) + 1
-            session_length  = int(self._signature_expires)
-            token = ctypes.create_string_buffer(SSPL_SEC.sspl_get_token_length())
-
-            SSPL_SEC.sspl_generate_session_token(
-                                    self._signature_user, authn_token_len,
-                                    self._signature_token, session_length, token)
-
-            # Generate the signature
-            msg_len = len(self._jsonMsg) + 1
-            sig = ctypes.create_string_buffer(SSPL_SEC.sspl_get_sig_length())
-            SSPL_SEC.sspl_sign_message(msg_len, str(self._jsonMsg), self._signature_user,
-                                       token, sig)
-
-            self._jsonMsg["signature"] = str(sig.raw, encoding='utf-8')
-        else:
-            self._jsonMsg["signature"] = "SecurityLibNotInstalled"
-
-    def _transmit_msg_on_exchange(self):
-        """Transmit json message onto RabbitMQ exchange"""
-        self._log_debug("_transmit_msg_on_exchange, jsonMsg: %s" % self._jsonMsg)
+        self._log_debug("_add_signature, jsonMsg: %s", self._jsonMsg)
+        self._jsonMsg = self._add_signatures([self._jsonMsg])[0]
+
+    def _add_signatures(self, messages):
+        """Returns the messages with their authentication signature added"""
+        now = str(int(time.time()))
+        messages = [message.replace(username=self._signature_user,
+                                    expires=int(self._signature_expires),
+                                    time=now)
+                    for message in messages]
+
+        signed = []
+        for message, sig in zip(messages, self._signer.sign_batch(messages)):
+            if sig is not None:
+                signature = str(sig, encoding='utf-8')
+            else:
+                signature = NO_SECURITY_LIB_SIGNATURE
+            signed.append(message.replace(signature=signature))
+        return signed
+
+    def _get_route(self):
+        """Returns the channel the json message is published on. Also sets
+        the shutdown flag on the shutdown message from sspl_ll_d."""
+        message = self._jsonMsg.get("message")
+        actuator_response = message.get("actuator_response_type")
+        if actuator_response is not None:
+            thread_controller = actuator_response.get("thread_controller")
 
-        try:
             # Check for shut down message from sspl_ll_d and set a flag to shutdown
             #  once our message queue is empty
-            if self._jsonMsg.get("message").get("actuator_response_type") is not None and \
-                self._jsonMsg.get("message").get("actuator_response_type").get("thread_controller") is not None and \
-                self._jsonMsg.get("message").get("actuator_response_type").get("thread_controller").get("thread_response") == \
-                    "SSPL-LL is shutting down":
+            if thread_controller is not None and \
+                thread_controller.get("thread_response") == "SSPL-LL is shutting down":
                     logger.info("RabbitMQegressProcessor, _transmit_msg_on_exchange, received" \
                                     "global shutdown message from sspl_ll_d")
                     self._request_shutdown = True
 
-            msg_props = pika.BasicProperties()
-            msg_props.content_type = "text/plain"
-
-            # Publish json message to the correct channel
             # NOTE: We need to route ThreadController messages to ACK channel.
             # We can't modify schema as it will affect other modules too. As a
             # temporary solution we have added a extra check to see if actuator_response_type
             # is "thread_controller".
             # TODO: Find a proper way to solve this issue. Avoid changing
             # core egress processor code
-            if self._jsonMsg.get("message").get("actuator_response_type") is not None and \
-              (self._jsonMsg.get("message").get("actuator_response_type").get("ack") is not None or \
-                self._jsonMsg.get("message").get("actuator_response_type").get("thread_controller") is not None):
+            if actuator_response.get("ack") is not None or thread_controller is not None:
+                return self.ACK_ROUTE
+
+        # Routing requests for IEM msgs sent from the LoggingMsgHandler
+        if message.get("IEM_routing") is not None:
+            return self.IEM_ROUTE
+
+        return self.SENSOR_ROUTE
+
+    def _transmit_msg_on_exchange(self, route=None, coalesce=True):
+        """Transmit json message onto RabbitMQ exchange"""
+        self._log_debug("_transmit_msg_on_exchange, jsonMsg: %s", self._jsonMsg)
+
+        try:
+            # Messages are serialized once, here, when they leave SSPL-LL
+            self._jsonMsg = MsgEnvelope.wrap(self._jsonMsg)
+            if route is None:
+                route = self._get_route()
+
+            msg_props = self._get_msg_props()
+
+            # Publish json message to the correct channel
+            if route == self.ACK_ROUTE:
                 self._add_signature()
-                jsonMsg = json.dumps(self._jsonMsg).encode('utf8')
+                body, content_encoding = self._encoder.encode(
+                                            self._jsonMsg.to_bytes())
                 self._ack_connection.publish(exchange=self._exchange_name,
                                              routing_key=self._ack_routing_key,
-                                             properties=msg_props,
-                                             body=jsonMsg)
+                                             properties=self._get_msg_props(content_encoding),
+                                             body=body)
 
-            # Routing requests for IEM msgs sent from the LoggingMsgHandler
-            elif self._jsonMsg.get("message").get("IEM_routing") is not None:
+            elif route == self.IEM_ROUTE:
                 log_msg = self._jsonMsg.get("message").get("IEM_routing").get("log_msg")
-                self._log_debug("Routing IEM: %s" % log_msg)
+                self._log_debug("Routing IEM: %s", log_msg)
                 if self._iem_route_addr != "":
                     self._iem_connection.publish(exchange=self._iem_route_exchange_name,
                                                  routing_key=self._routing_key,
@@ -273,13 +514,16 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
                 else:
                     logger.warn("RabbitMQegressProcessor, Attempted to route IEM without a valid 'iem_route_addr' set.")
             else:
+                if coalesce and not self._coalesce():
+                    return
                 self._add_signature()
-                jsonMsg = json.dumps(self._jsonMsg).encode('utf8')
+                jsonMsg = self._jsonMsg.to_bytes()
+                body, content_encoding = self._encoder.encode(jsonMsg)
                 try:
                     self._connection.publish(exchange=self._exchange_name,
                                             routing_key=self._routing_key,
-                                            properties=msg_props,
-                                            body=jsonMsg)
+                                            properties=self._get_msg_props(content_encoding),
+                                            body=body)
                 except connection_exceptions:
                     logger.error("RabbitMQegressProcessor, _transmit_msg_on_exchange, rabbitmq connectivity lost, adding message to consul %s" % self._jsonMsg)
                     self.store_queue.put(jsonMsg)
@@ -289,7 +533,8 @@ class RabbitMQegressProcessor(ScheduledModuleThread, InternalMsgQ):
 
 
             # No exceptions thrown so success
-            self._log_debug("_transmit_msg_on_exchange, Successfully Sent: %s" % self._jsonMsg)
+            self._log_debug("_transmit_msg_on_exchange, Successfully Sent: %s",
+                            self._jsonMsg)
             # If event is added by sensors, set it
             if self._event:
                 self._event.set()
@@ -20,24 +20,24 @@
 """
 
 import ctypes
-import json
-import os
 import time
 
 import pika
 from cortx.utils.security.cipher import Cipher
-from jsonschema import Draft3Validator, validate
 
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.base.module_thread import ScheduledModuleThread
-from framework.base.sspl_constants import RESOURCE_PATH, ServiceTypes
+from framework.base.sspl_constants import ServiceTypes
 from framework.rabbitmq.rabbitmq_egress_processor import \
     RabbitMQegressProcessor
 from framework.utils import encryptor
 from framework.utils.conf_utils import (CLUSTER, GLOBAL_CONF, SRVNODE,
                                         SSPL_CONF, Conf)
 from framework.utils.service_logging import logger
+from framework.utils import json_codec
+from framework.utils.content_encoding import decode_body
 from json_msgs.messages.actuators.ack_response import AckResponseMsg
+from json_msgs.schemas.registry import ACTUATORS, SENSORS, schema_registry
 
 from .rabbitmq_connector import RabbitMQSafeConnection
 
@@ -55,6 +55,7 @@ class RabbitMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "RabbitMQingressProcessor"
     PRIORITY = 1
+    DEDICATED_THREAD = True
 
     # Section and keys in configuration file
     RABBITMQPROCESSOR = MODULE_NAME.upper()
@@ -82,15 +83,9 @@ class RabbitMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
         super(RabbitMQingressProcessor, self).__init__(self.MODULE_NAME,
                                                        self.PRIORITY)
 
-        # Read in the actuator schema for validating messages
-        schema_file = os.path.join(RESOURCE_PATH + '/actuators',
-                                   self.JSON_ACTUATOR_SCHEMA)
-        self._actuator_schema = self._load_schema(schema_file)
-
-        # Read in the sensor schema for validating messages
-        schema_file = os.path.join(RESOURCE_PATH + '/sensors',
-                                   self.JSON_SENSOR_SCHEMA)
-        self._sensor_schema = self._load_schema(schema_file)
+        # Compile the request schemas for validating messages
+        schema_registry.get_validator(ACTUATORS, self.JSON_ACTUATOR_SCHEMA)
+        schema_registry.get_validator(SENSORS, self.JSON_SENSOR_SCHEMA)
 
         self._virtual_host = None
         self._queue_name = None
@@ -102,20 +97,6 @@ class RabbitMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
         self._password = None
         self._channel = None
 
-    def _load_schema(self, schema_file):
-        """Loads a schema from a file and validates
-
-        @param string schema_file     location of schema on the file system
-        @return string                Trimmed and validated schema
-        """
-        with open(schema_file, 'r') as f:
-            schema = json.load(f)
-
-        # Validate the schema to conform to Draft 3 specification
-        Draft3Validator.check_schema(schema)
-
-        return schema
-
     def initialize(self, conf_reader, msgQlist, product):
         """initialize configuration reader and internal msg queues"""
         # Initialize ScheduledMonitorThread
@@ -159,7 +140,9 @@ class RabbitMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
         uuid = None
         try:
             if isinstance(body, dict) is False:
-                ingressMsg = json.loads(body)
+                # Large bodies may be compressed, see content_encoding
+                body = decode_body(body, getattr(properties, "content_encoding", None))
+                ingressMsg = json_codec.loads(body)
             else:
                 ingressMsg = body
 
@@ -183,13 +166,13 @@ class RabbitMQingressProcessor(ScheduledModuleThread, InternalMsgQ):
                 msgType = message.get("actuator_request_type")
 
                 # Validate against the actuator schema
-                validate(ingressMsg, self._actuator_schema)
+                schema_registry.validate(ACTUATORS, self.JSON_ACTUATOR_SCHEMA, ingressMsg)
 
             elif message.get("sensor_request_type") is not None:
                 msgType = message.get("sensor_request_type")
 
                 # Validate against the sensor schema
-                validate(ingressMsg, self._sensor_schema)
+                schema_registry.validate(SENSORS, self.JSON_SENSOR_SCHEMA, ingressMsg)
 
             else:
                 # We only handle incoming actuator and sensor requests, ignore
@@ -93,6 +93,8 @@ class ThreadController(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "ThreadController"
     PRIORITY = 1
+    DEDICATED_THREAD = True
+    WAKE_ON_MSGQ = True
 
     # Section and keys in configuration file
     THREADCONTROLLER = MODULE_NAME.upper()
@@ -123,6 +125,7 @@ class ThreadController(ScheduledModuleThread, InternalMsgQ):
         self._systemd_support = True
         self._hostname = gethostname()
         self._modules_to_resume = []
+        self._shared_module_pool = None
 
     def get_sspl_module(self, module):
         try:
@@ -142,12 +145,14 @@ class ThreadController(ScheduledModuleThread, InternalMsgQ):
             self._modules_to_resume.extend(SSPL_SETTINGS[group].get("DEGRADED_STATE_MODULES"))
 
     def initialize_thread_list(self, sspl_modules, operating_system, product,
-                               systemd_support):
+                               systemd_support, module_pool=None):
         """initialize list of references to all modules"""
         self._sspl_modules = sspl_modules
         self._product = product
         self._operating_system = operating_system
         self._systemd_support = systemd_support
+        # Shared worker pool running the modules without a dedicated thread
+        self._shared_module_pool = module_pool
 
         if operating_system == OperatingSystem.CENTOS7.value or operating_system == OperatingSystem.RHEL7.value or \
             operating_system.lower() in OperatingSystem.CENTOS7.value.lower() or operating_system.lower() in OperatingSystem.RHEL7.value.lower():
@@ -235,7 +240,7 @@ class ThreadController(ScheduledModuleThread, InternalMsgQ):
             # Log it and restart the whole process when a failure occurs
             logger.exception("ThreadController restarting: %r" % ex)
 
-        self._scheduler.enter(1, self._priority, self.run, ())
+        self._scheduler.enter(self.MSGQ_IDLE_INTERVAL, self._priority, self.run, ())
         self._log_debug("Finished processing successfully")
 
     def _process_msg(self, jsonMsg):
@@ -282,6 +287,8 @@ class ThreadController(ScheduledModuleThread, InternalMsgQ):
             self._stop_module(module_name)
         elif thread_request == "status":
             self._status_module(module_name)
+        elif thread_request == "stats":
+            self._stats_module(module_name)
         elif thread_request == "degrade":
             if module_name.lower() != "all":
                 logger.warn(
@@ -412,17 +419,22 @@ class ThreadController(ScheduledModuleThread, InternalMsgQ):
 
             self._thread_response = "Start Successful"
 
+            # Put a configure debug message on the module's queue before starting it up
+            if self.debug_section is not None:
+                self._write_internal_msgQ(module_name, self.debug_section)
+
+            module = self._sspl_modules[module_name]
+            if self._shared_module_pool is not None and not module.DEDICATED_THREAD:
+                self._shared_module_pool.start_module(module, self._conf_reader,
+                                               self._msgQlist, self._product)
+                return
+
             # NOTE: This is internal code that is currently unused.
             # If this is brought into use again its interaction
             # with the init dependency code will need to be considered
             module_thread = Thread(target=_run_thread_capture_errors,
-                                      args=(self._sspl_modules[module_name], self._sspl_modules,
+                                      args=(module, self._sspl_modules,
                                       self._msgQlist, self._conf_reader, self._product))
-
-            # Put a configure debug message on the module's queue before starting it up
-            if self.debug_section is not None:
-                self._write_internal_msgQ(module_name, self.debug_section)
-
             module_thread.start()
         except Exception as ae:
             logger.warn("Start thread failed: %s" % str(ae))
@@ -439,6 +451,40 @@ class ThreadController(ScheduledModuleThread, InternalMsgQ):
                         (module_name, self._thread_response))
         return self._sspl_modules[module_name].is_running()
 
+    def _stats_module(self, module_name):
+        """Returns the runtime statistics of a module, or of all modules"""
+        if module_name.lower() == "all":
+            modules = list(self._sspl_modules.values())
+        elif module_name in self._sspl_modules:
+            modules = [self._sspl_modules[module_name]]
+        else:
+            self._thread_response = "Error, unknown module: %s" % module_name
+            return
+
+        stats = {}
+        for module in modules:
+            # Key by the module's name, not its registration key, which is
+            #  the class itself for some modules and not JSON serializable
+            name = module.name()
+            module_stats = module.get_stats()
+            msgQ = self._msgQlist.get(name)
+            if msgQ is not None:
+                module_stats["msgQ_depth"] = msgQ.qsize()
+                module_stats["msgQ_high_water_mark"] = \
+                    getattr(msgQ, "high_water_mark", None)
+                module_stats["msgQ_dropped"] = getattr(msgQ, "dropped", None)
+                module_stats["msgQ_spilled"] = getattr(msgQ, "spilled", None)
+                if hasattr(msgQ, "lane_stats"):
+                    module_stats["msgQ_lanes"] = msgQ.lane_stats()
+            if hasattr(module, "get_rate_limiter_stats"):
+                module_stats["rate_limiter"] = \
+                    module.get_rate_limiter_stats()
+            stats[name] = module_stats
+
+        self._thread_response = json.dumps(stats)
+        self._log_debug("_stats_module, module_name: %s, _thread_response: %s" %
+                        (module_name, self._thread_response))
+
     def _check_reset_all_modules(self, jsonMsg):
         """Restarts all modules with debug mode off. Activated by internal_msgQ"""
         if jsonMsg.get("sspl_ll_debug") is not None and \
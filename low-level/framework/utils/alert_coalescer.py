@@ -0,0 +1,166 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Coalesces the alerts raised for a resource within a
+                     time window, suppressing duplicates and flapping
+                     fault/fault_resolved pairs. The alerts suppressed in a
+                     window are reported by one summary alert.
+ ****************************************************************************
+"""
+
+import time
+
+from framework.base.msg_envelope import MsgEnvelope
+
+
+class _AlertWindow(object):
+    """Alerts suppressed for a resource until the end of its window"""
+
+    __slots__ = ("end", "pending", "counts", "first_time", "last_time")
+
+    def __init__(self, end):
+        self.end = end
+        # Latest alert suppressed, the summary reports it
+        self.pending = None
+        self.counts = {}
+        self.first_time = None
+        self.last_time = None
+
+    def suppress(self, jsonMsg, alert_type, now):
+        self.pending = jsonMsg
+        self.counts[alert_type] = self.counts.get(alert_type, 0) + 1
+        if self.first_time is None:
+            self.first_time = now
+        self.last_time = now
+
+
+class AlertCoalescer(object):
+    """Publishes the first alert of a resource, identified by its
+    resource_type and resource_id, and suppresses the following ones of the
+    given alert_types for window secs. Once the window ends, the latest
+    alert suppressed is published as a summary with a "coalesced" field
+    counting the alerts suppressed per alert_type, so consumers end up in
+    the resource's latest state.
+    """
+
+    def __init__(self, window, alert_types):
+        self._window = window
+        self._alert_types = alert_types
+        self._windows = {}
+
+        # Alerts offered, suppressed and summaries published in their
+        #  place, on their own or carried by the resource's next alert
+        self.received = 0
+        self.suppressed = 0
+        self.summaries = 0
+
+    def offer(self, jsonMsg, now=None):
+        """Returns the message to publish now, None when it was suppressed.
+        An alert arriving after its resource's window ended but before the
+        window was flushed carries the summary of that window.
+        """
+        sensor_response = (jsonMsg.get("message") or {}).get("sensor_response_type")
+        key = self._resource_key(sensor_response)
+        if key is None:
+            return jsonMsg
+
+        now = time.time() if now is None else now
+        self.received += 1
+        window = self._windows.get(key)
+        if window is not None and now >= window.end:
+            del self._windows[key]
+            if window.pending is not None:
+                jsonMsg = self._summary(jsonMsg, window)
+                self.summaries += 1
+            window = None
+
+        if window is None:
+            self._windows[key] = _AlertWindow(now + self._window)
+            return jsonMsg
+
+        window.suppress(jsonMsg, sensor_response.get("alert_type"), now)
+        self.suppressed += 1
+        return None
+
+    def flush_due(self, now=None):
+        """Returns the summaries of the windows that ended. A window is
+        opened again for the resources with a summary so that an ongoing
+        flap keeps being coalesced."""
+        now = time.time() if now is None else now
+        summaries = []
+        for key, window in list(self._windows.items()):
+            if now < window.end:
+                continue
+            del self._windows[key]
+            if window.pending is not None:
+                summaries.append(self._summary(window.pending, window))
+                self.summaries += 1
+                self._windows[key] = _AlertWindow(now + self._window)
+        return summaries
+
+    def flush_all(self):
+        """Returns the summaries of all the open windows and closes them"""
+        summaries = [self._summary(window.pending, window)
+                     for window in self._windows.values()
+                     if window.pending is not None]
+        self.summaries += len(summaries)
+        self._windows.clear()
+        return summaries
+
+    def next_due(self):
+        """Returns the time the first open window ends, None when there
+        are none"""
+        if not self._windows:
+            return None
+        return min(window.end for window in self._windows.values())
+
+    def stats(self):
+        """Returns the coalescing counters, saved being the number of
+        messages not published"""
+        return {
+            "window": self._window,
+            "received": self.received,
+            "suppressed": self.suppressed,
+            "summaries": self.summaries,
+            "saved": self.suppressed - self.summaries,
+            "open_windows": len(self._windows)
+        }
+
+    def _resource_key(self, sensor_response):
+        """Returns the resource an alert is raised for, None for the
+        messages which are not coalesced"""
+        if not isinstance(sensor_response, dict) or \
+           sensor_response.get("alert_type") not in self._alert_types:
+            return None
+        info = sensor_response.get("info")
+        if not isinstance(info, dict) or info.get("resource_type") is None:
+            return None
+        return info.get("resource_type"), info.get("resource_id")
+
+    def _summary(self, jsonMsg, window):
+        """Returns the message with the alerts suppressed in the window
+        added as its "coalesced" field"""
+        message = dict(jsonMsg["message"])
+        sensor_response = dict(message["sensor_response_type"])
+        sensor_response["coalesced"] = {
+            "count": sum(window.counts.values()),
+            "alert_types": dict(window.counts),
+            "first_time": str(int(window.first_time)),
+            "last_time": str(int(window.last_time))
+        }
+        message["sensor_response_type"] = sensor_response
+        return MsgEnvelope.wrap(jsonMsg).replace(message=message)
@@ -0,0 +1,359 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Read-through cache in front of a store. Values are kept
+                     in a bounded LRU for up to a TTL, keys found missing are
+                     cached for a shorter TTL. Writes go through to the store
+                     or, for the keys under a write-behind prefix, are
+                     coalesced and flushed in the background.
+ ****************************************************************************
+"""
+
+import atexit
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from framework.utils.store import Store
+from framework.utils.service_logging import logger
+
+
+class CachedStore(Store):
+    """Caching decorator of a Store. Values read or written are cached, a
+    copy is handed out so callers can not change the cached value. Keys
+    under a bypass prefix and values written unpickled are not cached.
+    Other attributes are those of the wrapped store."""
+
+    # Markers of the keys known to be missing and known to exist
+    ABSENT  = object()
+    PRESENT = object()
+
+    # Values shared with callers as they are
+    IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None))
+
+    def __init__(self, store, max_entries=1024, ttl=60, negative_ttl=10,
+                 write_behind=(), bypass=(), flush_interval=5):
+        super(CachedStore, self).__init__()
+        self.store = store
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._write_behind = tuple(write_behind)
+        self._bypass = tuple(bypass)
+        self._flush_interval = flush_interval
+
+        self._lock = threading.RLock()
+        # key -> (value or marker, expiry time), least recently used first
+        self._entries = OrderedDict()
+        # Values written behind, waiting for and being flushed
+        self._dirty = OrderedDict()
+        self._flushing = {}
+        self._flush_lock = threading.Lock()
+        # Bumped by every write, a value read while it changed is not cached
+        self._writes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._negative_hits = 0
+        self._evictions = 0
+        self._deferred_writes = 0
+        self._flushes = 0
+
+        self._stop = threading.Event()
+        self._flusher = None
+        if self._write_behind:
+            self._flusher = threading.Thread(target=self._flush_loop,
+                                             name="CachedStoreFlusher",
+                                             daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def __getattr__(self, name):
+        if name == "store":
+            raise AttributeError(name)
+        return getattr(self.store, name)
+
+    def put(self, value, key, pickled=True):
+        """Caches the value and writes it to the store, later for the keys
+        under a write-behind prefix"""
+        if self._bypassed(key) or not pickled:
+            with self._lock:
+                self._writes += 1
+                self._entries.pop(key, None)
+            self.store.put(value, key, pickled=pickled)
+            return
+
+        value = self._copy(value)
+        with self._lock:
+            self._writes += 1
+            self._cache(key, value, self._ttl)
+            if self._deferred(key):
+                self._dirty[key] = value
+                self._dirty.move_to_end(key)
+                self._deferred_writes += 1
+                return
+        self.store.put(value, key, pickled=pickled)
+
+    def get(self, key, *args, **kwargs):
+        """Returns the cached value, reading it from the store on a miss.
+        Reads with options, e.g. config sections, are not cached."""
+        if args or kwargs or self._bypassed(key):
+            return self.store.get(key, *args, **kwargs)
+
+        with self._lock:
+            value = self._lookup(key)
+            if value is self.ABSENT:
+                self._negative_hits += 1
+                return None
+            if value is not None and value is not self.PRESENT:
+                self._hits += 1
+                return self._copy(value)
+            self._misses += 1
+            writes = self._writes
+
+        value = self.store.get(key)
+        with self._lock:
+            if writes == self._writes:
+                if value is None:
+                    self._cache(key, self.ABSENT, self._negative_ttl)
+                else:
+                    self._cache(key, value, self._ttl)
+        return self._copy(value)
+
+    def exists(self, key):
+        """Returns whether the key exists and the status of the check like
+        the store, answered from the cache when the key was seen"""
+        if self._bypassed(key):
+            return self.store.exists(key)
+
+        with self._lock:
+            value = self._lookup(key)
+            if value is self.ABSENT:
+                self._negative_hits += 1
+                return False, "Success"
+            if value is not None:
+                self._hits += 1
+                return True, "Success"
+            self._misses += 1
+            writes = self._writes
+
+        key_present, status = self.store.exists(key)
+        with self._lock:
+            if status == "Success" and writes == self._writes:
+                if key_present:
+                    self._cache(key, self.PRESENT, self._ttl)
+                else:
+                    self._cache(key, self.ABSENT, self._negative_ttl)
+        return key_present, status
+
+    def delete(self, key):
+        """Deletes the key from the store and caches it as missing"""
+        self.delete_many([key], batch=False)
+
+    def get_many(self, keys):
+        """Returns the values of the keys, the ones not cached are read
+        from the store in one batch"""
+        values = {}
+        missed = []
+        with self._lock:
+            for key in keys:
+                value = None if self._bypassed(key) else self._lookup(key)
+                if value is self.ABSENT:
+                    self._negative_hits += 1
+                    values[key] = None
+                elif value is not None and value is not self.PRESENT:
+                    self._hits += 1
+                    values[key] = self._copy(value)
+                else:
+                    self._misses += 1
+                    missed.append(key)
+            writes = self._writes
+        if not missed:
+            return values
+
+        read = self.store.get_many(missed)
+        if read is None:
+            return None
+        with self._lock:
+            for key, value in read.items():
+                if writes == self._writes and not self._bypassed(key):
+                    if value is None:
+                        self._cache(key, self.ABSENT, self._negative_ttl)
+                    else:
+                        self._cache(key, value, self._ttl)
+                values[key] = self._copy(value)
+        return values
+
+    def put_many(self, items, pickled=True):
+        """Caches the values and writes them to the store in one batch,
+        later for the keys under a write-behind prefix"""
+        written = {}
+        with self._lock:
+            self._writes += 1
+            for key, value in items.items():
+                if self._bypassed(key) or not pickled:
+                    self._entries.pop(key, None)
+                    written[key] = value
+                    continue
+                value = self._copy(value)
+                self._cache(key, value, self._ttl)
+                if self._deferred(key):
+                    self._dirty[key] = value
+                    self._dirty.move_to_end(key)
+                    self._deferred_writes += 1
+                else:
+                    written[key] = value
+        if not written:
+            return True
+        return self.store.put_many(written, pickled=pickled)
+
+    def delete_many(self, keys, batch=True):
+        """Deletes the keys from the store in one batch and caches them as
+        missing. Waits for a flush in progress so a value written behind
+        is not written back once deleted."""
+        with self._flush_lock:
+            with self._lock:
+                self._writes += 1
+                for key in keys:
+                    self._dirty.pop(key, None)
+                    if self._bypassed(key):
+                        self._entries.pop(key, None)
+                    else:
+                        self._cache(key, self.ABSENT, self._negative_ttl)
+            if not batch:
+                self.store.delete(keys[0])
+                return True
+            return self.store.delete_many(keys)
+
+    def get_keys_with_prefix(self, prefix):
+        """Returns the keys under the prefix once the values written behind
+        under it are flushed"""
+        with self._lock:
+            pending = any(key.startswith(prefix) for key in self._dirty)
+        if pending:
+            self.flush()
+        return self.store.get_keys_with_prefix(prefix)
+
+    def get_all_with_prefix(self, prefix):
+        """Returns the values of the keys right under the prefix, read in
+        one go from the store and cached"""
+        with self._lock:
+            pending = any(key.startswith(prefix) for key in self._dirty)
+        if pending:
+            self.flush()
+        with self._lock:
+            writes = self._writes
+        values = self.store.get_all_with_prefix(prefix)
+        with self._lock:
+            if writes == self._writes and prefix.endswith("/") and \
+               not self._bypassed(prefix):
+                for name, value in values.items():
+                    if value is not None:
+                        self._cache(prefix + name, value, self._ttl)
+        return {name: self._copy(value) for name, value in values.items()}
+
+    def flush(self):
+        """Writes the values written behind to the store in one batch"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._flushing, self._dirty = self._dirty, OrderedDict()
+                batch = {key: self._copy(value)
+                         for key, value in self._flushing.items()}
+                self._flushes += 1
+            written = False
+            try:
+                written = self.store.put_many(batch)
+            except Exception as err:
+                logger.warn("CachedStore, flush, error writing %s keys: %r" %
+                            (len(batch), err))
+            with self._lock:
+                if not written:
+                    # Kept pending unless written again since
+                    for key, value in self._flushing.items():
+                        self._dirty.setdefault(key, value)
+                self._flushing = {}
+
+    def invalidate(self, prefix=""):
+        """Drops the cached values of the keys under the prefix, e.g. when
+        written to the store by another process"""
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def stats(self):
+        """Returns the cache counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "negative_hits": self._negative_hits,
+                "evictions": self._evictions,
+                "deferred_writes": self._deferred_writes,
+                "pending_writes": len(self._dirty),
+                "flushes": self._flushes,
+            }
+
+    def close(self):
+        """Stops the flusher and writes the values written behind"""
+        self._stop.set()
+        if self._flusher is not None and \
+           self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=self._flush_interval)
+        self.flush()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self._flush_interval):
+            self.flush()
+
+    def _deferred(self, key):
+        return bool(self._write_behind) and key.startswith(self._write_behind)
+
+    def _bypassed(self, key):
+        return bool(self._bypass) and key.startswith(self._bypass)
+
+    def _lookup(self, key):
+        """Returns the value or marker cached for the key, None on a miss.
+        Values written behind are not expired before they are flushed."""
+        if key in self._dirty:
+            return self._dirty[key]
+        if key in self._flushing:
+            return self._flushing[key]
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _cache(self, key, value, ttl):
+        self._entries[key] = (value, time.time() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _copy(self, value):
+        if isinstance(value, self.IMMUTABLE_TYPES):
+            return value
+        return copy.deepcopy(value)
@@ -0,0 +1,234 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Typed, immutable snapshots of sspl.conf sections. Each
+                     section is read and converted once, the backing yaml
+                     file or Consul keys are watched and subscribers are
+                     notified with the new snapshot when a value changes.
+ ****************************************************************************
+"""
+
+import os
+import threading
+from collections import namedtuple
+
+import yaml
+
+from framework.base.sspl_constants import component, file_store_config_path
+from framework.utils.service_logging import logger
+
+
+def to_number(value):
+    """Converts to int when the value is all digits, else to float"""
+    value = str(value).strip()
+    return int(value) if value.isdigit() else float(value)
+
+def to_bool(value):
+    if isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if value in ("true", "yes", "1"):
+        return True
+    if value in ("false", "no", "0", ""):
+        return False
+    raise ValueError("not a boolean: {}".format(value))
+
+def to_list(value):
+    """Lists are kept, comma separated strings are split"""
+    if value is None or value == "":
+        return ()
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return tuple(item.strip() for item in str(value).split(","))
+
+def percentage(value):
+    return 0 <= value <= 100
+
+
+class ConfField(namedtuple("ConfField", "name convert default check")):
+    """Key of a section, converted with convert(). The default is used when
+    the key is missing, can not be converted or check(value) fails."""
+
+    def __new__(cls, name, convert=str, default=None, check=None):
+        return super(ConfField, cls).__new__(cls, name, convert, default, check)
+
+    def parse(self, section, values):
+        if self.name not in values or values[self.name] is None:
+            return self.default
+        raw = values[self.name]
+        try:
+            value = self.convert(raw)
+            if self.check is not None and not self.check(value):
+                raise ValueError("out of range")
+        except (TypeError, ValueError) as err:
+            logger.warning(f"Invalid {section}>{self.name} value '{raw}' in config: {err}, "
+                           f"using default {self.default}")
+            return self.default
+        return value
+
+
+class YamlConfSource(object):
+    """Sections of the sspl.conf yaml file, also loaded as the SSPL_CONF
+    index of conf_utils"""
+
+    def __init__(self, path=file_store_config_path):
+        self.path = path
+        self._version = None
+        self._sections = {}
+
+    def version(self):
+        """Changes when the file is modified"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def load(self, section):
+        version = self.version()
+        if version is None or version != self._version:
+            try:
+                with open(self.path) as conf_file:
+                    self._sections = yaml.safe_load(conf_file) or {}
+                self._version = version
+            except OSError as err:
+                # Keeps the last sections read
+                logger.warning(f"Failed to read {self.path}: {err}")
+        return self._sections.get(section) or {}
+
+
+class ConsulConfSource(object):
+    """Sections stored in Consul as <prefix>/<section>/<key>"""
+
+    def __init__(self, store, prefix=component):
+        self.store = store
+        self.prefix = prefix
+
+    def version(self):
+        # Consul has no cheap change marker, sections are compared instead
+        return None
+
+    def load(self, section):
+        return self.store.get_all_with_prefix(f"{self.prefix}/{section}") or {}
+
+
+class ConfSnapshots(object):
+    """Registry of the section snapshots. A snapshot is a namedtuple with
+    a field per ConfField, so reads on hot paths are attribute lookups of
+    already converted values."""
+
+    # Seconds between checks of the backing source
+    POLL_INTERVAL = 10
+
+    def __init__(self, source=None, poll_interval=POLL_INTERVAL):
+        self.source = source if source is not None else YamlConfSource()
+        self.poll_interval = poll_interval
+        self._lock = threading.RLock()
+        # section -> (fields, snapshot type)
+        self._schemas = {}
+        self._snapshots = {}
+        self._subscribers = {}
+        self._version = None
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def register(self, section, fields):
+        """Loads the section with the given fields and returns its snapshot,
+        a section registered again gets the union of the fields"""
+        with self._lock:
+            known = self._schemas.get(section, ((), None))[0]
+            names = [field.name for field in known]
+            fields = tuple(known) + tuple(field for field in fields
+                                          if field.name not in names)
+            if section not in self._schemas or len(fields) != len(known):
+                snapshot_type = namedtuple(section.title().replace("_", ""),
+                                           [field.name for field in fields])
+                self._schemas[section] = (fields, snapshot_type)
+                self._snapshots[section] = self._load(section)
+            return self._snapshots[section]
+
+    def get(self, section):
+        """Returns the current snapshot of a registered section"""
+        return self._snapshots[section]
+
+    def subscribe(self, section, callback):
+        """Calls callback(snapshot) with the new snapshot each time a value
+        of the section changes, starts the watcher"""
+        with self._lock:
+            self._subscribers.setdefault(section, []).append(callback)
+            if self._watcher is None:
+                self._version = self.source.version()
+                self._watcher = threading.Thread(target=self._watch,
+                                    name="ConfSnapshots", daemon=True)
+                self._watcher.start()
+
+    def unsubscribe(self, section, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(section, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def refresh(self):
+        """Reloads the registered sections when the source changed and
+        notifies the subscribers of the changed ones. Returns the names of
+        the sections that changed."""
+        changed = []
+        with self._lock:
+            version = self.source.version()
+            if version is not None and version == self._version:
+                return changed
+            self._version = version
+            for section in list(self._schemas):
+                try:
+                    snapshot = self._load(section)
+                except Exception as err:
+                    logger.warning(f"Failed to reload {section} config: {err}")
+                    continue
+                if snapshot != self._snapshots[section]:
+                    self._snapshots[section] = snapshot
+                    changed.append(section)
+            notify = [(section, self._snapshots[section],
+                       list(self._subscribers.get(section, [])))
+                      for section in changed]
+
+        for section, snapshot, callbacks in notify:
+            logger.info(f"{section} config changed: {snapshot}")
+            for callback in callbacks:
+                try:
+                    callback(snapshot)
+                except Exception as err:
+                    logger.error(f"Error applying {section} config change: {err}")
+        return changed
+
+    def stop(self):
+        self._stop.set()
+
+    def _load(self, section):
+        fields, snapshot_type = self._schemas[section]
+        values = self.source.load(section)
+        return snapshot_type(*(field.parse(section, values) for field in fields))
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as err:
+                logger.warning(f"Failed to check config for changes: {err}")
+
+
+# Snapshots of the sections of sspl.conf
+conf_snapshots = ConfSnapshots()
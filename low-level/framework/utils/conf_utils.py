@@ -94,9 +94,16 @@ MESSAGE_HANDLERS="message_handlers"
 MESSAGE_SIGNATURE_EXPIRES="message_signature_expires"
 MESSAGE_SIGNATURE_TOKEN="message_signature_token"
 MESSAGE_SIGNATURE_USERNAME="message_signature_username"
+MESSAGE_VALIDATION="message_validation"
+MESSAGE_VALIDATION_SAMPLE_RATE="message_validation_sample_rate"
 MGMT_INTERFACE="mgmt_interface"
 MONITOR="monitor"
 MONITORED_SERVICES="monitored_services"
+MSGQ_MAX_SIZE="msgq_max_size"
+MSGQ_OVERFLOW_POLICY="msgq_overflow_policy"
+MSGQ_PRIORITY_LANES="msgq_priority_lanes"
+MSGQ_PUT_TIMEOUT="msgq_put_timeout"
+MSGQ_STARVATION_TIMEOUT="msgq_starvation_timeout"
 NODE_ID="node_id"
 PASS="pass"
 PASSWORD="password"
@@ -110,6 +117,10 @@ PROBE="probe"
 PRODUCT="product"
 QUEUE_NAME="queue_name"
 RACK_ID="rack_id"
+RATE_LIMIT="rate_limit"
+RATE_LIMIT_BACKLOG="rate_limit_backlog"
+RATE_LIMIT_BURST="rate_limit_burst"
+RATE_LIMIT_POLICY="rate_limit_policy"
 RELEASE="release"
 ROUTING_KEY="routing_key"
 RSYSLOG="rsyslog"
@@ -126,6 +137,7 @@ STORAGE="storage"
 STORAGE_SET_ID="storage_set_id"
 STORE_TYPE="store_type"
 THREADED="threaded"
+THREAD_POOL_SIZE="thread_pool_size"
 TIMESTAMP_FILE_PATH="timestamp_file_path"
 TRANSMIT_INTERVAL="transmit_interval"
 TYPE="type"
@@ -27,8 +27,10 @@ import requests
 from framework.base.sspl_constants import (component, salt_provisioner_pillar_sls, file_store_config_path,
         SSPL_STORE_TYPE, StoreTypes, salt_uniq_passwd_per_node, COMMON_CONFIGS, SSPL_CONFIGS, CONSUL_PORT,
         MAX_CONSUL_RETRY, WAIT_BEFORE_RETRY, CONSUL_ERR_STRING, CONSUL_HOST, PRODUCT_NAME)
+from framework.utils.cached_store import CachedStore
 from framework.utils.consulstore import ConsulStore
 from framework.utils.filestore import FileStore
+from framework.utils.sqlitestore import SQLiteStore
 # Onward LDR_R2, consul and salt will be abstracted out and won't exist as hard dependencies of SSPL
 try:
     import salt.client
@@ -104,7 +106,7 @@ class ConfigReader(object):
                         new_conf.get(sect)['password'] = rbmq_pass
                 self.store = configparser.ConfigParser(allow_no_value=True)
                 self.store.read_dict(new_conf)
-            elif store_type == StoreTypes.FILE.value:
+            elif store_type in (StoreTypes.FILE.value, StoreTypes.SQLITE.value):
                 print("Checking and reading file from local config path => /etc/sspl.conf")
                 self.store = configparser.ConfigParser(allow_no_value=True)
                 self.store.read(file_store_config_path)
@@ -147,6 +149,17 @@ class ConfigReader(object):
         print("Running via sspl service and taking key values from store factory")
         from framework.utils.store_factory import store
         self.store = store
+        if isinstance(self._backing_store(), SQLiteStore):
+            # The configuration is not kept in the SQLite store, it is read
+            # from the local config file as by read_dev_conf
+            self.store = configparser.ConfigParser(allow_no_value=True)
+            self.store.read(file_store_config_path)
+
+    def _backing_store(self):
+        """Returns the store read from, the one wrapped by the store cache"""
+        if isinstance(self.store, CachedStore):
+            return self.store.store
+        return self.store
 
     def _get_value(self, section, key):
         """Get a single value by section and key
@@ -161,9 +174,10 @@ class ConfigReader(object):
         """
         value = None
         try:
-            if self.store is not None and isinstance(self.store, FileStore):
+            store = self._backing_store()
+            if store is not None and isinstance(store, FileStore):
                 value = self.store.get(section, key)
-            elif self.store is not None and isinstance(self.store, ConsulStore):
+            elif store is not None and isinstance(store, ConsulStore):
                 if section not in COMMON_CONFIGS:
                     value = self.store.get(component + '/' + section + '/' + key)
                 elif key in SSPL_CONFIGS or section.lower() in SSPL_CONFIGS:
@@ -222,9 +236,10 @@ class ConfigReader(object):
         """Get all values for all the keys in the section"""
         value_list = list()
         try:
-            if self.store is not None and isinstance(self.store, FileStore):
+            store = self._backing_store()
+            if store is not None and isinstance(store, FileStore):
                 pairs = self.store.items(section)
-            elif self.store is not None and isinstance(self.store, ConsulStore):
+            elif store is not None and isinstance(store, ConsulStore):
                 if section not in COMMON_CONFIGS:
                     pairs = self.store.get(component + '/' + section + '/' , recurse=True)
                 else:
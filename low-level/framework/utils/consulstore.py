@@ -19,22 +19,61 @@
                     dump or load from consul
  ****************************************************************************
 """
+import base64
 import os
 import consul
+from framework.utils.circuit_breaker import CircuitBreaker
 from framework.utils.store import Store
 from framework.utils.service_logging import logger
+from framework.utils import json_codec
 import pickle
 from framework.base.sspl_constants import MAX_CONSUL_RETRY, WAIT_BEFORE_RETRY, CONSUL_ERR_STRING
 import time
 import requests
+from requests.adapters import HTTPAdapter
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter applying a timeout to the requests made without one, as
+    python-consul does"""
+
+    def __init__(self, timeout, **kwargs):
+        self.timeout = timeout
+        super(TimeoutHTTPAdapter, self).__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super(TimeoutHTTPAdapter, self).send(request, **kwargs)
+
 
 class ConsulStore(Store):
 
+    # Keep-alive connections kept open to consul
+    POOL_SIZE = 10
+    # Secs to wait for a consul response
+    HTTP_TIMEOUT = 10
+    # Operations of a transaction, consul rejects more
+    TXN_MAX_OPS = 64
+    # Connection failures after which consul is not called for
+    # BREAKER_RESET_TIMEOUT secs
+    BREAKER_FAILURES = 3
+    BREAKER_RESET_TIMEOUT = 30
+
     def __init__(self, host, port):
         super(Store, self).__init__()
+        self._url = "http://{0}:{1}".format(host, port)
+        self._session = requests.Session()
+        adapter = TimeoutHTTPAdapter(self.HTTP_TIMEOUT, pool_connections=1,
+                                     pool_maxsize=self.POOL_SIZE)
+        self._session.mount("http://", adapter)
+        self._breaker = CircuitBreaker(self.BREAKER_FAILURES, self.BREAKER_RESET_TIMEOUT)
+
         for retry_index in range(0, MAX_CONSUL_RETRY):
             try:
                 self.consul_conn = consul.Consul(host=host, port=port)
+                # Share the pooled session with python-consul
+                if hasattr(self.consul_conn.http, "session"):
+                    self.consul_conn.http.session = self._session
                 break
 
             except requests.exceptions.ConnectionError as connerr:
@@ -60,67 +99,66 @@ class ConsulStore(Store):
         else:
             return key
 
-    def put(self, value, key, pickled=True):
-        """ write data to given key"""
-        key = self._get_key(key)
-        if pickled:
-            value = pickle.dumps(value)
-
+    def _retry(self, operation, error_msg):
+        """Calls operation, retrying while consul can not be reached. Returns
+        its result and True, or None and False on error. Once the circuit
+        breaker opens consul is not called and the retries stop."""
         for retry_index in range(0, MAX_CONSUL_RETRY):
+            if not self._breaker.allow():
+                logger.debug("Consul unreachable, skipping: {0}".format(error_msg))
+                return None, False
             try:
-                self.consul_conn.kv.put(key, value)
-                break
+                result = operation()
+                self._breaker.record_success()
+                return result, True
 
-            except requests.exceptions.ConnectionError as connerr:
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as connerr:
                 logger.warn("Error[{0}] consul connection refused Retry Index {1}" \
                     .format(connerr, retry_index))
-                time.sleep(WAIT_BEFORE_RETRY)
 
             except Exception as gerr:
-                consuerr = str(gerr)
-                if CONSUL_ERR_STRING == consuerr:
-                    logger.warn("Error[{0}] consul connection refused Retry Index {1}" \
-                        .format(gerr, retry_index))
-                    time.sleep(WAIT_BEFORE_RETRY)
-                else:
-                    logger.warn("Error[{0}] consul error".format(gerr))
-                    break
-
-    def _consul_get(self, key, **kwargs):
-        """Load consul data from the given key."""
-        data = None
-        status = "Failure"
-
-        for retry_index in range(0, MAX_CONSUL_RETRY):
-            try:
-                _opt_recurse = kwargs.get("recurse", False)
-                key = self._get_key(key)
-                data = self.consul_conn.kv.get(key, recurse=_opt_recurse)[1]
-                if data:
-                    data = data["Value"]
-                    try:
-                        data = pickle.loads(data)
-                    except:
-                        pass
-                status = "Success"
-                break
-
-            except requests.exceptions.ConnectionError as connerr:
+                consulerr = str(gerr)
+                if CONSUL_ERR_STRING != consulerr:
+                    # Consul answered, it is reachable
+                    self._breaker.record_success()
+                    logger.warn("Error[{0}] {1}".format(gerr, error_msg))
+                    return None, False
                 logger.warn("Error[{0}] consul connection refused Retry Index {1}" \
-                    .format(connerr, retry_index))
+                    .format(gerr, retry_index))
+
+            self._breaker.record_failure()
+            if self._breaker.allow():
                 time.sleep(WAIT_BEFORE_RETRY)
+        return None, False
 
-            except Exception as gerr:
-                consuerr = str(gerr)
-                if CONSUL_ERR_STRING == consuerr:
-                    logger.warn("Error[{0}] consul connection refused Retry Index {1}" \
-                        .format(gerr, retry_index))
-                    time.sleep(WAIT_BEFORE_RETRY)
-                else:
-                    logger.warn("Error[{0}] consul error".format(gerr))
-                    break
+    def put(self, value, key, pickled=True):
+        """ write data to given key"""
+        key = self._get_key(key)
+        if pickled:
+            value = pickle.dumps(value)
+        self._retry(lambda: self.consul_conn.kv.put(key, value), "consul error")
 
-        return data, status
+    def _unpickle(self, data):
+        try:
+            return pickle.loads(data)
+        except:
+            return data
+
+    def _consul_get(self, key, **kwargs):
+        """Load consul data from the given key, with recurse the name and
+        data of each key under it."""
+        _opt_recurse = kwargs.get("recurse", False)
+        key = self._get_key(key)
+        data, ok = self._retry(
+            lambda: self.consul_conn.kv.get(key, recurse=_opt_recurse)[1],
+            "consul error")
+        if data and _opt_recurse:
+            data = [(item["Key"][len(key):], self._unpickle(item["Value"]))
+                    for item in data]
+        elif data:
+            data = self._unpickle(data["Value"])
+        return data, "Success" if ok else "Failure"
 
     def get(self, key, **kwargs):
         """ Load data from given key"""
@@ -141,53 +179,136 @@ class ConsulStore(Store):
     def delete(self, key):
         """ delete a key
         """
-        for retry_index in range(0, MAX_CONSUL_RETRY):
-            try:
-                key = self._get_key(key)
-                self.consul_conn.kv.delete(key)
-                break
-
-            except requests.exceptions.ConnectionError as connerr:
-                logger.warn("Error[{0}] consul connection refused Retry Index {1}" \
-                    .format(connerr, retry_index))
-                time.sleep(WAIT_BEFORE_RETRY)
-
-            except Exception as gerr:
-                consulerr = str(gerr)
-                if CONSUL_ERR_STRING == consulerr:
-                    logger.warn("Error[{0}] consul connection refused Retry Index {1}" \
-                        .format(gerr, retry_index))
-                    time.sleep(WAIT_BEFORE_RETRY)
-                else:
-                    logger.warn("Error[{0}] while deleting key from consul {1}" \
-                        .format(gerr, key))
-                    break
+        key = self._get_key(key)
+        self._retry(lambda: self.consul_conn.kv.delete(key),
+                    "while deleting key from consul {0}".format(key))
 
     def get_keys_with_prefix(self, prefix):
         """ get keys with given prefix
         """
-        for retry_index in range(0, MAX_CONSUL_RETRY):
+        prefix = self._get_key(prefix)
+        data, ok = self._retry(
+            lambda: self.consul_conn.kv.get(prefix, recurse=True)[1],
+            "while getting the keys from consul")
+        if not ok:
+            return None
+        return [item["Key"][item["Key"].rindex("/")+1:] for item in data or []]
+
+    def get_all_with_prefix(self, prefix):
+        """ get key name to data of the keys right under given prefix,
+        read in one request
+        """
+        prefix = self._get_key(prefix)
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        data, _ = self._retry(
+            lambda: self.consul_conn.kv.get(prefix, recurse=True)[1],
+            "while getting the keys from consul")
+        values = {}
+        for item in data or []:
+            name = item["Key"][len(prefix):]
+            if not name or "/" in name:
+                continue
+            values[name] = self._unpickle(item["Value"])
+        return values
+
+    def get_many(self, keys):
+        """ get key to data of the given keys, None for the missing ones,
+        read in transactions of up to TXN_MAX_OPS keys
+        """
+        values = dict.fromkeys(keys)
+        keys = list(values)
+        for start in range(0, len(keys), self.TXN_MAX_OPS):
+            chunk = keys[start:start + self.TXN_MAX_OPS]
+            results, ok = self._retry(lambda: self._txn_get(chunk),
+                                      "while reading keys from consul")
+            if not ok:
+                return None
+            values.update(results)
+        return values
+
+    def put_many(self, items, pickled=True):
+        """ write the data of each key in atomic transactions of up to
+        TXN_MAX_OPS keys
+        """
+        ops = []
+        for key, value in items.items():
+            if pickled:
+                value = pickle.dumps(value)
+            ops.append(self._txn_op("set", key, value))
+        return self._txn_write(ops, "while writing keys to consul")
+
+    def delete_many(self, keys):
+        """ delete the keys in atomic transactions of up to TXN_MAX_OPS keys
+        """
+        ops = [self._txn_op("delete", key) for key in keys]
+        return self._txn_write(ops, "while deleting keys from consul")
+
+    def _txn_op(self, verb, key, value=None):
+        op = {"Verb": verb, "Key": self._get_key(key)}
+        if value is not None:
+            if isinstance(value, str):
+                value = value.encode("utf-8")
+            op["Value"] = base64.b64encode(value).decode("ascii")
+        return {"KV": op}
+
+    def _txn_write(self, ops, error_msg):
+        """Runs the write operations in transactions, returns False on error"""
+        for start in range(0, len(ops), self.TXN_MAX_OPS):
+            chunk = ops[start:start + self.TXN_MAX_OPS]
+            _, ok = self._retry(lambda: self._txn(chunk), error_msg)
+            if not ok:
+                return False
+        return True
+
+    def _txn(self, ops):
+        """Runs a transaction, returns its results. Raises ConsulTxnError
+        with the errors of a rolled back transaction."""
+        response = self._session.put("{0}/v1/txn".format(self._url),
+                                     data=json_codec.dumps_bytes(ops))
+        if response.status_code == 409:
+            raise ConsulTxnError(response.json().get("Errors") or [])
+        if response.status_code != 200:
+            raise Exception("{0} {1}".format(response.status_code,
+                                             response.text.strip()))
+        return response.json().get("Results") or []
+
+    def _txn_get(self, keys):
+        """Reads the keys in one transaction. A get of a missing key rolls
+        back the transaction, it is run again without the missing keys."""
+        values = {}
+        ops = [(key, self._txn_op("get", key)) for key in keys]
+        while ops:
             try:
-                prefix = self._get_key(prefix)
-                data = self.consul_conn.kv.get(prefix, recurse=True)[1]
-                if data:
-                    return [item["Key"][item["Key"].rindex("/")+1:] for item in data]
-                else:
-                    return []
-                break
+                results = self._txn([op for _, op in ops])
+            except ConsulTxnError as err:
+                missing = err.missing_ops()
+                if not missing:
+                    raise
+                ops = [op for index, op in enumerate(ops) if index not in missing]
+                continue
+            for (key, _), result in zip(ops, results):
+                value = result["KV"].get("Value")
+                if value is not None:
+                    value = self._unpickle(base64.b64decode(value))
+                values[key] = value
+            break
+        return values
 
-            except requests.exceptions.ConnectionError as connerr:
-                logger.warn("Error[{0}] consul connection refused Retry Index {1}" \
-                    .format(connerr, retry_index))
-                time.sleep(WAIT_BEFORE_RETRY)
+    def stats(self):
+        """Returns the state of the circuit breaker"""
+        return {"breaker": self._breaker.stats()}
 
-            except Exception as gerr:
-                consulerr = str(gerr)
-                if CONSUL_ERR_STRING == consulerr:
-                    logger.warn("Error[{0}] consul connection refused Retry Index {1}" \
-                        .format(gerr, retry_index))
-                    time.sleep(WAIT_BEFORE_RETRY)
-                else:
-                    logger.warn("Error[{0}] while getting the keys from consul" \
-                        .format(gerr))
-                    break
+
+class ConsulTxnError(Exception):
+    """Errors of a consul transaction rolled back"""
+
+    def __init__(self, errors):
+        super(ConsulTxnError, self).__init__(
+            "; ".join(error.get("What", "") for error in errors))
+        self.errors = errors
+
+    def missing_ops(self):
+        """Returns the indexes of the gets of missing keys"""
+        return {error.get("OpIndex") for error in self.errors
+                if "doesn't exist" in error.get("What", "")}
@@ -0,0 +1,102 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Compression of the large message bodies published on
+                    RabbitMQ. Bodies of at least the threshold size are
+                    compressed and published with the content_encoding
+                    property set, decode_body() restores them on ingress.
+ ****************************************************************************
+"""
+
+import gzip
+import zlib
+
+from framework.utils.service_logging import logger
+
+# Values of the content_encoding property, NONE publishes bodies as is
+NONE = "none"
+GZIP = "gzip"
+DEFLATE = "deflate"
+ENCODINGS = (NONE, GZIP, DEFLATE)
+
+
+class ContentEncoder(object):
+    """Compresses the message bodies of at least threshold bytes"""
+
+    def __init__(self, encoding=NONE, threshold=65536, level=6):
+        encoding = str(encoding or NONE).lower()
+        if encoding not in ENCODINGS:
+            logger.warning(f"ContentEncoder, unknown content encoding "
+                           f"{encoding}, one of {ENCODINGS}, using {NONE}")
+            encoding = NONE
+        self._encoding = encoding
+        self._threshold = max(0, int(threshold))
+        self._level = min(9, max(1, int(level)))
+        self.encoded = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    @property
+    def enabled(self):
+        return self._encoding != NONE
+
+    def encode(self, body):
+        """Returns the body, compressed when it has at least threshold
+        bytes once utf-8 encoded, and its content encoding, None when it is
+        left as is"""
+        if not self.enabled:
+            return body, None
+
+        raw = body.encode("utf-8") if isinstance(body, str) else body
+        if len(raw) < self._threshold:
+            return body, None
+        if self._encoding == GZIP:
+            data = gzip.compress(raw, self._level)
+        else:
+            data = zlib.compress(raw, self._level)
+        # Bodies that do not shrink are not worth decoding on the consumer
+        if len(data) >= len(raw):
+            return body, None
+
+        self.encoded += 1
+        self.bytes_in += len(raw)
+        self.bytes_out += len(data)
+        return data, self._encoding
+
+    def stats(self):
+        """Returns the compression counters, saved being the number of
+        bytes not published"""
+        return {
+            "encoding": self._encoding,
+            "threshold": self._threshold,
+            "encoded": self.encoded,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "saved": self.bytes_in - self.bytes_out
+        }
+
+
+def decode_body(body, content_encoding):
+    """Returns the body decompressed as per its content_encoding property,
+    as is when it has none. Raises ValueError on an unknown encoding."""
+    if not content_encoding or content_encoding in (NONE, "identity"):
+        return body
+    if content_encoding == GZIP:
+        return gzip.decompress(body)
+    if content_encoding == DEFLATE:
+        return zlib.decompress(body)
+    raise ValueError(f"Unknown content encoding {content_encoding}")
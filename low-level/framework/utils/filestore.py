@@ -16,22 +16,47 @@
 """
  ****************************************************************************
   Description:       Utility functions to deal with json data,
-                    dump or load from file
+                    dump or load from file. Files are replaced atomically
+                    through a temporary file. With group commit the writes
+                    are buffered, written together and flushed to disk.
  ****************************************************************************
 """
+import atexit
 import os
 import errno
 import json
 import pickle
+import tempfile
+import threading
 from configparser import ConfigParser
 from framework.utils.store import Store
 from framework.utils.service_logging import logger
 
+# Read once, os.umask() can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 class FileStore(Store):
 
-    def __init__(self):
+    # Suffix of the temporary files written before being renamed
+    TMP_SUFFIX = ".tmp"
+
+    def __init__(self, group_commit=False, commit_interval=1.0):
         super(FileStore, self).__init__()
         self.config_parser = ConfigParser()
+        # Directories known to exist
+        self._dirs = set()
+        self._group_commit = group_commit
+        self._commit_interval = commit_interval
+        # Path -> data of the writes buffered by group commit
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._stop = threading.Event()
+        if group_commit:
+            threading.Thread(target=self._commit_loop, name="FileStoreCommit",
+                             daemon=True).start()
+            atexit.register(self.close)
 
     def read(self, config_path=None):
         if config_path is None:
@@ -45,37 +70,148 @@ class FileStore(Store):
             logger.error("config path can be either filepath or dict for filestore config operations")
 
     def put(self, value, key, pickled=True):
-        """ Dump value to given absolute file path"""
+        """ Dump value to given absolute file path, written on the next
+        commit with group commit"""
 
         absfilepath = key
+        try:
+            data = pickle.dumps(value) if pickled else value
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+        except Exception as gerr:
+            logger.warn("Error[{0}] while dumping data to file {1}"\
+                .format(gerr, absfilepath))
+            return
+
+        if self._group_commit:
+            with self._lock:
+                self._pending[absfilepath] = data
+            return
+        self._write_file(absfilepath, data, sync=False)
+
+    def put_many(self, items, pickled=True):
+        """ Dump the value of each file path, written on the next commit
+        with group commit
+        """
+        if self._group_commit:
+            for key, value in items.items():
+                self.put(value, key, pickled=pickled)
+            return True
+
+        written = []
+        for key, value in items.items():
+            data = pickle.dumps(value) if pickled else value
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            if self._write_file(key, data, sync=False):
+                written.append(key)
+        return len(written) == len(items)
+
+    def commit(self):
+        """ Writes the buffered writes, each file fsynced, then fsyncs
+        their directories once
+        """
+        with self._commit_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            written = [path for path, data in pending.items()
+                       if self._write_file(path, data, sync=True)]
+            self._sync_dirs(written)
+
+    def close(self):
+        """ Stops the group commit and commits the buffered writes
+        """
+        self._stop.set()
+        self.commit()
+
+    def _commit_loop(self):
+        while not self._stop.wait(self._commit_interval):
+            self.commit()
+
+    def _ensure_dir(self, directory_path):
+        """Creates the directory unless known to exist"""
+        if directory_path in self._dirs:
+            return
+        try:
+            os.makedirs(directory_path, exist_ok=True)
+            self._dirs.add(directory_path)
+        except OSError as exc:
+            if exc.errno == errno.EACCES:
+                logger.critical(f"Permission denied while creating dir: {directory_path}")
+            else:
+                logger.warn(f"{directory_path} creation failed with error {exc}, alerts \
+                may get missed on sspl restart or failover!!")
+
+    def _write_file(self, absfilepath, data, sync):
+        """Replaces the file by a temporary file holding the data, fsynced
+        first if sync. Returns True once written."""
         directory_path = os.path.join(os.path.dirname(absfilepath), "")
+        for attempt in range(2):
+            self._ensure_dir(directory_path)
+            try:
+                fd, tmppath = tempfile.mkstemp(
+                    dir=directory_path, suffix=self.TMP_SUFFIX,
+                    prefix="." + os.path.basename(absfilepath) + ".")
+            except FileNotFoundError:
+                # Removed since created
+                self._dirs.discard(directory_path)
+                continue
+            except Exception as gerr:
+                logger.warn("Error[{0}] while dumping data to file {1}"\
+                    .format(gerr, absfilepath))
+                return False
 
-        # If directory does not exists, create
-        if not os.path.isdir(directory_path):
             try:
-                os.makedirs(directory_path, exist_ok=True)
-            except OSError as exc:
-                if exc.errno == errno.EACCES:
-                    logger.critical(f"Permission denied while creating dir: {directory_path}")
-            except Exception as err:
-                    logger.warn(f"{directory_path} creation failed with error {err}, alerts \
-                    may get missed on sspl restart or failover!!")
+                with os.fdopen(fd, "wb") as fh:
+                    # mkstemp creates the file 0600, keep the mode the file
+                    # had or would have been created with
+                    os.fchmod(fh.fileno(), self._file_mode(absfilepath))
+                    fh.write(data)
+                    if sync:
+                        fh.flush()
+                        os.fsync(fh.fileno())
+                os.replace(tmppath, absfilepath)
+                return True
+            except IOError as err:
+                logger.warn("I/O error[{0}] while dumping data to file {1}): {2}"\
+                    .format(err.errno,absfilepath,err))
+            except Exception as gerr:
+                logger.warn("Error[{0}] while dumping data to file {1}"\
+                    .format(gerr, absfilepath))
+            try:
+                os.remove(tmppath)
+            except OSError:
+                pass
+            return False
+        return False
 
+    @staticmethod
+    def _file_mode(absfilepath):
+        """Returns the permissions of the file, those of a new file when
+        it does not exist"""
         try:
-            fh = open(absfilepath,"wb")
-            if pickled:
-                pickle.dump(value, fh)
-            else:
-                fh.write(value)
+            return os.stat(absfilepath).st_mode & 0o7777
+        except OSError:
+            return 0o666 & ~_UMASK
 
-        except IOError as err:
-            logger.warn("I/O error[{0}] while dumping data to file {1}): {2}"\
-                .format(err.errno,absfilepath,err))
-        except Exception as gerr:
-            logger.warn("Error[{0}] while dumping data to file {1}"\
-                .format(gerr, absfilepath))
-        else:
-            fh.close()
+    def _sync_dirs(self, paths):
+        """Flushes the directories of the files replaced to disk, once
+        each, for their renames to be durable"""
+        for directory_path in set(os.path.dirname(path) for path in paths):
+            try:
+                fd = os.open(directory_path or ".", os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError as err:
+                logger.warn("Error[{0}] while syncing dir {1}".format(err, directory_path))
+
+    def _pending_under(self, prefix):
+        with self._lock:
+            return any(path.startswith(prefix) for path in self._pending)
 
     def get(self, key, option=None):
         """
@@ -87,8 +223,19 @@ class FileStore(Store):
         if option:
             return self.config_parser.get(key, option)
         else:
+            with self._lock:
+                data = self._pending.get(key)
+            if data is not None:
+                return self._loads(data)
             return self._load_json_file(key)
 
+    @staticmethod
+    def _loads(data):
+        try:
+            return pickle.loads(data)
+        except Exception:
+            return data
+
     def items(self, section):
         """
         overridden from config parser to make look and feel like same
@@ -133,6 +280,9 @@ class FileStore(Store):
         """
         key_present = False
         status = "Failure"
+        with self._lock:
+            if key in self._pending:
+                return True, "Success"
         try:
             key_present = os.path.exists(key)
             status = "Success"
@@ -144,16 +294,52 @@ class FileStore(Store):
     def delete(self, key):
         """ delete a file
         """
-        if os.path.exists(key):
-            os.remove(key)
+        with self._commit_lock:
+            with self._lock:
+                self._pending.pop(key, None)
+            if os.path.exists(key):
+                os.remove(key)
 
     def get_keys_with_prefix(self, prefix):
         """ get keys with given prefix
         """
+        if self._pending_under(prefix):
+            self.commit()
         if not os.path.exists(prefix):
             return []
         else:
-            return os.listdir(prefix)
+            return [name for name in os.listdir(prefix)
+                    if not name.endswith(self.TMP_SUFFIX)]
+
+    def get_many(self, keys):
+        """ get data of the given files, None for the missing ones
+        """
+        with self._lock:
+            pending = {key: self._pending[key] for key in keys if key in self._pending}
+        values = {}
+        for key in keys:
+            if key in pending:
+                values[key] = self._loads(pending[key])
+            elif os.path.isfile(key):
+                values[key] = self._load_json_file(key)
+            else:
+                values[key] = None
+        return values
+
+    def get_all_with_prefix(self, prefix):
+        """ get file name to data of the files in given directory
+        """
+        if self._pending_under(prefix):
+            self.commit()
+        if not os.path.isdir(prefix):
+            return {}
+        values = {}
+        for name in os.listdir(prefix):
+            path = os.path.join(prefix, name)
+            if os.path.isfile(path) and not name.endswith(self.TMP_SUFFIX):
+                values[name] = self._load_json_file(path)
+        return values
+
 
 if __name__ == '__main__':
     store = FileStore()
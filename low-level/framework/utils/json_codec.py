@@ -0,0 +1,69 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       JSON encoding and decoding of the messages. The fastest
+                    backend available is picked at import time, orjson, else
+                    the standard json module. SSPL_JSON_BACKEND=json forces
+                    the standard module.
+ ****************************************************************************
+"""
+
+import json
+import os
+
+from framework.utils.service_logging import logger
+
+JSONDecodeError = json.JSONDecodeError
+
+BACKEND = "json"
+# Separators of the encoded output, for JSON assembled from parts
+ITEM_SEPARATOR = ", "
+KEY_SEPARATOR = ": "
+
+_orjson = None
+if os.getenv("SSPL_JSON_BACKEND", "orjson") == "orjson":
+    try:
+        import orjson as _orjson
+        BACKEND = "orjson"
+        ITEM_SEPARATOR = ","
+        KEY_SEPARATOR = ":"
+    except ImportError:
+        pass
+
+
+def dumps(obj, sort_keys=False):
+    """Returns obj encoded to a JSON string. With sort_keys the output is
+    the one of the standard json module, byte for byte."""
+    if _orjson is None or sort_keys:
+        return json.dumps(obj, sort_keys=sort_keys)
+    return dumps_bytes(obj).decode("utf-8")
+
+def dumps_bytes(obj, sort_keys=False):
+    """Returns obj encoded to UTF-8 JSON bytes"""
+    if _orjson is not None and not sort_keys:
+        try:
+            return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS)
+        except TypeError as err:
+            # Types orjson does not handle, such as integers beyond 64 bits
+            logger.debug(f"orjson could not encode the object, using json: {err}")
+    return json.dumps(obj, sort_keys=sort_keys).encode("utf-8")
+
+def loads(data):
+    """Decodes a JSON str, bytes or bytearray, raises JSONDecodeError"""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
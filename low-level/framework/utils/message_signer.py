@@ -0,0 +1,96 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Signs outgoing messages with libsspl_sec. The library
+                     is loaded and its buffers set up once, the session token
+                     is reused until shortly before it expires.
+ ****************************************************************************
+"""
+
+import ctypes
+import time
+
+from framework.utils.service_logging import logger
+
+try:
+    use_security_lib = True
+    SSPL_SEC = ctypes.cdll.LoadLibrary('libsspl_sec.so.0')
+    SSPL_SEC.sspl_get_token_length.restype = ctypes.c_uint
+    SSPL_SEC.sspl_get_sig_length.restype = ctypes.c_uint
+    SSPL_SEC.sspl_generate_session_token.restype = None
+    SSPL_SEC.sspl_sign_message.restype = None
+    TOKEN_LENGTH = SSPL_SEC.sspl_get_token_length()
+    SIG_LENGTH = SSPL_SEC.sspl_get_sig_length()
+except Exception:
+    logger.info("libsspl_sec not found, disabling authentication on egress msgs")
+    use_security_lib = False
+
+# Signature used when libsspl_sec is not available
+NO_SECURITY_LIB_SIGNATURE = "SecurityLibNotInstalled"
+
+
+class MessageSigner:
+    """Generates the signatures of one module's outgoing messages"""
+
+    # Secs before expiry at which the session token is renewed
+    RENEW_MARGIN = 60
+
+    def __init__(self, username, authn_token, expires):
+        self._username = username
+        self._authn_token = authn_token
+        self._session_length = int(expires)
+        self._token_renew_time = 0
+
+        if use_security_lib:
+            self._token = ctypes.create_string_buffer(TOKEN_LENGTH)
+            self._sig = ctypes.create_string_buffer(SIG_LENGTH)
+
+    def _get_token(self):
+        """Returns the session token, generating a new one when the current
+        one is about to expire"""
+        now = time.time()
+        if now >= self._token_renew_time:
+            SSPL_SEC.sspl_generate_session_token(
+                                self._username, len(self._authn_token) + 1,
+                                self._authn_token, self._session_length,
+                                self._token)
+            self._token_renew_time = now + max(
+                self._session_length - self.RENEW_MARGIN,
+                self._session_length / 2)
+        return self._token
+
+    def sign(self, message):
+        """Returns the raw signature of the message, None when libsspl_sec
+        is not installed"""
+        if not use_security_lib:
+            return None
+
+        return self._sign(message, self._get_token())
+
+    def sign_batch(self, messages):
+        """Returns the raw signatures of the messages, all signed with the
+        same session token"""
+        if not use_security_lib:
+            return [None] * len(messages)
+
+        token = self._get_token()
+        return [self._sign(message, token) for message in messages]
+
+    def _sign(self, message, token):
+        SSPL_SEC.sspl_sign_message(len(message) + 1, str(message),
+                                   self._username, token, self._sig)
+        return self._sig.raw
@@ -0,0 +1,454 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Persistent FIFO of messages kept in append-only segment
+                     files. Records are appended to the newest segment and
+                     read from the oldest one, through mmap once the segment
+                     is complete, a segment is deleted once drained. Writes
+                     are fsynced in groups and the index of the head is
+                     checkpointed along with them, the tail is recovered by
+                     scanning the segments. Evicted messages are recorded in
+                     a tombstone file and skipped.
+ ****************************************************************************
+"""
+
+import atexit
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+
+from framework.utils.service_logging import logger
+
+
+class SegmentLog(object):
+    """FIFO of messages stored in the segment files of a directory. Messages
+    are numbered from head to tail, a segment file is named after the number
+    of its first message. Use SegmentLog.open() to share one instance among
+    all the users of a directory."""
+
+    # Payload length, crc32 of the payload, flags, time and expiry time of
+    # a record, 0 when it does not expire
+    RECORD_HEADER = struct.Struct("<IIBII")
+    RAW     = 0
+    PICKLED = 1
+    FAULT   = 2
+
+    # Index of an evicted message
+    TOMBSTONE = struct.Struct("<Q")
+
+    SEGMENT_SUFFIX  = ".seg"
+    CHECKPOINT_FILE = "CHECKPOINT"
+    TOMBSTONES_FILE = "EVICTED"
+
+    # Size from which a new segment is started
+    SEGMENT_SIZE = 4 * 1024 * 1024
+    # Writes are fsynced every COMMIT_BATCH records or COMMIT_INTERVAL secs
+    COMMIT_BATCH    = 64
+    COMMIT_INTERVAL = 1.0
+
+    _logs = {}
+    _logs_lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path, **kwargs):
+        """Returns the log of the directory, opening it on first use"""
+        path = os.path.abspath(path)
+        with cls._logs_lock:
+            log = cls._logs.get(path)
+            if log is None:
+                log = cls._logs[path] = cls(path, **kwargs)
+            return log
+
+    def __init__(self, path, segment_size=SEGMENT_SIZE,
+                 commit_batch=COMMIT_BATCH, commit_interval=COMMIT_INTERVAL):
+        self._path = path
+        self._segment_size = segment_size
+        self._commit_batch = commit_batch
+        self._commit_interval = commit_interval
+        self._lock = threading.RLock()
+
+        # Numbers of the first message of each segment, oldest first
+        self._segments = deque()
+        self._writer = None
+        self._writer_size = 0
+        # Bytes of records written in each segment, tracked on append
+        self._segment_sizes = {}
+        self._map = None
+        self._map_base = None
+        # Records of the segment being written read from the read offset,
+        #  the segment is mapped once complete
+        self._reader = None
+        self._reader_base = None
+        self._buffer = b""
+        self._buffer_start = 0
+        self._read_offset = 0
+        # Indexes of the messages evicted but not read yet
+        self._evicted = set()
+        self._tombstones = None
+        # Index, size, fault flag, time and expiry of the messages found on open
+        self._entries = []
+
+        self.head = 0
+        self.tail = 0
+        # Bytes of the payloads between head and tail
+        self.current_size = 0
+
+        self._uncommitted = 0
+        self._checkpointed_head = None
+        self._last_commit = time.time()
+
+        os.makedirs(path, exist_ok=True)
+        self._recover()
+        atexit.register(self.close)
+
+    def is_empty(self):
+        return self.head >= self.tail
+
+    def entries(self):
+        """Returns the index, size, fault flag, time and expiry time of each
+        message found when the log was opened, once"""
+        entries, self._entries = self._entries, []
+        return entries
+
+    def append(self, item, pickled=False, fault=False, now=None, expires=0):
+        """Appends a message, bytes are stored as they are unless pickled.
+        Returns the size of the payload stored."""
+        if pickled or not isinstance(item, (bytes, bytearray, str)):
+            payload, flags = pickle.dumps(item), self.PICKLED
+        elif isinstance(item, str):
+            payload, flags = item.encode("utf-8"), self.RAW
+        else:
+            payload, flags = bytes(item), self.RAW
+        if fault:
+            flags |= self.FAULT
+        now = time.time() if now is None else now
+
+        record = self.RECORD_HEADER.pack(len(payload), zlib.crc32(payload),
+                                         flags, int(now), int(expires)) + payload
+        with self._lock:
+            if self._writer is None or self._writer_size >= self._segment_size:
+                self._roll()
+            self._writer.write(record)
+            self._writer.flush()
+            self._writer_size += len(record)
+            self._segment_sizes[self._segments[-1]] = self._writer_size
+            self.tail += 1
+            self.current_size += len(payload)
+            self._uncommitted += 1
+            self._maybe_commit()
+        return len(payload)
+
+    def evict(self, index, size):
+        """Removes the message of the given index and payload size, it is
+        skipped when read"""
+        with self._lock:
+            if index < self.head or index >= self.tail or index in self._evicted:
+                return
+            if self._tombstones is None:
+                self._tombstones = open(os.path.join(self._path, self.TOMBSTONES_FILE), "ab")
+            self._tombstones.write(self.TOMBSTONE.pack(index))
+            self._tombstones.flush()
+            self._evicted.add(index)
+            self.current_size -= size
+            self._uncommitted += 1
+            self._maybe_commit()
+
+    def pop(self):
+        """Removes and returns the oldest message, None when empty"""
+        popped = self._pop()
+        return popped[1] if popped is not None else None
+
+    def pop_batch(self, count):
+        """Removes up to count of the oldest messages, returns their index
+        and message"""
+        batch = []
+        with self._lock:
+            while len(batch) < count:
+                popped = self._pop()
+                if popped is None:
+                    break
+                batch.append(popped)
+        return batch
+
+    def _pop(self):
+        """Removes the oldest message, returns its index and the message or
+        None when empty"""
+        with self._lock:
+            while self._segments:
+                record = self._next_record()
+                if record is None:
+                    if len(self._segments) == 1:
+                        # Records lost to corruption are not waited for
+                        self.head = self.tail
+                        self.current_size = 0
+                        self._reset_segments()
+                        break
+                    self._drop_head_segment()
+                    continue
+
+                flags, payload = record
+                index = self.head
+                self.head += 1
+                if index in self._evicted:
+                    self._evicted.discard(index)
+                    if self.is_empty():
+                        self._reset_segments()
+                    continue
+                self.current_size -= len(payload)
+                if self.is_empty():
+                    self._reset_segments()
+                self._maybe_commit()
+                if flags & self.PICKLED:
+                    return index, pickle.loads(payload)
+                return index, payload
+            return None
+
+    def commit(self):
+        """fsyncs the records appended and checkpoints the head"""
+        with self._lock:
+            if self._writer is not None and self._uncommitted:
+                os.fsync(self._writer.fileno())
+            if self._tombstones is not None and self._uncommitted:
+                os.fsync(self._tombstones.fileno())
+            if self._checkpointed_head != self.head:
+                self._write_checkpoint()
+            self._uncommitted = 0
+            self._last_commit = time.time()
+
+    def close(self):
+        with self._lock:
+            self.commit()
+            self._close_map()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            if self._tombstones is not None:
+                self._tombstones.close()
+                self._tombstones = None
+
+    def _maybe_commit(self):
+        if self._uncommitted >= self._commit_batch or \
+           time.time() - self._last_commit >= self._commit_interval:
+            self.commit()
+
+    def _segment_path(self, base):
+        return os.path.join(self._path, "%020d%s" % (base, self.SEGMENT_SUFFIX))
+
+    def _roll(self):
+        """Starts a new segment at the tail"""
+        if self._writer is not None:
+            os.fsync(self._writer.fileno())
+            self._writer.close()
+        self._writer = open(self._segment_path(self.tail), "ab")
+        self._writer_size = 0
+        self._segments.append(self.tail)
+        self._segment_sizes[self.tail] = 0
+
+    def _next_record(self):
+        """Returns the flags and payload of the record at the read offset of
+        the head segment, None at its end"""
+        base = self._segments[0]
+        size = self._segment_sizes[base]
+        if self._read_offset + self.RECORD_HEADER.size > size:
+            return None
+        data, data_start = self._segment_data(base, size)
+
+        offset = self._read_offset - data_start
+        length, crc, flags, _, _ = self.RECORD_HEADER.unpack_from(data, offset)
+        start = offset + self.RECORD_HEADER.size
+        payload = data[start:start + length]
+        start += data_start
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            logger.error("SegmentLog, corrupted record in %s at offset %s, "
+                         "skipping the rest of the segment" %
+                         (self._segment_path(base), self._read_offset))
+            self._read_offset = size
+            return None
+        self._read_offset = start + length
+        return flags, payload
+
+    def _segment_data(self, base, size):
+        """Returns the data of the segment from the read offset up to size
+        and the offset the data starts at. A complete segment is mapped
+        once, the one being written is read from the read offset up to its
+        size and read again once it grew past it."""
+        if base != self._segments[-1] or self._writer is None:
+            if self._map_base != base:
+                self._close_map()
+                with open(self._segment_path(base), "rb") as fh:
+                    self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+                self._map_base = base
+            return self._map, 0
+
+        end = self._buffer_start + len(self._buffer)
+        if self._reader_base != base or self._read_offset < self._buffer_start or \
+           self._read_offset + self.RECORD_HEADER.size > end:
+            if self._reader_base != base:
+                self._close_map()
+                self._reader = os.open(self._segment_path(base), os.O_RDONLY)
+                self._reader_base = base
+            self._buffer = os.pread(self._reader, size - self._read_offset,
+                                    self._read_offset)
+            self._buffer_start = self._read_offset
+        else:
+            # The record may continue past the data read so far
+            length = self.RECORD_HEADER.unpack_from(
+                self._buffer, self._read_offset - self._buffer_start)[0]
+            if self._read_offset + self.RECORD_HEADER.size + length > end and end < size:
+                self._buffer = os.pread(self._reader, size - self._read_offset,
+                                        self._read_offset)
+                self._buffer_start = self._read_offset
+        return self._buffer, self._buffer_start
+
+    def _drop_head_segment(self):
+        """Deletes the drained head segment, a gap left by a corrupted
+        record is skipped"""
+        self._close_map()
+        base = self._segments.popleft()
+        self._segment_sizes.pop(base, None)
+        os.remove(self._segment_path(base))
+        self.head = max(self.head, self._segments[0])
+        self._read_offset = 0
+
+    def _reset_segments(self):
+        """Deletes all the segments once everything was read"""
+        self._close_map()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        while self._segments:
+            os.remove(self._segment_path(self._segments.popleft()))
+        self._segment_sizes.clear()
+        if self._tombstones is not None:
+            self._tombstones.close()
+            self._tombstones = None
+        tombstones_path = os.path.join(self._path, self.TOMBSTONES_FILE)
+        if os.path.exists(tombstones_path):
+            os.remove(tombstones_path)
+        self._evicted.clear()
+        self._read_offset = 0
+        self._uncommitted = 0
+
+    def _close_map(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._map_base = None
+        if self._reader is not None:
+            os.close(self._reader)
+            self._reader = None
+            self._reader_base = None
+            self._buffer = b""
+            self._buffer_start = 0
+
+    def _write_checkpoint(self):
+        path = os.path.join(self._path, self.CHECKPOINT_FILE)
+        with open(path + ".tmp", "w") as fh:
+            fh.write(str(self.head))
+        os.replace(path + ".tmp", path)
+        self._checkpointed_head = self.head
+
+    def _read_checkpoint(self):
+        try:
+            with open(os.path.join(self._path, self.CHECKPOINT_FILE)) as fh:
+                return int(fh.read())
+        except (IOError, ValueError):
+            return None
+
+    def _read_tombstones(self):
+        try:
+            with open(os.path.join(self._path, self.TOMBSTONES_FILE), "rb") as fh:
+                data = fh.read()
+        except IOError:
+            return set()
+        size = self.TOMBSTONE.size
+        return set(self.TOMBSTONE.unpack_from(data, offset)[0]
+                   for offset in range(0, len(data) - size + 1, size))
+
+    def _recover(self):
+        """Rebuilds the index from the checkpointed head, the tombstones and
+        the records found in the segments, a torn record at the end of a
+        segment is truncated. Messages read after the last checkpoint are
+        read again.
+        """
+        bases = sorted(int(name[:-len(self.SEGMENT_SUFFIX)])
+                       for name in os.listdir(self._path)
+                       if name.endswith(self.SEGMENT_SUFFIX))
+        head = self._read_checkpoint()
+        if bases and (head is None or head < bases[0]):
+            head = bases[0]
+        head = head or 0
+        tail = head
+        evicted = self._read_tombstones()
+
+        for base in bases:
+            path = self._segment_path(base)
+            if not self._segments and head < base:
+                # Skip the gap left by a corrupted record
+                head = base
+            with open(path, "rb") as fh:
+                data = fh.read()
+
+            index, offset, size = base, 0, 0
+            read_offset = None
+            while offset + self.RECORD_HEADER.size <= len(data):
+                length, crc, flags, created, expires = \
+                    self.RECORD_HEADER.unpack_from(data, offset)
+                start = offset + self.RECORD_HEADER.size
+                if start + length > len(data) or \
+                   zlib.crc32(data[start:start + length]) != crc:
+                    break
+                if index == head:
+                    read_offset = offset
+                if index >= head and index in evicted:
+                    self._evicted.add(index)
+                elif index >= head:
+                    size += length
+                    self._entries.append((index, length, bool(flags & self.FAULT),
+                                          created, expires))
+                index += 1
+                offset = start + length
+
+            if offset < len(data):
+                logger.warning("SegmentLog, truncating torn record in %s at "
+                               "offset %s" % (path, offset))
+                with open(path, "r+b") as fh:
+                    fh.truncate(offset)
+
+            if index <= head and base != bases[-1]:
+                os.remove(path)
+                continue
+            if not self._segments:
+                self._read_offset = offset if read_offset is None else read_offset
+            self._segments.append(base)
+            self._segment_sizes[base] = offset
+            self.current_size += size
+            tail = max(tail, index)
+
+        self.head = min(head, tail)
+        self.tail = tail
+        self._checkpointed_head = self.head
+        if self._segments:
+            self._writer = open(self._segment_path(self._segments[-1]), "ab")
+            self._writer_size = self._writer.tell()
+        if self.is_empty():
+            self._reset_segments()
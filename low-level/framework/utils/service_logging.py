@@ -19,7 +19,11 @@
  ****************************************************************************
 """
 
+import atexit
 import logging.handlers
+import queue
+import sys
+import threading
 import time
 import os
 
@@ -38,6 +42,13 @@ MAX_SYSLOG_CONNECT_ATTEMPTS = 120
 RECONNECT_DELAY_INTERVAL_SECONDS = 1
 SYSLOG_IDENTIFIER = "sspl"
 
+# Records buffered for the background syslog writer, 0 logs synchronously
+ASYNC_LOG_QUEUE_SIZE = 10000
+# Records written to syslog per wakeup of the background writer
+ASYNC_LOG_BATCH_SIZE = 100
+# Secs to wait for the queued records to be written on shutdown
+ASYNC_LOG_FLUSH_TIMEOUT = 5
+
 LOG_CRITICAL = "CRITICAL"
 LOG_ERROR = "ERROR"
 LOG_WARNING = "WARNING"
@@ -57,8 +68,112 @@ LOGLEVEL_NAME_TO_LEVEL_DICT = {
 }
 
 
-def init_logging(dcs_service_name, log_level=LOG_INFO, syslog_host="localhost", syslog_port=514):
-    """Initialize logging to log to syslog"""
+class AsyncLogHandler(logging.handlers.QueueHandler):
+    """
+    Hands the log records over to a single background thread writing them
+    to the target handler, so that logging never blocks on a slow or
+    restarting syslog. The queue is bounded, records logged while it is
+    full are counted as dropped and reported once there is room again.
+    """
+
+    def __init__(self, target, maxsize=ASYNC_LOG_QUEUE_SIZE,
+                 batch_size=ASYNC_LOG_BATCH_SIZE):
+        super(AsyncLogHandler, self).__init__(queue.Queue(maxsize))
+        self.target = target
+        self.batch_size = batch_size
+        # Records dropped, counted by every logging thread
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._reported_dropped = 0
+        self._writer = threading.Thread(target=self._write_records,
+                                        name="AsyncLogHandler", daemon=True)
+        self._writer.start()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def _write_records(self):
+        """Writes the queued records in batches until closed"""
+        while True:
+            batch = [self.queue.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            closed = None in batch
+            self.target.acquire()
+            try:
+                for record in batch:
+                    if record is not None:
+                        self.target.emit(record)
+                self._report_dropped()
+            finally:
+                self.target.release()
+                for _ in batch:
+                    self.queue.task_done()
+            if closed:
+                return
+
+    def _report_dropped(self):
+        with self._dropped_lock:
+            dropped = self.dropped
+        if dropped != self._reported_dropped:
+            record = logging.LogRecord(
+                _logger.name, logging.WARNING, __file__, 0,
+                "AsyncLogHandler, %d log records dropped, log queue full",
+                (dropped - self._reported_dropped,), None)
+            self.target.emit(record)
+            self._reported_dropped = dropped
+
+    def flush(self):
+        """Waits for the queued records to be written"""
+        if not self._writer.is_alive():
+            return
+        # queue.join() bounded by the flush timeout
+        deadline = time.time() + ASYNC_LOG_FLUSH_TIMEOUT
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self.queue.all_tasks_done.wait(remaining)
+        self.target.flush()
+
+    def close(self):
+        """Writes the queued records and stops the background writer"""
+        if self._writer.is_alive():
+            try:
+                self.queue.put(None, timeout=ASYNC_LOG_FLUSH_TIMEOUT)
+            except queue.Full:
+                pass
+            self._writer.join(ASYNC_LOG_FLUSH_TIMEOUT)
+        self.target.flush()
+        super(AsyncLogHandler, self).close()
+
+
+def shutdown_logging():
+    """Flushes the queued log records and switches the logger back to
+    writing to syslog synchronously"""
+    for handler in list(_logger.handlers):
+        if isinstance(handler, AsyncLogHandler):
+            handler.close()
+            _logger.removeHandler(handler)
+            _logger.addHandler(handler.target)
+
+
+atexit.register(shutdown_logging)
+
+
+def init_logging(dcs_service_name, log_level=LOG_INFO, syslog_host="localhost", syslog_port=514,
+                 async_queue_size=ASYNC_LOG_QUEUE_SIZE):
+    """Initialize logging to log to syslog, through a background writer
+    unless async_queue_size is 0"""
 
     warning_message = None
     if log_level not in list(LOGLEVEL_NAME_TO_LEVEL_DICT.keys()):
@@ -88,6 +203,8 @@ def init_logging(dcs_service_name, log_level=LOG_INFO, syslog_host="localhost",
             else:
                 print("Warning: Unable to connect to syslog for logging")
                 break
+    if handler is not None and async_queue_size > 0:
+        handler = AsyncLogHandler(handler, async_queue_size)
     _logger.addHandler(handler)
     _logger.info(f"Logging has been initialized for sspl {dcs_service_name} \
                   service after {num_attempts} attempts to level {log_level}")
@@ -140,5 +257,58 @@ class Logger:
 # Make use of python logger
 logger = _logger
 
+
+class Deferred(object):
+    """Log message argument computed only when the message is formatted,
+    e.g. Deferred(json.dumps, msg, sort_keys=True)"""
+
+    __slots__ = ("_func", "_args", "_kwargs")
+
+    def __init__(self, func, *args, **kwargs):
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+
+    def __str__(self):
+        return str(self._func(*self._args, **self._kwargs))
+
+    def __repr__(self):
+        return repr(self._func(*self._args, **self._kwargs))
+
+
+class LazyLogger(object):
+    """
+    Logging facade for the hot paths. The level is checked before anything
+    is done and the %-style arguments, including Deferred ones, are only
+    formatted into the message when it is emitted. Records carry the file
+    and line of the caller, caller_depth skips wrappers like
+    Debug._log_debug.
+    """
+
+    def __init__(self, _logger):
+        self._logger = _logger
+
+    def is_enabled_for(self, level):
+        return self._logger.isEnabledFor(level)
+
+    def debug(self, msg, *args, caller_depth=0):
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, msg, args, caller_depth)
+
+    def info(self, msg, *args, caller_depth=0):
+        if self._logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, msg, args, caller_depth)
+
+    def _log(self, level, msg, args, caller_depth):
+        frame = sys._getframe(caller_depth + 2)
+        record = self._logger.makeRecord(self._logger.name, level,
+                                         frame.f_code.co_filename,
+                                         frame.f_lineno, msg, args, None,
+                                         frame.f_code.co_name)
+        self._logger.handle(record)
+
+
+lazy_logger = LazyLogger(_logger)
+
 # TODO: Instead of python logger, make use of this custom logger class and
 # which should also solve problem of line no and file name
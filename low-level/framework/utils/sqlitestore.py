@@ -0,0 +1,236 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Store keeping every key in one embedded SQLite database
+                     in WAL mode. Keys are indexed by their parent path so
+                     the keys of a directory are read with a single query,
+                     batches of writes are committed in one transaction.
+ ****************************************************************************
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from framework.utils.store import Store
+from framework.utils.service_logging import logger
+
+
+class SQLiteStore(Store):
+    """Store on a SQLite database shared by the threads of the process.
+    Values are pickled as by the other stores, those written unpickled are
+    returned as they were written when they do not unpickle."""
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS kv ("
+        " key TEXT PRIMARY KEY,"
+        " parent TEXT NOT NULL,"
+        " name TEXT NOT NULL,"
+        " value BLOB) WITHOUT ROWID",
+        "CREATE INDEX IF NOT EXISTS kv_parent ON kv (parent, name)",
+    )
+
+    def __init__(self, path):
+        super(SQLiteStore, self).__init__()
+        self._path = path
+        self._lock = threading.RLock()
+        # Depth of the transaction() blocks entered
+        self._depth = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self._db.execute(statement)
+
+    @staticmethod
+    def _split(key):
+        """Returns the parent path, with its trailing '/', and name of a key"""
+        parent, _, name = key.rpartition("/")
+        return (parent + "/" if parent or key.startswith("/") else ""), name
+
+    @staticmethod
+    def _dir(prefix):
+        return prefix if not prefix or prefix.endswith("/") else prefix + "/"
+
+    @staticmethod
+    def _encode(value, pickled):
+        if pickled:
+            return pickle.dumps(value)
+        if isinstance(value, str):
+            return value.encode("utf-8")
+        return bytes(value)
+
+    @staticmethod
+    def _decode(value):
+        if value is None:
+            return None
+        try:
+            return pickle.loads(value)
+        except Exception:
+            return bytes(value)
+
+    @contextmanager
+    def transaction(self):
+        """Commits the writes made within the block in one transaction,
+        rolled back if the block raises. Blocks may be nested."""
+        with self._lock:
+            if self._depth == 0:
+                self._db.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._db.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._db.execute("COMMIT")
+
+    def _write(self, statement, rows, error_msg):
+        try:
+            with self.transaction():
+                self._db.executemany(statement, rows)
+            return True
+        except sqlite3.Error as err:
+            logger.warn("SQLite error[{0}] {1}".format(err, error_msg))
+            return False
+
+    def _read(self, statement, args, error_msg):
+        try:
+            with self._lock:
+                return self._db.execute(statement, args).fetchall()
+        except sqlite3.Error as err:
+            logger.warn("SQLite error[{0}] {1}".format(err, error_msg))
+            return None
+
+    def put(self, value, key, pickled=True):
+        """ write data to given key"""
+        self.put_many({key: value}, pickled=pickled)
+
+    def put_many(self, items, pickled=True):
+        """ write the data of each key in one transaction
+        """
+        rows = [(key,) + self._split(key) + (self._encode(value, pickled),)
+                for key, value in items.items()]
+        return self._write("INSERT OR REPLACE INTO kv (key, parent, name, value) "
+                           "VALUES (?, ?, ?, ?)", rows,
+                           "while writing {0} keys".format(len(rows)))
+
+    def get(self, key):
+        """ Load data from given key"""
+        rows = self._read("SELECT value FROM kv WHERE key = ?", (key,),
+                          "while reading {0}".format(key))
+        return self._decode(rows[0][0]) if rows else None
+
+    def get_many(self, keys):
+        """ get key to data of the given keys, None for the missing ones
+        """
+        values = dict.fromkeys(keys)
+        keys = list(values)
+        # Below the default limit of 999 parameters of a statement
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self._read("SELECT key, value FROM kv WHERE key IN (%s)" %
+                              ",".join("?" * len(chunk)), chunk,
+                              "while reading {0} keys".format(len(chunk)))
+            if rows is None:
+                return None
+            for key, value in rows:
+                values[key] = self._decode(value)
+        return values
+
+    def exists(self, key):
+        """check if key exists
+        """
+        rows = self._read("SELECT 1 FROM kv WHERE key = ?", (key,),
+                          "while checking {0}".format(key))
+        if rows is None:
+            return False, "Failure"
+        return bool(rows), "Success"
+
+    def delete(self, key):
+        """ delete a key
+        """
+        self.delete_many([key])
+
+    def delete_many(self, keys):
+        """ delete the keys in one transaction
+        """
+        return self._write("DELETE FROM kv WHERE key = ?",
+                           [(key,) for key in keys],
+                           "while deleting {0} keys".format(len(keys)))
+
+    def get_keys_with_prefix(self, prefix):
+        """ get names of the keys and subdirectories in given directory,
+        as listed by FileStore
+        """
+        prefix = self._dir(prefix)
+        names = []
+        for key, _ in self.get_range(prefix, self._prefix_end(prefix), values=False):
+            name = key[len(prefix):].split("/", 1)[0]
+            if not names or names[-1] != name:
+                names.append(name)
+        return names
+
+    def get_all_with_prefix(self, prefix):
+        """ get name to data of the keys right under given directory, read
+        with one indexed query
+        """
+        rows = self._read("SELECT name, value FROM kv WHERE parent = ?",
+                          (self._dir(prefix),),
+                          "while reading {0}".format(prefix))
+        return {name: self._decode(value) for name, value in rows or []}
+
+    def get_range(self, start, end=None, values=True):
+        """ get the keys from start up to end excluded, in key order, with
+        their data unless values is False
+        """
+        column = "value" if values else "NULL"
+        if end is None:
+            rows = self._read("SELECT key, %s FROM kv WHERE key >= ? "
+                              "ORDER BY key" % column, (start,),
+                              "while reading from {0}".format(start))
+        else:
+            rows = self._read("SELECT key, %s FROM kv WHERE key >= ? AND key < ? "
+                              "ORDER BY key" % column, (start, end),
+                              "while reading {0} to {1}".format(start, end))
+        return [(key, self._decode(value)) for key, value in rows or []]
+
+    def delete_prefix(self, prefix):
+        """ delete the keys under given prefix in one query
+        """
+        return self._write("DELETE FROM kv WHERE key >= ? AND key < ?",
+                           [(prefix, self._prefix_end(prefix))],
+                           "while deleting {0}".format(prefix))
+
+    @staticmethod
+    def _prefix_end(prefix):
+        """Returns the smallest key greater than every key under prefix"""
+        return prefix[:-1] + chr(ord(prefix[-1]) + 1) if prefix else "\U0010ffff"
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -60,3 +60,28 @@ class Store(object):
         """ get keys with given prefix
         """
         raise NotImplementedError("sub class should implement this")
+
+    @abc.abstractmethod
+    def get_all_with_prefix(self, prefix):
+        """ get name to value of the keys right under given prefix
+        """
+        raise NotImplementedError("sub class should implement this")
+
+    def get_many(self, keys):
+        """ get key to data of the given keys, None for the missing ones
+        """
+        return {key: self.get(key) for key in keys}
+
+    def put_many(self, items, pickled=True):
+        """ write the data of each key
+        """
+        for key, value in items.items():
+            self.put(value, key, pickled=pickled)
+        return True
+
+    def delete_many(self, keys):
+        """ delete the keys
+        """
+        for key in keys:
+            self.delete(key)
+        return True
@@ -17,29 +17,48 @@ import os
 import sys
 from configparser import ConfigParser
 
+from framework.utils.cached_store import CachedStore
 from framework.utils.filestore import FileStore
 from framework.utils.consulstore import ConsulStore
-from framework.base.sspl_constants import StoreTypes, SSPL_STORE_TYPE, CONSUL_HOST, CONSUL_PORT, file_store_config_path
+from framework.utils.sqlitestore import SQLiteStore
+from framework.base.sspl_constants import StoreTypes, SSPL_STORE_TYPE, CONSUL_HOST, CONSUL_PORT, file_store_config_path, \
+    SQLITE_STORE_PATH
 
 
 class StorFactory:
 
     __store = None
 
+    # Keys of the DATASTORE section configuring the cache of the store
+    CACHE_SIZE           = 'cache_size'
+    CACHE_TTL            = 'cache_ttl'
+    CACHE_NEGATIVE_TTL   = 'cache_negative_ttl'
+    CACHE_WRITE_BEHIND   = 'cache_write_behind'
+    CACHE_BYPASS         = 'cache_bypass'
+    CACHE_FLUSH_INTERVAL = 'cache_flush_interval'
+
+    # Keys of the DATASTORE section configuring the file store
+    FILE_STORE_GROUP_COMMIT    = 'file_store_group_commit'
+    FILE_STORE_COMMIT_INTERVAL = 'file_store_commit_interval'
+
     @staticmethod
     def get_store():
         if StorFactory.__store == None:
             try:
                 store_type = os.getenv('SSPL_STORE_TYPE', SSPL_STORE_TYPE)
                 if store_type == StoreTypes.FILE.value:
-                    StorFactory.__store = FileStore()
+                    StorFactory.__store = StorFactory._file_store()
                 elif store_type == StoreTypes.CONSUL.value:
                     host = os.getenv('CONSUL_HOST', CONSUL_HOST)
                     port = os.getenv('CONSUL_PORT', CONSUL_PORT)
                     StorFactory.__store = ConsulStore(host, port)
+                elif store_type == StoreTypes.SQLITE.value:
+                    path = os.getenv('SQLITE_STORE_PATH', SQLITE_STORE_PATH)
+                    StorFactory.__store = SQLiteStore(path)
                 else:
                     raise Exception("{} type store is not supported".format(store_type))
 
+                StorFactory.__store = StorFactory._cached(StorFactory.__store)
                 return StorFactory.__store
             except Exception as serror:
                 print("Error in connecting either with file or consul store: {}".format(serror))
@@ -47,6 +66,51 @@ class StorFactory:
                 sys.exit(os.EX_USAGE)
         return StorFactory.__store
 
+    @staticmethod
+    def _file_store():
+        """Returns a FileStore, committing its writes in groups every
+        file_store_commit_interval seconds when file_store_group_commit
+        is set"""
+        try:
+            from framework.utils.conf_utils import DATASTORE, SSPL_CONF, Conf
+            group_commit = Conf.get(SSPL_CONF, f"{DATASTORE}>{StorFactory.FILE_STORE_GROUP_COMMIT}", False)
+            commit_interval = float(Conf.get(SSPL_CONF, f"{DATASTORE}>{StorFactory.FILE_STORE_COMMIT_INTERVAL}", 1))
+        except Exception as err:
+            print("File store group commit disabled, error reading its configuration: {}".format(err))
+            return FileStore()
+
+        if isinstance(group_commit, str):
+            group_commit = group_commit.lower() == "true"
+        if not group_commit:
+            return FileStore()
+        return FileStore(group_commit=True, commit_interval=commit_interval)
+
+    @staticmethod
+    def _cached(store):
+        """Wraps the store in a CachedStore of cache_size entries, the store
+        is used as it is when cache_size is 0 or sspl.conf can not be read"""
+        try:
+            from framework.utils.conf_utils import DATASTORE, SSPL_CONF, Conf
+            max_entries = int(Conf.get(SSPL_CONF, f"{DATASTORE}>{StorFactory.CACHE_SIZE}", 0))
+            if max_entries <= 0:
+                return store
+            ttl = int(Conf.get(SSPL_CONF, f"{DATASTORE}>{StorFactory.CACHE_TTL}", 60))
+            negative_ttl = int(Conf.get(SSPL_CONF, f"{DATASTORE}>{StorFactory.CACHE_NEGATIVE_TTL}", 10))
+            write_behind = Conf.get(SSPL_CONF, f"{DATASTORE}>{StorFactory.CACHE_WRITE_BEHIND}", []) or []
+            bypass = Conf.get(SSPL_CONF, f"{DATASTORE}>{StorFactory.CACHE_BYPASS}", []) or []
+            flush_interval = int(Conf.get(SSPL_CONF, f"{DATASTORE}>{StorFactory.CACHE_FLUSH_INTERVAL}", 5))
+        except Exception as err:
+            print("Store cache disabled, error reading its configuration: {}".format(err))
+            return store
+
+        if isinstance(write_behind, str):
+            write_behind = [write_behind]
+        if isinstance(bypass, str):
+            bypass = [bypass]
+        return CachedStore(store, max_entries, ttl=ttl, negative_ttl=negative_ttl,
+                           write_behind=write_behind, bypass=bypass,
+                           flush_interval=flush_interval)
+
 file_store=FileStore()
 #store based on configuration
 store=StorFactory.get_store()
@@ -19,101 +19,509 @@
   ****************************************************************************
  """
 
+import heapq
 import os
-import sys
+import pickle
+import threading
+import time
+from collections import deque
 
 from framework.base.sspl_constants import DATA_PATH
 from framework.utils.conf_utils import SSPL_CONF, Conf
 from framework.utils.config_reader import ConfigReader
+from framework.utils.segment_log import SegmentLog
 from framework.utils.service_logging import logger
 from framework.utils.store_factory import store
+from framework.utils import json_codec
 
 
-class StoreQueue:
+def sizeof_payload(item, pickled=False):
+    """Returns the size in bytes of a message as it is stored, bytes and
+    text as they are unless pickled, anything else pickled"""
+    if not pickled:
+        if isinstance(item, (bytes, bytearray)):
+            return len(item)
+        if isinstance(item, str):
+            return len(item.encode("utf-8"))
+    return len(pickle.dumps(item))
 
-    RABBITMQPROCESSOR    = 'RABBITMQEGRESSPROCESSOR'
-    LIMIT_CONSUL_MEMORY  = 'limit_consul_memory'
-    CACHE_DIR_NAME       = "SSPL_UNSENT_MESSAGES"
 
-    def __init__(self):
-        self._max_size = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.LIMIT_CONSUL_MEMORY}", 50000000))
+class KeyValueQueue:
+    """Queue keeping each message under its own key of the store, along
+    with the head and tail indexes and memory usage. Those are cached once
+    read and written through to the store, in one batch with the messages
+    written or removed. The size of each message is kept so that the
+    memory usage is decreased by the bytes stored for it."""
 
-        self.cache_dir_path = os.path.join(DATA_PATH, self.CACHE_DIR_NAME)
-        self.SSPL_MEMORY_USAGE = os.path.join(self.cache_dir_path, 'SSPL_MEMORY_USAGE')
+    MEMORY_USAGE_KEY = 'SSPL_MEMORY_USAGE'
+    HEAD_INDEX_KEY   = 'SSPL_MESSAGE_HEAD_INDEX'
+    TAIL_INDEX_KEY   = 'SSPL_MESSAGE_TAIL_INDEX'
+    MESSAGES_KEY     = 'MESSAGES'
+
+    def __init__(self, cache_dir_path):
+        self.SSPL_MEMORY_USAGE = os.path.join(cache_dir_path, self.MEMORY_USAGE_KEY)
         self._current_size = store.get(self.SSPL_MEMORY_USAGE)
         if self._current_size is None:
-            store.put(0, self.SSPL_MEMORY_USAGE)
+            self.current_size = 0
 
-        self.SSPL_MESSAGE_HEAD_INDEX = os.path.join(self.cache_dir_path, 'SSPL_MESSAGE_HEAD_INDEX')
+        self.SSPL_MESSAGE_HEAD_INDEX = os.path.join(cache_dir_path, self.HEAD_INDEX_KEY)
         self._head = store.get(self.SSPL_MESSAGE_HEAD_INDEX)
         if self._head is None:
-            store.put(0, self.SSPL_MESSAGE_HEAD_INDEX)
+            self.head = 0
 
-        self.SSPL_MESSAGE_TAIL_INDEX = os.path.join(self.cache_dir_path, 'SSPL_MESSAGE_TAIL_INDEX')
+        self.SSPL_MESSAGE_TAIL_INDEX = os.path.join(cache_dir_path, self.TAIL_INDEX_KEY)
         self._tail = store.get(self.SSPL_MESSAGE_TAIL_INDEX)
         if self._tail is None:
-            store.put(0, self.SSPL_MESSAGE_TAIL_INDEX)
-        self.SSPL_UNSENT_MESSAGES = os.path.join(self.cache_dir_path, 'MESSAGES')
+            self.tail = 0
+        self.SSPL_UNSENT_MESSAGES = os.path.join(cache_dir_path, self.MESSAGES_KEY)
+        # Bytes stored for each message by index
+        self._sizes = {}
+
+    @classmethod
+    def has_messages(cls, cache_dir_path):
+        """Returns True when messages are left in the store, without
+        creating the queue's keys"""
+        head = store.get(os.path.join(cache_dir_path, cls.HEAD_INDEX_KEY))
+        tail = store.get(os.path.join(cache_dir_path, cls.TAIL_INDEX_KEY))
+        return head is not None and tail is not None and head < tail
 
     @property
     def current_size(self):
-        return store.get(self.SSPL_MEMORY_USAGE)
+        return self._current_size
 
     @current_size.setter
     def current_size(self, size):
+        self._current_size = size
         store.put(size, self.SSPL_MEMORY_USAGE)
 
     @property
     def head(self):
-        return store.get(self.SSPL_MESSAGE_HEAD_INDEX)
+        return self._head
 
     @head.setter
     def head(self, index):
+        self._head = index
         store.put(index, self.SSPL_MESSAGE_HEAD_INDEX)
 
     @property
     def tail(self):
-        return store.get(self.SSPL_MESSAGE_TAIL_INDEX)
+        return self._tail
 
     @tail.setter
     def tail(self, index):
+        self._tail = index
         store.put(index, self.SSPL_MESSAGE_TAIL_INDEX)
 
     def is_empty(self):
         if self.tail == self.head:
-            self.head = 0
-            self.tail = 0
-            self.current_size = 0
+            if self.head != 0:
+                self._head = self._tail = self._current_size = 0
+                self._save_indexes(head=True, tail=True)
             return True
         else:
             return False
 
-    def is_full(self, size_of_item):
-        return (self.current_size + size_of_item) >= self._max_size
+    def _save_indexes(self, head=False, tail=False, items=None, pickled=True):
+        """Writes the memory usage, the indexes asked for and the given
+        messages in one batch"""
+        values = {self.SSPL_MEMORY_USAGE: self._current_size}
+        if head:
+            values[self.SSPL_MESSAGE_HEAD_INDEX] = self._head
+        if tail:
+            values[self.SSPL_MESSAGE_TAIL_INDEX] = self._tail
+        if not pickled:
+            values = {key: pickle.dumps(value) for key, value in values.items()}
+        values.update(items or {})
+        store.put_many(values, pickled=pickled)
+
+    def entries(self, describe):
+        """Returns the index, size, fault flag, time and expiry time of each
+        message in the store. Only the messages are kept in the store, their
+        time is taken as now and describe(item) returns the fault flag and
+        expiry time. The memory usage is reset to the size of the messages
+        found."""
+        now = time.time()
+        entries = []
+        keys = [f"{self.SSPL_UNSENT_MESSAGES}/{index}"
+                for index in range(self.head, self.tail)]
+        items = store.get_many(keys) or {}
+        for index, key in enumerate(keys, self.head):
+            item = items.get(key)
+            if item is not None:
+                fault, expires = describe(item)
+                self._sizes[index] = sizeof_payload(item)
+                entries.append((index, self._sizes[index], fault, now, expires))
+        size = sum(self._sizes.values())
+        if size != self._current_size:
+            self.current_size = size
+        return entries
+
+    def pop(self):
+        """Removes and returns the oldest message, None when it was evicted"""
+        item = store.get(f"{self.SSPL_UNSENT_MESSAGES}/{self.head}")
+        if item is not None:
+            store.delete(f"{self.SSPL_UNSENT_MESSAGES}/{self.head}")
+            self.current_size -= self._size_of(self.head, item)
+        self.head += 1
+        return item
+
+    def pop_batch(self, count):
+        """Removes up to count of the oldest messages, returns their index
+        and message, None for the evicted ones. The indexes and memory usage
+        are written once for the batch."""
+        indexes = range(self.head, min(self.tail, self.head + count))
+        keys = [f"{self.SSPL_UNSENT_MESSAGES}/{index}" for index in indexes]
+        if not keys:
+            return []
+        items = store.get_many(keys)
+        if items is None:
+            return []
+
+        found = [key for key in keys if items.get(key) is not None]
+        if found:
+            store.delete_many(found)
+        self._head = indexes[-1] + 1
+        for index, key in zip(indexes, keys):
+            if items.get(key) is not None:
+                self._current_size -= self._size_of(index, items[key])
+        self._save_indexes(head=True)
+        return [(index, items.get(key)) for index, key in zip(indexes, keys)]
+
+    def append(self, item, pickled=False, fault=False, now=None, expires=0):
+        """Appends a message, bytes and text are stored as they are unless
+        pickled. Returns the size of its payload. Its fault flag, time and
+        expiry time are not stored."""
+        pickled = pickled or not isinstance(item, (bytes, bytearray, str))
+        size = sizeof_payload(item, pickled)
+        key = f"{self.SSPL_UNSENT_MESSAGES}/{self._tail}"
+        self._sizes[self._tail] = size
+        self._tail += 1
+        self._current_size += size
+        self._save_indexes(tail=True, items={key: item}, pickled=pickled)
+        return size
+
+    def evict(self, index, size):
+        """Removes the message of the given index and payload size"""
+        store.delete(f"{self.SSPL_UNSENT_MESSAGES}/{index}")
+        self._sizes.pop(index, None)
+        self.current_size -= size
+
+    def _size_of(self, index, item):
+        """Returns the bytes stored for the message, forgetting them"""
+        size = self._sizes.pop(index, None)
+        return sizeof_payload(item) if size is None else size
+
+
+class RetentionIndex:
+    """Time and size of the queued messages by index, kept in a telemetry
+    lane and a fault lane, both ordered oldest first, giving the message to
+    evict: an expired message first, then the oldest telemetry message,
+    then the oldest fault. Without severity all the messages go in one lane
+    and the oldest is evicted. The messages with an expiry time of their
+    own, the actuator responses, are also kept in a heap by expiry time.
+
+    Removed messages are only dropped from the index, the lanes and the
+    heap skip them once they reach their head, so that each operation
+    takes constant time on average."""
+
+    TELEMETRY = 0
+    FAULT     = 1
+
+    # The expiring heap is rebuilt once it holds this many times more
+    #  entries than there are messages in it
+    COMPACT_RATIO = 4
+
+    def __init__(self, ttl=0, severity=True):
+        self._ttl = ttl
+        self._severity = severity
+        # Time, size and expiry time of each message by index
+        self._entries = {}
+        self._lanes = (deque(), deque())
+        # Heap of the (expires, index) of the messages which expire
+        self._expiring = []
+        self._expiring_count = 0
+        # Messages dropped once expired and evicted for space
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, index, size, fault, created, expires=0):
+        lane = self.FAULT if fault and self._severity else self.TELEMETRY
+        self._lanes[lane].append(index)
+        self._entries[index] = (created, size, expires)
+        if expires > 0:
+            heapq.heappush(self._expiring, (expires, index))
+            self._expiring_count += 1
+
+    def remove(self, index):
+        """Removes the message, returns its time, size and expiry time or
+        None when it is not indexed"""
+        entry = self._entries.pop(index, None)
+        if entry is None:
+            return None
+        if entry[2] > 0:
+            self._expiring_count -= 1
+            if len(self._expiring) > self.COMPACT_RATIO * (self._expiring_count + 1):
+                self._compact_expiring()
+        return entry
+
+    def discard_before(self, index):
+        """Removes the messages below the given index, read or lost"""
+        for msgs in self._lanes:
+            while msgs and msgs[0] < index:
+                self.remove(msgs.popleft())
+
+    def is_expired(self, created, expires, now):
+        return (self._ttl > 0 and now - created >= self._ttl) or \
+            0 < expires <= now
+
+    def victim(self, now):
+        """Returns the index of the next message to evict, None when the
+        index is empty"""
+        heads = [self._head(msgs) for msgs in self._lanes]
+        heads = [index for index in heads if index is not None]
+        if not heads:
+            return None
+        if self._ttl > 0:
+            oldest = min(heads, key=lambda index: self._entries[index][0])
+            if now - self._entries[oldest][0] >= self._ttl:
+                return oldest
+        while self._expiring and self._expiring[0][1] not in self._entries:
+            heapq.heappop(self._expiring)
+        if self._expiring and self._expiring[0][0] <= now:
+            return self._expiring[0][1]
+        return heads[0]
+
+    def _head(self, msgs):
+        """Returns the oldest message of the lane still indexed, dropping
+        the removed ones before it"""
+        while msgs and msgs[0] not in self._entries:
+            msgs.popleft()
+        return msgs[0] if msgs else None
+
+    def _compact_expiring(self):
+        """Drops the removed messages from the expiring heap"""
+        self._expiring = [(expires, index) for expires, index in self._expiring
+                          if index in self._entries]
+        heapq.heapify(self._expiring)
+
+
+class StoreQueue:
+    """Persistent queue of messages, kept either in the store, one key per
+    message, or in the segment files of a SegmentLog as selected by
+    store_queue_backend. The queue of a directory is shared by all its
+    StoreQueue instances.
+
+    Messages are sized by their serialized payload. Once the queue would
+    grow over limit_consul_memory bytes messages are evicted by the
+    store_queue_eviction_policy:
+        severity - expired messages first, then telemetry, then faults,
+                   oldest first within each
+        oldest   - expired messages, then the oldest
+    Messages older than store_queue_message_ttl secs expire, 0 keeps them
+    until evicted, actuator responses expire ACTUATOR_RESPONSE_TIMEOUT secs
+    after their event_time. The messages are parsed once when put and
+    expired messages are dropped by time when read.
+    """
+
+    RABBITMQPROCESSOR    = 'RABBITMQEGRESSPROCESSOR'
+    LIMIT_CONSUL_MEMORY  = 'limit_consul_memory'
+    STORE_QUEUE_BACKEND  = 'store_queue_backend'
+    EVICTION_POLICY      = 'store_queue_eviction_policy'
+    MESSAGE_TTL          = 'store_queue_message_ttl'
+    CACHE_DIR_NAME       = "SSPL_UNSENT_MESSAGES"
+    SEGMENTS_DIR_NAME    = "SEGMENTS"
+
+    STORE_BACKEND   = "store"
+    SEGMENT_BACKEND = "segment"
+
+    SEVERITY_POLICY = "severity"
+    OLDEST_POLICY   = "oldest"
+
+    # Alerts retained over telemetry by the severity policy
+    FAULT_ALERT_TYPES = ("fault", "fault_resolved", "missing", "insertion")
+    FAULT_SEVERITIES  = ("critical", "error")
+    # 300 seconds for 5 mins
+    ACTUATOR_RESPONSE_TIMEOUT = 300
+
+    _queues = {}
+    _queues_lock = threading.Lock()
 
-    def _create_space(self, size_of_item, reclaimed_space=0):
-        if (self.current_size - reclaimed_space + size_of_item) >= self._max_size:
-            reclaimed_space += sys.getsizeof(self.get())
-            self._create_space(size_of_item, reclaimed_space)
+    def __init__(self, cache_dir_name=CACHE_DIR_NAME):
+        self._max_size = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.LIMIT_CONSUL_MEMORY}", 50000000))
+
+        self.cache_dir_path = os.path.join(DATA_PATH, cache_dir_name)
+        with StoreQueue._queues_lock:
+            shared = StoreQueue._queues.get(self.cache_dir_path)
+            if shared is None:
+                shared = self._open_queue()
+                StoreQueue._queues[self.cache_dir_path] = shared
+        self._queue, self._retention, self._lock = shared
+
+    def _open_queue(self):
+        """Opens the queue of the cache directory and indexes the messages
+        left in it"""
+        backend = Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.STORE_QUEUE_BACKEND}",
+                           self.STORE_BACKEND)
+        policy = Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.EVICTION_POLICY}",
+                          self.SEVERITY_POLICY)
+        ttl = int(Conf.get(SSPL_CONF, f"{self.RABBITMQPROCESSOR}>{self.MESSAGE_TTL}", 0))
+        retention = RetentionIndex(ttl, policy == self.SEVERITY_POLICY)
+
+        if backend == self.SEGMENT_BACKEND:
+            queue = SegmentLog.open(
+                os.path.join(self.cache_dir_path, self.SEGMENTS_DIR_NAME))
+            entries = queue.entries()
         else:
+            queue = KeyValueQueue(self.cache_dir_path)
+            entries = queue.entries(self._describe)
+        for entry in entries:
+            retention.add(*entry)
+
+        shared = (queue, retention, threading.RLock())
+        if backend == self.SEGMENT_BACKEND:
+            self._migrate_store_messages(*shared)
+        return shared
+
+    def _migrate_store_messages(self, queue, retention, lock):
+        """Moves the messages left in the store by the store backend into
+        the segment log"""
+        if not KeyValueQueue.has_messages(self.cache_dir_path):
             return
 
+        old_queue = KeyValueQueue(self.cache_dir_path)
+        moved = 0
+        while not old_queue.is_empty():
+            item = old_queue.pop()
+            if item is not None:
+                fault, expires = self._describe(item)
+                now = time.time()
+                size = queue.append(item, fault=fault, now=now, expires=expires)
+                retention.add(queue.tail - 1, size, fault, now, expires)
+                moved += 1
+        logger.info("StoreQueue, moved %s messages from the store to %s" %
+                    (moved, self.cache_dir_path))
+
+    @classmethod
+    def _describe(cls, item):
+        """Returns the fault flag and expiry time of a message. Fault alerts
+        and anything which is neither a sensor message nor an actuator
+        response are retained over telemetry, only actuator responses
+        expire."""
+        try:
+            if isinstance(item, (bytes, bytearray, str)):
+                item = json_codec.loads(item)
+            message = item.get("message", {})
+            sensor_response = message.get("sensor_response_type")
+            actuator_response = message.get("actuator_response_type")
+        except Exception:
+            return True, 0
+
+        expires = 0
+        if isinstance(actuator_response, dict):
+            try:
+                event_time = actuator_response["info"]["event_time"]
+                expires = int(event_time) + cls.ACTUATOR_RESPONSE_TIMEOUT
+            except (KeyError, TypeError, ValueError):
+                pass
+            return False, expires
+        if not isinstance(sensor_response, dict):
+            return True, expires
+        fault = sensor_response.get("alert_type") in cls.FAULT_ALERT_TYPES or \
+            str(sensor_response.get("severity")).lower() in cls.FAULT_SEVERITIES
+        return fault, expires
+
+    @property
+    def current_size(self):
+        return self._queue.current_size
+
+    @property
+    def head(self):
+        return self._queue.head
+
+    @property
+    def tail(self):
+        return self._queue.tail
+
+    def is_empty(self):
+        with self._lock:
+            return self._queue.is_empty()
+
+    def backlog(self):
+        """Returns the number of messages queued"""
+        return len(self._retention)
+
+    def stats(self):
+        """Returns the size of the queue and the messages dropped from it"""
+        with self._lock:
+            return {
+                "backlog": len(self._retention),
+                "bytes": self.current_size,
+                "expired": self._retention.expired,
+                "evicted": self._retention.evicted,
+            }
+
+    def is_full(self, size_of_item):
+        return (self.current_size + size_of_item) > self._max_size
+
+    def _create_space(self, size_of_item):
+        """Evicts messages until the item fits, one index lookup each"""
+        now = time.time()
+        evicted = 0
+        while self.is_full(size_of_item):
+            index = self._retention.victim(now)
+            if index is None:
+                break
+            _, size, _ = self._retention.remove(index)
+            self._queue.evict(index, size)
+            self._retention.evicted += 1
+            evicted += 1
+        logger.debug("StoreQueue, put, memory usage limit reached, evicted %s "
+                     "messages" % evicted)
+
     def get(self):
-        if self.is_empty():
+        """Returns the oldest message, None when the queue is empty"""
+        batch = self.get_batch(1)
+        return batch[0] if batch else None
+
+    def get_batch(self, count):
+        """Removes and returns up to count of the oldest messages, dropping
+        the expired ones by their stored time"""
+        batch = []
+        with self._lock:
+            now = time.time()
+            while len(batch) < count and not self._queue.is_empty():
+                popped = self._queue.pop_batch(count - len(batch))
+                if not popped:
+                    break
+                for index, item in popped:
+                    entry = self._retention.remove(index)
+                    if item is None:
+                        continue
+                    if entry is not None and \
+                       self._retention.is_expired(entry[0], entry[2], now):
+                        self._retention.expired += 1
+                        continue
+                    batch.append(item)
+                # Messages lost to a corrupted segment are not read
+                self._retention.discard_before(self._queue.head)
+        return batch
+
+    def put(self, item, pickled=False):
+        size_of_item = sizeof_payload(item, pickled)
+        if size_of_item > self._max_size:
+            logger.error("StoreQueue, put, message of %s bytes exceeds the %s "
+                         "bytes limit, dropping it" % (size_of_item, self._max_size))
             return
-        item = store.get(f"{self.SSPL_UNSENT_MESSAGES}/{self.head}")
-        store.delete(f"{self.SSPL_UNSENT_MESSAGES}/{self.head}")
-        self.head += 1
-        self.current_size -= sys.getsizeof(item)
-        return item
 
-    def put(self, item):
-        size_of_item = sys.getsizeof(item)
-        if self.is_full(size_of_item):
-            logger.debug("StoreQueue, put, consul memory usage exceded limit, \
-                removing old message")
-            self._create_space(size_of_item)
-        store.put(item, f"{self.SSPL_UNSENT_MESSAGES}/{self.tail}", pickled=False)
-        self.tail += 1
-        self.current_size += size_of_item
+        fault, expires = self._describe(item)
+        with self._lock:
+            if self.is_full(size_of_item):
+                self._create_space(size_of_item)
+            now = time.time()
+            size = self._queue.append(item, pickled=pickled, fault=fault,
+                                      now=now, expires=expires)
+            self._retention.add(self._queue.tail - 1, size, fault, now, expires)
         logger.debug("StoreQueue, put, current memory usage %s" % self.current_size)
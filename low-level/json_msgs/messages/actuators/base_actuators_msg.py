@@ -20,14 +20,8 @@
  ****************************************************************************
 """
 
-import os
-import json
-from jsonschema import Draft3Validator
-from jsonschema import validate
-
 from json_msgs.messages.base_msg import BaseMsg
-from json_msgs.schemas import actuators
-from framework.base.sspl_constants import RESOURCE_PATH
+from json_msgs.schemas.registry import ACTUATORS, schema_registry
 
 class BaseActuatorMsg(BaseMsg):
     '''
@@ -40,20 +34,16 @@ class BaseActuatorMsg(BaseMsg):
 
 
     def __init__(self):
-        """Reads in the json schema for all actuator response messages"""
+        """The actuator response schema is compiled once by the registry"""
         super(BaseActuatorMsg, self).__init__()
 
-        # Read in the schema for validating messages
-        fileName = os.path.join(RESOURCE_PATH + '/actuators',
-                                self.JSON_ACTUATOR_SCHEMA)
-        with open(fileName, 'r') as f:
-            self._schema = json.load(f)
-
-        # Validate the schema
-        Draft3Validator.check_schema(self._schema)
+    @property
+    def _schema(self):
+        return schema_registry.get_schema(ACTUATORS, self.JSON_ACTUATOR_SCHEMA)
 
     def validateMsg(self, _jsonMsg):
-        """Validate the json message against the schema"""
+        """Validate the json message against the schema, as often as the
+        validation policy of the registry asks for"""
         _jsonMsg = self.normalize_kv(_jsonMsg)
-        validate(_jsonMsg, self._schema)
+        schema_registry.validate_trusted(ACTUATORS, self.JSON_ACTUATOR_SCHEMA, _jsonMsg)
         return _jsonMsg
@@ -22,6 +22,42 @@
 
 import abc
 
+from framework.base.msg_envelope import MsgEnvelope
+
+
+class NormalizedDict(dict):
+    """Dict whose keys, nested ones included, are already normalized"""
+    __slots__ = ()
+
+
+class NormalizedList(list):
+    """List whose items are already normalized"""
+    __slots__ = ()
+
+
+def normalize_kv(item):
+    """Normalize all keys coming from firmware from - to _ and "N/A" values
+    to "NA". Sections already normalized are returned as they are, so that
+    data normalized once when it is read is not walked again."""
+    if isinstance(item, str):
+        return "NA" if item == "N/A" else item
+    elif isinstance(item, (NormalizedDict, NormalizedList)):
+        return item
+    elif isinstance(item, dict):
+        normalized = NormalizedDict()
+        for key, value in item.items():
+            # Most values are strings, normalized without recursing
+            if type(value) is str:
+                normalized[key.replace("-", "_")] = "NA" if value == "N/A" else value
+            else:
+                normalized[key.replace("-", "_")] = normalize_kv(value)
+        return normalized
+    elif isinstance(item, list):
+        return NormalizedList(map(normalize_kv, item))
+    else:
+        return item
+
+
 class BaseMsg(metaclass=abc.ABCMeta):
     '''
     The base class for all JSON messages transmitted by SSPL-LL
@@ -39,13 +75,11 @@ class BaseMsg(metaclass=abc.ABCMeta):
     def getJson(self):
         raise NotImplementedError("Subclasses should implement this!")
 
+    def getEnvelope(self):
+        """Return the validated message in a MsgEnvelope to pass it to
+        another module without serializing it to JSON"""
+        return MsgEnvelope(self.validateMsg(self._json))
+
     def normalize_kv(self, item):
         """Normalize all keys coming from firmware from - to _"""
-        if isinstance(item, dict):
-            return {key.replace("-", "_"): self.normalize_kv(value) for key, value in item.items()}
-        elif isinstance(item, list):
-            return [self.normalize_kv(_) for _ in item]
-        elif item == "N/A":
-            return "NA"
-        else:
-            return item
+        return normalize_kv(item)
@@ -0,0 +1,130 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Builds the sensor response messages of a message class
+                    with its static parts precomputed once per process: the
+                    title, description and header are serialized up front,
+                    the host and its site, rack, node and cluster ids are
+                    read once, only the response is normalized and
+                    serialized for each message.
+ ****************************************************************************
+"""
+
+import socket
+import threading
+
+from framework.base.msg_envelope import MsgEnvelope
+from framework.utils import json_codec
+from json_msgs.messages.base_msg import NormalizedDict, normalize_kv
+from framework.utils.service_logging import logger
+from json_msgs.schemas.registry import SENSORS, schema_registry
+
+
+class MsgBuilder(object):
+    """Builder of the messages of one BaseSensorMsg subclass, returning
+    MsgEnvelopes whose "message" section is already serialized"""
+
+    RESPONSE_TYPE = "sensor_response_type"
+
+    # Keys of the info section of the enclosure alerts, the ids of the node
+    #  followed by the ones of the alert
+    NODE_ID_KEYS = ("site_id", "rack_id", "node_id", "cluster_id")
+    ALERT_INFO_KEYS = NODE_ID_KEYS + ("resource_type", "event_time", "resource_id")
+
+    _builders = {}
+    _lock = threading.Lock()
+    # Host name and ids of the node, read once per process
+    _node = None
+
+    @classmethod
+    def node(cls):
+        """Returns the host name and the site, rack, node and cluster ids
+        of the node, read once. Defaults to the ids used by the sensors
+        when sspl.conf can not be read."""
+        if cls._node is None:
+            ids = {"site_id": "DC01", "rack_id": "RC01", "node_id": "SN01",
+                   "cluster_id": "CC01"}
+            try:
+                from framework.utils.conf_utils import (CLUSTER, CLUSTER_ID,
+                    GLOBAL_CONF, NODE_ID, RACK_ID, SITE_ID, SRVNODE, Conf)
+                for key, conf_key in ((SITE_ID, f"{CLUSTER}>{SRVNODE}>{SITE_ID}"),
+                                      (RACK_ID, f"{CLUSTER}>{SRVNODE}>{RACK_ID}"),
+                                      (NODE_ID, f"{CLUSTER}>{SRVNODE}>{NODE_ID}"),
+                                      (CLUSTER_ID, f"{CLUSTER}>{CLUSTER_ID}")):
+                    ids[key] = Conf.get(GLOBAL_CONF, conf_key, ids[key])
+            except Exception as err:
+                logger.warning(f"MsgBuilder, using the default node ids, error reading them: {err}")
+            cls._node = (socket.gethostname(), normalize_kv(ids))
+        return cls._node
+
+    @classmethod
+    def for_class(cls, msg_class):
+        """Returns the builder of the message class, created once"""
+        builder = cls._builders.get(msg_class)
+        if builder is None:
+            with cls._lock:
+                builder = cls._builders.setdefault(msg_class, cls(msg_class))
+        return builder
+
+    def __init__(self, msg_class):
+        self.msg_class = msg_class
+        self._schema_name = msg_class.JSON_SENSOR_SCHEMA
+        self._title = msg_class.TITLE
+        self._description = msg_class.DESCRIPTION
+        self._header = NormalizedDict((
+            ("schema_version", msg_class.SCHEMA_VERSION),
+            ("sspl_version", msg_class.SSPL_VERSION),
+            ("msg_version", msg_class.MESSAGE_VERSION)))
+        self._message_prefix = "{%s%s%s%s%s%s" % (
+            json_codec.dumps("sspl_ll_msg_header"), json_codec.KEY_SEPARATOR,
+            json_codec.dumps(self._header), json_codec.ITEM_SEPARATOR,
+            json_codec.dumps(self.RESPONSE_TYPE), json_codec.KEY_SEPARATOR)
+
+    def build(self, response, username="SSPL-LL", signature="N/A",
+              time="N/A", expires=-1):
+        """Returns the message holding the sensor response, validated as
+        the registry policy asks for"""
+        response = normalize_kv(response)
+        msg = {"title": self._title,
+               "description": self._description,
+               "username": normalize_kv(username),
+               "signature": normalize_kv(signature),
+               "time": normalize_kv(time),
+               "expires": expires,
+               "message": NormalizedDict((
+                   ("sspl_ll_msg_header", self._header),
+                   (self.RESPONSE_TYPE, response)))}
+        schema_registry.validate_trusted(SENSORS, self._schema_name, msg)
+        return MsgEnvelope.prepared(
+            msg, {"message": self._message_prefix + json_codec.dumps(response) + "}"})
+
+    def build_alert(self, alert_type, alert_id, severity, info,
+                    specific_info, host_id=None, **kwargs):
+        """Returns the message of an enclosure alert, laid out as by the
+        RealStor*DataMsg classes. The host and node ids are the ones of
+        this node, read once, unless host_id is given."""
+        host_name, node_ids = self.node()
+        alert_info = NormalizedDict(node_ids)
+        for key in self.ALERT_INFO_KEYS[len(self.NODE_ID_KEYS):]:
+            alert_info[key] = normalize_kv(info.get(key))
+        return self.build({
+            "host_id": host_id or host_name,
+            "alert_type": alert_type,
+            "alert_id": alert_id,
+            "severity": severity,
+            "info": alert_info,
+            "specific_info": specific_info}, **kwargs)
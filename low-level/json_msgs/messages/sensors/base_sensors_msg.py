@@ -20,14 +20,8 @@
  ****************************************************************************
 """
 
-import os
-import json
-from jsonschema import Draft3Validator
-from jsonschema import validate
-
 from json_msgs.messages.base_msg import BaseMsg
-from json_msgs.schemas import sensors
-from framework.base.sspl_constants import RESOURCE_PATH
+from json_msgs.schemas.registry import SENSORS, schema_registry
 
 class BaseSensorMsg(BaseMsg):
     '''
@@ -40,23 +34,16 @@ class BaseSensorMsg(BaseMsg):
 
 
     def __init__(self):
-        """Reads in the json schema for all sensor response messages"""
+        """The sensor response schema is compiled once by the registry"""
         super(BaseSensorMsg, self).__init__()
 
-        # Read in the sensor schema for validating messages
-        fileName = os.path.join(RESOURCE_PATH + '/sensors',
-                                self.JSON_SENSOR_SCHEMA)
-        with open(fileName, 'r') as f:
-            _schema = f.read()
-
-        # Remove tabs and newlines
-        self._schema = json.loads(' '.join(_schema.split()))
-
-        # Validate the schema
-        Draft3Validator.check_schema(self._schema)
+    @property
+    def _schema(self):
+        return schema_registry.get_schema(SENSORS, self.JSON_SENSOR_SCHEMA)
 
     def validateMsg(self, _jsonMsg):
-        """Validate the json message against the schema"""
+        """Validate the json message against the schema, as often as the
+        validation policy of the registry asks for"""
         _jsonMsg = self.normalize_kv(_jsonMsg)
-        validate(_jsonMsg, self._schema)
+        schema_registry.validate_trusted(SENSORS, self.JSON_SENSOR_SCHEMA, _jsonMsg)
         return _jsonMsg
@@ -0,0 +1,135 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Process wide registry of the message json schemas. Each
+                    schema is read, checked and compiled into a validator
+                    once, messages built by SSPL can be validated according
+                    to a sampling or debug only policy.
+ ****************************************************************************
+"""
+
+import itertools
+import json
+import logging
+import os
+import threading
+
+from jsonschema.validators import Draft3Validator, validator_for
+
+from framework.base.sspl_constants import RESOURCE_PATH
+from framework.utils.service_logging import logger
+
+SENSORS   = "sensors"
+ACTUATORS = "actuators"
+
+
+class SchemaRegistry(object):
+    """Validators of the schemas under resource_path/<kind>/<name>"""
+
+    # Policies validating the messages built by SSPL
+    ALWAYS = "always"
+    SAMPLE = "sample"
+    DEBUG  = "debug"
+    POLICIES = (ALWAYS, SAMPLE, DEBUG)
+
+    DEFAULT_SAMPLE_RATE = 100
+
+    def __init__(self, resource_path=RESOURCE_PATH, policy=None,
+                 sample_rate=DEFAULT_SAMPLE_RATE):
+        """Policy and sample_rate are read from sspl.conf when policy is
+        None"""
+        self.resource_path = resource_path
+        self._policy = policy
+        self._sample_rate = max(sample_rate, 1)
+        self._validators = {}
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+
+    def get_schema(self, kind, name):
+        return self.get_validator(kind, name).schema
+
+    def get_validator(self, kind, name):
+        """Returns the validator of the schema, compiled on first use"""
+        validator = self._validators.get((kind, name))
+        if validator is None:
+            with self._lock:
+                validator = self._validators.get((kind, name))
+                if validator is None:
+                    validator = self._compile(os.path.join(self.resource_path, kind, name))
+                    self._validators[(kind, name)] = validator
+        return validator
+
+    def validate(self, kind, name, msg):
+        """Validates the message, raises jsonschema.ValidationError"""
+        self.get_validator(kind, name).validate(msg)
+
+    def validate_trusted(self, kind, name, msg):
+        """Validates a message built by SSPL when the policy asks for it,
+        returns True when validated"""
+        if not self.should_validate():
+            return False
+        self.validate(kind, name, msg)
+        return True
+
+    def should_validate(self):
+        if self._policy is None:
+            self._load_policy()
+        if self._policy == self.SAMPLE:
+            return next(self._counter) % self._sample_rate == 0
+        if self._policy == self.DEBUG:
+            return logger.isEnabledFor(logging.DEBUG)
+        return True
+
+    def set_policy(self, policy, sample_rate=DEFAULT_SAMPLE_RATE):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Invalid validation policy: {policy}")
+        self._sample_rate = max(sample_rate, 1)
+        self._policy = policy
+
+    def _compile(self, schema_file):
+        with open(schema_file, 'r') as f:
+            schema = json.load(f)
+
+        # Validate the schema to conform to its draft, Draft 3 by default
+        cls = validator_for(schema, default=Draft3Validator)
+        cls.check_schema(schema)
+        return cls(schema)
+
+    def _load_policy(self):
+        """Reads the policy from sspl.conf, validating every message when
+        it can not be read"""
+        policy, sample_rate = self.ALWAYS, self.DEFAULT_SAMPLE_RATE
+        try:
+            from framework.utils.conf_utils import (MESSAGE_VALIDATION,
+                MESSAGE_VALIDATION_SAMPLE_RATE, SSPL_CONF, SSPL_LL_SETTING, Conf)
+            policy = Conf.get(SSPL_CONF, f"{SSPL_LL_SETTING}>{MESSAGE_VALIDATION}",
+                              self.ALWAYS)
+            sample_rate = int(Conf.get(SSPL_CONF,
+                f"{SSPL_LL_SETTING}>{MESSAGE_VALIDATION_SAMPLE_RATE}",
+                self.DEFAULT_SAMPLE_RATE))
+        except Exception as err:
+            logger.warning(f"Validating every message, error reading the validation policy: {err}")
+
+        if policy not in self.POLICIES:
+            logger.warning(f"Invalid message_validation '{policy}', validating every message")
+            policy = self.ALWAYS
+        self._sample_rate = max(sample_rate, 1)
+        self._policy = policy
+
+
+# Registry shared by all the messages of the process
+schema_registry = SchemaRegistry()
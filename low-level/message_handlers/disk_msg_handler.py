@@ -19,7 +19,6 @@
  ****************************************************************************
 """
 
-import json
 import os
 import socket
 import subprocess
@@ -27,10 +26,12 @@ import time
 
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.base.module_thread import ScheduledModuleThread
+from framework.base.msg_envelope import MsgEnvelope
 from framework.rabbitmq.rabbitmq_egress_processor import \
     RabbitMQegressProcessor
 from framework.utils.conf_utils import SSPL_CONF, Conf
 from framework.utils.service_logging import logger
+from framework.utils import json_codec
 from json_msgs.messages.actuators.ack_response import AckResponseMsg
 from json_msgs.messages.sensors.drive_mngr import DriveMngrMsg
 from json_msgs.messages.sensors.expander_reset import ExpanderResetMsg
@@ -45,6 +46,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "DiskMsgHandler"
     PRIORITY    = 2
+    WAKE_ON_MSGQ = True
 
     # Section and keys in configuration file
     DISKMSGHANDLER    = MODULE_NAME.upper()
@@ -134,12 +136,8 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
         self._log_debug("Start accepting requests")
 
         try:
-            # Block on message queue until it contains an entry
-            jsonMsg, _ = self._read_my_msgQ()
-            if jsonMsg is not None:
-                self._process_msg(jsonMsg)
-
-            # Keep processing until the message queue is empty
+            # Process messages until the queue is empty, the scheduler runs
+            #  this module as soon as a new message is placed on the queue
             while not self._is_my_msgQ_empty():
                 jsonMsg, _ = self._read_my_msgQ()
                 if jsonMsg is not None:
@@ -149,7 +147,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Log it and restart the whole process when a failure occurs
             logger.exception(f"DiskMsgHandler restarting: {ae}")
 
-        self._scheduler.enter(1, self._priority, self.run, ())
+        self._scheduler.enter(self.MSGQ_IDLE_INTERVAL, self._priority, self.run, ())
         self._log_debug("Finished processing successfully")
 
     def _process_msg(self, jsonMsg):
@@ -157,7 +155,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
         self._log_debug(f"_process_msg, jsonMsg: {jsonMsg}")
 
         if isinstance(jsonMsg, dict) is False:
-            jsonMsg = json.loads(jsonMsg)
+            jsonMsg = json_codec.loads(jsonMsg)
 
         # Handle sensor response type messages that update the drive's state
         if jsonMsg.get("sensor_response_type") is not None:
@@ -238,7 +236,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
                         request = f"SMART_TEST: {drive.getSerialNumber()}"
 
-                        json_msg = AckResponseMsg(request, response, uuid).getJson()
+                        json_msg = AckResponseMsg(request, response, uuid).getEnvelope()
                         self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
                     return
@@ -254,7 +252,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
                     self._log_debug("_processMsg, disk smart test data not yet available")
                     response = "Error: SMART results not yet available for drive, please try again later."
 
-                json_msg = AckResponseMsg(node_request, response, uuid).getJson()
+                json_msg = AckResponseMsg(node_request, response, uuid).getEnvelope()
                 self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
             elif sensor_request_type == "drvmngr_status":
@@ -264,7 +262,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
                         drive = self._drvmngr_drives[serial_number]
 
                         # Obtain json message containing all relevant data
-                        internal_json_msg = drive.toDriveMngrJsonMsg(uuid=uuid).getJson()
+                        internal_json_msg = drive.toDriveMngrJsonMsg(uuid=uuid).getEnvelope()
 
                         # Send the json message to the RabbitMQ processor to transmit out
                         self._log_debug(f"_process_msg, internal_json_msg: {internal_json_msg}")
@@ -272,7 +270,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
                     # Send over a msg on the ACK channel notifying success
                     response = "All Drive manager data sent successfully"
-                    json_msg = AckResponseMsg(node_request, response, uuid).getJson()
+                    json_msg = AckResponseMsg(node_request, response, uuid).getEnvelope()
                     self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
                 elif serial_number == "serialize":
@@ -282,7 +280,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 elif self._drvmngr_drives.get(serial_number) is not None:
                     drive = self._drvmngr_drives[serial_number]
                     # Obtain json message containing all relevant data
-                    internal_json_msg = drive.toDriveMngrJsonMsg(uuid=uuid).getJson()
+                    internal_json_msg = drive.toDriveMngrJsonMsg(uuid=uuid).getEnvelope()
 
                     # Send the json message to the RabbitMQ processor to transmit out
                     self._log_debug(f"_process_msg, internal_json_msg: {internal_json_msg}")
@@ -290,13 +288,13 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
                     # Send over a msg on the ACK channel notifying success
                     response = "Drive manager data sent successfully"
-                    json_msg = AckResponseMsg(node_request, response, uuid).getJson()
+                    json_msg = AckResponseMsg(node_request, response, uuid).getEnvelope()
                     self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
                 else:
                     # Send over a msg on the ACK channel notifying failure
                     response = "Drive not found in drive manager data"
-                    json_msg = AckResponseMsg(node_request, response, uuid).getJson()
+                    json_msg = AckResponseMsg(node_request, response, uuid).getEnvelope()
                     self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
             elif sensor_request_type == "hpi_status":
@@ -306,7 +304,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
                         drive = self._hpi_drives[serial_number]
 
                         # Obtain json message containing all relevant data
-                        internal_json_msg = drive.toHPIjsonMsg(uuid=uuid).getJson()
+                        internal_json_msg = drive.toHPIjsonMsg(uuid=uuid).getEnvelope()
 
                         # Send the json message to the RabbitMQ processor to transmit out
                         self._log_debug(f"_process_msg, internal_json_msg: {internal_json_msg}")
@@ -314,7 +312,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
                     # Send over a msg on the ACK channel notifying success
                     response = "All HPI data sent successfully"
-                    json_msg = AckResponseMsg(node_request, response, uuid).getJson()
+                    json_msg = AckResponseMsg(node_request, response, uuid).getEnvelope()
                     self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
                 elif serial_number == "serialize":
@@ -324,7 +322,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 elif self._hpi_drives.get(serial_number) is not None:
                     drive = self._hpi_drives[serial_number]
                     # Obtain json message containing all relevant data
-                    internal_json_msg = drive.toHPIjsonMsg(uuid=uuid).getJson()
+                    internal_json_msg = drive.toHPIjsonMsg(uuid=uuid).getEnvelope()
 
                     # Send the json message to the RabbitMQ processor to transmit out
                     self._log_debug(f"_process_msg, internal_json_msg: {internal_json_msg}")
@@ -332,13 +330,13 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
                     # Send over a msg on the ACK channel notifying success
                     response = "HPI data sent successfully"
-                    json_msg = AckResponseMsg(node_request, response, uuid).getJson()
+                    json_msg = AckResponseMsg(node_request, response, uuid).getEnvelope()
                     self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
                 else:
                     # Send over a msg on the ACK channel notifying failure
                     response = "Drive not found in HPI data"
-                    json_msg = AckResponseMsg(node_request, response, uuid).getJson()
+                    json_msg = AckResponseMsg(node_request, response, uuid).getEnvelope()
                     self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
             elif sensor_request_type == "sim_event":
@@ -365,14 +363,14 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
             # Send over a msg on the ACK channel notifying failure
             response = f"DiskMsgHandler, received unknown msg: {jsonMsg}"
-            json_msg = AckResponseMsg(node_request, response, uuid).getJson()
+            json_msg = AckResponseMsg(node_request, response, uuid).getEnvelope()
             self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
     def _sim_exp_reset(self, serial_number):
         """Handle simulating an expander reset"""
         # Send the expander reset message
         expanderResetMsg = ExpanderResetMsg()
-        internal_json_msg = expanderResetMsg.getJson()
+        internal_json_msg = expanderResetMsg.getEnvelope()
 
         # Send the json message to the RabbitMQ processor to transmit out
         self._write_internal_msgQ(RabbitMQegressProcessor.name(), internal_json_msg)
@@ -384,7 +382,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Obtain json message containing all relevant data
             json_msg = drive.toDriveMngrJsonMsg()
             json_msg.setStatus("EMPTY_None")
-            internal_json_msg = json_msg.getJson()
+            internal_json_msg = json_msg.getEnvelope()
 
             # Send the json message to the RabbitMQ processor to transmit out
             self._write_internal_msgQ(RabbitMQegressProcessor.name(), internal_json_msg)
@@ -396,7 +394,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Obtain json message containing all relevant data
             json_msg = drive.toDriveMngrJsonMsg()
             json_msg.setStatus("OK_None")
-            internal_json_msg = json_msg.getJson()
+            internal_json_msg = json_msg.getEnvelope()
 
             # Send the json message to the RabbitMQ processor to transmit out
             self._write_internal_msgQ(RabbitMQegressProcessor.name(), internal_json_msg)
@@ -409,7 +407,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Obtain json message containing all relevant data
             json_msg = drive.toDriveMngrJsonMsg()
             json_msg.setStatus("EMPTY_None")
-            internal_json_msg = json_msg.getJson()
+            internal_json_msg = json_msg.getEnvelope()
 
             # Send the json message to the RabbitMQ processor to transmit out
             self._log_debug(f"_process_msg, internal_json_msg: {internal_json_msg}")
@@ -422,7 +420,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
             json_msg = drive.toHPIjsonMsg()
             json_msg.setDiskPowered(False)
             json_msg.setDiskInstalled(False)
-            internal_json_msg = json_msg.getJson()
+            internal_json_msg = json_msg.getEnvelope()
 
             # Send the json message to the RabbitMQ processor to transmit out
             self._log_debug(f"_process_msg, internal_json_msg: {internal_json_msg}")
@@ -436,7 +434,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Obtain json message containing all relevant data
             json_msg = drive.toDriveMngrJsonMsg()
             json_msg.setStatus("OK_None")
-            internal_json_msg = json_msg.getJson()
+            internal_json_msg = json_msg.getEnvelope()
 
             # Send the json message to the RabbitMQ processor to transmit out
             self._log_debug(f"_process_msg, internal_json_msg: {internal_json_msg}")
@@ -449,7 +447,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
             json_msg = drive.toHPIjsonMsg()
             json_msg.setDiskPowered(True)
             json_msg.setDiskInstalled(True)
-            internal_json_msg = json_msg.getJson()
+            internal_json_msg = json_msg.getEnvelope()
 
             # Send the json message to the RabbitMQ processor to transmit out
             self._log_debug(f"_process_msg, internal_json_msg: {internal_json_msg}")
@@ -481,7 +479,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
         """Transmit all drivemanager data for every drive"""
         for drive in self._drvmngr_drives:
             # Obtain json message containing all relevant data
-            internal_json_msg = drive.toDriveMngrJsonMsg().getJson()
+            internal_json_msg = drive.toDriveMngrJsonMsg().getEnvelope()
 
             # Send the json message to the RabbitMQ processor to transmit out
             self._write_internal_msgQ(RabbitMQegressProcessor.name(), internal_json_msg)
@@ -490,7 +488,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
         """Transmit all HPI data for every drive"""
         for drive in self._hpi_drives:
             # Obtain json message containing all relevant data
-            internal_json_msg = drive.toHPIjsonMsg().getJson()
+            internal_json_msg = drive.toHPIjsonMsg().getEnvelope()
 
             # Send the json message to the RabbitMQ processor to transmit out
             self._write_internal_msgQ(RabbitMQegressProcessor.name(), internal_json_msg)
@@ -567,7 +565,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 self._log_IEM(drive)
 
         # Obtain json message containing all relevant data
-        internal_json_msg = drive.toDriveMngrJsonMsg().getJson()
+        internal_json_msg = drive.toDriveMngrJsonMsg().getEnvelope()
 
         # Send the json message to the RabbitMQ processor to transmit out
         self._write_internal_msgQ(RabbitMQegressProcessor.name(), internal_json_msg)
@@ -608,7 +606,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
         self._hpi_drives[serial_number] = drive
 
         # Obtain json message containing all relevant data
-        internal_json_msg = drive.toHPIjsonMsg().getJson()
+        internal_json_msg = drive.toHPIjsonMsg().getEnvelope()
 
         # Send the json message to the RabbitMQ processor to transmit out
         self._log_debug(f"_process_msg, internal_json_msg: {internal_json_msg}")
@@ -625,7 +623,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 drivemngr_drive.set_drive_num(drive.get_drive_num())
 
                 # Obtain json message containing all relevant data
-                internal_json_msg = drivemngr_drive.toDriveMngrJsonMsg().getJson()
+                internal_json_msg = drivemngr_drive.toDriveMngrJsonMsg().getEnvelope()
 
                 # Send the json message to the RabbitMQ processor to transmit out
                 self._write_internal_msgQ(RabbitMQegressProcessor.name(), internal_json_msg)
@@ -638,7 +636,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
         # Have the drivemanager resend the drive's state in the OS
         if self._drvmngr_drives:
-            internal_json_msg = json.dumps(
+            internal_json_msg = MsgEnvelope(
                 {"sensor_request_type" : "resend_drive_status",
                     "serial_number" : serial_number
                 })
@@ -744,7 +742,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 self._hpi_drives[serial_number] = drive
 
                 # Obtain json message containing all relevant data
-                internal_json_msg = drive.toHPIjsonMsg().getJson()
+                internal_json_msg = drive.toHPIjsonMsg().getEnvelope()
 
                 # Send the json message to the RabbitMQ processor to transmit out
                 self._log_debug(f"_process_hpi_response_ZBX_NOTPRESENT, internal_json_msg: {internal_json_msg}")
@@ -785,7 +783,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
             json_dict["last_update_time"] = time.strftime("%c")
             json_dict["drives"] = drives_list
-            json_dump = json.dumps(json_dict, sort_keys=True)
+            json_dump = json_codec.dumps(json_dict, sort_keys=True)
             with open(self._dmreport_file, "w+") as dm_file:
                 dm_file.write(json_dump)
         except Exception as ae:
@@ -799,7 +797,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
             for serial_number, drive in list(self._hpi_drives.items()):
                 # Obtain json message containing all relevant HPI data
                 hpi_msg = drive.toHPIjsonMsg().getJson()
-                hpi_json_msg = json.loads(hpi_msg).get("message").get("sensor_response_type").get("disk_status_hpi")
+                hpi_json_msg = json_codec.loads(hpi_msg).get("message").get("sensor_response_type").get("disk_status_hpi")
 
                 status = "N/A"
                 reason = "N/A"
@@ -814,7 +812,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
             json_dict["timestamp"] = time.strftime("%c")
             json_dict["drives"] = drives_list
-            json_dump = json.dumps(json_dict, sort_keys=True)
+            json_dump = json_codec.dumps(json_dict, sort_keys=True)
             with open(self._disk_info_file, "w+") as disk_info_file:
                 disk_info_file.write(json_dump)
 
@@ -860,13 +858,13 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
                          "path_id": drive.get_path_id()
                          }
 
-        self._log_debug(f"_log_IEM, log_msg: %{log_msg}:{json.dumps(json_data, sort_keys=True)}")
-        internal_json_msg = json.dumps(
+        self._log_debug(f"_log_IEM, log_msg: %{log_msg}:{json_codec.dumps(json_data, sort_keys=True)}")
+        internal_json_msg = MsgEnvelope(
                     {"actuator_request_type" : {
                         "logging": {
                             "log_level": "LOG_WARNING",
                             "log_type": "IEM",
-                            "log_msg": f"{log_msg}:{json.dumps(json_data, sort_keys=True)}"
+                            "log_msg": f"{log_msg}:{json_codec.dumps(json_data, sort_keys=True)}"
                             }
                         }
                      })
@@ -954,7 +952,7 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
         """Create and transmit an expander reset JSON msg"""
         # Build JSON message, currently no data but following same pattern
         expanderResetMsg = ExpanderResetMsg()
-        internal_json_msg = expanderResetMsg.getJson()
+        internal_json_msg = expanderResetMsg.getEnvelope()
 
         # Send the json message to the RabbitMQ processor to transmit out
         self._write_internal_msgQ(RabbitMQegressProcessor.name(), internal_json_msg)
@@ -963,12 +961,12 @@ class DiskMsgHandler(ScheduledModuleThread, InternalMsgQ):
         json_data = {"scsi_generic_device": self._scsi_generic}
 
         # Log an IEM
-        internal_json_msg = json.dumps(
+        internal_json_msg = MsgEnvelope(
                     {"actuator_request_type" : {
                         "logging": {
                             "log_level": "LOG_WARNING",
                             "log_type": "IEM",
-                            "log_msg": f"{log_msg}:{json.dumps(json_data, sort_keys=True)}"
+                            "log_msg": f"{log_msg}:{json_codec.dumps(json_data, sort_keys=True)}"
                             }
                         }
                      })
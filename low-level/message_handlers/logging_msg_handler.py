@@ -23,6 +23,7 @@ import json
 
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.base.module_thread import ScheduledModuleThread
+from framework.base.msg_envelope import MsgEnvelope
 from framework.base.sspl_constants import enabled_products
 # Modules that receive messages from this module
 from framework.rabbitmq.rabbitmq_egress_processor import \
@@ -37,6 +38,7 @@ class LoggingMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "LoggingMsgHandler"
     PRIORITY    = 2
+    WAKE_ON_MSGQ = True
 
     # Section and keys in configuration file
     LOGGINGMSGHANDLER   = MODULE_NAME.upper()
@@ -86,12 +88,8 @@ class LoggingMsgHandler(ScheduledModuleThread, InternalMsgQ):
             return
 
         try:
-            # Block on message queue until it contains an entry
-            jsonMsg, _ = self._read_my_msgQ()
-            if jsonMsg is not None:
-                self._process_msg(jsonMsg)
-
-            # Keep processing until the message queue is empty
+            # Process messages until the queue is empty, the scheduler runs
+            #  this module as soon as a new message is placed on the queue
             while not self._is_my_msgQ_empty():
                 jsonMsg, _ = self._read_my_msgQ()
                 if jsonMsg is not None:
@@ -101,7 +99,7 @@ class LoggingMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Log it and restart the whole process when a failure occurs
             logger.exception(f"LoggingMsgHandler restarting: {ae}")
 
-        self._scheduler.enter(1, self._priority, self.run, ())
+        self._scheduler.enter(self.MSGQ_IDLE_INTERVAL, self._priority, self.run, ())
         self._log_debug("Finished processing successfully")
 
     def _process_msg(self, jsonMsg):
@@ -142,7 +140,7 @@ class LoggingMsgHandler(ScheduledModuleThread, InternalMsgQ):
             self._log_debug(f"_processMsg, serial_number: {serial_number}, status:{status}, reason: {reason}")
 
             # Send a message to the disk manager handler to create and transmit json msg
-            internal_json_msg = json.dumps(
+            internal_json_msg = MsgEnvelope(
                  {"sensor_response_type" : "disk_status_HDS",
                   "object_path" : "HDS",
                   "status" : status,
@@ -158,7 +156,7 @@ class LoggingMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # result = self._iem_logger.log_msg(jsonMsg)
 
             # Send ack about logging msg
-            ack_msg = AckResponseMsg(log_type, result, uuid).getJson()
+            ack_msg = AckResponseMsg(log_type, result, uuid).getEnvelope()
             self._write_internal_msgQ(RabbitMQegressProcessor.name(), ack_msg)
 
         # ... handle other logging types
@@ -180,7 +178,7 @@ class LoggingMsgHandler(ScheduledModuleThread, InternalMsgQ):
         # Get the message to log in format "IEC: EVENT_CODE: EVENT_STRING: JSON DATA"
         log_msg = f"{log_level} {jsonMsg.get('actuator_request_type').get('logging').get('log_msg')}"
 
-        internal_json_msg = json.dumps(
+        internal_json_msg = MsgEnvelope(
                  {"message": {
                     "IEM_routing": {
                         "log_msg": log_msg
@@ -42,6 +42,7 @@ class NodeControllerMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "NodeControllerMsgHandler"
     PRIORITY    = 2
+    WAKE_ON_MSGQ = True
 
     SYS_INFORMATION = 'SYSTEM_INFORMATION'
     SETUP = 'setup'
@@ -120,12 +121,8 @@ class NodeControllerMsgHandler(ScheduledModuleThread, InternalMsgQ):
             return
 
         try:
-            # Block on message queue until it contains an entry
-            jsonMsg, _ = self._read_my_msgQ()
-            if jsonMsg is not None:
-                self._process_msg(jsonMsg)
-
-            # Keep processing until the message queue is empty
+            # Process messages until the queue is empty, the scheduler runs
+            #  this module as soon as a new message is placed on the queue
             while not self._is_my_msgQ_empty():
                 jsonMsg, _ = self._read_my_msgQ()
                 if jsonMsg is not None:
@@ -135,7 +132,7 @@ class NodeControllerMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Log it and restart the whole process when a failure occurs
             logger.exception(f"NodeControllerMsgHandler restarting: {ae}")
 
-        self._scheduler.enter(1, self._priority, self.run, ())
+        self._scheduler.enter(self.MSGQ_IDLE_INTERVAL, self._priority, self.run, ())
         self._log_debug("Finished processing successfully")
 
     def _process_msg(self, jsonMsg):
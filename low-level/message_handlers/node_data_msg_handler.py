@@ -25,8 +25,9 @@ import time
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.base.module_thread import ScheduledModuleThread
 from framework.base.sspl_constants import enabled_products
-from framework.utils.conf_utils import (CLUSTER, GLOBAL_CONF, SRVNODE,
-                                        SSPL_CONF, Conf)
+from framework.utils.conf_snapshot import (ConfField, conf_snapshots,
+                                           percentage, to_number)
+from framework.utils.conf_utils import CLUSTER, GLOBAL_CONF, SRVNODE, Conf
 from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from json_msgs.messages.sensors.cpu_data import CPUdataMsg
@@ -47,6 +48,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "NodeDataMsgHandler"
     PRIORITY    = 2
+    DEDICATED_THREAD = True
 
     # Section and keys in configuration file
     NODEDATAMSGHANDLER = MODULE_NAME.upper()
@@ -116,18 +118,17 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
         # Initialize internal message queues for this module
         super(NodeDataMsgHandler, self).initialize_msgQ(msgQlist)
 
-        self._transmit_interval = int(Conf.get(SSPL_CONF, f"{self.NODEDATAMSGHANDLER}>{self.TRANSMIT_INTERVAL}",
-                                                60))
-        self._units = Conf.get(SSPL_CONF, f"{self.NODEDATAMSGHANDLER}>{self.UNITS}",
-                                                "MB")
-        self._disk_usage_threshold = Conf.get(SSPL_CONF, f"{self.NODEDATAMSGHANDLER}>{self.DISK_USAGE_THRESHOLD}",
-                                                self.DEFAULT_DISK_USAGE_THRESHOLD)
-
-        self._cpu_usage_threshold = Conf.get(SSPL_CONF, f"{self.NODEDATAMSGHANDLER}>{self.CPU_USAGE_THRESHOLD}",
-                                                self.DEFAULT_CPU_USAGE_THRESHOLD)
-
-        self._host_memory_usage_threshold = Conf.get(SSPL_CONF, f"{self.NODEDATAMSGHANDLER}>{self.HOST_MEMORY_USAGE_THRESHOLD}",
-                                                self.DEFAULT_HOST_MEMORY_USAGE_THRESHOLD)
+        # Thresholds are converted once and updated when sspl.conf changes
+        self._apply_conf(conf_snapshots.register(self.NODEDATAMSGHANDLER, (
+            ConfField(self.TRANSMIT_INTERVAL, int, 60),
+            ConfField(self.UNITS, str, "MB"),
+            ConfField(self.DISK_USAGE_THRESHOLD, to_number,
+                      self.DEFAULT_DISK_USAGE_THRESHOLD, percentage),
+            ConfField(self.CPU_USAGE_THRESHOLD, to_number,
+                      self.DEFAULT_CPU_USAGE_THRESHOLD, percentage),
+            ConfField(self.HOST_MEMORY_USAGE_THRESHOLD, to_number,
+                      self.DEFAULT_HOST_MEMORY_USAGE_THRESHOLD, percentage))))
+        conf_snapshots.subscribe(self.NODEDATAMSGHANDLER, self._apply_conf)
 
         self.site_id = Conf.get(GLOBAL_CONF, f'{CLUSTER}>{SRVNODE}>{self.SITE_ID}','DC01')
         self.rack_id = Conf.get(GLOBAL_CONF, f'{CLUSTER}>{SRVNODE}>{self.RACK_ID}','RC01')
@@ -172,6 +173,14 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
         self._import_products(product)
 
+    def _apply_conf(self, conf):
+        """Takes the settings of the NODEDATAMSGHANDLER snapshot"""
+        self._transmit_interval = conf.transmit_interval
+        self._units = conf.units
+        self._disk_usage_threshold = conf.disk_usage_threshold
+        self._cpu_usage_threshold = conf.cpu_usage_threshold
+        self._host_memory_usage_threshold = conf.host_memory_usage_threshold
+
     def _import_products(self, product):
         """Import classes based on which product is being used"""
         if product.lower() in [x.lower() for x in enabled_products]:
@@ -350,16 +359,6 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
         if not successful:
             logger.error("NodeDataMsgHandler, _generate_host_update was NOT successful.")
 
-        self._host_memory_usage_threshold = str(self._host_memory_usage_threshold)
-        try:
-            if self._host_memory_usage_threshold.isdigit():
-                self._host_memory_usage_threshold = int(self._host_memory_usage_threshold)
-            else:
-                self._host_memory_usage_threshold = float(self._host_memory_usage_threshold)
-        except ValueError:
-            logger.warning("Host Memory Alert, Invalid host_memory_usage_threshold value are entered in config.")
-            # Assigning default value to _disk_usage_threshold
-            self._host_memory_usage_threshold = self.DEFAULT_HOST_MEMORY_USAGE_THRESHOLD
         if self._node_sensor.total_memory["percent"] >= self._host_memory_usage_threshold:
             # Create the disk space data message and hand it over to the egress processor to transmit
             if not self.host_fault:
@@ -386,7 +385,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 # Add in uuid if it was present in the json request
                 if self._uuid is not None:
                     hostUpdateMsg.set_uuid(self._uuid)
-                jsonMsg = hostUpdateMsg.getJson()
+                jsonMsg = hostUpdateMsg.getEnvelope()
                 # Transmit it out over rabbitMQ channel
                 self.host_sensor_data = jsonMsg
                 self.os_sensor_type["system"] = self.host_sensor_data
@@ -416,7 +415,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 # Add in uuid if it was present in the json request
                 if self._uuid is not None:
                     hostUpdateMsg.set_uuid(self._uuid)
-                jsonMsg = hostUpdateMsg.getJson()
+                jsonMsg = hostUpdateMsg.getEnvelope()
                 # Transmit it out over rabbitMQ channel
                 self.host_sensor_data = jsonMsg
                 self.os_sensor_type["system"] = self.host_sensor_data
@@ -446,7 +445,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
         # Add in uuid if it was present in the json request
         if self._uuid is not None:
             localMountDataMsg.set_uuid(self._uuid)
-        jsonMsg = localMountDataMsg.getJson()
+        jsonMsg = localMountDataMsg.getEnvelope()
 
         logger.info(f"RAAL: {jsonMsg}")
         # Transmit it out over rabbitMQ channel
@@ -461,17 +460,6 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
         if not successful:
             logger.error("NodeDataMsgHandler, _generate_cpu_data was NOT successful.")
 
-        self._cpu_usage_threshold = str(self._cpu_usage_threshold)
-        try:
-            if self._cpu_usage_threshold.isdigit():
-                self._cpu_usage_threshold = int(self._cpu_usage_threshold)
-            else:
-                self._cpu_usage_threshold = float(self._cpu_usage_threshold)
-        except ValueError:
-            logger.warning("CPU Usage Alert, Invalid host_memory_usage_threshold value are entered in config.")
-            # Assigning default value to _cpu_usage_threshold
-            self._cpu_usage_threshold = self.DEFAULT_CPU_USAGE_THRESHOLD
-
         if self._node_sensor.cpu_usage >= self._cpu_usage_threshold:
 
             if not self.cpu_fault :
@@ -504,7 +492,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 # Add in uuid if it was present in the json request
                 if self._uuid is not None:
                     cpuDataMsg.set_uuid(self._uuid)
-                jsonMsg = cpuDataMsg.getJson()
+                jsonMsg = cpuDataMsg.getEnvelope()
                 self.cpu_sensor_data = jsonMsg
                 self.os_sensor_type["cpu"] = self.cpu_sensor_data
                 logger.info(f"RAAL: {jsonMsg}")
@@ -540,7 +528,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Add in uuid if it was present in the json request
             if self._uuid is not None:
                 cpuDataMsg.set_uuid(self._uuid)
-            jsonMsg = cpuDataMsg.getJson()
+            jsonMsg = cpuDataMsg.getEnvelope()
             self.cpu_sensor_data = jsonMsg
             self.os_sensor_type["cpu"] = self.cpu_sensor_data
             logger.info(f"RAAL: {jsonMsg}")
@@ -559,7 +547,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
         # Add in uuid if it was present in the json request
         if self._uuid is not None:
             ifDataMsg.set_uuid(self._uuid)
-        jsonMsg = ifDataMsg.getJson()
+        jsonMsg = ifDataMsg.getEnvelope()
         self.if_sensor_data = jsonMsg
         self.os_sensor_type[sensor_type] = self.if_sensor_data
 
@@ -730,18 +718,6 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
             logger.error("NodeDataMsgHandler, _generate_disk_space_alert was NOT successful.")
             return
 
-        # Changing disk_usage_threshold type according to what value type entered in config file
-        self._disk_usage_threshold = str(self._disk_usage_threshold)
-        try:
-            if self._disk_usage_threshold.isdigit():
-                self._disk_usage_threshold = int(self._disk_usage_threshold)
-            else:
-                self._disk_usage_threshold = float(self._disk_usage_threshold)
-        except ValueError:
-            logger.warning("Disk Space Alert, Invalid disk_usage_threshold value are entered in config.")
-            # Assigning default value to _disk_usage_threshold
-            self._disk_usage_threshold = self.DEFAULT_DISK_USAGE_THRESHOLD
-
         if self._node_sensor.disk_used_percentage >= self._disk_usage_threshold:
             if not self.disk_fault:
                 self.disk_fault = True
@@ -760,7 +736,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 # Add in uuid if it was present in the json request
                 if self._uuid is not None:
                     diskSpaceAlertMsg.set_uuid(self._uuid)
-                jsonMsg = diskSpaceAlertMsg.getJson()
+                jsonMsg = diskSpaceAlertMsg.getEnvelope()
                 self.disk_sensor_data = jsonMsg
                 self.os_sensor_type["disk_space"] = self.disk_sensor_data
                 logger.info(f"RAAL: {jsonMsg}")
@@ -787,7 +763,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Add in uuid if it was present in the json request
             if self._uuid is not None:
                 diskSpaceAlertMsg.set_uuid(self._uuid)
-            jsonMsg = diskSpaceAlertMsg.getJson()
+            jsonMsg = diskSpaceAlertMsg.getEnvelope()
             self.disk_sensor_data = jsonMsg
             self.os_sensor_type["disk_space"] = self.disk_sensor_data
             logger.info(f"RAAL: {jsonMsg}")
@@ -818,7 +794,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Add in uuid if it was present in the json request
             if self._uuid is not None:
                 raidDataMsg.set_uuid(self._uuid)
-            jsonMsg = raidDataMsg.getJson()
+            jsonMsg = raidDataMsg.getEnvelope()
             self.raid_sensor_data = jsonMsg
             self.os_sensor_type["raid_data"] = self.raid_sensor_data
 
@@ -863,7 +839,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Add in uuid if it was present in the json request
             if self._uuid is not None:
                 RAIDintegrityMsg.set_uuid(self._uuid)
-            jsonMsg = RAIDintegrityMsg.getJson()
+            jsonMsg = RAIDintegrityMsg.getEnvelope()
             self.raid_integrity_data = jsonMsg
             self.os_sensor_type["raid_integrity"] = self.raid_integrity_data
              
@@ -885,7 +861,7 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
         if self._uuid is not None:
             node_ipmi_data_msg.set_uuid(self._uuid)
-        jsonMsg = node_ipmi_data_msg.getJson()
+        jsonMsg = node_ipmi_data_msg.getEnvelope()
         self._write_internal_msgQ(RabbitMQegressProcessor.name(), jsonMsg)
 
     def suspend(self):
@@ -900,4 +876,5 @@ class NodeDataMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     def shutdown(self):
         """Clean up scheduler queue and gracefully shutdown thread"""
+        conf_snapshots.unsubscribe(self.NODEDATAMSGHANDLER, self._apply_conf)
         super(NodeDataMsgHandler, self).shutdown()
@@ -35,6 +35,7 @@ class PlaneCntrlMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "PlaneCntrlMsgHandler"
     PRIORITY    = 2
+    DEDICATED_THREAD = True
 
 
     @staticmethod
@@ -33,6 +33,7 @@ from json_msgs.messages.sensors.realstor_sideplane_expander_data import \
 from json_msgs.messages.sensors.realstor_logical_volume_data import \
     RealStorLogicalVolumeDataMsg
 from json_msgs.messages.sensors.realstor_encl_data_msg import RealStorEnclDataMsg
+from json_msgs.messages.msg_builder import MsgBuilder
 from rabbitmq.rabbitmq_egress_processor import RabbitMQegressProcessor
 
 
@@ -44,6 +45,7 @@ class RealStorEnclMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     # TODO increase the priority
     PRIORITY = 2
+    WAKE_ON_MSGQ = True
 
     # Dependency list
     DEPENDENCIES = {
@@ -118,12 +120,8 @@ class RealStorEnclMsgHandler(ScheduledModuleThread, InternalMsgQ):
             return
 
         try:
-            # Block on message queue until it contains an entry
-            json_msg, self._event = self._read_my_msgQ()
-            if json_msg is not None:
-                self._process_msg(json_msg)
-
-            # Keep processing until the message queue is empty
+            # Process messages until the queue is empty, the scheduler runs
+            #  this module as soon as a new message is placed on the queue
             while not self._is_my_msgQ_empty():
                 json_msg, self._event = self._read_my_msgQ()
                 if json_msg is not None:
@@ -133,7 +131,7 @@ class RealStorEnclMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Log it and restart the whole process when a failure occurs
             logger.exception(f"RealStorEnclMsgHandler restarting: {ae}")
 
-        self._scheduler.enter(1, self._priority, self.run, ())
+        self._scheduler.enter(self.MSGQ_IDLE_INTERVAL, self._priority, self.run, ())
         self._log_debug("Finished processing successfully")
 
     def _process_msg(self, json_msg):
@@ -207,9 +205,8 @@ class RealStorEnclMsgHandler(ScheduledModuleThread, InternalMsgQ):
         self._log_debug(f"RealStorEnclMsgHandler, _generate_disk_alert,\
             json_msg {json_msg}")
 
-        real_stor_disk_data_msg = \
-            RealStorDiskDataMsg(host_name, alert_type, alert_id, severity, info, specific_info)
-        json_msg = real_stor_disk_data_msg.getJson()
+        json_msg = MsgBuilder.for_class(RealStorDiskDataMsg).build_alert(
+            alert_type, alert_id, severity, info, specific_info)
 
         # save the json message in memory to serve sspl CLI sensor request
         self._disk_sensor_message = json_msg
@@ -224,9 +221,8 @@ class RealStorEnclMsgHandler(ScheduledModuleThread, InternalMsgQ):
         self._log_debug(f"RealStorEnclMsgHandler, _generate_psu_alert,\
             json_msg {json_msg}")
 
-        real_stor_psu_data_msg = \
-            RealStorPSUDataMsg(host_name, alert_type, alert_id, severity, info, specific_info)
-        json_msg = real_stor_psu_data_msg.getJson()
+        json_msg = MsgBuilder.for_class(RealStorPSUDataMsg).build_alert(
+            alert_type, alert_id, severity, info, specific_info)
 
         # Saves the json message in memory to serve sspl CLI sensor request
         self._psu_sensor_message = json_msg
@@ -241,9 +237,8 @@ class RealStorEnclMsgHandler(ScheduledModuleThread, InternalMsgQ):
         self._log_debug(f"RealStorEnclMsgHandler, _generate_fan_alert,\
             json_msg {json_msg}")
 
-        real_stor_fan_data_msg = \
-            RealStorFanDataMsg(host_name, alert_type, alert_id, severity, info, specific_info)
-        json_msg = real_stor_fan_data_msg.getJson()
+        json_msg = MsgBuilder.for_class(RealStorFanDataMsg).build_alert(
+            alert_type, alert_id, severity, info, specific_info)
 
         # save the json message in memory to serve sspl CLI sensor request
         self._fan_module_sensor_message = json_msg
@@ -259,10 +254,8 @@ class RealStorEnclMsgHandler(ScheduledModuleThread, InternalMsgQ):
         self._log_debug(f"RealStorEnclMsgHandler, _generate_controller_alert,\
             json_msg {json_msg}")
 
-        real_stor_controller_data_msg = \
-            RealStorControllerDataMsg(host_name, alert_type, alert_id, severity, info,
-                                      specific_info)
-        json_msg = real_stor_controller_data_msg.getJson()
+        json_msg = MsgBuilder.for_class(RealStorControllerDataMsg).build_alert(
+            alert_type, alert_id, severity, info, specific_info)
 
         # save the json message in memory to serve sspl CLI sensor request
         self._controller_sensor_message = json_msg
@@ -278,10 +271,8 @@ class RealStorEnclMsgHandler(ScheduledModuleThread, InternalMsgQ):
         self._log_debug(f"RealStorEnclMsgHandler, _generate_expander_alert,\
             json_msg {json_msg}")
 
-        real_stor_expander_data_msg = \
-            RealStorSideplaneExpanderDataMsg(host_name, alert_type, alert_id, severity, info,
-                                             specific_info)
-        json_msg = real_stor_expander_data_msg.getJson()
+        json_msg = MsgBuilder.for_class(RealStorSideplaneExpanderDataMsg).build_alert(
+            alert_type, alert_id, severity, info, specific_info)
 
         # save the json message in memory to serve sspl CLI sensor request
         self._expander_sensor_message = json_msg
@@ -297,10 +288,8 @@ class RealStorEnclMsgHandler(ScheduledModuleThread, InternalMsgQ):
         self._log_debug(f"RealStorEnclMsgHandler, _generate_logical_volume_alert,\
             json_msg {json_msg}")
 
-        real_stor_logical_volume_data_msg = \
-            RealStorLogicalVolumeDataMsg(host_name, alert_type, alert_id, severity, info,
-                                      specific_info)
-        json_msg = real_stor_logical_volume_data_msg.getJson()
+        json_msg = MsgBuilder.for_class(RealStorLogicalVolumeDataMsg).build_alert(
+            alert_type, alert_id, severity, info, specific_info)
 
         # save the json message in memory to serve sspl CLI sensor request
         self._logical_volume_sensor_message = json_msg
@@ -316,9 +305,8 @@ class RealStorEnclMsgHandler(ScheduledModuleThread, InternalMsgQ):
         self._log_debug(f"RealStorEnclMsgHandler, _generate_enclosure_alert,\
             json_msg {json_msg}")
 
-        real_stor_encl_msg = RealStorEnclDataMsg(host_name, alert_type, alert_id, severity,
-                                                info, specific_info)
-        json_msg = real_stor_encl_msg.getJson()
+        json_msg = MsgBuilder.for_class(RealStorEnclDataMsg).build_alert(
+            alert_type, alert_id, severity, info, specific_info)
         self._enclosure_message = json_msg
         self._fru_type[sensor_type] = self._enclosure_message
         self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg, self._event)
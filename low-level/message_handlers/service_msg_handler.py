@@ -25,6 +25,7 @@ import json
 from framework.actuator_state_manager import actuator_state_manager
 from framework.base.module_thread import ScheduledModuleThread
 from framework.base.internal_msgQ import InternalMsgQ
+from framework.base.msg_envelope import MsgEnvelope
 from framework.utils.service_logging import logger
 from framework.base.sspl_constants import enabled_products
 from json_msgs.messages.actuators.service_controller import ServiceControllerMsg
@@ -39,6 +40,7 @@ class ServiceMsgHandler(ScheduledModuleThread, InternalMsgQ):
 
     MODULE_NAME = "ServiceMsgHandler"
     PRIORITY = 2
+    WAKE_ON_MSGQ = True
 
     # Dependency list
     DEPENDENCIES = {
@@ -98,12 +100,8 @@ class ServiceMsgHandler(ScheduledModuleThread, InternalMsgQ):
         # self._set_debug_persist(True)
 
         try:
-            # Block on message queue until it contains an entry
-            json_msg, _ = self._read_my_msgQ()
-            if json_msg is not None:
-                self._process_msg(json_msg)
-
-            # Keep processing until the message queue is empty
+            # Process messages until the queue is empty, the scheduler runs
+            #  this module as soon as a new message is placed on the queue
             while not self._is_my_msgQ_empty():
                 json_msg, _ = self._read_my_msgQ()
                 if json_msg is not None:
@@ -113,7 +111,7 @@ class ServiceMsgHandler(ScheduledModuleThread, InternalMsgQ):
             # Log it and restart the whole process when a failure occurs
             logger.exception(f"ServiceMsgHandler restarting: {ae}")
 
-        self._scheduler.enter(1, self._priority, self.run, ())
+        self._scheduler.enter(self.MSGQ_IDLE_INTERVAL, self._priority, self.run, ())
         self._log_debug("Finished processing successfully")
 
     def _process_msg(self, jsonMsg):
@@ -152,7 +150,7 @@ class ServiceMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 # This state will not be reached. Kept here for consistency.
                 logger.info("Service actuator is initializing")
                 busy_json_msg = AckResponseMsg(
-                    request, "BUSY", uuid, error_no=errno.EBUSY).getJson()
+                    request, "BUSY", uuid, error_no=errno.EBUSY).getEnvelope()
                 self._write_internal_msgQ(
                     "RabbitMQegressProcessor", busy_json_msg)
 
@@ -210,7 +208,7 @@ class ServiceMsgHandler(ScheduledModuleThread, InternalMsgQ):
                 self._log_debug(f"_processMsg, prev state: {prev_state}, prev substate: {prev_substate}")
 
             # Create a service watchdog message and send it out
-            jsonMsg = ServiceWatchdogMsg(service_name, state, prev_state, substate, prev_substate, pid, prev_pid).getJson()
+            jsonMsg = ServiceWatchdogMsg(service_name, state, prev_state, substate, prev_substate, pid, prev_pid).getEnvelope()
             self._write_internal_msgQ("RabbitMQegressProcessor", jsonMsg)
 
             # Create an IEM if the resulting service state is failed
@@ -225,7 +223,7 @@ class ServiceMsgHandler(ScheduledModuleThread, InternalMsgQ):
                              "previous_pid": prev_pid
                             }
 
-                internal_json_msg = json.dumps(
+                internal_json_msg = MsgEnvelope(
                     {"actuator_request_type" : {
                         "logging": {
                             "log_level": "LOG_WARNING",
@@ -259,7 +257,7 @@ class ServiceMsgHandler(ScheduledModuleThread, InternalMsgQ):
         service_controller_msg = ServiceControllerMsg(service_name, result)
         if uuid is not None:
             service_controller_msg.set_uuid(uuid)
-        json_msg = service_controller_msg.getJson()
+        json_msg = service_controller_msg.getEnvelope()
         self._write_internal_msgQ("RabbitMQegressProcessor", json_msg)
 
     def suspend(self):
@@ -47,6 +47,7 @@ class DriveManager(SensorThread, InternalMsgQ):
 
     SENSOR_NAME     = "DriveManager"
     PRIORITY        = 1
+    DEDICATED_THREAD = True
 
     # Section and keys in configuration file
     DRIVEMANAGER      = SENSOR_NAME.upper()
@@ -91,7 +92,7 @@ class DriveManager(SensorThread, InternalMsgQ):
         self._read_my_msgQ_noWait()
 
         self._log_debug("Start accepting requests")
-        self._log_debug(f"run, CentOS 7 base directory: {self._drive_mngr_base_dir}")
+        self._log_debug("run, CentOS 7 base directory: %s", self._drive_mngr_base_dir)
 
         # Retrieve the current information about each drive from the file system
         self._init_drive_status()
@@ -125,8 +126,8 @@ class DriveManager(SensorThread, InternalMsgQ):
             # Check for debug mode being activated when it breaks out of blocking loop
             self._read_my_msgQ_noWait()
             if self.is_running() is True:
-                self._log_debug("DriveManager ungracefully breaking " \
-                                "out of iNotify Loop, restarting: %r" % ae)
+                self._log_debug("DriveManager ungracefully breaking out of iNotify Loop, restarting: %r",
+                                ae)
                 self._scheduler.enter(1, self._priority, self.run, ())
             else:
                 self._log_debug("DriveManager gracefully breaking out " \
@@ -281,7 +282,7 @@ class DriveManager(SensorThread, InternalMsgQ):
             return
 
         # Update the status for this drive
-        self._log_debug(f"Status change, status_file: {status_file}, status: {status}")
+        self._log_debug("Status change, status_file: %s, status: %s", status_file, status)
         self._drive_status[os.path.dirname(status_file)] = status
 
         # Read in the serial number
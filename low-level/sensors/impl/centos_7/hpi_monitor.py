@@ -41,6 +41,7 @@ class HPIMonitor(SensorThread, InternalMsgQ):
 
     SENSOR_NAME      = "HPIMonitor"
     PRIORITY         = 1
+    DEDICATED_THREAD = True
 
     # Section and keys in configuration file
     HPIMONITOR      = SENSOR_NAME.upper()
@@ -92,7 +93,7 @@ class HPIMonitor(SensorThread, InternalMsgQ):
         self._read_my_msgQ_noWait()
 
         self._log_debug("Start accepting requests")
-        self._log_debug(f"run, CentOS 7 base directory: {self._hpi_mntr_base_dir}")
+        self._log_debug("run, CentOS 7 base directory: %s", self._hpi_mntr_base_dir)
 
         # Retrieve the current information about each drive from the file system
         self._init_drive_data()
@@ -127,8 +128,8 @@ class HPIMonitor(SensorThread, InternalMsgQ):
             self._read_my_msgQ_noWait()
 
             if self.is_running() is True:
-                self._log_debug("HPIMonitor ungracefully breaking " \
-                                "out of iNotify Loop, restarting: %r" % ae)
+                self._log_debug("HPIMonitor ungracefully breaking out of iNotify Loop, restarting: %r",
+                                ae)
                 self._scheduler.enter(1, self._priority, self.run, ())
             else:
                 self._log_debug("HPIMonitor gracefully breaking out " \
@@ -157,7 +158,7 @@ class HPIMonitor(SensorThread, InternalMsgQ):
 
         for enclosure in enclosures:
             disk_dir = os.path.join(self._hpi_mntr_base_dir, enclosure, "disk")
-            self._log_debug(f"initializing: {disk_dir}")
+            self._log_debug("initializing: %s", disk_dir)
 
             disks = os.listdir(disk_dir)
             for disk in disks:
@@ -335,7 +336,7 @@ class HPIMonitor(SensorThread, InternalMsgQ):
                     "disk_installed.swp" in event_path)):
                     return False
 
-                self._log_debug(f"_validate_event_path event_path: {event_path}")
+                self._log_debug("_validate_event_path event_path: %s", event_path)
                 return True
 
             def _log_debug(self, msg):
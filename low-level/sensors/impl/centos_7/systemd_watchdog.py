@@ -40,6 +40,7 @@ from zope.interface import implementer
 
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.base.module_thread import SensorThread
+from framework.base.msg_envelope import MsgEnvelope
 from framework.base.sspl_constants import cs_products
 from framework.rabbitmq.rabbitmq_egress_processor import \
     RabbitMQegressProcessor
@@ -64,6 +65,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
 
     SENSOR_NAME       = "SystemdWatchdog"
     PRIORITY          = 2
+    DEDICATED_THREAD  = True
 
     # Section and keys in configuration file
     SYSTEMDWATCHDOG    = SENSOR_NAME.upper()
@@ -150,10 +152,11 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
         self._smart_interval = self._getSMART_interval()
 
         self._run_smart_on_start = self._can_run_smart_on_start()
-        self._log_debug(f"SystemdWatchdog, Run SMART test on start: {self._run_smart_on_start}")
+        self._log_debug("SystemdWatchdog, Run SMART test on start: %s",
+                        self._run_smart_on_start)
 
         self._smart_supported = self._is_smart_supported()
-        self._log_debug(f"SystemdWatchdog, SMART supported: {self._smart_supported}")
+        self._log_debug("SystemdWatchdog, SMART supported: %s", self._smart_supported)
 
         # Dict of drives by-id symlink from systemd
         self._drive_by_id = {}
@@ -285,7 +288,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                     if self._monitored_services:
                         if unit_name not in self._monitored_services:
                             continue
-                    logger.debug(f"    {unit_name}")
+                    logger.debug("    %s", unit_name)
 
                     # Retrieve an object representation of the systemd unit
                     unit = self._bus.get_object('org.freedesktop.systemd1',
@@ -321,7 +324,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                     self._service_pids[str(unit_name)] = curr_pid
 
                     # Setting service_request to 'status' will case msg handler to retrieve current values
-                    msgString = json.dumps({"actuator_request_type": {
+                    msgString = MsgEnvelope({"actuator_request_type": {
                                     "service_watchdog_controller": {
                                         "service_name" : unit_name,
                                         "service_request" : "None",
@@ -389,7 +392,8 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
             # Check for debug mode being activated when it breaks out of blocking loop
             self._read_my_msgQ_noWait()
             if self.is_running() is True:
-                self._log_debug(f"Ungracefully breaking out of dbus loop with error: {ae}")
+                self._log_debug("Ungracefully breaking out of dbus loop with error: %s",
+                                ae)
                 # Let the top level sspl_ll_d know that we have a fatal error
                 #  and shutdown so that systemd can restart it
                 raise Exception(ae)
@@ -415,17 +419,18 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
 
         if jsonMsg.get("sensor_request_type") is not None:
             sensor_request_type = jsonMsg.get("sensor_request_type")
-            self._log_debug(f"_processMsg, sensor_request_type: {sensor_request_type}")
+            self._log_debug("_processMsg, sensor_request_type: %s", sensor_request_type)
 
             # Serial number is used as an index into dicts
             jsonMsg_serial_number = jsonMsg.get("serial_number")
-            self._log_debug(f"_processMsg, serial_number: {jsonMsg_serial_number}")
+            self._log_debug("_processMsg, serial_number: %s", jsonMsg_serial_number)
 
             # Parse out the UUID and save to send back in response if it's available
             uuid =  "Not-Found"
             if jsonMsg.get("uuid") is not None:
                 uuid = jsonMsg.get("uuid")
-            self._log_debug(f"_processMsg, sensor_request_type: {sensor_request_type}, uuid: {uuid}")
+            self._log_debug("_processMsg, sensor_request_type: %s, uuid: %s",
+                            sensor_request_type, uuid)
 
             # Refresh the set of managed systemd objects
             self._disk_objects = self._disk_manager.GetManagedObjects()
@@ -439,13 +444,15 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
             if sensor_request_type == "simulate_failure":
                 # Handle simulation requests
                 sim_request = jsonMsg.get("node_request")
-                self._log_debug(f"_processMsg, Starting simulating failure: {sim_request}")
+                self._log_debug("_processMsg, Starting simulating failure: %s",
+                                sim_request)
                 if sim_request == "SMART_FAILURE":
                     # Append to list of drives requested to simulate failure
                     self._simulated_smart_failures.append(jsonMsg_serial_number)
 
             elif sensor_request_type == "resend_drive_status":
-                self._log_debug(f"_processMsg, resend_drive_status: {jsonMsg_serial_number}")
+                self._log_debug("_processMsg, resend_drive_status: %s",
+                                jsonMsg_serial_number)
                 for drive in drives:
                     try:
                         if self._disk_objects[drive['path']].get('org.freedesktop.UDisks2.Drive') is not None:
@@ -467,7 +474,8 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                                 # Notify internal msg handlers who need to map device name to serial numbers
                                 self._notify_msg_handler_sn_device_mappings(drive['path'], serial_number)
                     except Exception as ae:
-                        self._log_debug(f"_process_msg, resend_drive_status, Exception: {ae}")
+                        self._log_debug("_process_msg, resend_drive_status, Exception: %s",
+                                        ae)
 
             elif sensor_request_type == "disk_smart_test":
                 # No need to validate for serial if SMART is not supported.
@@ -475,7 +483,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                     # Create the request to be sent back
                     request = f"SMART_TEST: {jsonMsg_serial_number}"
                     # Send an Ack msg back with SMART results as Unsupported
-                    json_msg = AckResponseMsg(request, self.SMART_STATUS_UNSUPPORTED, "").getJson()
+                    json_msg = AckResponseMsg(request, self.SMART_STATUS_UNSUPPORTED, "").getEnvelope()
                     self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
                     return
 
@@ -505,7 +513,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                                         serial_number = tmp_serial[start_index:].strip()
                                 else:
                                     self._log_debug(
-                                        f"_init_drives, couldn't extract serial number from by-id link for drive path {drive['path']} ")
+                                        "_init_drives, couldn't extract serial number from by-id link for drive path %s ", drive['path'])
 
                             if len(serial_number) > 0:
                                 # Found the drive requested or it's an * indicating all drives
@@ -519,7 +527,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                                     self._schedule_SMART_test(drive['path'], serial_number=serial_number)
 
                     except Exception as ae:
-                        self._log_debug(f"_process_msg, Exception: {ae}")
+                        self._log_debug("_process_msg, Exception: %s", ae)
                         try:
                             # If the error is not a duplicate request for running a test then send back an error
                             if "already SMART self-test running" not in str(ae):
@@ -527,7 +535,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                                 response = "Failed"
 
                                 # Send an Ack msg back with SMART results
-                                json_msg = AckResponseMsg(request, response, uuid).getJson()
+                                json_msg = AckResponseMsg(request, response, uuid).getEnvelope()
                                 self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
                                 # Remove from our list if it's present
@@ -536,7 +544,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                                     self._smart_uuids[uuid] = None
 
                         except Exception as e:
-                            self._log_debug(f"_process_msg, Exception: {e}")
+                            self._log_debug("_process_msg, Exception: %s", e)
 
     def _add_wildcard_services(self):
         """Update the list of monitored services with wildcard entries"""
@@ -624,7 +632,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                     self._drive_by_device_name[udisk_block["Drive"]] = device
 
             except Exception as ae:
-                self._log_debug("block_dev unusable: %r" % ae)
+                self._log_debug("block_dev unusable: %r", ae)
 
     def _schedule_SMART_test(self, drive_path, test_type ="short", serial_number =None):
         """Schedules a SMART test to be executed on a drive
@@ -632,7 +640,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
            on completion
         """
         if self._disk_objects[drive_path].get('org.freedesktop.UDisks2.Drive.Ata') is not None:
-            self._log_debug(f"Running SMART on drive: {drive_path}")
+            self._log_debug("Running SMART on drive: %s", drive_path)
 
             # Obtain an interface to the ATA drive and start the SMART test
             dev_obj = self._bus.get_object('org.freedesktop.UDisks2', drive_path)
@@ -643,7 +651,8 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
         elif serial_number is not None:
             # Retrieve the device name for the disk
             device_name = self._drive_by_device_name[drive_path]
-            self._log_debug(f"Running SMART on SAS drive path: {drive_path}, dev name: {device_name}")
+            self._log_debug("Running SMART on SAS drive path: %s, dev name: %s",
+                            drive_path, device_name)
 
             # Schedule a smart test to be run
             command = f"/usr/sbin/smartctl -t short -d scsi {device_name}"
@@ -652,7 +661,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
             ack_response = "Passed"
             status_reason = "OK_None"
             if len(error) > 0:
-                self._log_debug(f"Error running SMART on SAS drive: {error}")
+                self._log_debug("Error running SMART on SAS drive: %s", error)
                 status_reason = "Failed_smart_unknown"
                 ack_response  = "Failed"
             else:
@@ -664,7 +673,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                 response, error = self._run_command(command)
 
                 if "SMART Health Status: OK" not in response:
-                    self._log_debug(f"Error running SMART on SAS drive: {response}")
+                    self._log_debug("Error running SMART on SAS drive: %s", response)
                     ack_response  = "Failed"
                     status_reason = "Failed_smart_failure"
 
@@ -683,7 +692,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                     serial_number == uuid_serial_number:
 
                     # Send an Ack msg back with SMART results
-                    json_msg = AckResponseMsg(request, ack_response, smart_uuid).getJson()
+                    json_msg = AckResponseMsg(request, ack_response, smart_uuid).getEnvelope()
                     self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
                     # Remove from our list
@@ -785,7 +794,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                                 serial_number = tmp_serial[start_index:].strip()
                         else:
                             self._log_debug(
-                                f"_init_drives, couldn't extract serial number from by-id link for drive path {drive['path']}")
+                                "_init_drives, couldn't extract serial number from by-id link for drive path %s", drive['path'])
 
                     if len(serial_number) > 0:
                         # Generate and send an internal msg to DiskMsgHandler that the drive is available
@@ -802,7 +811,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                         self._schedule_SMART_test(drive['path'])
 
             except Exception as ae:
-                self._log_debug(f"_init_drives, Exception: {ae}")
+                self._log_debug("_init_drives, Exception: %s", ae)
 
         # Update the next time to run SMART tests
         self._next_smart_tm = datetime.now() + timedelta(seconds=self._smart_interval)
@@ -825,7 +834,8 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                              dbus_interface='org.freedesktop.DBus.Properties')
 
             if state == "active":
-                self._log_debug(f"Service: {disabled_service} is now active and being monitored!")
+                self._log_debug("Service: %s is now active and being monitored!",
+                                disabled_service)
                 self._service_status[str(disabled_service)] = str(state) + ":" + str(substate)
 
                 # Use the systemd unit to get an Interface to call methods
@@ -853,7 +863,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                 self._service_pids[str(disabled_service)] = curr_pid
 
                 # Send out notification of the state change
-                msgString = json.dumps({"actuator_request_type": {
+                msgString = MsgEnvelope({"actuator_request_type": {
                                     "service_watchdog_controller": {
                                         "service_name" : disabled_service,
                                         "service_request" : "None",
@@ -923,20 +933,22 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
             #self._log_debug("\tstate: %s, substate: %s" % (state, substate))
             return
 
-        self._log_debug(f"_on_prop_changed, Service state change detected on unit: {unit_name}")
+        self._log_debug("_on_prop_changed, Service state change detected on unit: %s",
+                        unit_name)
 
         # get the previous state and substate for the service
         previous_state = self._service_status.get(unit_name, "N/A:N/A").split(":")[0]
         previous_substate = self._service_status.get(unit_name, "N/A:N/A").split(":")[1]
 
-        self._log_debug(f"_on_prop_changed, State: {state}, Substate: {substate}")
-        self._log_debug(f"_on_prop_changed, Previous State: {previous_state}, Previous Substate: {previous_substate}")
+        self._log_debug("_on_prop_changed, State: %s, Substate: %s", state, substate)
+        self._log_debug("_on_prop_changed, Previous State: %s, Previous Substate: %s",
+                        previous_state, previous_substate)
 
         # Update the state in the global dict for later use
         self._service_status[unit_name] = str(state) + ":" + str(substate)
 
         # Notify the service message handler to transmit the status of the service
-        msgString = json.dumps(
+        msgString = MsgEnvelope(
                     {"actuator_request_type": {
                         "service_watchdog_controller": {
                             "service_name" : unit_name,
@@ -959,7 +971,8 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
     def _interface_added(self, object_path, interfaces_and_properties):
         """Callback for when an interface like drive or SMART job has been added"""
         try:
-            self._log_debug(f"Interface Added, Object Path: {object_path}, interfaces_and_properties {interfaces_and_properties}")
+            self._log_debug("Interface Added, Object Path: %s, interfaces_and_properties %s",
+                            object_path, interfaces_and_properties)
             # Handle drives added
             if interfaces_and_properties.get("org.freedesktop.UDisks2.Drive") is not None and \
                 is_physical_drive(interfaces_and_properties.get("org.freedesktop.UDisks2.Drive")):
@@ -1007,11 +1020,12 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                 self._print_interfaces_and_properties(interfaces_and_properties)
 
         except Exception as ae:
-            self._log_debug("_interface_added: Exception: %r" % ae)
+            self._log_debug("_interface_added: Exception: %r", ae)
 
     def _interface_removed(self, object_path, interfaces):
         """Callback for when an interface like drive or SMART job has been removed"""
-        self._log_debug(f"Interface Removed, Object Path: {object_path}, interfaces: {interfaces}")
+        self._log_debug("Interface Removed, Object Path: %s, interfaces: %s",
+                        object_path, interfaces)
         for interface in interfaces:
             try:
                 # Handle drives removed
@@ -1031,13 +1045,14 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                         try:
                             drive = self._drives[object_path][self.DRIVE_DBUS_INFO]
                         except KeyError:
-                            self._log_debug(f"Object is not present in drives info {self._drives.keys()}, ignoring signal")
+                            self._log_debug("Object is not present in drives info %s, ignoring signal",
+                                            self._drives.keys())
                             continue
                         serial_number = str(drive["Serial"])
 
                         self._log_debug("Drive Interface Removed")
-                        self._log_debug(f"  Object Path: {object_path}")
-                        self._log_debug(f"  Serial Number: {serial_number}")
+                        self._log_debug("  Object Path: %s", object_path)
+                        self._log_debug("  Serial Number: %s", serial_number)
 
                         resource_type = self._get_resource_type(object_path)
 
@@ -1062,7 +1077,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                     # Retrieve the saved SMART data when the test was started
                     smart_job = self._smart_jobs.get(object_path)
                     if smart_job is None:
-                        self._log_debug(f"SMART job not found, ignoring: {object_path}")
+                        self._log_debug("SMART job not found, ignoring: %s", object_path)
                         return
                     self._smart_jobs[object_path] = None
 
@@ -1101,8 +1116,9 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                                     response = "Passed"
 
                             self._log_debug("SMART Job Interface Removed")
-                            self._log_debug(f"  Object Path: {object_path}")
-                            self._log_debug(f"  Serial Number: {serial_number}, SMART status: {smart_status}")
+                            self._log_debug("  Object Path: %s", object_path)
+                            self._log_debug("  Serial Number: %s, SMART status: %s",
+                                            serial_number, smart_status)
 
                             # Proccess the SMART result
                             self._process_smart_status(disk_path, smart_status, serial_number)
@@ -1119,7 +1135,7 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
                                     serial_number == uuid_serial_number:
 
                                     # Send an Ack msg back with SMART results
-                                    json_msg = AckResponseMsg(request, response, smart_uuid).getJson()
+                                    json_msg = AckResponseMsg(request, response, smart_uuid).getEnvelope()
                                     self._write_internal_msgQ(RabbitMQegressProcessor.name(), json_msg)
 
                                     # Remove from our list
@@ -1127,10 +1143,10 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
 
                 else:
                     self._log_debug("Systemd Interface Removed")
-                    self._log_debug(f"  Object Path: {object_path}")
+                    self._log_debug("  Object Path: %s", object_path)
 
             except Exception as ae:
-                self._log_debug(f"interface_removed: Exception: {ae}") # Drive was removed during SMART?
+                self._log_debug("interface_removed: Exception: %s", ae) # Drive was removed during SMART?
                 self._log_debug("Possible cause: Job not found because service was recently restarted")
 
     def _process_smart_status(self, disk_path, smart_status, serial_number):
@@ -1145,7 +1161,8 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
             # Ignore if the test was interrupted, not conclusive
             return
         elif smart_status.lower() == "aborted":
-            self._log_debug(f"SMART test aborted on drive, rescheduling: {serial_number}")
+            self._log_debug("SMART test aborted on drive, rescheduling: %s",
+                            serial_number)
             self._schedule_SMART_test(disk_path)
             return
         elif smart_status.lower() == "fatal":
@@ -1270,10 +1287,10 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
             http://dbus.freedesktop.org/doc/dbus-specification.html#standard-interfaces-objectmanager
         """
         for interface_name, properties in list(interfaces_and_properties.items()):
-            self._log_debug(f"  Interface {interface_name}")
+            self._log_debug("  Interface %s", interface_name)
             for prop_name, prop_value in list(properties.items()):
                 prop_value = self._sanitize_dbus_value(prop_value)
-                self._log_debug(f"  {prop_name}: {prop_value}")
+                self._log_debug("  %s: %s", prop_name, prop_value)
 
     def _getSMART_interval(self):
         """Retrieves the frequency to run SMART tests on all the drives"""
@@ -1347,7 +1364,8 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
             response = json.loads(response)
             try:
                 if "No such device" in response["smartctl"]["message"][0]["string"]:
-                    logger.debug(f"SystemdWatchdog, _update_drive_faults, drive {object_path} is removed, ignoring SMART test")
+                    logger.debug("SystemdWatchdog, _update_drive_faults, drive %s is removed, ignoring SMART test",
+                                 object_path)
                     continue
             # If smratctl command is not failing there will be no ["smartctl"]["message"][0]["string"] in response
             except (KeyError, IndexError):
@@ -1416,7 +1434,8 @@ class SystemdWatchdog(SensorThread, InternalMsgQ):
         if retcode == 0:
             return True
         else:
-            logger.debug(f"SystemdWatchdog, _is_local_drive: Error for drive {drive_name}, ERROR: {err}")
+            logger.debug("SystemdWatchdog, _is_local_drive: Error for drive %s, ERROR: %s",
+                         drive_name, err)
             # TODO : In case of different error(other than "SG_IO: bad/missing sense data") for local drives,
             # this check would fail.
             if DISK_ERR_MISSING_SENSE_DATA not in err and DISK_ERR_GET_ID_FAILURE not in err:
@@ -171,7 +171,8 @@ class SMRdriveData(SensorThread, InternalMsgQ):
         try:
             with open(dev, 'r') as fd:
                 if libc.ioctl(fd.fileno(), SG_IO, ctypes.byref(sgio)) != 0:
-                    self._log_debug(f" _send_ATA_command dev: {dev} does not support ATA command, skipping")
+                    self._log_debug(" _send_ATA_command dev: %s does not support ATA command, skipping",
+                                    dev)
                     return
 
                 orig_row = result[64:80]
@@ -45,6 +45,7 @@ class SNMPtraps(SensorThread, InternalMsgQ):
 
     SENSOR_NAME       = "SNMPtraps"
     PRIORITY          = 1
+    DEDICATED_THREAD  = True
 
     # Section and keys in configuration file
     SNMPTRAPS         = SENSOR_NAME.upper()
@@ -114,7 +115,7 @@ class SNMPtraps(SensorThread, InternalMsgQ):
                 # Dispatcher will never finish as job #1 never reaches zero
                 transportDispatcher.runDispatcher()
             except Exception as ae:
-                self._log_debug("Exception: %r" % ae)
+                self._log_debug("Exception: %r", ae)
                 transportDispatcher.closeDispatcher()
 
             self._log_debug("Finished processing, restarting SNMP listener")
@@ -128,7 +129,8 @@ class SNMPtraps(SensorThread, InternalMsgQ):
         # Could not bind to IP:port, log it and exit out module
         except Exception as ae:
             self._log_debug("Unable to process SNMP traps from this node, closing module.")
-            self._log_debug(f"SNMP Traps sensor attempted to bind to {self._bind_ip}:{self._bind_port}")
+            self._log_debug("SNMP Traps sensor attempted to bind to %s:%s",
+                            self._bind_ip, self._bind_port)
 
     def _mib_builder(self):
         """Loads the MIB files and creates dicts with hierarchical structure"""
@@ -141,7 +143,7 @@ class SNMPtraps(SensorThread, InternalMsgQ):
             builder.DirMibSource('/etc/sspl-ll/templates/snmp'),)
         mibBuilder.setMibSources(*mibSources)
 
-        self._log_debug("MIB sources: %s" % str(mibBuilder.getMibSources()))
+        self._log_debug("MIB sources: %s", mibBuilder.getMibSources())
         for module in self._enabled_MIBS:
             mibBuilder.loadModules(module)
         self._mibView = view.MibViewController(mibBuilder)
@@ -154,7 +156,8 @@ class SNMPtraps(SensorThread, InternalMsgQ):
             # Retrieve information in MIB using the OID
             modName, nodeDesc, suffix = self._mibView.getNodeLocation(oid)
             ret_val = val.getComponent().getComponent().getComponent().prettyPrint()
-            self._log_debug(f'module: {modName}, {nodeDesc}: {ret_val}, oid: {oid.prettyPrint()}')
+            self._log_debug("module: %s, %s: %s, oid: %s",
+                            modName, nodeDesc, ret_val, oid.prettyPrint())
 
             # Lookup the trap name from the SNMP Modules MIB
             if nodeDesc == "snmpModules":
@@ -165,9 +168,9 @@ class SNMPtraps(SensorThread, InternalMsgQ):
 
                 oid, label, suffix = self._mibView.getNodeName(tuple_oid)
                 self._trap_name = str(label[-1])
-                self._log_debug(f'Trap Notification: {self._trap_name}')
+                self._log_debug("Trap Notification: %s", self._trap_name)
         except Exception as ae:
-            self._log_debug("_mib_oid_value: %r" % ae)
+            self._log_debug("_mib_oid_value: %r", ae)
         return (nodeDesc, ret_val)
 
     def _trap_catcher(self, transportDispatcher, transportDomain, transportAddress, wholeMsg):
@@ -180,25 +183,31 @@ class SNMPtraps(SensorThread, InternalMsgQ):
             if msgVer in api.protoModules:
                 pMod = api.protoModules[msgVer]
             else:
-                self._log_debug(f'Unsupported SNMP version {msgVer}')
+                self._log_debug("Unsupported SNMP version %s", msgVer)
                 return
 
             reqMsg, wholeMsg = decoder.decode(
                 wholeMsg, asn1Spec=pMod.Message(),)
-            self._log_debug(f'Notification message from {transportDomain}:{transportAddress}: ')
+            self._log_debug("Notification message from %s:%s: ",
+                            transportDomain, transportAddress)
 
             reqPDU = pMod.apiMessage.getPDU(reqMsg)
             if reqPDU.isSameTypeWith(pMod.TrapPDU()):
                 if msgVer == api.protoVersion1:
-                    self._log_debug(f'Enterprise: {pMod.apiTrapPDU.getEnterprise(reqPDU).prettyPrint()}')
+                    self._log_debug("Enterprise: %s",
+                                    pMod.apiTrapPDU.getEnterprise(reqPDU).prettyPrint())
 
-                    self._log_debug(f'Agent Address: {pMod.apiTrapPDU.getAgentAddr(reqPDU).prettyPrint()}')
+                    self._log_debug("Agent Address: %s",
+                                    pMod.apiTrapPDU.getAgentAddr(reqPDU).prettyPrint())
 
-                    self._log_debug(f'Generic Trap: {pMod.apiTrapPDU.getGenericTrap(reqPDU).prettyPrint()}')
+                    self._log_debug("Generic Trap: %s",
+                                    pMod.apiTrapPDU.getGenericTrap(reqPDU).prettyPrint())
 
-                    self._log_debug(f'Specific Trap: {pMod.apiTrapPDU.getSpecificTrap(reqPDU).prettyPrint()}')
+                    self._log_debug("Specific Trap: %s",
+                                    pMod.apiTrapPDU.getSpecificTrap(reqPDU).prettyPrint())
 
-                    self._log_debug(f'Uptime: {pMod.apiTrapPDU.getTimeStamp(reqPDU).prettyPrint()}')
+                    self._log_debug("Uptime: %s",
+                                    pMod.apiTrapPDU.getTimeStamp(reqPDU).prettyPrint())
 
                     varBinds = pMod.apiTrapPDU.getVarBindList(reqPDU)
                 else:
@@ -211,8 +220,8 @@ class SNMPtraps(SensorThread, InternalMsgQ):
                     if nodeDesc != "N/A" and ret_val != "N/A":
                         json_data[nodeDesc] = ret_val
 
-        self._log_debug(f"trap_name: {self._trap_name}")
-        self._log_debug(f"enabled_traps: {self._enabled_traps}")
+        self._log_debug("trap_name: %s", self._trap_name)
+        self._log_debug("enabled_traps: %s", self._enabled_traps)
 
         # Apply filter unless there is an asterisk in the list
         if '*' in self._enabled_traps or \
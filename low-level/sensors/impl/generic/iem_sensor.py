@@ -175,7 +175,8 @@ class IEMSensor(SensorThread, InternalMsgQ):
 
         except IOError as io_error:
             if io_error.errno == errno.ENOENT:
-                logger.debug(f"IEMSensor, self.run, {io_error.args} {io_error.filename}")
+                logger.debug("IEMSensor, self.run, %s %s",
+                             io_error.args, io_error.filename)
             elif io_error.errno == errno.EACCES:
                 logger.error(f"IEMSensor, self.run, {io_error.args} {io_error.filename}")
             else:
@@ -207,7 +208,7 @@ class IEMSensor(SensorThread, InternalMsgQ):
         iem_msg = self._get_iem(iem_log)
         iem_components = self._extract_iem_components(iem_msg)
         if iem_components:
-            logger.debug("IEM mesage {} {}".format(log_timestamp, iem_components))
+            logger.debug("IEM mesage %s %s", log_timestamp, iem_components)
             self._send_msg(iem_components, log_timestamp)
         with open(self._timestamp_file_path, "w") as timestamp_file:
             timestamp_file.write(log_timestamp)
@@ -97,7 +97,7 @@ class NodeData(Debug):
     def read_data(self, subset, debug, units="MB"):
         """Updates data based on a subset"""
         self._set_debug(debug)
-        self._log_debug("read_data, subset: %s, units: %s" % (subset, units))
+        self._log_debug("read_data, subset: %s, units: %s", subset, units)
 
         try:
             # Determine the units factor value
@@ -177,7 +177,8 @@ class NodeData(Debug):
         """Retrieves node information for the cpu_data json message"""
         cpu_core_usage_dict = dict()
         cpu_data = psutil.cpu_times_percent()
-        self._log_debug("_get_cpu_data, cpu_data: %s %s %s %s %s %s %s %s %s %s" % cpu_data)
+        self._log_debug("_get_cpu_data, cpu_data: %s %s %s %s %s %s %s %s %s %s",
+                        *cpu_data)
 
         self.csps           = 0  # What the hell is csps - cycles per second?
         self.user_time      = int(cpu_data[0])
@@ -194,11 +195,11 @@ class NodeData(Debug):
         self.cpu_core_data = []
         index = 0
         while index < self.cpus:
-            self._log_debug("_get_cpu_data, index: %s, 1 min: %s, 5 min: %s, 15 min: %s" %
-                            (index,
+            self._log_debug("_get_cpu_data, index: %s, 1 min: %s, 5 min: %s, 15 min: %s",
+                            index,
                             self.load_1min_average[index],
                             self.load_5min_average[index],
-                            self.load_15min_average[index]))
+                            self.load_15min_average[index])
 
             cpu_core_data = {"coreId"      : index,
                              "load1MinAvg" : int(self.load_1min_average[index]),
@@ -216,7 +217,7 @@ class NodeData(Debug):
         self.if_data = []
         bmc_data = self._get_bmc_info()
         for interface, if_data in net_data.items():
-            self._log_debug("_get_if_data, interface: %s %s" % (interface, net_data))
+            self._log_debug("_get_if_data, interface: %s %s", interface, net_data)
             nw_status = self._fetch_nw_status()
             nw_cable_conn_status = self.fetch_nw_cable_conn_status(interface)
             if_data = {"ifId" : interface,
@@ -244,7 +245,7 @@ class NodeData(Debug):
             else:
                 ip = ""
             nw_dict[nw.split(' ')[0]] = [nw.split(' ')[1], ip]
-        logger.debug("network info going is : {}".format(nw_dict))
+        logger.debug("network info going is : %s", nw_dict)
         return nw_dict
 
     def fetch_nw_cable_conn_status(self, interface):
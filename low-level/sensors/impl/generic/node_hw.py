@@ -378,7 +378,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
                     free = free + entries
 
                     used = (100 * entries) / free
-                    logger.debug(f"SEL % Used: calculated {used}%")
+                    logger.debug("SEL %% Used: calculated %s%%", used)
 
             if used > self.SEL_USAGE_THRESHOLD:
                 logger.warning(f"SEL usage above threshold {self.SEL_USAGE_THRESHOLD}%, \
@@ -508,8 +508,8 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
                 in self._get_sel_event():
 
             is_last = (last_fru_index[device_type] == index)
-            logger.debug(f"_notify_NodeDataMsgHandler '{device_type}': is_last: \
-                                        {is_last}, sel_event: {(index, date, event_time, device_id, event, status)}")
+            logger.debug("_notify_NodeDataMsgHandler '%s': is_last: %s, sel_event: %s",
+                         device_type, is_last, (index, date, event_time, device_id, event, status))
             # TODO: Also use information from the command
             # 'ipmitool sel get <sel-entry-id>'
             # which gives more detailed information
@@ -181,7 +181,8 @@ class RAIDsensor(SensorThread, InternalMsgQ):
 
         # Do nothing if the RAID status file has not changed
         if self._RAID_status_contents == status:
-            self._log_debug(f"_notify_NodeDataMsgHandler status unchanged, ignoring: {status}")
+            self._log_debug("_notify_NodeDataMsgHandler status unchanged, ignoring: %s",
+                            status)
             return
 
         # Update the RAID status contents of file
@@ -277,7 +278,7 @@ class RAIDsensor(SensorThread, InternalMsgQ):
             if "md" in fields[0]:
                 self._device = f"/dev/{fields[0]}"
                 self._devices.append(self._device)
-                self._log_debug(f"md device found: {self._device}")
+                self._log_debug("md device found: %s", self._device)
                 md_device_list.append(self._device)
                 drive_dict[self._device] = []
                 if self._device not in self.prev_alert_type:
@@ -310,13 +311,14 @@ class RAIDsensor(SensorThread, InternalMsgQ):
         response, error = self._run_command(detail_command)
 
         if error:
-            self._log_debug(f"_add_drive, Error retrieving drive index into status, example: [U_]: {str(error)}")
+            self._log_debug("_add_drive, Error retrieving drive index into status, example: [U_]: %s",
+                            error)
         try:
             drive_index = int(response.split(" ")[-1])
         except Exception as ae:
-            self._log_debug(f"_add_drive, get drive_index error: {str(ae)}")
+            self._log_debug("_add_drive, get drive_index error: %s", ae)
             return
-        self._log_debug(f"_add_drive, drive index: {drive_index}, path: {drive_path}")
+        self._log_debug("_add_drive, drive index: %s, path: %s", drive_index, drive_path)
 
         # Create the json msg, serial number will be filled in by NodeDataMsgHandler
         identity_data = {
@@ -337,15 +339,16 @@ class RAIDsensor(SensorThread, InternalMsgQ):
             return False
 
         self._total_drives[device] = int(status_line[first_bracket_index + 1])
-        self._log_debug("_parse_raid_status, total_drives: %d" % self._total_drives[device])
+        self._log_debug("_parse_raid_status, total_drives: %d",
+                        self._total_drives[device])
 
         # Break the line apart into separate fields
         fields = status_line.split(" ")
 
         # The last field is the list of U & _
         status = fields[-1]
-        self._log_debug("_parse_raid_status, status: %s, total drives: %d" %
-                        (status, self._total_drives[device]))
+        self._log_debug("_parse_raid_status, status: %s, total drives: %d",
+                        status, self._total_drives[device])
 
         # Array of raid drives in json format based on schema
         self._drives[device] = []
@@ -365,18 +368,19 @@ class RAIDsensor(SensorThread, InternalMsgQ):
             else:
                drive_status_msg = {"status" : status[drive_index + 1]}  # Move past '['
 
-            self._log_debug(f"_parse_raid_status, drive_index: {drive_index}")
-            self._log_debug(f"_parse_raid_status, drive_status_msg: {drive_status_msg}")
+            self._log_debug("_parse_raid_status, drive_index: %s", drive_index)
+            self._log_debug("_parse_raid_status, drive_status_msg: %s", drive_status_msg)
             self._drives[device].append(drive_status_msg)
 
             drive_index = drive_index + 1
 
         # See if the status line has changed, if not there's nothing to do
         if device in self._RAID_status and self._RAID_status[device] == status:
-            self._log_debug(f"RAID status has not changed, ignoring: {status}")
+            self._log_debug("RAID status has not changed, ignoring: %s", status)
             return False
         else:
-            self._log_debug(f"RAID status has changed, old: {self._RAID_status}, new: {status}")
+            self._log_debug("RAID status has changed, old: %s, new: %s",
+                            self._RAID_status, status)
             self._RAID_status[device] = status
 
         return True
@@ -406,8 +410,8 @@ class RAIDsensor(SensorThread, InternalMsgQ):
                     else:
                         conf_device_list.append(raid_conf_field[1])
             except Exception as ae:
-                self._log_debug(f"_process_missing_md_devices, error retrieving raid entry    \
-                 from {self.RAID_CONF_FILE} file: {str(ae)}")
+                self._log_debug("_process_missing_md_devices, error retrieving raid entry from %s file: %s",
+                                self.RAID_CONF_FILE, ae)
                 return
 
         # compare conf file raid array list with mdstat raid array list
@@ -526,14 +530,14 @@ class RAIDsensor(SensorThread, InternalMsgQ):
 
     def _run_command(self, command):
         """Run the command and get the response and error returned"""
-        self._log_debug(f"_run_command: {command}")
+        self._log_debug("_run_command: %s", command)
         process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         response, error = process.communicate()
 
         if response:
-            self._log_debug(f"_run_command, response: {str(response)}")
+            self._log_debug("_run_command, response: %s", response)
         if error:
-            self._log_debug(f"_run_command: error: {str(error)}")
+            self._log_debug("_run_command: error: %s", error)
 
         return response.decode().rstrip('\n'), error.decode().rstrip('\n')
 
@@ -47,6 +47,7 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
 
     SENSOR_NAME       = "RAIDIntegritySensor"
     PRIORITY          = 1
+    DEDICATED_THREAD  = True
     RESOURCE_TYPE     = "node:os:raid_integrity"
 
     # Section and keys in configuration file
@@ -155,7 +156,7 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
             devices = self._get_devices()
             if len(devices) == 0:
                 return
-            logger.debug("Fetched devices:{}".format(devices))
+            logger.debug("Fetched devices:%s", devices)
             
             for device in devices:
                 # Update the state as 'check' for RAID device file
@@ -195,8 +196,7 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
 
                     # Retry to check mismatch_cnt
                     self._retry_execution(self._check_mismatch_count, device)
-                logger.debug("No mismatch count is found in Raid device:{}"
-                            .format(device))
+                logger.debug("No mismatch count is found in Raid device:%s", device)
 
         except Exception as ae:
             logger.error("Failed in monitoring RAID health. ERROR:{}"
@@ -226,8 +226,7 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
             raid_dir = RaidDataConfig.DIR.value
             mismatch_cnt_file = RaidDataConfig.MISMATCH_COUNT_FILE.value
             MISMATCH_COUNT_COMMAND = 'cat ' + raid_dir + device + mismatch_cnt_file
-            logger.debug('Executing MISMATCH_CNT_COMMAND:{}'
-                         .format(MISMATCH_COUNT_COMMAND))
+            logger.debug("Executing MISMATCH_CNT_COMMAND:%s", MISMATCH_COUNT_COMMAND)
             response, error = self._run_command(MISMATCH_COUNT_COMMAND)
             if error:
                 logger.error("Error in cmd{} in raid health monitor"
@@ -250,8 +249,8 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
                             self._update_fault_state_file(device, self.FAULT_RESOLVED, fault_status_file)
             else:
                 status = "failed"
-                logger.debug("Mismatch found in {} file in raid_integrity_data!"
-                             .format(mismatch_cnt_file))
+                logger.debug("Mismatch found in %s file in raid_integrity_data!",
+                             mismatch_cnt_file)
             return status
         except Exception as ae:
             logger.error("Failed in checking mismatch_cnt in RAID file. ERROR:{}"
@@ -267,7 +266,7 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
             while raid_check <= RaidDataConfig.MAX_RETRIES.value:
                 self.output_file = self._get_unique_filename(RaidDataConfig.RAID_RESULT_FILE_PATH.value, device)
                 STATE_COMMAND = 'cat ' + raid_dir + device + sync_action_file
-                logger.debug('Executing STATE_COMMAND:{}'.format(STATE_COMMAND))
+                logger.debug("Executing STATE_COMMAND:%s", STATE_COMMAND)
                 response, error = self._run_command(STATE_COMMAND)
                 if error:
                     logger.warn("Error in cmd{} in raid health monitor"
@@ -297,7 +296,7 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
             sync_action_file = RaidDataConfig.SYNC_ACTION_FILE.value
             while raid_check <= RaidDataConfig.MAX_RETRIES.value:
                 CHECK_COMMAND = "echo 'check' |sudo tee " + raid_dir + device + sync_action_file + " > /dev/null"
-                logger.debug('Executing CHECK_COMMAND:{}'.format(CHECK_COMMAND))
+                logger.debug("Executing CHECK_COMMAND:%s", CHECK_COMMAND)
                 response, error = self._run_command(CHECK_COMMAND)
                 if error:
                     logger.warn("Failed in executing command:{}."
@@ -305,7 +304,8 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
                     raid_check += 1
                     time.sleep(1)
                 else:
-                    logger.debug("RAID device state is changed to 'check' with response : {}".format(response))
+                    logger.debug("RAID device state is changed to 'check' with response : %s",
+                                 response)
                     status = "success"
                     break
             return status
@@ -316,8 +316,8 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
 
     def _retry_execution(self, function_call, device):
         while True:
-            logger.debug("Executing function:{} after {} time interval"
-                         .format(function_call, RaidDataConfig.NEXT_ITERATION_TIME.value))
+            logger.debug("Executing function:%s after %s time interval",
+                         function_call, RaidDataConfig.NEXT_ITERATION_TIME.value)
             time.sleep(RaidDataConfig.NEXT_ITERATION_TIME.value)
             result = function_call(device)
             if result == self.SUCCESS:
@@ -391,13 +391,13 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
 
     def _run_command(self, command):
         """Run the command and get the response and error returned"""
-        logger.debug(f"_run_command: {command}")
+        logger.debug("_run_command: %s", command)
         process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         response, error = process.communicate()
         if response:
-            logger.debug(f"_run_command, response: {str(response)}")
+            logger.debug("_run_command, response: %s", response)
         if error:
-            logger.debug(f"_run_command: error: {str(error)}")
+            logger.debug("_run_command: error: %s", error)
 
         return response.decode().rstrip('\n'), error.decode().rstrip('\n')
 
@@ -409,7 +409,7 @@ class RAIDIntegritySensor(SensorThread, InternalMsgQ):
         dir_path = path[:path.rindex("/")]
         if not os.path.exists(dir_path):
             os.makedirs(dir_path)
-            logger.debug("{} in creation of dir path : {}".format(self.SUCCESS, dir_path))
+            logger.debug("%s in creation of dir path : %s", self.SUCCESS, dir_path)
         if not os.path.exists(path):
             file = open(path, "w+")
             file.close()
@@ -36,6 +36,7 @@ from framework.utils.conf_utils import (POLLING_FREQUENCY_OVERRIDE, SSPL_CONF,
 from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import store
+from framework.utils import json_codec
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
 from sensors.Icontroller import IControllersensor
@@ -179,7 +180,7 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
                      err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_codec.loads(response.content)
         controllers = response_data.get("controllers")
         return controllers
 
@@ -282,7 +283,7 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
                 # Wait till msg is sent to rabbitmq or added in consul for resending.
                 # If timed out, do not update cache and revert in-memory cache.
                 # So, in next iteration change can be detected
-                if self._event.wait(self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
+                if self._wait_msg_delivered(self._event, self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
                     store.put(self._previously_faulty_controllers,\
                         self._faulty_controller_file_path)
                 else:
@@ -36,6 +36,7 @@ from framework.utils.conf_utils import (POLLING_FREQUENCY_OVERRIDE, SSPL_CONF,
 from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import store
+from framework.utils import json_codec
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
 from sensors.Ilogicalvolume import ILogicalVolumesensor
@@ -244,7 +245,7 @@ class RealStorLogicalVolumeSensor(SensorThread, InternalMsgQ):
                      err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_codec.loads(response.content)
         disk_groups = response_data.get("disk-groups")
         return disk_groups
 
@@ -268,7 +269,7 @@ class RealStorLogicalVolumeSensor(SensorThread, InternalMsgQ):
                  err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_codec.loads(response.content)
         logical_volumes = response_data.get("volumes")
         return logical_volumes
 
@@ -333,7 +334,7 @@ class RealStorLogicalVolumeSensor(SensorThread, InternalMsgQ):
                 # Wait till msg is sent to rabbitmq or added in consul for resending.
                 # If timed out, do not update cache and revert in-memory cache.
                 # So, in next iteration change can be detected
-                if self._event.wait(self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
+                if self._wait_msg_delivered(self._event, self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
                     store.put(self._previously_faulty_disk_groups,\
                         self._faulty_disk_group_file_path)
                 else:
@@ -404,7 +405,7 @@ class RealStorLogicalVolumeSensor(SensorThread, InternalMsgQ):
                 # Wait till msg is sent to rabbitmq or added in consul for resending.
                 # If timed out, do not update cache and revert in-memory cache.
                 # So, in next iteration change can be detected
-                if self._event.wait(self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
+                if self._wait_msg_delivered(self._event, self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
                     store.put(self._previously_faulty_logical_volumes,\
                         self._faulty_logical_volume_file_path)
                 else:
@@ -39,6 +39,7 @@ from framework.utils.conf_utils import (POLLING_FREQUENCY_OVERRIDE, SSPL_CONF,
 from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import store
+from framework.utils import json_codec
 from message_handlers.logging_msg_handler import LoggingMsgHandler
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
@@ -260,7 +261,7 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
             self._rss_raise_disk_alert(self.rssencl.FRU_MISSING, disk_info)
             # Wait till msg is sent to rabbitmq or added in consul for resending.
             # If timed out, do not update cache
-            if self._event.wait(self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
+            if self._wait_msg_delivered(self._event, self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
                 store.delete(disk_datafile)
             self._event.clear()
         self._event = None
@@ -306,7 +307,7 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
             return
 
         try:
-            jresponse = json.loads(response.content)
+            jresponse = json_codec.loads(response.content)
         except ValueError as badjson:
             logger.error(f"{url} returned mal-formed json:\n{badjson}")
 
@@ -327,6 +328,19 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
                 self.latest_disks = {}
                 self.invalidate_latest_disks_info = False
 
+                # Read the persistent cache of all the drives in one batch
+                dcache_paths = [f"{self.disks_prcache}disk_{drive.get('slot')}.json"
+                                for drive in drives if drive.get("slot", -1) != -1]
+                prevdrives = store.get_many(dcache_paths)
+                if prevdrives is None:
+                    # Invalidate latest disks info if persistence store error encountered
+                    logger.warn(f"store.get_many {self.disks_prcache} failed")
+                    self.invalidate_latest_disks_info = True
+                    prevdrives = {}
+                    drives = []
+
+                # Persistent cache updates, written in one batch
+                updates = {}
                 for drive in drives:
                     slot = drive.get("slot", -1)
                     sn = drive.get("serial-number", "NA")
@@ -341,27 +355,19 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
                         # If drive is replaced, previous drive info needs
                         # to be retained in disk_<slot>.json.prev file and
                         # then only dump new data to disk_<slot>.json
-                        path_exists, ret_val = store.exists(dcache_path)
-                        if path_exists and ret_val == "Success":
-                            prevdrive = store.get(dcache_path)
-
-                            if prevdrive is not None:
-                                prevsn = prevdrive.get("serial-number","NA")
-                                prevhealth = prevdrive.get("health", "NA")
-
-                                if prevsn != sn or prevhealth != health:
-                                    # Rename path
-                                    store.put(store.get(dcache_path), dcache_path + ".prev")
-                                    store.delete(dcache_path)
-
-                                    store.put(drive, dcache_path)
-                        elif not path_exists and ret_val == "Success":
-                            store.put(drive, dcache_path)
+                        prevdrive = prevdrives.get(dcache_path)
+                        if prevdrive is not None:
+                            prevsn = prevdrive.get("serial-number","NA")
+                            prevhealth = prevdrive.get("health", "NA")
+
+                            if prevsn != sn or prevhealth != health:
+                                updates[dcache_path + ".prev"] = prevdrive
+                                updates[dcache_path] = drive
                         else:
-                            # Invalidate latest disks info if persistence store error encountered
-                            logger.warn(f"store.exists {dcache_path} return value {ret_val}")
-                            self.invalidate_latest_disks_info = True
-                            break
+                            updates[dcache_path] = drive
+
+                if updates:
+                    store.put_many(updates)
 
                 if self.invalidate_latest_disks_info is True:
                     # Reset latest disks info
@@ -379,7 +385,7 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
     def _rss_build_disk_cache_from_persistent_cache(self):
         """Retreive realstor system state info using cli api /show/system"""
 
-        files = store.get_keys_with_prefix(self.disks_prcache)
+        files = store.get_all_with_prefix(self.disks_prcache)
 
         if not files:
             logger.debug("No files in Disk cache folder, ignoring")
@@ -389,11 +395,11 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
             if filename.startswith('disk_') and filename.endswith('.json'):
                 if f"{filename}.prev" in files:
                     filename = f"{filename}.prev"
-                drive = store.get(self.disks_prcache + filename)
+                drive = files[filename]
                 slotstr = re.findall("disk_(\d+).json", filename)[0]
 
                 if not slotstr.isdigit():
-                    logger.debug(f"slot {slotstr} not numeric, ignoring")
+                    logger.debug("slot %s not numeric, ignoring", slotstr)
                     continue
 
                 slot = int(slotstr)
@@ -442,7 +448,7 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
                                 self._rss_raise_disk_alert(self.rssencl.FRU_FAULT, disk_info)
                                 # To ensure all msg is sent to rabbitmq or added in consul for resending.
                                 self._event_wait_results.add(
-                                    self._event.wait(self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT))
+                                    self._wait_msg_delivered(self._event, self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT))
                                 self._event.clear() 
 
             # Check for resolved faults
@@ -463,7 +469,7 @@ class RealStorDiskSensor(SensorThread, InternalMsgQ):
                         self._rss_raise_disk_alert(self.rssencl.FRU_FAULT_RESOLVED, disk_info)
                         # To ensure all msg is sent to rabbitmq or added in consul for resending.
                         self._event_wait_results.add(
-                                    self._event.wait(self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT))
+                                    self._wait_msg_delivered(self._event, self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT))
                         self._event.clear()
             # If all messages are sent to rabbitmq or added in consul for resending.
             # then only update cache
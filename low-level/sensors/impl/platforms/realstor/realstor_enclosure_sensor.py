@@ -30,6 +30,7 @@ from framework.base.module_thread import SensorThread
 from framework.base.internal_msgQ import InternalMsgQ
 from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
+from framework.utils import json_codec
 from framework.platforms.realstor.realstor_enclosure import singleton_realstorencl
 
 # Modules that receive messages from this module
@@ -177,7 +178,7 @@ class RealStorEnclosureSensor(SensorThread, InternalMsgQ):
                                 failed with http err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_codec.loads(response.content)
         enclosure_status = response_data["events"]
 
         return enclosure_status
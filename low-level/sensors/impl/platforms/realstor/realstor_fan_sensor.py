@@ -37,6 +37,7 @@ from framework.utils.conf_utils import (POLLING_FREQUENCY_OVERRIDE, SSPL_CONF,
 from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import store
+from framework.utils import json_codec
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
 from sensors.Ifan import IFANsensor
@@ -201,7 +202,7 @@ class RealStorFanSensor(SensorThread, InternalMsgQ):
                     # Wait till msg is sent to rabbitmq or added in consul for resending.
                     # If timed out, do not update cache and revert in-memory cache.
                     # So, in next iteration change can be detectedcted
-                    if self._event.wait(self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
+                    if self._wait_msg_delivered(self._event, self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
                         store.put(self._faulty_fan_modules_list,\
                             self._faulty_fan_file_path)
                     else:
@@ -238,7 +239,7 @@ class RealStorFanSensor(SensorThread, InternalMsgQ):
                                {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_codec.loads(response.content)
 
         fan_modules_list = response_data["fan-modules"]
         return fan_modules_list
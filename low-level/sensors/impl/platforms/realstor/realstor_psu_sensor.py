@@ -37,6 +37,7 @@ from framework.utils.conf_utils import (POLLING_FREQUENCY_OVERRIDE, SSPL_CONF,
 from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import store
+from framework.utils import json_codec
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
 from sensors.Ipsu import IPSUsensor
@@ -114,7 +115,7 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
         self._faulty_psu_file_path = os.path.join(
             self.psu_prcache, "psudata.json")
         self._log_debug(
-            f"_faulty_psu_file_path: {self._faulty_psu_file_path}")
+            "_faulty_psu_file_path: %s", self._faulty_psu_file_path)
 
         # Load faulty PSU data from file if available
         self._previously_faulty_psus = store.get(\
@@ -179,7 +180,7 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
                                        with err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_codec.loads(response.content)
         psus = response_data.get("power-supplies")
         return psus
 
@@ -188,7 +189,7 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
            sent to handler if there are any.
         """
         self._log_debug(
-            f"RealStorPSUSensor._get_msgs_for_faulty_psus -> {psus} {send_message}")
+            "RealStorPSUSensor._get_msgs_for_faulty_psus -> %s %s", psus, send_message)
         faulty_psu_messages = []
         internal_json_msg = None
         psu_health = None
@@ -205,7 +206,7 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
             psu_health_reason = psu["health-reason"]
             # Check for missing and fault case
             if psu_health == self.rssencl.HEALTH_FAULT:
-                self._log_debug("Found fault in PSU {0}".format(durable_id))
+                self._log_debug("Found fault in PSU %s", durable_id)
                 alert_type = self.rssencl.FRU_FAULT
                 # Check for removal
                 if self._check_if_psu_not_installed(psu_health_reason):
@@ -223,7 +224,7 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
                         self._send_json_msg(internal_json_msg)
             # Check for fault case
             elif psu_health == self.rssencl.HEALTH_DEGRADED:
-                self._log_debug("Found degraded in PSU {0}".format(durable_id))
+                self._log_debug("Found degraded in PSU %s", durable_id)
                 state_changed = durable_id not in self._previously_faulty_psus
                 if state_changed:
                     alert_type = self.rssencl.FRU_FAULT
@@ -237,7 +238,7 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
                         self._send_json_msg(internal_json_msg)
             # Check for healthy case
             elif psu_health == self.rssencl.HEALTH_OK:
-                self._log_debug("Found ok in PSU {0}".format(durable_id))
+                self._log_debug("Found ok in PSU %s", durable_id)
                 state_changed = durable_id in self._previously_faulty_psus
                 if state_changed:
                     # Send message to handler
@@ -258,7 +259,7 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
                 # Wait till msg is sent to rabbitmq or added in consul for resending.
                 # If timed out, do not update cache and revert in-memory cache.
                 # So, in next iteration change can be detected
-                if self._event.wait(self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
+                if self._wait_msg_delivered(self._event, self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
                     store.put(self._previously_faulty_psus,\
                         self._faulty_psu_file_path)
                 else:
@@ -299,7 +300,7 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
            message handler.
         """
         self._log_debug(
-            f"RealStorPSUSensor._create_internal_msg -> {psu_detail} {alert_type}")
+            "RealStorPSUSensor._create_internal_msg -> %s %s", psu_detail, alert_type)
         if not psu_detail:
             return {}
 
@@ -379,7 +380,7 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
     def _send_json_msg(self, json_msg):
         """Sends JSON message to Handler"""
         self._log_debug(
-            "RealStorPSUSensor._send_json_msg -> {0}".format(json_msg))
+            "RealStorPSUSensor._send_json_msg -> %s", json_msg)
         if not json_msg:
             return
         self._event.clear()
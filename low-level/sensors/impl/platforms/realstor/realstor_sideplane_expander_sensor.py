@@ -36,6 +36,7 @@ from framework.utils.conf_utils import (POLLING_FREQUENCY_OVERRIDE, SSPL_CONF,
 from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import store
+from framework.utils import json_codec
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
 from sensors.ISideplane_expander import ISideplaneExpandersensor
@@ -170,7 +171,7 @@ class RealStorSideplaneExpanderSensor(SensorThread, InternalMsgQ):
                                       err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_codec.loads(response.content)
         encl_drawers = response_data["enclosures"][0]["drawers"]
         if encl_drawers:
             for drawer in encl_drawers:
@@ -238,7 +239,7 @@ class RealStorSideplaneExpanderSensor(SensorThread, InternalMsgQ):
                     # Wait till msg is sent to rabbitmq or added in consul for resending.
                     # If timed out, do not update cache and revert in-memory cache.
                     # So, in next iteration change can be detected
-                    if self._event.wait(self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
+                    if self._wait_msg_delivered(self._event, self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
                         store.put(\
                             self._faulty_sideplane_expander_dict,\
                             self._faulty_sideplane_expander_file_path)
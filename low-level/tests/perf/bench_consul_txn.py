@@ -0,0 +1,173 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Compares ConsulStore reading and writing keys one HTTP
+                    request each with the /v1/txn batches of get_many(),
+                    put_many() and delete_many(), against a local fake
+                    consul KV server adding latency_ms to each request.
+                    Then times calls to an unreachable consul once the
+                    circuit breaker opened.
+
+  Usage:             python3 tests/perf/bench_consul_txn.py [num_keys] [latency_ms]
+ ****************************************************************************
+"""
+
+import base64
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils import consulstore
+from framework.utils.consulstore import ConsulStore
+
+
+class FakeConsulHandler(BaseHTTPRequestHandler):
+    """KV and txn endpoints of consul, enough for ConsulStore"""
+
+    kv = {}
+    latency = 0
+    requests = 0
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _begin(self):
+        FakeConsulHandler.requests += 1
+        time.sleep(self.latency)
+        url = urlparse(self.path)
+        return url.path, parse_qs(url.query, keep_blank_values=True)
+
+    def _entry(self, key):
+        value = self.kv[key]
+        return {"Key": key, "Flags": 0, "ModifyIndex": 1, "CreateIndex": 1,
+                "LockIndex": 0, "Value": base64.b64encode(value).decode()}
+
+    def do_GET(self):
+        path, query = self._begin()
+        key = path[len("/v1/kv/"):]
+        if "recurse" in query:
+            keys = sorted(k for k in self.kv if k.startswith(key))
+        else:
+            keys = [key] if key in self.kv else []
+        if not keys:
+            self._reply(404, None)
+        else:
+            self._reply(200, [self._entry(k) for k in keys])
+
+    def do_PUT(self):
+        path, _ = self._begin()
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if path == "/v1/txn":
+            self._txn(json.loads(body))
+        else:
+            self.kv[path[len("/v1/kv/"):]] = body
+            self._reply(200, True)
+
+    def do_DELETE(self):
+        path, _ = self._begin()
+        self.kv.pop(path[len("/v1/kv/"):], None)
+        self._reply(200, True)
+
+    def _txn(self, ops):
+        if len(ops) > ConsulStore.TXN_MAX_OPS:
+            self._reply(413, None)
+            return
+        errors = [{"OpIndex": index, "What": 'key "%s" doesn\'t exist' % op["KV"]["Key"]}
+                  for index, op in enumerate(ops)
+                  if op["KV"]["Verb"] == "get" and op["KV"]["Key"] not in self.kv]
+        if errors:
+            self._reply(409, {"Results": None, "Errors": errors})
+            return
+        results = []
+        for op in ops:
+            kv = op["KV"]
+            if kv["Verb"] == "set":
+                self.kv[kv["Key"]] = base64.b64decode(kv["Value"])
+                results.append({"KV": dict(self._entry(kv["Key"]), Value=None)})
+            elif kv["Verb"] == "get":
+                results.append({"KV": self._entry(kv["Key"])})
+            elif kv["Verb"] == "delete":
+                self.kv.pop(kv["Key"], None)
+        self._reply(200, {"Results": results, "Errors": None})
+
+
+def timed(label, num_keys, func):
+    requests = FakeConsulHandler.requests
+    start = time.time()
+    func()
+    elapsed = time.time() - start
+    print("%-24s keys=%-5d %8.1f ms  %5d requests" %
+          (label, num_keys, elapsed * 1000, FakeConsulHandler.requests - requests))
+
+
+def main():
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    FakeConsulHandler.latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.002
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeConsulHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    store = ConsulStore("127.0.0.1", server.server_address[1])
+
+    keys = ["sspl/bench/disks/disk_%s.json" % i for i in range(num_keys)]
+    drive = {"serial-number": "ZC1234567", "health": "OK", "slot": 0}
+    missing = keys + ["sspl/bench/disks/missing"]
+
+    timed("put per key", num_keys, lambda: [store.put(drive, key) for key in keys])
+    timed("get per key", num_keys, lambda: [store.get(key) for key in missing])
+    timed("delete per key", num_keys, lambda: [store.delete(key) for key in keys])
+
+    timed("put_many txn", num_keys, lambda: store.put_many({key: drive for key in keys}))
+    values = {}
+    timed("get_many txn", num_keys, lambda: values.update(store.get_many(missing)))
+    assert values[keys[-1]] == drive and values[missing[-1]] is None
+    timed("delete_many txn", num_keys, lambda: store.delete_many(keys))
+    assert not FakeConsulHandler.kv
+    server.shutdown()
+    server.server_close()
+
+    # Consul down: the breaker opens after BREAKER_FAILURES connection errors
+    consulstore.WAIT_BEFORE_RETRY = 0.1
+    down = ConsulStore("127.0.0.1", server.server_address[1])
+    start = time.time()
+    down.get(keys[0])
+    print("%-24s %8.1f ms  breaker %s" % ("first call, consul down",
+          (time.time() - start) * 1000, down.stats()["breaker"]["state"]))
+    start = time.time()
+    for key in keys:
+        down.get(key)
+    print("%-24s %8.1f ms for %s calls" % ("later calls, consul down",
+          (time.time() - start) * 1000, num_keys))
+
+
+if __name__ == "__main__":
+    main()
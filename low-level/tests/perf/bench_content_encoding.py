@@ -0,0 +1,92 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Measures the content encodings of the egress processor
+                    on the bodies of RealStor show disks actuator responses:
+                    bytes published per message, time to compress them on
+                    egress and to decode and parse them again on ingress.
+
+  Usage:             python3 tests/perf/bench_content_encoding.py [num_msgs] [num_drives]
+ ****************************************************************************
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils import json_codec
+from framework.utils.content_encoding import (DEFLATE, GZIP, NONE,
+                                              ContentEncoder, decode_body)
+
+
+def actuator_response(num_drives):
+    """Body of an actuator response listing the drives of the enclosure"""
+    drives = [{"durable-id": "disk_00.%02d" % slot, "serial-number": "ZC%07d" % slot,
+               "health": "OK", "health-reason": "", "health-recommendation": "",
+               "size": "4000.7GB", "temperature": "31 C", "vendor": "SEAGATE",
+               "model": "ST4000NM0035", "slot": slot, "enclosure-id": 0,
+               "blocks": 7814037168, "status": "Up", "usage": "LINEAR POOL",
+               "disk-group": "dg01", "storage-pool-name": "A",
+               "firmware-revision": "TN04", "led-status": "Online"}
+              for slot in range(num_drives)]
+    return json_codec.dumps_bytes({
+        "username": "sspl-ll", "signature": "None", "time": "1600000000",
+        "expires": 3600,
+        "message": {
+            "sspl_ll_msg_header": {"schema_version": "1.0.0",
+                                   "sspl_version": "1.0.0",
+                                   "msg_version": "1.0.0",
+                                   "uuid": "16476007-a739-4785-b5c6-f3de189cdf9d"},
+            "actuator_response_type": {
+                "host_id": "srvnode-1", "alert_type": "UPDATE",
+                "severity": "informational", "alert_id": "15740242640000",
+                "info": {"resource_type": "enclosure:fru:disk",
+                         "resource_id": "*", "event_time": "1574075909"},
+                "specific_info": drives}}})
+
+
+def run(encoding, body, num_msgs):
+    encoder = ContentEncoder(encoding, threshold=1024)
+    start = time.perf_counter()
+    encoded = [encoder.encode(body) for _ in range(num_msgs)]
+    egress = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for data, content_encoding in encoded:
+        json_codec.loads(decode_body(data, content_encoding))
+    ingress = time.perf_counter() - start
+
+    size = len(encoded[0][0])
+    print("%-8s %10d bytes  %6.1f%%  egress %8.1f us/msg  ingress %8.1f us/msg" %
+          (encoding, size, 100.0 * size / len(body),
+           egress / num_msgs * 1e6, ingress / num_msgs * 1e6))
+
+
+def main():
+    num_msgs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    num_drives = int(sys.argv[2]) if len(sys.argv) > 2 else 84
+    body = actuator_response(num_drives)
+    print("%d messages of %d drives, %d bytes, json backend %s" %
+          (num_msgs, num_drives, len(body), json_codec.BACKEND))
+    for encoding in (NONE, GZIP, DEFLATE):
+        run(encoding, body, num_msgs)
+
+
+if __name__ == "__main__":
+    main()
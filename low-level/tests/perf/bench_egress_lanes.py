@@ -0,0 +1,106 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Measures the queueing latency of fault alerts placed on
+                    the egress message queue behind a flood of telemetry,
+                    with a single FIFO and with priority lanes. Every other
+                    telemetry message is queued as a JSON string, as
+                    NodeDataMsgHandler does.
+
+  Usage:             python3 tests/perf/bench_egress_lanes.py [num_telemetry]
+ ****************************************************************************
+"""
+
+import os
+import sys
+import time
+from threading import Thread
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.base.internal_msgQ import InternalMsgQueue, PriorityLaneMsgQueue
+from framework.utils import json_codec
+
+# Time spent 'publishing' each message
+PUBLISH_TIME = 0.0001
+# One fault alert is produced every ALERT_EVERY telemetry messages
+ALERT_EVERY = 100
+
+LANES = ("ack", "alert", "telemetry")
+
+
+def msg_lane(jsonMsg):
+    """Same lanes RabbitMQegressProcessor.msg_lane() assigns, without
+    importing pika"""
+    if isinstance(jsonMsg, (str, bytes)):
+        jsonMsg = json_codec.loads(jsonMsg)
+    alert_type = jsonMsg["message"]["sensor_response_type"]["alert_type"]
+    return 1 if alert_type == "fault" else 2
+
+
+def _sensor_msg(alert_type):
+    return {"message": {"sensor_response_type": {
+                "alert_type": alert_type, "severity": "critical",
+                "enqueued": time.time()}}}
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def bench(name, msgQ, num_telemetry):
+    num_msgs = num_telemetry + num_telemetry // ALERT_EVERY
+    latencies = {"fault": [], "UPDATE": []}
+
+    def consume():
+        for _ in range(num_msgs):
+            jsonMsg, _ = msgQ.get()
+            if isinstance(jsonMsg, str):
+                jsonMsg = json_codec.loads(jsonMsg)
+            response = jsonMsg["message"]["sensor_response_type"]
+            latencies[response["alert_type"]].append(
+                time.time() - response["enqueued"])
+            deadline = time.perf_counter() + PUBLISH_TIME
+            while time.perf_counter() < deadline:
+                pass
+
+    consumer = Thread(target=consume)
+    consumer.start()
+    start = time.time()
+    for count in range(1, num_telemetry + 1):
+        jsonMsg = _sensor_msg("UPDATE")
+        if count % 2:
+            jsonMsg = json_codec.dumps(jsonMsg)
+        msgQ.put((jsonMsg, None))
+        if count % ALERT_EVERY == 0:
+            msgQ.put((_sensor_msg("fault"), None))
+    consumer.join()
+    elapsed = time.time() - start
+
+    for alert_type, lat in latencies.items():
+        lat = [x * 1000 for x in lat]
+        print("%-15s %-9s msgs=%-6d elapsed=%.1fs  latency ms: p50=%.2f p99=%.2f max=%.2f" %
+              (name, alert_type, len(lat), elapsed, _percentile(lat, 50),
+               _percentile(lat, 99), max(lat)))
+
+
+if __name__ == "__main__":
+    num_telemetry = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    bench("fifo", InternalMsgQueue(), num_telemetry)
+    bench("priority lanes", PriorityLaneMsgQueue(LANES, msg_lane, 1),
+          num_telemetry)
@@ -0,0 +1,82 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Compares the FileStore writes of one polling cycle of
+                     the RealStor disk sensor: each drive file replaced on
+                     its own, the cycle saved with put_many(), both left to
+                     the page cache, and with group commit, buffered and
+                     written durably, each file fsynced and then their
+                     directory once.
+
+  Usage:             python3 tests/perf/bench_file_store.py [num_drives] [rounds]
+ ****************************************************************************
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils.filestore import FileStore
+
+
+def drive(slot, cycle):
+    return {"slot": slot, "serial-number": "ZC%07d" % slot, "health": "OK",
+            "health-reason": "", "health-recommendation": "",
+            "durable-id": "disk_00.%02d" % slot, "size": "4000.7GB",
+            "cycle": cycle}
+
+
+def bench(mode, root, num_drives, rounds):
+    store = FileStore(group_commit=(mode == "group"), commit_interval=3600)
+    prefix = os.path.join(root, "encl", "frus", "disks", "")
+    paths = ["%sdisk_%s.json" % (prefix, slot) for slot in range(num_drives)]
+
+    start = time.time()
+    for cycle in range(rounds):
+        if mode == "put_many":
+            store.put_many({path: drive(slot, cycle) for slot, path in enumerate(paths)})
+        else:
+            for slot, path in enumerate(paths):
+                store.put(drive(slot, cycle), path)
+            store.commit()
+    elapsed = (time.time() - start) / rounds * 1000
+    store.close()
+
+    values = store.get_all_with_prefix(prefix)
+    assert len(values) == num_drives
+    assert all(value["cycle"] == rounds - 1 for value in values.values())
+    return elapsed
+
+
+def main():
+    num_drives = int(sys.argv[1]) if len(sys.argv) > 1 else 106
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print("%d drives, ms per polling cycle" % num_drives)
+    for mode in ("put", "put_many", "group"):
+        root = tempfile.mkdtemp(prefix="bench_file_store_")
+        try:
+            print("%-10s %8.2f" % (mode, bench(mode, root, num_drives, rounds)))
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Compares the json_codec backends. The micro benchmark
+                    times dumps()/loads() of a sensor message and of a
+                    RealStor API response, the macro benchmark the hops of
+                    an alert: API response parsed, message built as an
+                    envelope, signed and serialized by the egress processor
+                    and parsed again as an incoming message. Each backend
+                    runs in its own process, selected by SSPL_JSON_BACKEND.
+
+  Usage:             python3 tests/perf/bench_json_codec.py [num_msgs] [num_drives]
+ ****************************************************************************
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.base.msg_envelope import MsgEnvelope
+from framework.utils import json_codec
+
+
+def api_response(num_drives):
+    """Body of a RealStor show disks response"""
+    drives = [{"durable-id": "disk_00.%02d" % slot, "serial-number": "ZC%07d" % slot,
+               "health": "OK", "health-reason": "", "health-recommendation": "",
+               "size": "4000.7GB", "temperature": "31 C", "vendor": "SEAGATE",
+               "model": "ST4000NM0035", "slot": slot, "enclosure-id": 0,
+               "blocks": 7814037168, "status": "Up", "usage": "LINEAR POOL"}
+              for slot in range(num_drives)]
+    return json_codec.dumps_bytes({"drives": drives, "status": [{
+        "response-type": "Success", "response-type-numeric": 0,
+        "response": "Command completed successfully.", "return-code": 0}]})
+
+
+def alert(seq, drive):
+    return {"title": "SSPL Sensor Response",
+            "description": "Seagate Storage Platform Library - Sensor Response",
+            "username": "SSPL-LL", "signature": "NA", "time": "NA", "expires": -1,
+            "message": {
+                "sspl_ll_msg_header": {"schema_version": "1.0.0",
+                                       "sspl_version": "1.0.0",
+                                       "msg_version": "1.0.0"},
+                "sensor_response_type": {
+                    "host_id": "srvnode-1", "alert_type": "fault",
+                    "alert_id": str(seq), "severity": "critical",
+                    "info": {"site_id": "DC01", "rack_id": "RC01",
+                             "node_id": "SN01", "cluster_id": "CC01",
+                             "resource_type": "enclosure:fru:disk",
+                             "resource_id": drive["durable-id"],
+                             "event_time": "1600000000"},
+                    "specific_info": drive}}}
+
+
+def timed(func, rounds):
+    start = time.time()
+    for _ in range(rounds):
+        func()
+    return (time.time() - start) / rounds * 1e6
+
+
+def child(num_msgs, num_drives):
+    response = api_response(num_drives)
+    drives = json_codec.loads(response)["drives"]
+    message = alert(0, drives[0])
+    encoded = json_codec.dumps(message)
+
+    results = [
+        timed(lambda: json_codec.dumps(message), num_msgs),
+        timed(lambda: json_codec.loads(encoded), num_msgs),
+        timed(lambda: json_codec.loads(response), max(num_msgs // num_drives, 1)),
+    ]
+
+    def hops():
+        for seq, drive in enumerate(json_codec.loads(response)["drives"]):
+            envelope = MsgEnvelope(alert(seq, drive))
+            envelope = envelope.replace(username="sspl-ll", expires=3600,
+                                        time=str(int(time.time())))
+            body = envelope.replace(signature="SecurityLibNotInstalled").to_bytes()
+            json_codec.loads(body)
+
+    results.append(timed(hops, max(num_msgs // num_drives, 1)) / num_drives)
+    print("%-8s %10.2f %10.2f %12.1f %10.2f" % ((json_codec.BACKEND,) + tuple(results)))
+
+
+def main():
+    num_msgs = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    num_drives = int(sys.argv[2]) if len(sys.argv) > 2 else 84
+    print("us per call, api response of %d drives" % num_drives)
+    print("%-8s %10s %10s %12s %10s" % ("backend", "dumps", "loads", "api loads", "alert"))
+    for backend in ("json", "orjson"):
+        env = dict(os.environ, SSPL_JSON_BACKEND=backend)
+        subprocess.check_call([sys.executable, os.path.abspath(__file__), "--child",
+                               str(num_msgs), str(num_drives)], env=env)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        main()
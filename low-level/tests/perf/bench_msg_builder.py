@@ -0,0 +1,101 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Compares building the RealStor enclosure alerts with
+                    their message classes, getJson() then parsed again by
+                    the egress processor, and with MsgBuilder. Each message
+                    is signed and serialized to the bytes published, as the
+                    egress processor does.
+
+  Usage:             python3 tests/perf/bench_msg_builder.py [num_msgs] [num_fields]
+ ****************************************************************************
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.base.msg_envelope import MsgEnvelope
+from json_msgs.messages.msg_builder import MsgBuilder
+from json_msgs.messages.sensors.realstor_controller_data import RealStorControllerDataMsg
+from json_msgs.messages.sensors.realstor_disk_data import RealStorDiskDataMsg
+from json_msgs.messages.sensors.realstor_encl_data_msg import RealStorEnclDataMsg
+from json_msgs.messages.sensors.realstor_fan_data import RealStorFanDataMsg
+from json_msgs.messages.sensors.realstor_logical_volume_data import RealStorLogicalVolumeDataMsg
+from json_msgs.messages.sensors.realstor_psu_data import RealStorPSUDataMsg
+from json_msgs.messages.sensors.realstor_sideplane_expander_data import \
+    RealStorSideplaneExpanderDataMsg
+from json_msgs.schemas.registry import SchemaRegistry, schema_registry
+
+MSG_CLASSES = (RealStorDiskDataMsg, RealStorPSUDataMsg, RealStorFanDataMsg,
+               RealStorControllerDataMsg, RealStorSideplaneExpanderDataMsg,
+               RealStorLogicalVolumeDataMsg, RealStorEnclDataMsg)
+
+INFO = {"site_id": "DC01", "rack_id": "RC01", "node_id": "SN01",
+        "cluster_id": "CC01", "resource_type": "enclosure:fru:disk",
+        "resource_id": "disk_00.01", "event_time": "1600000000"}
+
+
+def firmware_response(num_fields):
+    """Specific info as returned by the RealStor API, hyphenated keys and
+    N/A values, with a nested list of sub components"""
+    fru = {"durable-id": "disk_00.01", "health": "Fault",
+           "health-reason": "N/A", "health-recommendation": "N/A"}
+    for field in range(num_fields):
+        fru["property-%d" % field] = "N/A" if field % 4 == 0 else "value-%d" % field
+    fru["sub-components"] = [{"component-id": "c%d" % i, "status": "N/A"}
+                             for i in range(num_fields // 4)]
+    return fru
+
+
+def sign(message):
+    message = message.replace(username="sspl-ll", expires=3600, time=str(int(time.time())))
+    return message.replace(signature="SecurityLibNotInstalled").to_bytes()
+
+
+def bench(num_msgs, num_fields, use_builder):
+    specific_info = firmware_response(num_fields)
+    size = 0
+    start = time.time()
+    for seq in range(num_msgs):
+        msg_class = MSG_CLASSES[seq % len(MSG_CLASSES)]
+        if use_builder:
+            message = MsgBuilder.for_class(msg_class).build_alert(
+                "fault", str(seq), "critical", INFO, specific_info,
+                host_id="srvnode-1")
+        else:
+            message = msg_class("srvnode-1", "fault", str(seq), "critical",
+                                INFO, specific_info).getJson()
+        size += len(sign(MsgEnvelope.wrap(message)))
+    elapsed = time.time() - start
+    print("%-8s %8.1f us/msg %8.0f msgs/sec %6d bytes/msg" %
+          ("builder" if use_builder else "class", elapsed / num_msgs * 1e6,
+           num_msgs / elapsed, size // num_msgs))
+
+
+def main():
+    num_msgs = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    num_fields = int(sys.argv[2]) if len(sys.argv) > 2 else 80
+    schema_registry.set_policy(SchemaRegistry.SAMPLE)
+    bench(num_msgs, num_fields, False)
+    bench(num_msgs, num_fields, True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Measures the messages per second going through the
+                    internal queue pipeline, sensor -> message handler ->
+                    egress processor, when messages are passed as JSON
+                    strings and as MsgEnvelopes.
+
+  Usage:             python3 tests/perf/bench_msg_envelope.py [num_msgs]
+ ****************************************************************************
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.base.debug import Debug
+from framework.base.internal_msgQ import InternalMsgQueue
+from framework.base.msg_envelope import MsgEnvelope
+
+
+class BenchModule(Debug):
+    """Reads messages the way InternalMsgQ._read_my_msgQ does"""
+
+    @staticmethod
+    def name():
+        return "BenchModule"
+
+    def read(self, q):
+        jsonMsg, _ = q.get()
+        _, jsonMsg = self._check_debug(jsonMsg)
+        return jsonMsg
+
+
+def _alert(seq):
+    return {"title": "SSPL Sensor Response",
+            "description": "Seagate Storage Platform Library - Sensor Response",
+            "username": "SSPL-LL",
+            "signature": "N/A",
+            "time": "N/A",
+            "expires": -1,
+            "message": {
+                "sspl_ll_msg_header": {
+                    "schema_version": "1.0.0",
+                    "sspl_version": "1.0.0",
+                    "msg_version": "1.0.0"
+                    },
+                "sensor_response_type": {
+                    "service_watchdog": {
+                        "service_name": "service-%d.service" % seq,
+                        "service_state": "failed",
+                        "previous_service_state": "active",
+                        "service_substate": "failed",
+                        "previous_service_substate": "running",
+                        "pid": str(seq),
+                        "previous_pid": str(seq - 1)
+                        }
+                    }
+                }
+            }
+
+
+def _sign(jsonMsg):
+    fields = {"username": "sspl-ll", "expires": 3600,
+              "time": str(int(time.time())), "signature": "SecurityLibNotInstalled"}
+    if isinstance(jsonMsg, MsgEnvelope):
+        return jsonMsg.replace(**fields).to_json()
+    jsonMsg.update(fields)
+    return json.dumps(jsonMsg)
+
+
+def bench(use_envelope, num_msgs):
+    handler_q = InternalMsgQueue()
+    egress_q = InternalMsgQueue()
+    handler = BenchModule()
+    egress = BenchModule()
+    published = 0
+
+    start = time.time()
+    for seq in range(num_msgs):
+        # Sensor
+        if use_envelope:
+            handler_q.put((MsgEnvelope(_alert(seq)), None))
+        else:
+            handler_q.put((json.dumps(_alert(seq)), None))
+
+        # Message handler forwards it to the egress processor
+        jsonMsg = handler.read(handler_q)
+        if use_envelope:
+            egress_q.put((jsonMsg, None))
+        else:
+            egress_q.put((json.dumps(jsonMsg), None))
+
+        # Egress processor signs and serializes it once for RabbitMQ
+        body = _sign(egress.read(egress_q)).encode("utf8")
+        published += len(body) > 0
+    elapsed = time.time() - start
+
+    print("%-12s msgs=%d elapsed=%.2fs  %.0f msgs/sec" %
+          ("envelope" if use_envelope else "json string", published,
+           elapsed, published / elapsed))
+
+
+if __name__ == "__main__":
+    num_msgs = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    bench(False, num_msgs)
+    bench(True, num_msgs)
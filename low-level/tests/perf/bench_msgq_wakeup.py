@@ -0,0 +1,113 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Measures the enqueue to publish latency of a module
+                    draining its internal message queue, with the legacy
+                    1 second re-arm polling and with wake on put.
+
+  Usage:             python3 tests/perf/bench_msgq_wakeup.py [num_msgs]
+ ****************************************************************************
+"""
+
+import os
+import random
+import sys
+import time
+from threading import Thread
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.base.internal_msgQ import InternalMsgQ, InternalMsgQueue
+from framework.base.module_thread import ScheduledModuleThread
+
+
+class BenchEgressProcessor(ScheduledModuleThread, InternalMsgQ):
+    """Drains its queue the same way RabbitMQegressProcessor does and
+    records how long each message waited before being 'published'"""
+
+    MODULE_NAME = "BenchEgressProcessor"
+    PRIORITY    = 1
+
+    @staticmethod
+    def name():
+        return BenchEgressProcessor.MODULE_NAME
+
+    def __init__(self, wake_on_msgQ):
+        super(BenchEgressProcessor, self).__init__(self.MODULE_NAME,
+                                                   self.PRIORITY)
+        self.WAKE_ON_MSGQ = wake_on_msgQ
+        self.latencies = []
+        self.runs = 0
+
+    def initialize(self, conf_reader, msgQlist, product):
+        super(BenchEgressProcessor, self).initialize(conf_reader)
+        super(BenchEgressProcessor, self).initialize_msgQ(msgQlist)
+
+    def run(self):
+        self.runs += 1
+        while not self._is_my_msgQ_empty():
+            jsonMsg, _ = self._read_my_msgQ()
+            if jsonMsg is not None:
+                self.latencies.append(time.time() - jsonMsg["enqueued"])
+
+        if not self._running:
+            return
+        if self.WAKE_ON_MSGQ:
+            self._scheduler.enter(self.MSGQ_IDLE_INTERVAL, self._priority, self.run, ())
+        else:
+            self._scheduler.enter(1, self._priority, self.run, ())
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def bench(wake_on_msgQ, num_msgs):
+    msgQlist = {BenchEgressProcessor.name(): InternalMsgQueue()}
+    module = BenchEgressProcessor(wake_on_msgQ)
+    thread = Thread(target=module.start_thread, args=(None, msgQlist, "LR2"))
+    thread.start()
+
+    # Let the first scheduled run fire before producing
+    time.sleep(1.5)
+    random.seed(0)
+    start = time.time()
+    for _ in range(num_msgs):
+        time.sleep(random.uniform(0, 0.2))
+        module._write_internal_msgQ(module.name(), {"enqueued": time.time()})
+
+    while len(module.latencies) < num_msgs:
+        time.sleep(0.1)
+    elapsed = time.time() - start
+
+    module._running = False
+    module._cleanup_and_stop()
+    module.wakeup()
+    thread.join()
+
+    lat = [x * 1000 for x in module.latencies]
+    print("%-14s msgs=%d runs=%d elapsed=%.1fs  latency ms: mean=%.2f p50=%.2f p99=%.2f max=%.2f" %
+          ("wake on put" if wake_on_msgQ else "1s polling", num_msgs, module.runs,
+           elapsed, sum(lat) / len(lat), _percentile(lat, 50),
+           _percentile(lat, 99), max(lat)))
+
+
+if __name__ == "__main__":
+    num_msgs = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    bench(False, num_msgs)
+    bench(True, num_msgs)
@@ -0,0 +1,83 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Measures the cost of building and serializing a sensor
+                    response message when each message reads, checks and
+                    validates the schema itself as before, and with the
+                    compiled validators of the schema registry under the
+                    always, sample and debug validation policies.
+
+  Usage:             python3 tests/perf/bench_schema_registry.py [num_msgs]
+ ****************************************************************************
+"""
+
+import json
+import os
+import sys
+import time
+
+LOW_LEVEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, LOW_LEVEL)
+
+from jsonschema import Draft3Validator, validate
+
+from json_msgs.messages.sensors.service_watchdog import ServiceWatchdogMsg
+from json_msgs.schemas.registry import SchemaRegistry, schema_registry
+
+SCHEMA_DIR = os.path.join(LOW_LEVEL, "json_msgs", "schemas")
+
+
+class UncompiledServiceWatchdogMsg(ServiceWatchdogMsg):
+    """Reads and validates the schema for every message, as BaseSensorMsg
+    did before the registry"""
+
+    def __init__(self, *args):
+        super(UncompiledServiceWatchdogMsg, self).__init__(*args)
+        fileName = os.path.join(SCHEMA_DIR, "sensors", self.JSON_SENSOR_SCHEMA)
+        with open(fileName, 'r') as f:
+            _schema = f.read()
+        self._uncompiled_schema = json.loads(' '.join(_schema.split()))
+        Draft3Validator.check_schema(self._uncompiled_schema)
+
+    def validateMsg(self, _jsonMsg):
+        _jsonMsg = self.normalize_kv(_jsonMsg)
+        validate(_jsonMsg, self._uncompiled_schema)
+        return _jsonMsg
+
+
+def bench(label, msg_class, num_msgs):
+    start = time.time()
+    for seq in range(num_msgs):
+        msg_class("service-%d.service" % seq, "failed", "active", "failed",
+                  "running", str(seq), str(seq - 1)).getJson()
+    elapsed = time.time() - start
+    print("%-12s %8.1f us/msg %8.0f msgs/sec" %
+          (label, elapsed / num_msgs * 1e6, num_msgs / elapsed))
+
+
+def main():
+    num_msgs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    schema_registry.resource_path = SCHEMA_DIR
+    schema_registry.set_policy(SchemaRegistry.ALWAYS)
+    bench("uncompiled", UncompiledServiceWatchdogMsg, num_msgs)
+    for policy in SchemaRegistry.POLICIES:
+        schema_registry.set_policy(policy)
+        bench(policy, ServiceWatchdogMsg, num_msgs)
+
+
+if __name__ == "__main__":
+    main()
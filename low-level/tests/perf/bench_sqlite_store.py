@@ -0,0 +1,97 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Compares FileStore, one pickle file per key, with
+                     SQLiteStore on the enclosure state of the RealStor
+                     sensors: saving the cache of every drive, loading it
+                     back at startup and the per poll exists()/get() reads.
+
+  Usage:             python3 tests/perf/bench_sqlite_store.py [num_drives] [rounds]
+ ****************************************************************************
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils.filestore import FileStore
+from framework.utils.sqlitestore import SQLiteStore
+
+
+def drive(slot):
+    return {"slot": slot, "serial-number": "ZC%07d" % slot, "health": "OK",
+            "health-reason": "", "health-recommendation": "",
+            "durable-id": "disk_00.%02d" % slot, "size": "4000.7GB"}
+
+
+def timed(label, rounds, func):
+    start = time.time()
+    for _ in range(rounds):
+        func()
+    return (time.time() - start) / rounds * 1000
+
+
+def bench(store, root, num_drives, rounds):
+    prefix = os.path.join(root, "encl", "frus", "disks", "")
+    paths = ["%sdisk_%s.json" % (prefix, slot) for slot in range(num_drives)]
+
+    def save():
+        for slot, path in enumerate(paths):
+            store.put(drive(slot), path)
+
+    def save_batch():
+        store.put_many({path: drive(slot) for slot, path in enumerate(paths)})
+
+    def load():
+        values = store.get_all_with_prefix(prefix)
+        assert len(values) == num_drives
+
+    def poll():
+        for path in paths:
+            if store.exists(path)[0]:
+                store.get(path)
+
+    return (timed("save", rounds, save), timed("save_batch", rounds, save_batch),
+            timed("load", rounds, load), timed("poll", rounds, poll))
+
+
+def main():
+    num_drives = int(sys.argv[1]) if len(sys.argv) > 1 else 106
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print("%d drives, ms per round" % num_drives)
+    print("%-8s %8s %11s %8s %8s" % ("store", "save", "save_batch", "load", "poll"))
+    for name in ("file", "sqlite"):
+        root = tempfile.mkdtemp(prefix="bench_store_")
+        try:
+            if name == "file":
+                store = FileStore()
+            else:
+                store = SQLiteStore(os.path.join(root, "sspl_store.db"))
+            results = bench(store, root, num_drives, rounds)
+            print("%-8s %8.2f %11.2f %8.2f %8.2f" % ((name,) + results))
+            if name == "sqlite":
+                store.close()
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
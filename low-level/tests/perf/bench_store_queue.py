@@ -0,0 +1,120 @@
+# Copyright (c) 2001-2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Compares the put and get throughput of the StoreQueue
+                    store backend, one FileStore key per message, with the
+                    segment log backend. The store backend is replayed here
+                    with the same store operations StoreQueue issues so that
+                    the benchmark runs without the cortx configuration.
+                    With ConsulStore each of these operations is an HTTP
+                    round trip, making the difference larger.
+
+  Usage:             python3 tests/perf/bench_store_queue.py [num_msgs]
+ ****************************************************************************
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils.filestore import FileStore
+from framework.utils.segment_log import SegmentLog
+
+MSG = b'{"username": "sspl-ll", "message": {"sensor_response_type": ' \
+      b'{"alert_type": "fault", "info": {"resource_type": "node:os:disk"}}}}' * 8
+
+
+class StoreBackendQueue(object):
+    """Store operations issued by StoreQueue put() and get() with the store
+    backend"""
+
+    def __init__(self, path):
+        self.store = FileStore()
+        self.size_key = os.path.join(path, "SSPL_MEMORY_USAGE")
+        self.head_key = os.path.join(path, "SSPL_MESSAGE_HEAD_INDEX")
+        self.tail_key = os.path.join(path, "SSPL_MESSAGE_TAIL_INDEX")
+        self.msgs_key = os.path.join(path, "MESSAGES")
+        for key in (self.size_key, self.head_key, self.tail_key):
+            self.store.put(0, key)
+
+    def put(self, item):
+        self.store.get(self.size_key)  # is_full()
+        self.store.put(item, "%s/%s" % (self.msgs_key, self.store.get(self.tail_key)),
+                       pickled=False)
+        self.store.put(self.store.get(self.tail_key) + 1, self.tail_key)
+        self.store.put(self.store.get(self.size_key) + sys.getsizeof(item),
+                       self.size_key)
+
+    def get(self):
+        if self.store.get(self.tail_key) == self.store.get(self.head_key):
+            return None
+        key = "%s/%s" % (self.msgs_key, self.store.get(self.head_key))
+        item = self.store.get(key)
+        self.store.delete(key)
+        self.store.put(self.store.get(self.head_key) + 1, self.head_key)
+        self.store.put(self.store.get(self.size_key) - sys.getsizeof(item),
+                       self.size_key)
+        return item
+
+    def close(self):
+        pass
+
+
+class SegmentBackendQueue(object):
+
+    def __init__(self, path):
+        self.log = SegmentLog(path)
+
+    def put(self, item):
+        self.log.append(item)
+
+    def get(self):
+        return self.log.pop()
+
+    def close(self):
+        self.log.close()
+
+
+def bench(name, klass, num_msgs):
+    path = tempfile.mkdtemp()
+    try:
+        queue = klass(path)
+        start = time.time()
+        for _ in range(num_msgs):
+            queue.put(MSG)
+        put_time = time.time() - start
+
+        start = time.time()
+        for _ in range(num_msgs):
+            assert queue.get() == MSG
+        get_time = time.time() - start
+        queue.close()
+    finally:
+        shutil.rmtree(path)
+
+    print("%-8s msgs=%d  put: %8.0f msgs/sec  get: %8.0f msgs/sec" %
+          (name, num_msgs, num_msgs / put_time, num_msgs / get_time))
+
+
+if __name__ == "__main__":
+    num_msgs = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    bench("store", StoreBackendQueue, num_msgs)
+    bench("segment", SegmentBackendQueue, num_msgs)
@@ -0,0 +1,124 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       Profiles the CPU time spent on debug logging with the
+                    logger at INFO level while a sustained load of alerts
+                    goes through the internal queues, with the eager string
+                    formatting _log_debug used to do and with lazy_logger.
+
+  Usage:             python3 tests/perf/profile_debug_logging.py [num_msgs] [--cprofile]
+ ****************************************************************************
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.base.internal_msgQ import InternalMsgQ, InternalMsgQueue
+from framework.base.module_thread import ScheduledModuleThread
+from framework.utils.service_logging import logger
+
+
+class BenchModule(ScheduledModuleThread, InternalMsgQ):
+    """Forwards alerts to itself logging them the way the egress processor
+    and the sensors do"""
+
+    MODULE_NAME = "BenchModule"
+    PRIORITY    = 1
+
+    @staticmethod
+    def name():
+        return BenchModule.MODULE_NAME
+
+    def __init__(self):
+        super(BenchModule, self).__init__(self.MODULE_NAME, self.PRIORITY)
+
+    def run(self):
+        pass
+
+    def process(self, alert):
+        self._write_internal_msgQ(self.name(), alert)
+        jsonMsg, _ = self._read_my_msgQ()
+        self._log_debug("_transmit_msg_on_exchange, jsonMsg: %s", jsonMsg)
+        self._log_debug("_transmit_msg_on_exchange, Successfully Sent: %s",
+                        jsonMsg)
+
+
+class EagerBenchModule(BenchModule):
+    """Formats the debug messages whatever the log level, as before"""
+
+    def _log_debug(self, message, *args):
+        if args:
+            message = message % args
+        log_msg = self.name() + ", " + message
+        logger.debug(log_msg)
+
+
+def _alert(seq):
+    return {"sensor_response_type": "node_disk",
+            "response": {
+                "alert_type": "fault",
+                "severity": "critical",
+                "alert_id": "%d%s" % (seq, "f" * 32),
+                "host_id": "srvnode-1.localhost",
+                "info": {
+                    "site_id": "1", "rack_id": "1", "node_id": "1",
+                    "cluster_id": "CC01", "resource_type": "node:fru:disk",
+                    "resource_id": "/dev/sd%d" % (seq % 26),
+                    "event_time": str(int(time.time()))},
+                "specific_info": {"serial_number": "SN%08d" % seq,
+                                  "path_id": "/dev/disk/by-id/scsi-%d" % seq,
+                                  "status": "Failed"}
+                }
+            }
+
+
+def profile(module, alerts, use_cprofile):
+    module.initialize_msgQ({module.name(): InternalMsgQueue()})
+    profiler = cProfile.Profile() if use_cprofile else None
+    if profiler:
+        profiler.enable()
+    start = time.process_time()
+    for alert in alerts:
+        module.process(alert)
+    cpu = time.process_time() - start
+    if profiler:
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(8)
+    return cpu
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    num_msgs = int(args[0]) if args else 50000
+    use_cprofile = "--cprofile" in sys.argv
+
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.NullHandler())
+    alerts = [_alert(seq) for seq in range(num_msgs)]
+
+    eager = profile(EagerBenchModule(), alerts, use_cprofile)
+    lazy = profile(BenchModule(), alerts, use_cprofile)
+    print("log level INFO, %d alerts" % num_msgs)
+    print("eager formatting  cpu=%.2fs  %.1f us/alert" % (eager, eager * 1e6 / num_msgs))
+    print("lazy_logger       cpu=%.2fs  %.1f us/alert" % (lazy, lazy * 1e6 / num_msgs))
+    print("cpu saved         %.0f%%" % ((eager - lazy) * 100 / eager))
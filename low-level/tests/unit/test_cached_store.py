@@ -0,0 +1,198 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils.cached_store import CachedStore
+from framework.utils.store import Store
+
+
+class DictStore(Store):
+    """In memory store counting its reads"""
+
+    def __init__(self):
+        super(DictStore, self).__init__()
+        self.values = {}
+        self.reads = 0
+
+    def put(self, value, key, pickled=True):
+        self.values[key] = value
+
+    def put_many(self, items, pickled=True):
+        self.values.update(items)
+        return True
+
+    def get(self, key):
+        self.reads += 1
+        return self.values.get(key)
+
+    def get_many(self, keys):
+        self.reads += 1
+        return {key: self.values.get(key) for key in keys}
+
+    def exists(self, key):
+        return key in self.values, "Success"
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.values.pop(key, None)
+        return True
+
+
+class TestCachedStore(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = DictStore()
+        self.store = CachedStore(self.backend, max_entries=3)
+        self.addCleanup(self.store.close)
+
+    def test_read_through(self):
+        self.backend.values["a"] = {"value": 1}
+        self.assertEqual(self.store.get("a"), {"value": 1})
+        self.assertEqual(self.store.get("a"), {"value": 1})
+        self.assertEqual(self.backend.reads, 1)
+        stats = self.store.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_copy_handed_out(self):
+        self.store.put({"value": 1}, "a")
+        self.store.get("a")["value"] = 2
+        self.assertEqual(self.store.get("a"), {"value": 1})
+
+    def test_invalidate_prefix(self):
+        self.backend.values.update({"dir/a": 1, "dir/b": 2, "other": 3})
+        for key in ("dir/a", "dir/b", "other"):
+            self.store.get(key)
+        # Written by another process
+        self.backend.values.update({"dir/a": 10, "dir/b": 20, "other": 30})
+        self.store.invalidate("dir/")
+        self.assertEqual(self.store.get("dir/a"), 10)
+        self.assertEqual(self.store.get("dir/b"), 20)
+        self.assertEqual(self.store.get("other"), 3)
+
+    def test_missing_key_cached_until_written(self):
+        self.assertIsNone(self.store.get("a"))
+        self.assertIsNone(self.store.get("a"))
+        self.assertEqual(self.backend.reads, 1)
+        self.assertEqual(self.store.stats()["negative_hits"], 1)
+        self.store.put(1, "a")
+        self.assertEqual(self.store.get("a"), 1)
+
+    def test_delete_cached_as_missing(self):
+        self.store.put(1, "a")
+        self.store.delete("a")
+        self.assertIsNone(self.store.get("a"))
+        self.assertEqual(self.store.exists("a"), (False, "Success"))
+        self.assertEqual(self.backend.reads, 0)
+
+    def test_unpickled_write_drops_cached_value(self):
+        self.store.put(1, "a")
+        self.store.put(b"raw", "a", pickled=False)
+        self.assertEqual(self.store.get("a"), b"raw")
+        self.assertEqual(self.backend.reads, 1)
+
+    def test_read_racing_a_write_not_cached(self):
+        self.backend.values["a"] = "old"
+
+        def get(key):
+            # Written while the old value is read from the store
+            self.store.put("new", key)
+            return "old"
+
+        with mock.patch.object(self.backend, "get", side_effect=get):
+            self.assertEqual(self.store.get("a"), "old")
+        self.assertEqual(self.store.get("a"), "new")
+
+    def test_expired_value_read_again(self):
+        self.backend.values["a"] = 1
+        self.store.get("a")
+        self.backend.values["a"] = 2
+        with mock.patch("framework.utils.cached_store.time.time",
+                        return_value=10 ** 10):
+            self.assertEqual(self.store.get("a"), 2)
+
+    def test_least_recently_used_evicted(self):
+        for key in ("a", "b", "c"):
+            self.store.put(key, key)
+        self.store.get("a")
+        self.store.put("d", "d")
+        self.assertEqual(self.store.stats()["evictions"], 1)
+        self.store.get("b")
+        self.assertEqual(self.backend.reads, 1)
+        self.store.get("a")
+        self.assertEqual(self.backend.reads, 1)
+
+    def test_bypassed_keys_not_cached(self):
+        store = CachedStore(self.backend, bypass=["live/"])
+        self.addCleanup(store.close)
+        self.backend.values["live/a"] = 1
+        store.get("live/a")
+        self.backend.values["live/a"] = 2
+        self.assertEqual(store.get("live/a"), 2)
+
+
+class TestWriteBehind(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = DictStore()
+        self.store = CachedStore(self.backend, write_behind=["cache/"],
+                                 flush_interval=3600)
+        self.addCleanup(self.store.close)
+
+    def test_writes_coalesced_until_flushed(self):
+        for value in range(3):
+            self.store.put(value, "cache/a")
+        self.store.put(1, "other")
+        self.assertNotIn("cache/a", self.backend.values)
+        self.assertEqual(self.backend.values["other"], 1)
+        self.assertEqual(self.store.get("cache/a"), 2)
+        self.assertEqual(self.store.stats()["pending_writes"], 1)
+
+        self.store.flush()
+        self.assertEqual(self.backend.values["cache/a"], 2)
+        self.assertEqual(self.store.stats()["pending_writes"], 0)
+
+    def test_delete_drops_pending_write(self):
+        self.store.put(1, "cache/a")
+        self.store.delete("cache/a")
+        self.store.flush()
+        self.assertNotIn("cache/a", self.backend.values)
+        self.assertIsNone(self.store.get("cache/a"))
+
+    def test_failed_flush_kept_pending(self):
+        self.store.put(1, "cache/a")
+        with mock.patch.object(self.backend, "put_many", return_value=False):
+            self.store.flush()
+        self.assertEqual(self.store.stats()["pending_writes"], 1)
+        self.store.flush()
+        self.assertEqual(self.backend.values["cache/a"], 1)
+
+    def test_pending_write_not_invalidated(self):
+        self.store.put(1, "cache/a")
+        self.store.invalidate("cache/")
+        self.assertEqual(self.store.get("cache/a"), 1)
+        self.assertEqual(self.backend.reads, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
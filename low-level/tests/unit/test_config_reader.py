@@ -0,0 +1,88 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.base.sspl_constants import component
+from framework.utils.cached_store import CachedStore
+from framework.utils.config_reader import ConfigReader
+from framework.utils.consulstore import ConsulStore
+from framework.utils.sqlitestore import SQLiteStore
+
+
+class TestCachedStoreConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.consul = mock.create_autospec(ConsulStore, instance=True)
+        self.consul.get.side_effect = lambda key, **kwargs: {
+            component + "/SECTION/key": " value ",
+            component + "/SECTION/": [("key", "value"), ("other", "value 2")],
+        }.get(key)
+        store = CachedStore(self.consul)
+        self.addCleanup(store.close)
+        self.conf_reader = ConfigReader.__new__(ConfigReader)
+        self.conf_reader.store = store
+
+    def test_value_read_from_wrapped_store(self):
+        self.assertEqual(self.conf_reader._get_value("SECTION", "key"), "value")
+        self.assertEqual(self.conf_reader._get_value("SECTION", "key"), "value")
+        self.consul.get.assert_called_once_with(component + "/SECTION/key")
+
+    def test_section_read_from_wrapped_store(self):
+        self.assertEqual(self.conf_reader._get_all_values_for_section("SECTION"),
+                         ["value", "value 2"])
+        self.consul.get.assert_called_once_with(component + "/SECTION/", recurse=True)
+
+
+class TestSQLiteStoreConfig(unittest.TestCase):
+
+    def setUp(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        config_path = os.path.join(path, "sspl.conf")
+        with open(config_path, "w") as fh:
+            fh.write("[SECTION]\nkey = value\nother = value 2\n")
+        sqlite_store = SQLiteStore(os.path.join(path, "store.db"))
+        self.addCleanup(sqlite_store.close)
+        store = CachedStore(sqlite_store)
+        self.addCleanup(store.close)
+
+        for patcher in (
+                mock.patch("framework.utils.config_reader.file_store_config_path",
+                           config_path),
+                mock.patch.dict(sys.modules, {
+                    "framework.utils.store_factory": mock.Mock(store=store)})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.conf_reader = ConfigReader()
+
+    def test_value_read_from_config_file(self):
+        self.assertEqual(self.conf_reader._get_value("SECTION", "key"), "value")
+        self.assertEqual(self.conf_reader._get_value_with_default("SECTION", "missing", "x"), "x")
+
+    def test_section_read_from_config_file(self):
+        self.assertEqual(self.conf_reader._get_all_values_for_section("SECTION"),
+                         ["value", "value 2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
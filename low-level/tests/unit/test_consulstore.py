@@ -0,0 +1,163 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import base64
+import json
+import os
+import pickle
+import sys
+import unittest
+from unittest import mock
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils.circuit_breaker import CircuitBreaker
+from framework.utils.consulstore import ConsulStore
+
+
+def txn_response(status_code, body):
+    response = mock.Mock(status_code=status_code, text=json.dumps(body))
+    response.json.return_value = body
+    return response
+
+
+class ConsulStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        for name in ("consul", "time.sleep"):
+            patcher = mock.patch("framework.utils.consulstore." + name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.store = ConsulStore("localhost", 8500)
+        self.kv = self.store.consul_conn.kv
+        self.session = self.store._session = mock.Mock()
+
+
+class TestGet(ConsulStoreTest):
+
+    def test_value_unpickled(self):
+        self.kv.get.return_value = (1, {"Key": "a", "Value": pickle.dumps({"x": 1})})
+        self.assertEqual(self.store.get("/a"), {"x": 1})
+        self.kv.get.assert_called_once_with("a", recurse=False)
+
+    def test_recurse_returns_name_and_value_of_each_key(self):
+        self.kv.get.return_value = (1, [
+            {"Key": "sspl/SECTION/", "Value": None},
+            {"Key": "sspl/SECTION/key", "Value": b"value"},
+            {"Key": "sspl/SECTION/other", "Value": pickle.dumps(2)},
+        ])
+        self.assertEqual(self.store.get("sspl/SECTION/", recurse=True),
+                         [("", None), ("key", b"value"), ("other", 2)])
+
+    def test_missing_key(self):
+        self.kv.get.return_value = (1, None)
+        self.assertEqual(self.store.exists("a"), (False, "Success"))
+
+
+class TestTransactions(ConsulStoreTest):
+
+    def test_writes_chunked(self):
+        self.session.put.return_value = txn_response(200, {"Results": []})
+        items = {"key%d" % index: index for index in range(150)}
+        self.assertTrue(self.store.put_many(items))
+
+        chunks = [json.loads(call[1]["data"]) for call in self.session.put.call_args_list]
+        self.assertEqual([len(chunk) for chunk in chunks], [64, 64, 22])
+        op = chunks[2][-1]["KV"]
+        self.assertEqual((op["Verb"], op["Key"]), ("set", "key149"))
+        self.assertEqual(pickle.loads(base64.b64decode(op["Value"])), 149)
+
+    def test_write_stops_at_failed_chunk(self):
+        self.session.put.side_effect = [txn_response(200, {"Results": []}),
+                                        txn_response(500, "error")]
+        self.assertFalse(self.store.delete_many(["key%d" % index for index in range(200)]))
+        self.assertEqual(self.session.put.call_count, 2)
+
+    def test_reads_chunked_and_missing_keys_skipped(self):
+        def txn(url, data):
+            ops = json.loads(data)
+            errors = [{"OpIndex": index, "What": "key doesn't exist"}
+                      for index, op in enumerate(ops) if op["KV"]["Key"] == "missing"]
+            if errors:
+                return txn_response(409, {"Errors": errors})
+            return txn_response(200, {"Results": [
+                {"KV": {"Key": op["KV"]["Key"],
+                        "Value": base64.b64encode(pickle.dumps(op["KV"]["Key"])).decode()}}
+                for op in ops]})
+
+        self.session.put.side_effect = txn
+        keys = ["key%d" % index for index in range(70)] + ["missing"]
+        values = self.store.get_many(keys)
+        self.assertEqual(values["key69"], "key69")
+        self.assertIsNone(values["missing"])
+        self.assertEqual(len(values), 71)
+        # Two chunks, the second run again without the missing key
+        self.assertEqual([len(json.loads(call[1]["data"]))
+                          for call in self.session.put.call_args_list], [64, 7, 6])
+
+
+class TestCircuitBreaker(ConsulStoreTest):
+
+    def test_opens_after_failures(self):
+        self.kv.get.side_effect = requests.exceptions.ConnectionError("refused")
+        self.assertEqual(self.store.exists("a"), (False, "Failure"))
+        self.assertEqual(self.kv.get.call_count, ConsulStore.BREAKER_FAILURES)
+        self.assertEqual(self.store.stats()["breaker"]["state"], CircuitBreaker.OPEN)
+
+        # Not called while open
+        self.assertIsNone(self.store.get("a"))
+        self.assertEqual(self.kv.get.call_count, ConsulStore.BREAKER_FAILURES)
+
+    def test_closed_by_probe(self):
+        self.kv.get.side_effect = requests.exceptions.ConnectionError("refused")
+        self.store.get("a")
+        self.kv.get.side_effect = None
+        self.kv.get.return_value = (1, {"Key": "a", "Value": pickle.dumps(1)})
+        with mock.patch("framework.utils.circuit_breaker.time.time",
+                        return_value=10 ** 10):
+            self.assertEqual(self.store.get("a"), 1)
+        self.assertEqual(self.store.stats()["breaker"]["state"], CircuitBreaker.CLOSED)
+
+    def test_consul_errors_do_not_open(self):
+        self.kv.get.side_effect = ValueError("bad request")
+        for _ in range(ConsulStore.BREAKER_FAILURES):
+            self.assertIsNone(self.store.get("a"))
+        self.assertEqual(self.kv.get.call_count, ConsulStore.BREAKER_FAILURES)
+        self.assertEqual(self.store.stats()["breaker"]["state"], CircuitBreaker.CLOSED)
+
+
+class TestCircuitBreakerStates(unittest.TestCase):
+
+    def test_single_probe_when_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        with mock.patch("framework.utils.circuit_breaker.time.time",
+                        return_value=10 ** 10):
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            self.assertTrue(breaker.allow())
+            self.assertFalse(breaker.allow())
+            # A failed probe opens it again
+            breaker.record_failure()
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(breaker.stats()["trips"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
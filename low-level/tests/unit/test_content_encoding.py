@@ -0,0 +1,67 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils import content_encoding
+from framework.utils.content_encoding import ContentEncoder, decode_body
+
+
+class TestContentEncoder(unittest.TestCase):
+
+    def test_round_trip(self):
+        body = '{"message": "%s"}' % ("disk fault " * 200)
+        for encoding in (content_encoding.GZIP, content_encoding.DEFLATE):
+            encoder = ContentEncoder(encoding, threshold=1024)
+            data, used = encoder.encode(body)
+            self.assertEqual(used, encoding)
+            self.assertLess(len(data), len(body))
+            self.assertEqual(decode_body(data, used), body.encode("utf-8"))
+            self.assertEqual(encoder.stats()["bytes_in"], len(body))
+
+    def test_small_body_left_as_is(self):
+        encoder = ContentEncoder(content_encoding.GZIP, threshold=1024)
+        body = "x" * 1023
+        self.assertEqual(encoder.encode(body), (body, None))
+        self.assertEqual(encoder.encoded, 0)
+
+    def test_threshold_compared_to_encoded_size(self):
+        # 600 characters of 2 bytes each once utf-8 encoded
+        body = "é" * 600
+        encoder = ContentEncoder(content_encoding.GZIP, threshold=1024)
+        data, used = encoder.encode(body)
+        self.assertEqual(used, content_encoding.GZIP)
+        self.assertEqual(decode_body(data, used), body.encode("utf-8"))
+        self.assertEqual(encoder.stats()["bytes_in"], 1200)
+
+    def test_body_not_shrinking_left_as_is(self):
+        body = os.urandom(2048)
+        encoder = ContentEncoder(content_encoding.DEFLATE, threshold=1024)
+        self.assertEqual(encoder.encode(body), (body, None))
+
+    def test_disabled(self):
+        encoder = ContentEncoder("unknown", threshold=0)
+        self.assertFalse(encoder.enabled)
+        self.assertEqual(encoder.encode("body"), ("body", None))
+        self.assertEqual(decode_body(b"body", None), b"body")
+        self.assertRaises(ValueError, decode_body, b"body", "br")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils import filestore
+from framework.utils.filestore import FileStore
+
+
+class TestFileStore(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.store = FileStore()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def _mode(self, path):
+        return stat.S_IMODE(os.stat(path).st_mode)
+
+    def test_put_and_get(self):
+        path = os.path.join(self.path, "dir", "key")
+        self.store.put({"value": 1}, path)
+        self.assertEqual(self.store.get(path), {"value": 1})
+        self.store.put(b"{\"value\": 2}", path, pickled=False)
+        self.assertEqual(self.store.get(path), b"{\"value\": 2}")
+        self.assertEqual(self.store.get_keys_with_prefix(os.path.join(self.path, "dir")),
+                         ["key"])
+
+    def test_new_file_mode_from_umask(self):
+        path = os.path.join(self.path, "key")
+        self.store.put(1, path)
+        self.assertEqual(self._mode(path), 0o666 & ~filestore._UMASK)
+
+    def test_file_mode_kept_when_replaced(self):
+        path = os.path.join(self.path, "key")
+        self.store.put(1, path)
+        os.chmod(path, 0o640)
+        self.store.put(2, path)
+        self.assertEqual(self._mode(path), 0o640)
+        self.assertEqual(self.store.get(path), 2)
+
+    def test_no_temporary_file_left(self):
+        path = os.path.join(self.path, "key")
+        with mock.patch("framework.utils.filestore.os.replace",
+                        side_effect=OSError("replace failed")):
+            self.store.put(1, path)
+        self.assertEqual(os.listdir(self.path), [])
+
+
+class TestGroupCommit(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.store = FileStore(group_commit=True, commit_interval=3600)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.path)
+
+    def test_writes_buffered_until_commit(self):
+        path = os.path.join(self.path, "key")
+        self.store.put(1, path)
+        self.store.put(2, path)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(self.store.get(path), 2)
+        self.assertEqual(self.store.get_many([path]), {path: 2})
+        self.assertEqual(self.store.exists(path), (True, "Success"))
+
+        self.store.commit()
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(FileStore().get(path), 2)
+
+    def test_commit_fsyncs_each_file_and_directory_once(self):
+        paths = [os.path.join(self.path, "key%d" % index) for index in range(3)]
+        self.store.put_many({path: index for index, path in enumerate(paths)})
+        with mock.patch("framework.utils.filestore.os.fsync") as fsync:
+            self.store.commit()
+        self.assertEqual(fsync.call_count, len(paths) + 1)
+
+    def test_directory_read_commits_pending_writes(self):
+        directory = os.path.join(self.path, "dir")
+        self.store.put(1, os.path.join(directory, "a"))
+        self.assertEqual(self.store.get_all_with_prefix(directory), {"a": 1})
+        self.assertTrue(os.path.exists(os.path.join(directory, "a")))
+
+    def test_delete_drops_pending_write(self):
+        path = os.path.join(self.path, "key")
+        self.store.put(1, path)
+        self.store.delete(path)
+        self.store.commit()
+        self.assertFalse(os.path.exists(path))
+
+    def test_close_commits(self):
+        path = os.path.join(self.path, "key")
+        self.store.put(1, path)
+        self.store.close()
+        self.assertTrue(os.path.exists(path))
+
+    def test_committed_in_background(self):
+        store = FileStore(group_commit=True, commit_interval=0.05)
+        self.addCleanup(store.close)
+        path = os.path.join(self.path, "key")
+        store.put(1, path)
+        deadline = time.time() + 5
+        while not os.path.exists(path) and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertTrue(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import os
+import queue
+import sys
+import threading
+import time
+import unittest
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.base.internal_msgQ import InternalMsgQ, InternalMsgQueue
+
+
+class MemorySpillQueue(object):
+    """In memory stand-in for the StoreQueue a queue spills to"""
+
+    def __init__(self):
+        self.msgs = deque()
+        self.head = 0
+        self.tail = 0
+
+    def put(self, jsonMsg, pickled=False):
+        self.msgs.append(jsonMsg)
+        self.tail += 1
+
+    def get(self):
+        if not self.msgs:
+            return None
+        self.head += 1
+        return self.msgs.popleft()
+
+
+class Producer(InternalMsgQ):
+    """Module writing messages to the queue of Consumer"""
+
+    @staticmethod
+    def name():
+        return "Producer"
+
+    def _log_debug(self, message, *args):
+        pass
+
+
+class TestBlockPolicy(unittest.TestCase):
+
+    def test_put_times_out_when_full(self):
+        msgQ = InternalMsgQueue(2, InternalMsgQueue.BLOCK, put_timeout=0.1)
+        msgQ.put((1, None))
+        msgQ.put((2, None))
+        start = time.time()
+        self.assertRaises(queue.Full, msgQ.put, (3, None))
+        self.assertGreaterEqual(time.time() - start, 0.1)
+        self.assertEqual(msgQ.dropped, 1)
+        self.assertEqual([msgQ.get()[0] for _ in range(2)], [1, 2])
+
+    def test_put_waits_for_space(self):
+        msgQ = InternalMsgQueue(1, InternalMsgQueue.BLOCK, put_timeout=5)
+        msgQ.put((1, None))
+        threading.Timer(0.1, msgQ.get).start()
+        msgQ.put((2, None))
+        self.assertEqual(msgQ.get()[0], 2)
+        self.assertEqual(msgQ.dropped, 0)
+
+    def test_producer_released_when_dropped(self):
+        producer = Producer()
+        producer.initialize_msgQ(
+            {"Consumer": InternalMsgQueue(1, InternalMsgQueue.BLOCK, put_timeout=0)})
+        producer._write_internal_msgQ("Consumer", 1)
+        event = threading.Event()
+        producer._write_internal_msgQ("Consumer", 2, event)
+        self.assertTrue(event.is_set())
+        self.assertFalse(producer._wait_msg_delivered(event, 0))
+
+
+class TestDropOldestPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.msgQ = InternalMsgQueue(3, InternalMsgQueue.DROP_OLDEST)
+
+    def test_oldest_dropped(self):
+        for msg in range(5):
+            self.msgQ.put((msg, None))
+        self.assertEqual(self.msgQ.dropped, 2)
+        self.assertEqual(self.msgQ.qsize(), 3)
+        self.assertEqual([self.msgQ.get()[0] for _ in range(3)], [2, 3, 4])
+
+    def test_dropped_message_not_delivered(self):
+        events = [threading.Event() for _ in range(4)]
+        for msg, event in enumerate(events):
+            self.msgQ.put((msg, event))
+
+        # The producer of the dropped message is released at once
+        self.assertTrue(events[0].is_set())
+        self.assertFalse(InternalMsgQ._wait_msg_delivered(events[0], 0))
+        self.assertFalse(any(event.is_set() for event in events[1:]))
+
+        # The event can be reused for the next message
+        events[0].clear()
+        events[0].set()
+        self.assertTrue(InternalMsgQ._wait_msg_delivered(events[0], 0))
+
+
+class TestSpillPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.spill_queue = MemorySpillQueue()
+        self.msgQ = InternalMsgQueue(2, InternalMsgQueue.SPILL,
+                                     spill_queue=self.spill_queue)
+
+    def test_spill_requires_spill_queue(self):
+        self.assertRaises(ValueError, InternalMsgQueue, 2, InternalMsgQueue.SPILL)
+
+    def test_overflow_spilled_in_order(self):
+        for msg in range(5):
+            self.msgQ.put((msg, None))
+        self.assertEqual(self.msgQ.spilled, 3)
+        self.assertEqual(len(self.spill_queue.msgs), 3)
+        self.assertEqual(self.msgQ.qsize(), 5)
+        self.assertEqual([self.msgQ.get()[0] for _ in range(5)], list(range(5)))
+        self.assertTrue(self.msgQ.empty())
+        self.assertEqual(len(self.spill_queue.msgs), 0)
+
+    def test_spill_keeps_order_while_draining(self):
+        for msg in range(4):
+            self.msgQ.put((msg, None))
+        self.assertEqual(self.msgQ.get()[0], 0)
+        # Queued behind the spilled messages although there is space
+        self.msgQ.put((4, None))
+        self.assertEqual([self.msgQ.get()[0] for _ in range(4)], [1, 2, 3, 4])
+
+    def test_spill_keeps_order_of_concurrent_producers(self):
+        def produce(producer):
+            for msg in range(200):
+                self.msgQ.put(((producer, msg), None))
+
+        producers = [threading.Thread(target=produce, args=(p,)) for p in range(3)]
+        for producer in producers:
+            producer.start()
+        received = [self.msgQ.get(timeout=5)[0] for _ in range(600)]
+        for producer in producers:
+            producer.join()
+
+        for producer in range(3):
+            msgs = [msg for p, msg in received if p == producer]
+            self.assertEqual(msgs, list(range(200)))
+
+    def test_messages_left_in_spill_queue_read_first(self):
+        self.spill_queue.put("left over")
+        msgQ = InternalMsgQueue(2, InternalMsgQueue.SPILL,
+                                spill_queue=self.spill_queue)
+        msgQ.put(("new", None))
+        self.assertEqual(msgQ.qsize(), 2)
+        self.assertEqual([msgQ.get()[0] for _ in range(2)], ["left over", "new"])
+
+
+if __name__ == '__main__':
+    unittest.main()
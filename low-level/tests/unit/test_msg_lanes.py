@@ -0,0 +1,119 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.base.internal_msgQ import InternalMsgQ, InternalMsgQueue, PriorityLaneMsgQueue
+
+LANES = ("ack", "alert", "telemetry")
+
+
+def classify(jsonMsg):
+    """Messages are (lane, sequence) tuples"""
+    return LANES.index(jsonMsg[0])
+
+
+class TestPriorityLanes(unittest.TestCase):
+
+    def setUp(self):
+        self.msgQ = PriorityLaneMsgQueue(LANES, classify, starvation_timeout=60)
+
+    def _get_all(self):
+        msgs = []
+        while not self.msgQ.empty():
+            msgs.append(self.msgQ.get_nowait()[0])
+        return msgs
+
+    def test_served_by_priority(self):
+        for msg in [("telemetry", 0), ("alert", 0), ("telemetry", 1),
+                    ("ack", 0), ("alert", 1)]:
+            self.msgQ.put((msg, None))
+        self.assertEqual(self._get_all(),
+                         [("ack", 0), ("alert", 0), ("alert", 1),
+                          ("telemetry", 0), ("telemetry", 1)])
+
+    def test_iterated_in_serving_order(self):
+        self.msgQ.put((("telemetry", 0), None))
+        self.msgQ.put((("ack", 0), None))
+        self.assertEqual([msg for msg, _ in self.msgQ.queue],
+                         [("ack", 0), ("telemetry", 0)])
+
+    def test_unclassified_message_on_first_lane(self):
+        self.msgQ.put((("unknown", 0), None))
+        self.msgQ.put((("ack", 0), None))
+        self.assertEqual(self._get_all(), [("unknown", 0), ("ack", 0)])
+
+    def test_lane_stats(self):
+        self.msgQ.put((("alert", 0), None))
+        self.msgQ.put((("telemetry", 0), None))
+        self.msgQ.get_nowait()
+        stats = self.msgQ.lane_stats()
+        self.assertEqual(sorted(stats), sorted(LANES))
+        self.assertEqual(stats["alert"]["served"], 1)
+        self.assertEqual(stats["alert"]["depth"], 0)
+        self.assertIsNotNone(stats["alert"]["latency_p99_ms"])
+        self.assertEqual(stats["telemetry"]["depth"], 1)
+        self.assertIsNone(stats["telemetry"]["latency_p50_ms"])
+
+
+class TestStarvation(unittest.TestCase):
+
+    def test_starved_lane_served(self):
+        msgQ = PriorityLaneMsgQueue(LANES, classify, starvation_timeout=0.1)
+        msgQ.put((("telemetry", 0), None))
+        time.sleep(0.15)
+        for seq in range(3):
+            msgQ.put((("alert", seq), None))
+
+        # The telemetry message waited past the starvation timeout
+        self.assertEqual(msgQ.get_nowait()[0], ("telemetry", 0))
+        self.assertEqual([msgQ.get_nowait()[0] for _ in range(3)],
+                         [("alert", 0), ("alert", 1), ("alert", 2)])
+        self.assertEqual(msgQ.lane_stats()["telemetry"]["starved"], 1)
+
+    def test_lower_lane_waits_under_starvation_timeout(self):
+        msgQ = PriorityLaneMsgQueue(LANES, classify, starvation_timeout=60)
+        msgQ.put((("telemetry", 0), None))
+        msgQ.put((("alert", 0), None))
+        self.assertEqual(msgQ.get_nowait()[0], ("alert", 0))
+        self.assertEqual(msgQ.lane_stats()["telemetry"]["starved"], 0)
+
+
+class TestLaneOverflow(unittest.TestCase):
+
+    def test_drop_oldest_drops_lowest_lane(self):
+        msgQ = PriorityLaneMsgQueue(LANES, classify, maxsize=3,
+                                    overflow_policy=InternalMsgQueue.DROP_OLDEST)
+        events = [threading.Event() for _ in range(2)]
+        msgQ.put((("telemetry", 0), events[0]))
+        msgQ.put((("telemetry", 1), events[1]))
+        msgQ.put((("alert", 0), None))
+        msgQ.put((("ack", 0), None))
+
+        self.assertEqual(msgQ.dropped, 1)
+        self.assertFalse(InternalMsgQ._wait_msg_delivered(events[0], 0))
+        self.assertFalse(events[1].is_set())
+        self.assertEqual([msgQ.get_nowait()[0] for _ in range(3)],
+                         [("ack", 0), ("alert", 0), ("telemetry", 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
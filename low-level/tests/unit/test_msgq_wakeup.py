@@ -0,0 +1,97 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.base.internal_msgQ import InternalMsgQ, InternalMsgQueue
+from framework.base.module_thread import ScheduledModuleThread
+
+
+class WakeOnPutModule(ScheduledModuleThread, InternalMsgQ):
+    """Module reading its queue on each run, re-armed every idle interval"""
+
+    MODULE_NAME = "WakeOnPutModule"
+    WAKE_ON_MSGQ = True
+    MSGQ_IDLE_INTERVAL = 60
+
+    @staticmethod
+    def name():
+        return WakeOnPutModule.MODULE_NAME
+
+    def __init__(self):
+        super(WakeOnPutModule, self).__init__(self.MODULE_NAME, 1)
+        self.received = []
+        self.got_msg = threading.Event()
+
+    def initialize(self, msgQlist):
+        self.initialize_msgQ(msgQlist)
+        self._scheduler.enter(self.MSGQ_IDLE_INTERVAL, self._priority, self.run, ())
+
+    def run(self):
+        while not self._is_my_msgQ_empty():
+            jsonMsg, _ = self._read_my_msgQ()
+            self.received.append(jsonMsg)
+            self.got_msg.set()
+        if self._running:
+            self._scheduler.enter(self.MSGQ_IDLE_INTERVAL, self._priority, self.run, ())
+
+
+class TestMsgQWakeup(unittest.TestCase):
+
+    def setUp(self):
+        self.msgQ = InternalMsgQueue()
+        self.module = WakeOnPutModule()
+        self.module.initialize({WakeOnPutModule.name(): self.msgQ})
+        self.thread = threading.Thread(target=self.module.start, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.module._running = False
+        self.module._cleanup_and_stop()
+        self.module.wakeup()
+        self.thread.join(5)
+
+    def test_put_sets_waker(self):
+        woken = []
+        msgQ = InternalMsgQueue()
+        msgQ.set_waker(lambda: woken.append(True))
+        msgQ.put(({"msg": 1}, None))
+        self.assertEqual(woken, [True])
+
+    def test_put_runs_module_before_idle_interval(self):
+        time.sleep(0.1)
+        start = time.time()
+        self.msgQ.put(({"msg": 1}, None))
+        self.assertTrue(self.module.got_msg.wait(5))
+        self.assertLess(time.time() - start, 5)
+        self.assertEqual(self.module.received, [{"msg": 1}])
+
+    def test_module_woken_for_each_burst(self):
+        for burst in range(3):
+            self.module.got_msg.clear()
+            self.msgQ.put(({"burst": burst}, None))
+            self.assertTrue(self.module.got_msg.wait(5))
+        self.assertEqual(self.module.received,
+                         [{"burst": 0}, {"burst": 1}, {"burst": 2}])
+
+
+if __name__ == '__main__':
+    unittest.main()
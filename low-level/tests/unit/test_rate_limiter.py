@@ -0,0 +1,140 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.base.internal_msgQ import InternalMsgQ, InternalMsgQueue
+from framework.base.rate_limiter import MsgRateLimiter, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(10, 3)
+        now = bucket._last
+        self.assertEqual([bucket.consume(now) for _ in range(4)],
+                         [True, True, True, False])
+        self.assertAlmostEqual(bucket.wait_time(now), 0.1)
+        self.assertFalse(bucket.consume(now + 0.05))
+        self.assertTrue(bucket.consume(now + 0.11))
+
+    def test_refill_capped_at_burst(self):
+        bucket = TokenBucket(10, 3)
+        now = bucket._last
+        self.assertEqual(bucket.take(10, now + 60), 3)
+        self.assertEqual(bucket.take(10, now + 60), 0)
+
+    def test_reserve_ahead(self):
+        bucket = TokenBucket(10, 1)
+        now = bucket._last
+        self.assertEqual(bucket.reserve(now), 0)
+        self.assertAlmostEqual(bucket.reserve(now), 0.1)
+        self.assertAlmostEqual(bucket.reserve(now), 0.2)
+
+
+class Producer(InternalMsgQ):
+    """Module writing rate limited messages to the queue of Consumer"""
+
+    def __init__(self, rate_limiter, module_pool=None):
+        super(Producer, self).__init__()
+        self._module_pool = module_pool
+        self.consumerQ = InternalMsgQueue()
+        self.initialize_msgQ({"Consumer": self.consumerQ})
+        self.set_rate_limiter(rate_limiter)
+
+    @staticmethod
+    def name():
+        return "Producer"
+
+    def _log_debug(self, message, *args):
+        pass
+
+    def received(self, count, timeout=5):
+        return [self.consumerQ.get(timeout=timeout)[0] for _ in range(count)]
+
+
+class TestDelayPolicy(unittest.TestCase):
+
+    def test_writer_sleeps_over_limit(self):
+        producer = Producer(MsgRateLimiter("Producer", 20, 2))
+        start = time.time()
+        for msg in range(4):
+            producer._write_internal_msgQ("Consumer", msg)
+        self.assertGreaterEqual(time.time() - start, 0.09)
+        self.assertEqual(producer.received(4), [0, 1, 2, 3])
+        self.assertEqual(producer.get_rate_limiter_stats()["delayed"], 2)
+
+    def test_pool_worker_does_not_sleep(self):
+        producer = Producer(MsgRateLimiter("Producer", 20, 2),
+                            module_pool=mock.Mock())
+        start = time.time()
+        for msg in range(6):
+            producer._write_internal_msgQ("Consumer", msg)
+        self.assertLess(time.time() - start, 0.2)
+
+        # The messages held back are written by the timer, in order
+        self.assertEqual(producer.consumerQ.qsize(), 2)
+        self.assertEqual(producer.received(6), list(range(6)))
+        stats = producer.get_rate_limiter_stats()
+        self.assertEqual(stats["delayed"], 4)
+        self.assertEqual(stats["backlog"], 0)
+        self.assertGreater(stats["delay_secs"], 0)
+
+
+class TestDropOldestPolicy(unittest.TestCase):
+
+    def test_oldest_held_back_dropped(self):
+        limiter = MsgRateLimiter("Producer", 20, 1, MsgRateLimiter.DROP_OLDEST,
+                                 backlog=2)
+        producer = Producer(limiter)
+        events = [threading.Event() for _ in range(4)]
+        for msg, event in enumerate(events):
+            producer._write_internal_msgQ("Consumer", msg, event)
+
+        # 0 is written, 1 to 3 are held back and 1 dropped once the backlog
+        #  of 2 is full
+        self.assertFalse(producer._wait_msg_delivered(events[1], 0))
+        self.assertEqual(producer.received(3), [0, 2, 3])
+        stats = producer.get_rate_limiter_stats()
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["held"], 3)
+
+
+class TestSummaryReport(unittest.TestCase):
+
+    def test_summary_logged_after_burst(self):
+        limiter = MsgRateLimiter("Producer", 100, 1)
+        limiter.SUMMARY_INTERVAL = 0.1
+        producer = Producer(limiter, module_pool=mock.Mock())
+        with mock.patch("framework.base.rate_limiter.logger") as logger:
+            for msg in range(3):
+                producer._write_internal_msgQ("Consumer", msg)
+            # The module stopped writing, the timer logs the summary
+            deadline = time.time() + 5
+            while not logger.warning.called and time.time() < deadline:
+                time.sleep(0.05)
+        self.assertTrue(logger.warning.called)
+        self.assertIn("2 messages delayed", logger.warning.call_args[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
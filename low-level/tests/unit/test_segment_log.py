@@ -0,0 +1,162 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils.segment_log import SegmentLog
+
+
+class TestSegmentLog(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.logs = []
+
+    def tearDown(self):
+        for log in self.logs:
+            log.close()
+        shutil.rmtree(self.path)
+
+    def _open(self, **kwargs):
+        # Commits only when asked to unless the test sets a batch
+        kwargs.setdefault("commit_batch", 1000000)
+        kwargs.setdefault("commit_interval", 3600)
+        log = SegmentLog(self.path, **kwargs)
+        self.logs.append(log)
+        return log
+
+    def _segments(self):
+        return sorted(name for name in os.listdir(self.path)
+                      if name.endswith(SegmentLog.SEGMENT_SUFFIX))
+
+    def test_fifo_across_segments(self):
+        log = self._open(segment_size=100)
+        for msg in range(50):
+            log.append({"msg": msg})
+        self.assertGreater(len(self._segments()), 1)
+        self.assertEqual([log.pop()["msg"] for _ in range(50)], list(range(50)))
+        self.assertIsNone(log.pop())
+        self.assertTrue(log.is_empty())
+        self.assertEqual(self._segments(), [])
+
+    def test_interleaved_append_and_pop(self):
+        log = self._open(segment_size=200)
+        popped = []
+        for msg in range(100):
+            log.append(b"msg %d" % msg)
+            if msg % 3 == 2:
+                popped.append(log.pop())
+        while not log.is_empty():
+            popped.append(log.pop())
+        self.assertEqual(popped, [b"msg %d" % msg for msg in range(100)])
+
+    def test_reopen_after_close(self):
+        log = self._open(segment_size=100)
+        for msg in range(20):
+            log.append("msg %d" % msg, fault=msg % 2 == 0)
+        for _ in range(5):
+            log.pop()
+        log.close()
+
+        log = self._open(segment_size=100)
+        self.assertEqual((log.head, log.tail), (5, 20))
+        entries = log.entries()
+        self.assertEqual([entry[0] for entry in entries], list(range(5, 20)))
+        self.assertEqual([entry[2] for entry in entries],
+                         [msg % 2 == 0 for msg in range(5, 20)])
+        self.assertEqual(log.pop(), b"msg 5")
+
+    def test_crash_replays_reads_since_checkpoint(self):
+        log = self._open()
+        for msg in range(10):
+            log.append(msg, pickled=True)
+        log.pop()
+        log.pop()
+        log.commit()
+        # Read but not checkpointed before the crash
+        log.pop()
+
+        recovered = self._open()
+        self.assertEqual((recovered.head, recovered.tail), (2, 10))
+        self.assertEqual([recovered.pop() for _ in range(8)], list(range(2, 10)))
+
+    def test_torn_record_truncated(self):
+        log = self._open()
+        for msg in range(3):
+            log.append(b"complete %d" % msg)
+        log.commit()
+        segment = os.path.join(self.path, self._segments()[-1])
+        size = os.path.getsize(segment)
+        # A record header written without its payload
+        with open(segment, "ab") as fh:
+            fh.write(SegmentLog.RECORD_HEADER.pack(100, 0, 0, 0, 0) + b"torn")
+
+        recovered = self._open()
+        self.assertEqual(os.path.getsize(segment), size)
+        self.assertEqual(recovered.tail, 3)
+        self.assertEqual([recovered.pop() for _ in range(3)],
+                         [b"complete 0", b"complete 1", b"complete 2"])
+        recovered.append(b"after")
+        self.assertEqual(recovered.pop(), b"after")
+
+    def test_corrupted_record_skips_rest_of_segment(self):
+        log = self._open(segment_size=60)
+        for msg in range(6):
+            log.append(b"record %d" % msg)
+        log.commit()
+        first = os.path.join(self.path, self._segments()[0])
+        with open(first, "r+b") as fh:
+            fh.seek(SegmentLog.RECORD_HEADER.size)
+            fh.write(b"X")
+
+        recovered = self._open(segment_size=60)
+        msgs = []
+        while not recovered.is_empty():
+            msgs.append(recovered.pop())
+        self.assertNotIn(b"record 0", msgs)
+        self.assertIn(b"record 5", msgs)
+        self.assertEqual(msgs, sorted(msgs))
+
+    def test_evicted_skipped_after_reopen(self):
+        log = self._open()
+        sizes = [log.append(b"msg %d" % msg) for msg in range(4)]
+        log.evict(1, sizes[1])
+        self.assertEqual(log.current_size, sum(sizes) - sizes[1])
+        log.commit()
+
+        recovered = self._open()
+        self.assertEqual(recovered.current_size, sum(sizes) - sizes[1])
+        self.assertEqual([entry[0] for entry in recovered.entries()], [0, 2, 3])
+        self.assertEqual([recovered.pop() for _ in range(3)],
+                         [b"msg 0", b"msg 2", b"msg 3"])
+        self.assertTrue(recovered.is_empty())
+
+    def test_pop_batch(self):
+        log = self._open()
+        for msg in range(5):
+            log.append(b"%d" % msg)
+        self.assertEqual(log.pop_batch(3), [(0, b"0"), (1, b"1"), (2, b"2")])
+        self.assertEqual(log.pop_batch(3), [(3, b"3"), (4, b"4")])
+        self.assertEqual(log.pop_batch(3), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils.sqlitestore import SQLiteStore
+
+
+class TestSQLiteStore(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.store = self._open()
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.path)
+
+    def _open(self):
+        return SQLiteStore(os.path.join(self.path, "store", "sspl.db"))
+
+    def test_put_and_get(self):
+        self.store.put({"drive": 1}, "/var/cortx/sspl/data/drive1")
+        self.assertEqual(self.store.get("/var/cortx/sspl/data/drive1"), {"drive": 1})
+        self.assertIsNone(self.store.get("/var/cortx/sspl/data/drive2"))
+        self.assertEqual(self.store.exists("/var/cortx/sspl/data/drive1"), (True, "Success"))
+        self.assertEqual(self.store.exists("/var/cortx/sspl/data/drive2"), (False, "Success"))
+
+    def test_unpickled_values_read_back(self):
+        self.store.put("text", "text", pickled=False)
+        self.store.put(b"bytes", "bytes", pickled=False)
+        self.assertEqual(self.store.get("text"), b"text")
+        self.assertEqual(self.store.get("bytes"), b"bytes")
+
+    def test_persisted_across_reopen(self):
+        self.store.put([1, 2], "a/b")
+        self.store.close()
+        self.store = self._open()
+        self.assertEqual(self.store.get("a/b"), [1, 2])
+
+    def test_get_many_over_parameter_limit(self):
+        items = {"dir/key%04d" % index: index for index in range(1200)}
+        self.assertTrue(self.store.put_many(items))
+        keys = list(items) + ["dir/missing"]
+        values = self.store.get_many(keys)
+        self.assertEqual(len(values), 1201)
+        self.assertEqual(values["dir/key1199"], 1199)
+        self.assertIsNone(values["dir/missing"])
+
+    def test_delete(self):
+        self.store.put_many({"a": 1, "b": 2, "c": 3})
+        self.store.delete("a")
+        self.assertTrue(self.store.delete_many(["b", "missing"]))
+        self.assertEqual(self.store.get_many(["a", "b", "c"]),
+                         {"a": None, "b": None, "c": 3})
+
+    def test_directory_reads(self):
+        self.store.put_many({"/data/drives/1": "d1", "/data/drives/2": "d2",
+                             "/data/drives/1/prev": "p1", "/data/drivesX": "x",
+                             "/data/psu": "psu"})
+        self.assertEqual(self.store.get_all_with_prefix("/data/drives"),
+                         {"1": "d1", "2": "d2"})
+        self.assertEqual(self.store.get_keys_with_prefix("/data/drives/"), ["1", "2"])
+        self.assertEqual(self.store.get_keys_with_prefix("/data"),
+                         ["drives", "drivesX", "psu"])
+
+    def test_range_and_delete_prefix(self):
+        self.store.put_many({"sel/%03d" % index: index for index in range(10)})
+        self.store.put("other", "sem")
+        self.assertEqual([key for key, _ in self.store.get_range("sel/003", "sel/006")],
+                         ["sel/003", "sel/004", "sel/005"])
+        self.assertEqual(self.store.get_range("sel/008"),
+                         [("sel/008", 8), ("sel/009", 9), ("sem", "other")])
+        self.assertEqual(self.store.get_range("sel/008", values=False)[0], ("sel/008", None))
+        self.assertTrue(self.store.delete_prefix("sel/"))
+        self.assertEqual(self.store.get_keys_with_prefix(""), ["sem"])
+
+    def test_transaction_rolled_back(self):
+        self.store.put(1, "a")
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction():
+                self.store.put(2, "a")
+                with self.store.transaction():
+                    self.store.put(3, "b")
+                raise RuntimeError("abort")
+        self.assertEqual(self.store.get_many(["a", "b"]), {"a": 1, "b": None})
+
+    def test_nested_transaction_committed_once(self):
+        with self.store.transaction():
+            with self.store.transaction():
+                self.store.put(1, "a")
+            # Not visible to other connections until the outer block ends
+            other = self._open()
+            self.assertIsNone(other.get("a"))
+            other.close()
+        other = self._open()
+        self.assertEqual(other.get("a"), 1)
+        other.close()
+
+    def test_shared_by_threads(self):
+        def write(thread):
+            for index in range(50):
+                self.store.put(index, "t%d/%d" % (thread, index))
+
+        threads = [threading.Thread(target=write, args=(thread,)) for thread in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for thread in range(4):
+            self.assertEqual(len(self.store.get_all_with_prefix("t%d" % thread)), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,258 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from framework.utils.filestore import FileStore
+from framework.utils.segment_log import SegmentLog
+from framework.utils.store_queue import RetentionIndex, StoreQueue, sizeof_payload
+
+
+def sensor_msg(alert_type, seq):
+    return json.dumps({"message": {"sensor_response_type": {
+        "alert_type": alert_type, "severity": "informational", "seq": seq}}})
+
+
+def actuator_msg(event_time, seq):
+    return json.dumps({"message": {"actuator_response_type": {
+        "info": {"event_time": str(int(event_time))}, "seq": seq}}})
+
+
+def seq_of(msg):
+    if isinstance(msg, bytes):
+        msg = msg.decode("utf-8")
+    message = json.loads(msg)["message"]
+    response = message.get("sensor_response_type") or message["actuator_response_type"]
+    return response["seq"]
+
+
+class TestRetentionIndex(unittest.TestCase):
+
+    def test_telemetry_evicted_before_faults(self):
+        retention = RetentionIndex()
+        retention.add(0, 10, True, 100)
+        retention.add(1, 10, False, 101)
+        retention.add(2, 10, False, 102)
+        self.assertEqual(retention.victim(200), 1)
+        retention.remove(1)
+        self.assertEqual(retention.victim(200), 2)
+        retention.remove(2)
+        self.assertEqual(retention.victim(200), 0)
+        retention.remove(0)
+        self.assertIsNone(retention.victim(200))
+        self.assertEqual(len(retention), 0)
+
+    def test_oldest_evicted_without_severity(self):
+        retention = RetentionIndex(severity=False)
+        retention.add(0, 10, True, 100)
+        retention.add(1, 10, False, 101)
+        self.assertEqual(retention.victim(200), 0)
+
+    def test_expired_evicted_first(self):
+        retention = RetentionIndex(ttl=50)
+        retention.add(0, 10, True, 100)
+        retention.add(1, 10, False, 160)
+        self.assertEqual(retention.victim(140), 1)
+        self.assertEqual(retention.victim(150), 0)
+        self.assertTrue(retention.is_expired(100, 0, 150))
+        self.assertFalse(retention.is_expired(160, 0, 150))
+
+    def test_expiring_message_evicted_once_expired(self):
+        retention = RetentionIndex()
+        retention.add(0, 10, False, 100)
+        retention.add(1, 10, False, 101, expires=300)
+        retention.add(2, 10, False, 102, expires=200)
+        self.assertEqual(retention.victim(150), 0)
+        self.assertEqual(retention.victim(250), 2)
+        retention.remove(2)
+        self.assertEqual(retention.victim(250), 0)
+        self.assertEqual(retention.victim(350), 1)
+
+    def test_remove_returns_entry(self):
+        retention = RetentionIndex()
+        retention.add(0, 10, False, 100)
+        retention.add(1, 20, False, 101, expires=300)
+        retention.add(2, 30, False, 102)
+        self.assertEqual(retention.remove(1), (101, 20, 300))
+        self.assertIsNone(retention.remove(1))
+        self.assertEqual(len(retention), 2)
+        self.assertEqual(retention.victim(400), 0)
+
+    def test_discard_before(self):
+        retention = RetentionIndex()
+        for index in range(6):
+            retention.add(index, 10, index % 2 == 0, 100 + index)
+        retention.discard_before(4)
+        self.assertEqual(len(retention), 2)
+        self.assertEqual(retention.victim(200), 5)
+
+    def test_expiring_heap_compacted(self):
+        retention = RetentionIndex()
+        for index in range(1000):
+            retention.add(index, 10, False, 100, expires=1000 - index)
+            retention.remove(index)
+        self.assertLess(len(retention._expiring), 10)
+        retention.add(1000, 10, False, 100, expires=50)
+        self.assertEqual(retention.victim(60), 1000)
+
+
+class TestStoreQueue(unittest.TestCase):
+
+    BACKEND = StoreQueue.STORE_BACKEND
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.conf = {
+            StoreQueue.LIMIT_CONSUL_MEMORY: 1000,
+            StoreQueue.STORE_QUEUE_BACKEND: self.BACKEND,
+            StoreQueue.EVICTION_POLICY: StoreQueue.SEVERITY_POLICY,
+            StoreQueue.MESSAGE_TTL: 0
+        }
+        conf = mock.patch("framework.utils.store_queue.Conf")
+        conf.start().get.side_effect = \
+            lambda index, key, default: self.conf.get(key.split(">")[1], default)
+        self.addCleanup(conf.stop)
+        for name, value in (("DATA_PATH", self.path), ("store", FileStore())):
+            patcher = mock.patch("framework.utils.store_queue." + name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        StoreQueue._queues.clear()
+        for log in SegmentLog._logs.values():
+            log.close()
+        SegmentLog._logs.clear()
+        shutil.rmtree(self.path)
+
+    def _reopen(self):
+        StoreQueue._queues.clear()
+        for log in SegmentLog._logs.values():
+            log.close()
+        SegmentLog._logs.clear()
+        return StoreQueue()
+
+    def test_fifo(self):
+        queue = StoreQueue()
+        for seq in range(5):
+            queue.put(sensor_msg("fault", seq))
+        self.assertEqual(queue.backlog(), 5)
+        self.assertEqual([seq_of(queue.get()) for _ in range(5)], list(range(5)))
+        self.assertIsNone(queue.get())
+        self.assertTrue(queue.is_empty())
+
+    def test_size_of_stored_bytes(self):
+        queue = StoreQueue()
+        text = sensor_msg("fault", 0)
+        msg = {"message": {"seq": 1}}
+        queue.put(text)
+        queue.put(msg, pickled=True)
+        self.assertEqual(queue.current_size,
+                         len(text.encode("utf-8")) + len(pickle.dumps(msg)))
+        self.assertEqual(sizeof_payload(msg, pickled=True), len(pickle.dumps(msg)))
+        queue.put(text, pickled=True)
+        self.assertEqual(queue.current_size,
+                         len(text.encode("utf-8")) + len(pickle.dumps(msg)) +
+                         len(pickle.dumps(text)))
+        queue.get()
+        self.assertEqual(queue.get(), msg)
+        self.assertEqual(queue.current_size, len(pickle.dumps(text)))
+        self.assertEqual(queue.get(), text)
+        self.assertEqual(queue.current_size, 0)
+
+    def test_telemetry_evicted_before_faults(self):
+        size = len(sensor_msg("fault", 0))
+        self.conf[StoreQueue.LIMIT_CONSUL_MEMORY] = size * 4
+        queue = StoreQueue()
+        queue.put(sensor_msg("fault", 0))
+        queue.put(sensor_msg("update", 1))
+        queue.put(sensor_msg("fault", 2))
+        queue.put(sensor_msg("update", 3))
+        queue.put(sensor_msg("fault", 4))
+        queue.put(sensor_msg("fault", 5))
+
+        self.assertLessEqual(queue.current_size, size * 4)
+        self.assertEqual(queue.stats()["evicted"], 2)
+        msgs = []
+        while not queue.is_empty():
+            msg = queue.get()
+            if msg is not None:
+                msgs.append(seq_of(msg))
+        self.assertEqual(msgs, [0, 2, 4, 5])
+        self.assertEqual(queue.current_size, 0)
+
+    def test_oldest_evicted(self):
+        self.conf[StoreQueue.LIMIT_CONSUL_MEMORY] = \
+            len(sensor_msg("update", 1)) + len(sensor_msg("fault", 2))
+        self.conf[StoreQueue.EVICTION_POLICY] = StoreQueue.OLDEST_POLICY
+        queue = StoreQueue()
+        queue.put(sensor_msg("fault", 0))
+        queue.put(sensor_msg("update", 1))
+        queue.put(sensor_msg("fault", 2))
+        msgs = []
+        while not queue.is_empty():
+            msg = queue.get()
+            if msg is not None:
+                msgs.append(seq_of(msg))
+        self.assertEqual(msgs, [1, 2])
+
+    def test_expired_actuator_response_evicted_first(self):
+        self.conf[StoreQueue.LIMIT_CONSUL_MEMORY] = \
+            len(sensor_msg("update", 0)) + len(sensor_msg("update", 2))
+        queue = StoreQueue()
+        expired = time.time() - StoreQueue.ACTUATOR_RESPONSE_TIMEOUT - 10
+        queue.put(sensor_msg("update", 0))
+        queue.put(actuator_msg(expired, 1))
+        queue.put(sensor_msg("update", 2))
+        msgs = []
+        while not queue.is_empty():
+            msg = queue.get()
+            if msg is not None:
+                msgs.append(seq_of(msg))
+        self.assertEqual(msgs, [0, 2])
+
+    def test_oversized_message_dropped(self):
+        queue = StoreQueue()
+        queue.put("x" * 2000)
+        self.assertTrue(queue.is_empty())
+        self.assertEqual(queue.current_size, 0)
+
+    def test_messages_left_indexed_on_open(self):
+        queue = StoreQueue()
+        for seq in range(3):
+            queue.put(sensor_msg("update", seq))
+        size = queue.current_size
+        queue = self._reopen()
+        self.assertEqual(queue.backlog(), 3)
+        self.assertEqual(queue.current_size, size)
+        self.assertEqual([seq_of(queue.get()) for _ in range(3)], [0, 1, 2])
+
+
+class TestSegmentStoreQueue(TestStoreQueue):
+
+    BACKEND = StoreQueue.SEGMENT_BACKEND
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# Copyright (c) 2020 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import json
+import os
+import sys
+import unittest
+
+LOW_LEVEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, LOW_LEVEL)
+# The message handlers import the framework packages without the prefix
+sys.path.insert(0, os.path.join(LOW_LEVEL, "framework"))
+
+from framework.base.internal_msgQ import InternalMsgQueue
+from framework.base.module_stats import ModuleStats
+from framework.base.sspl_constants import enabled_products
+from framework.rabbitmq.rabbitmq_egress_processor import RabbitMQegressProcessor
+from framework.rabbitmq.thread_controller import ThreadController
+
+
+class StubModule(object):
+    """Module answering the statistics requests of the ThreadController"""
+
+    def __init__(self, name):
+        self._name = name
+        self._stats = ModuleStats()
+        self._stats.record_run(0.1, 0.2)
+
+    def name(self):
+        return self._name
+
+    def get_stats(self):
+        return self._stats.snapshot()
+
+
+class AccumulatedMsgsModule(StubModule):
+    """Registered by its class, as sspl_ll_d does for
+    RabbitMQEgressAccumulatedMsgsProcessor"""
+
+
+class TestThreadControllerStats(unittest.TestCase):
+
+    def setUp(self):
+        self.msgQlist = {
+            ThreadController.name(): InternalMsgQueue(),
+            RabbitMQegressProcessor.name(): InternalMsgQueue(),
+            "StubModule": InternalMsgQueue()
+        }
+        self.controller = ThreadController()
+        self.controller.initialize_msgQ(self.msgQlist)
+        self.controller._product = enabled_products[0]
+        self.controller._sspl_modules = {
+            "StubModule": StubModule("StubModule"),
+            AccumulatedMsgsModule: AccumulatedMsgsModule("AccumulatedMsgsModule")
+        }
+
+    def _request_stats(self, module_name):
+        self.controller._process_msg({
+            "sspl_ll_msg_header": {"uuid": "16476007-a739-4785-b5c6-f3de189cdf12"},
+            "actuator_request_type": {
+                "thread_controller": {
+                    "module_name": module_name,
+                    "thread_request": "stats"
+                }
+            }
+        })
+        egressQ = self.msgQlist[RabbitMQegressProcessor.name()]
+        self.assertEqual(egressQ.qsize(), 1)
+        jsonMsg, _ = egressQ.get_nowait()
+        response = json.loads(jsonMsg)["message"]["actuator_response_type"]
+        return response["thread_controller"]["thread_response"]
+
+    def test_stats_all(self):
+        stats = json.loads(self._request_stats("all"))
+        self.assertEqual(sorted(stats),
+                         ["AccumulatedMsgsModule", "StubModule"])
+        self.assertEqual(stats["StubModule"]["msgQ_depth"], 0)
+        self.assertNotIn("msgQ_depth", stats["AccumulatedMsgsModule"])
+
+    def test_stats_module(self):
+        stats = json.loads(self._request_stats("StubModule"))
+        self.assertEqual(list(stats), ["StubModule"])
+
+    def test_stats_unknown_module(self):
+        response = self._request_stats("UnknownModule")
+        self.assertTrue(response.startswith("Error, unknown module"))
+
+
+if __name__ == '__main__':
+    unittest.main()